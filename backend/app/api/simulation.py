@@ -4,8 +4,10 @@ Step2: Zep实体读取与过滤、OASIS模拟准备与运行（全程自动化
 """
 
 import os
+import json
 import traceback
-from flask import request, jsonify, send_file
+from typing import Optional
+from flask import request, jsonify, send_file, Response, stream_with_context
 
 from . import simulation_bp
 from ..config import Config
@@ -1270,6 +1272,109 @@ def generate_profiles():
 
 # ============== 模拟运行控制接口 ==============
 
+@simulation_bp.route('/schedule/preview', methods=['POST'])
+def preview_activation_schedule():
+    """
+    预览激活计划（不调用 LLM）
+    
+    以固定种子计算每轮激活的 Agent，估算每轮 LLM 调用数、峰值并发和预计耗时，
+    计划写入模拟目录的 activation_schedule.json，启动模拟时传入 use_activation_schedule=true 即按该计划回放
+    
+    请求（JSON）：
+        {
+            "simulation_id": "sim_xxxx",   // 必填，模拟ID
+            "platform": "parallel",         // 可选: 只支持 parallel（回放仅支持双平台并行模拟）
+            "seed": 42,                     // 可选: 随机种子，未指定时随机生成
+            "max_rounds": 100,              // 可选: 最大模拟轮数
+            "llm_call_seconds": 10          // 可选: 估算耗时使用的单次 LLM 调用平均耗时（秒）
+        }
+    
+    返回：
+        {
+            "success": true,
+            "data": {
+                "simulation_id": "sim_xxxx",
+                "seed": 42,
+                "total_rounds": 144,
+                "platforms": ["twitter", "reddit"],
+                "summary": {
+                    "total_llm_calls": 3120,
+                    "max_llm_calls_per_round": 48,
+                    "peak_concurrency": 48,
+                    "estimated_duration_seconds": 5760.0,
+                    "per_round": [{"round": 1, "llm_calls": 12, "concurrency": 12, "twitter": 6, "reddit": 6}, ...]
+                }
+            }
+        }
+    """
+    try:
+        data = request.get_json() or {}
+        
+        simulation_id = data.get('simulation_id')
+        if not simulation_id:
+            return jsonify({
+                "success": False,
+                "error": "请提供 simulation_id"
+            }), 400
+        
+        platform = data.get('platform', 'parallel')
+        if platform != 'parallel':
+            return jsonify({
+                "success": False,
+                "error": f"激活计划回放仅支持双平台并行模拟，platform 只能为 parallel: {platform}"
+            }), 400
+        
+        try:
+            seed = int(data['seed']) if data.get('seed') is not None else None
+            max_rounds = int(data['max_rounds']) if data.get('max_rounds') is not None else None
+            llm_call_seconds = float(data['llm_call_seconds']) if data.get('llm_call_seconds') is not None else None
+        except (ValueError, TypeError):
+            return jsonify({
+                "success": False,
+                "error": "seed、max_rounds 必须是整数，llm_call_seconds 必须是数字"
+            }), 400
+        
+        if max_rounds is not None and max_rounds <= 0:
+            return jsonify({
+                "success": False,
+                "error": "max_rounds 必须是正整数"
+            }), 400
+        
+        manager = SimulationManager()
+        if not manager.get_simulation(simulation_id):
+            return jsonify({
+                "success": False,
+                "error": f"模拟不存在: {simulation_id}"
+            }), 404
+        
+        schedule = manager.preview_activation_schedule(
+            simulation_id,
+            platform=platform,
+            seed=seed,
+            max_rounds=max_rounds,
+            llm_call_seconds=llm_call_seconds
+        )
+        
+        return jsonify({
+            "success": True,
+            "data": schedule
+        })
+        
+    except ValueError as e:
+        return jsonify({
+            "success": False,
+            "error": str(e)
+        }), 400
+        
+    except Exception as e:
+        logger.error(f"预览激活计划失败: {str(e)}")
+        return jsonify({
+            "success": False,
+            "error": str(e),
+            "traceback": traceback.format_exc()
+        }), 500
+
+
 @simulation_bp.route('/start', methods=['POST'])
 def start_simulation():
     """
@@ -1281,6 +1386,9 @@ def start_simulation():
             "platform": "parallel",                // 可选: twitter / reddit / parallel (默认)
             "max_rounds": 100,                     // 可选: 最大模拟轮数，用于截断过长的模拟
             "enable_graph_memory_update": false,   // 可选: 是否将Agent活动动态更新到Zep图谱记忆
+            "log_segment_rounds": 12,              // 可选: 动作日志按轮次分段，每段的轮数（仅 parallel）
+            "seed": 42,                            // 可选: Agent 激活抽样的随机种子
+            "use_activation_schedule": false,      // 可选: 按 /schedule/preview 生成的激活计划回放（仅 parallel）
             "force": false                         // 可选: 强制重新开始（会停止运行中的模拟并清理日志）
         }
 
@@ -1325,6 +1433,9 @@ def start_simulation():
         max_rounds = data.get('max_rounds')  # 可选：最大模拟轮数
         enable_graph_memory_update = data.get('enable_graph_memory_update', False)  # 可选：是否启用图谱记忆更新
         force = data.get('force', False)  # 可选：强制重新开始
+        log_segment_rounds = data.get('log_segment_rounds')  # 可选：动作日志按轮次分段
+        seed = data.get('seed')  # 可选：Agent 激活抽样的随机种子
+        use_activation_schedule = data.get('use_activation_schedule', False)  # 可选：按激活计划回放
 
         # 验证 max_rounds 参数
         if max_rounds is not None:
@@ -1341,6 +1452,31 @@ def start_simulation():
                     "error": "max_rounds 必须是有效的整数"
                 }), 400
 
+        # 验证 log_segment_rounds 参数
+        if log_segment_rounds is not None:
+            try:
+                log_segment_rounds = int(log_segment_rounds)
+                if log_segment_rounds <= 0:
+                    return jsonify({
+                        "success": False,
+                        "error": "log_segment_rounds 必须是正整数"
+                    }), 400
+            except (ValueError, TypeError):
+                return jsonify({
+                    "success": False,
+                    "error": "log_segment_rounds 必须是有效的整数"
+                }), 400
+
+        # 验证 seed 参数
+        if seed is not None:
+            try:
+                seed = int(seed)
+            except (ValueError, TypeError):
+                return jsonify({
+                    "success": False,
+                    "error": "seed 必须是有效的整数"
+                }), 400
+
         if platform not in ['twitter', 'reddit', 'parallel']:
             return jsonify({
                 "success": False,
@@ -1428,7 +1564,10 @@ def start_simulation():
             platform=platform,
             max_rounds=max_rounds,
             enable_graph_memory_update=enable_graph_memory_update,
-            graph_id=graph_id
+            graph_id=graph_id,
+            log_segment_rounds=log_segment_rounds,
+            seed=seed,
+            use_activation_schedule=bool(use_activation_schedule)
         )
         
         # 更新模拟状态
@@ -1522,6 +1661,205 @@ def stop_simulation():
         }), 500
 
 
+@simulation_bp.route('/resume', methods=['POST'])
+def resume_simulation():
+    """
+    从最近的检查点继续运行中断（进程崩溃或被停止）的模拟
+
+    模拟脚本默认每 10 轮保存一次检查点（收到退出信号和模拟完成时也会保存），
+    恢复后检查点之前的轮次不再重新调用 LLM；沿用中断前的运行平台、轮数和激活计划
+
+    请求（JSON）：
+        {
+            "simulation_id": "sim_xxxx",          // 必填，模拟ID
+            "enable_graph_memory_update": false    // 可选: 是否将Agent活动动态更新到Zep图谱记忆
+        }
+
+    返回：
+        {
+            "success": true,
+            "data": {
+                "simulation_id": "sim_xxxx",
+                "runner_status": "running",
+                "process_pid": 12345,
+                "resumed_from": {"twitter": 130, "reddit": 120},  // 各平台恢复的轮次
+                "graph_memory_update_enabled": false
+            }
+        }
+    """
+    try:
+        data = request.get_json() or {}
+
+        simulation_id = data.get('simulation_id')
+        if not simulation_id:
+            return jsonify({
+                "success": False,
+                "error": "请提供 simulation_id"
+            }), 400
+
+        enable_graph_memory_update = data.get('enable_graph_memory_update', False)
+
+        manager = SimulationManager()
+        state = manager.get_simulation(simulation_id)
+        if not state:
+            return jsonify({
+                "success": False,
+                "error": f"模拟不存在: {simulation_id}"
+            }), 404
+
+        graph_id = None
+        if enable_graph_memory_update:
+            graph_id = state.graph_id
+            if not graph_id:
+                project = ProjectManager.get_project(state.project_id)
+                if project:
+                    graph_id = project.graph_id
+
+            if not graph_id:
+                return jsonify({
+                    "success": False,
+                    "error": "启用图谱记忆更新需要有效的 graph_id，请确保项目已构建图谱"
+                }), 400
+
+        checkpoints = SimulationRunner.get_checkpoints(simulation_id)
+        run_state = SimulationRunner.resume_simulation(
+            simulation_id=simulation_id,
+            enable_graph_memory_update=enable_graph_memory_update,
+            graph_id=graph_id
+        )
+
+        state.status = SimulationStatus.RUNNING
+        manager._save_simulation_state(state)
+
+        response_data = run_state.to_dict()
+        response_data['resumed_from'] = {
+            platform: checkpoint.get('round') for platform, checkpoint in checkpoints.items()
+        }
+        response_data['graph_memory_update_enabled'] = enable_graph_memory_update
+        if enable_graph_memory_update:
+            response_data['graph_id'] = graph_id
+
+        return jsonify({
+            "success": True,
+            "data": response_data
+        })
+
+    except ValueError as e:
+        return jsonify({
+            "success": False,
+            "error": str(e)
+        }), 400
+
+    except Exception as e:
+        logger.error(f"恢复模拟失败: {str(e)}")
+        return jsonify({
+            "success": False,
+            "error": str(e),
+            "traceback": traceback.format_exc()
+        }), 500
+
+
+@simulation_bp.route('/<simulation_id>/checkpoints', methods=['GET'])
+def get_simulation_checkpoints(simulation_id: str):
+    """
+    获取各平台最近的检查点（用于判断能否调用 /resume 接口）
+
+    返回：
+        {
+            "success": true,
+            "data": {
+                "simulation_id": "sim_xxxx",
+                "resumable": true,
+                "checkpoints": {
+                    "twitter": {"round": 130, "total_rounds": 144, "total_actions": 5210, "created_at": "..."}
+                }
+            }
+        }
+    """
+    try:
+        checkpoints = SimulationRunner.get_checkpoints(simulation_id)
+        summary_keys = ('round', 'total_rounds', 'total_actions', 'script', 'created_at')
+        return jsonify({
+            "success": True,
+            "data": {
+                "simulation_id": simulation_id,
+                "resumable": bool(checkpoints),
+                "checkpoints": {
+                    platform: {key: checkpoint.get(key) for key in summary_keys}
+                    for platform, checkpoint in checkpoints.items()
+                }
+            }
+        })
+
+    except Exception as e:
+        logger.error(f"获取检查点失败: {str(e)}")
+        return jsonify({
+            "success": False,
+            "error": str(e),
+            "traceback": traceback.format_exc()
+        }), 500
+
+
+@simulation_bp.route('/archive', methods=['POST'])
+def archive_simulation():
+    """
+    归档已结束的模拟（压缩日志、整理数据库），节省磁盘空间
+    
+    归档后动作历史、时间线、帖子、采访历史等接口仍可正常读取；
+    模拟或模拟环境仍在运行时无法归档
+    
+    请求（JSON）：
+        {
+            "simulation_id": "sim_xxxx"  // 必填，模拟ID
+        }
+    
+    返回：
+        {
+            "success": true,
+            "data": {
+                "simulation_id": "sim_xxxx",
+                "archived_files": ["twitter/actions.jsonl", "simulation.log", "twitter_simulation.db"],
+                "bytes_before": 104857600,
+                "bytes_after": 15728640,
+                "errors": null
+            }
+        }
+    """
+    try:
+        data = request.get_json() or {}
+        
+        simulation_id = data.get('simulation_id')
+        if not simulation_id:
+            return jsonify({
+                "success": False,
+                "error": "请提供 simulation_id"
+            }), 400
+        
+        result = SimulationRunner.archive_simulation(simulation_id)
+        
+        return jsonify({
+            "success": result["success"],
+            "data": {
+                "simulation_id": simulation_id,
+                **result
+            }
+        })
+        
+    except ValueError as e:
+        return jsonify({
+            "success": False,
+            "error": str(e)
+        }), 400
+        
+    except Exception as e:
+        logger.error(f"归档模拟失败: {str(e)}")
+        return jsonify({
+            "success": False,
+            "error": str(e),
+            "traceback": traceback.format_exc()
+        }), 500
+
+
 # ============== 实时状态监控接口 ==============
 
 @simulation_bp.route('/<simulation_id>/run-status', methods=['GET'])
@@ -1668,6 +2006,8 @@ def get_run_status_detail(simulation_id: str):
         result["rounds_count"] = len(run_state.rounds)
         # recent_actions 只展示当前最新一轮两个平台的内容
         result["recent_actions"] = [a.to_dict() for a in recent_actions]
+        # 模拟进程资源占用（最近 60 次采样）
+        result["resources"] = SimulationRunner.get_resource_metrics(simulation_id, limit=60)
         
         return jsonify({
             "success": True,
@@ -1683,6 +2023,88 @@ def get_run_status_detail(simulation_id: str):
         }), 500
 
 
+@simulation_bp.route('/<simulation_id>/metrics', methods=['GET'])
+def get_simulation_metrics(simulation_id: str):
+    """
+    获取模拟进程的资源占用采样
+    
+    监控线程每 5 秒从 /proc 采样一次（仅 Linux 有进程指标），用于发现内存泄漏
+    
+    Query参数：
+        limit: 只返回最近的采样数（默认全部，最多保留约 1 小时）
+    
+    返回：
+        {
+            "success": true,
+            "data": {
+                "pid": 12345,
+                "running": true,
+                "latest": {"timestamp": "...", "cpu_percent": 85.2, "rss_bytes": 524288000,
+                           "num_fds": 42, "num_threads": 12,
+                           "db_size_bytes": {"twitter_simulation.db": 1048576}, "db_total_bytes": 1048576},
+                "peak_rss_bytes": 530000000,
+                "avg_cpu_percent": 80.1,
+                "samples_count": 120,
+                "interval_seconds": 5.0,
+                "history": [...]
+            }
+        }
+    """
+    try:
+        limit = request.args.get('limit', type=int)
+        
+        metrics = SimulationRunner.get_resource_metrics(simulation_id, limit=limit)
+        if metrics is None:
+            return jsonify({
+                "success": False,
+                "error": f"没有该模拟的资源采样（模拟未在本次服务运行期间启动）: {simulation_id}"
+            }), 404
+        
+        return jsonify({
+            "success": True,
+            "data": metrics
+        })
+        
+    except Exception as e:
+        logger.error(f"获取资源采样失败: {str(e)}")
+        return jsonify({
+            "success": False,
+            "error": str(e),
+            "traceback": traceback.format_exc()
+        }), 500
+
+
+@simulation_bp.route('/metrics', methods=['GET'])
+def get_all_simulation_metrics():
+    """
+    获取所有模拟进程的最新资源占用汇总
+    
+    返回：
+        {
+            "success": true,
+            "data": {
+                "running_count": 3,
+                "total_rss_bytes": 1572864000,
+                "total_cpu_percent": 240.5,
+                "simulations": {"sim_xxxx": {"pid": ..., "running": true, "latest": {...}, ...}}
+            }
+        }
+    """
+    try:
+        return jsonify({
+            "success": True,
+            "data": SimulationRunner.get_all_resource_metrics()
+        })
+        
+    except Exception as e:
+        logger.error(f"获取资源采样汇总失败: {str(e)}")
+        return jsonify({
+            "success": False,
+            "error": str(e),
+            "traceback": traceback.format_exc()
+        }), 500
+
+
 @simulation_bp.route('/<simulation_id>/actions', methods=['GET'])
 def get_simulation_actions(simulation_id: str):
     """
@@ -1694,6 +2116,8 @@ def get_simulation_actions(simulation_id: str):
         platform: 过滤平台（twitter/reddit）
         agent_id: 过滤Agent ID
         round_num: 过滤轮次
+        cursor: 增量获取，上一次返回的 next_cursor（可选）
+        since_seq: 增量获取，已见过的最大动作序号，如 120 或 "twitter:120,reddit:98"（可选）
     
     返回：
         {
@@ -1703,6 +2127,9 @@ def get_simulation_actions(simulation_id: str):
                 "actions": [...]
             }
         }
+    
+    指定 cursor 或 since_seq 时只返回之后的新动作（按时间从旧到新，忽略 offset），
+    并在 data 中附带 "next_cursor"，下一次请求传入即可继续获取
     """
     try:
         limit = request.args.get('limit', 100, type=int)
@@ -1710,6 +2137,34 @@ def get_simulation_actions(simulation_id: str):
         platform = request.args.get('platform')
         agent_id = request.args.get('agent_id', type=int)
         round_num = request.args.get('round_num', type=int)
+        cursor = request.args.get('cursor')
+        since_seq = request.args.get('since_seq')
+        
+        if cursor or since_seq is not None:
+            try:
+                actions, next_cursor = SimulationRunner.get_actions_since(
+                    simulation_id=simulation_id,
+                    cursor=cursor,
+                    since_seq=since_seq,
+                    platform=platform,
+                    agent_id=agent_id,
+                    round_num=round_num,
+                    limit=limit
+                )
+            except ValueError as e:
+                return jsonify({
+                    "success": False,
+                    "error": str(e)
+                }), 400
+            
+            return jsonify({
+                "success": True,
+                "data": {
+                    "count": len(actions),
+                    "actions": [a.to_dict() for a in actions],
+                    "next_cursor": next_cursor
+                }
+            })
         
         actions = SimulationRunner.get_actions(
             simulation_id=simulation_id,
@@ -1737,6 +2192,90 @@ def get_simulation_actions(simulation_id: str):
         }), 500
 
 
+@simulation_bp.route('/<simulation_id>/actions/stream', methods=['GET'])
+def stream_simulation_actions(simulation_id: str):
+    """
+    实时推送模拟中的Agent动作（Server-Sent Events）
+    
+    监控线程读取到新动作后立即推送，替代轮询 /actions 和 /run-status/detail
+    
+    Query参数：
+        platform: 过滤平台（twitter/reddit）
+        agent_id: 过滤Agent ID
+        cursor: 续传游标（上一次收到的事件 id，也可以通过 Last-Event-ID 请求头传递）
+    
+    返回（text/event-stream）：
+        没有游标时先返回当前位置：
+        id: twitter:1024,reddit:2048
+        event: cursor
+        data: {"cursor": "twitter:1024,reddit:2048"}
+        
+        每条新动作（字段同 /actions）：
+        id: twitter:1536,reddit:2048
+        event: action
+        data: {"round_num": 5, "platform": "twitter", "agent_id": 3, "action_type": "CREATE_POST", ...}
+        
+        模拟结束时：
+        event: end
+        data: {"simulation_id": "sim_xxxx", "runner_status": "completed"}
+    """
+    try:
+        platform = request.args.get('platform')
+        agent_id = request.args.get('agent_id', type=int)
+        cursor = request.args.get('cursor') or request.headers.get('Last-Event-ID')
+        
+        if platform and platform not in ("twitter", "reddit"):
+            return jsonify({
+                "success": False,
+                "error": "platform 参数只能是 'twitter' 或 'reddit'"
+            }), 400
+        
+        events = SimulationRunner.stream_actions(
+            simulation_id=simulation_id,
+            platform=platform,
+            agent_id=agent_id,
+            cursor=cursor
+        )
+        
+    except ValueError as e:
+        return jsonify({
+            "success": False,
+            "error": str(e)
+        }), 400
+        
+    except Exception as e:
+        logger.error(f"订阅动作流失败: {str(e)}")
+        return jsonify({
+            "success": False,
+            "error": str(e),
+            "traceback": traceback.format_exc()
+        }), 500
+    
+    def generate():
+        try:
+            for item in events:
+                if item["event"] == "keepalive":
+                    # SSE 注释行，保持连接不被代理断开
+                    yield ": keepalive\n\n"
+                else:
+                    yield _format_sse(item["event"], item["data"], item.get("id"))
+        except Exception as e:
+            logger.error(f"推送动作流失败: {str(e)}")
+            yield _format_sse("error", {
+                "success": False,
+                "error": str(e)
+            })
+    
+    return Response(
+        stream_with_context(generate()),
+        mimetype='text/event-stream',
+        headers={
+            'Cache-Control': 'no-cache',
+            'X-Accel-Buffering': 'no'
+        }
+    )
+
+
 @simulation_bp.route('/<simulation_id>/timeline', methods=['GET'])
 def get_simulation_timeline(simulation_id: str):
     """
@@ -1975,7 +2514,9 @@ def interview_agent():
             "prompt": "你对这件事有什么看法？",  // 必填，采访问题
             "platform": "twitter",             // 可选，指定平台（twitter/reddit）
                                                // 不指定时：双平台模拟同时采访两个平台
-            "timeout": 60                      // 可选，超时时间（秒），默认60
+            "timeout": 60,                     // 可选，超时时间（秒），默认60
+            "async": false                     // 可选，为 true 时立即返回 task_id，
+                                               // 通过 GET /interview/task/<task_id> 查询结果
         }
 
     返回（不指定platform，双平台模式）：
@@ -2056,6 +2597,15 @@ def interview_agent():
         # 优化prompt，添加前缀避免Agent调用工具
         optimized_prompt = optimize_interview_prompt(prompt)
         
+        if data.get('async'):
+            return _submit_interview_task(simulation_id, SimulationRunner.interview_agent_async(
+                simulation_id=simulation_id,
+                agent_id=agent_id,
+                prompt=optimized_prompt,
+                platform=platform,
+                timeout=timeout
+            ))
+        
         result = SimulationRunner.interview_agent(
             simulation_id=simulation_id,
             agent_id=agent_id,
@@ -2090,6 +2640,68 @@ def interview_agent():
         }), 500
 
 
+def _validate_batch_interviews(interviews, platform) -> str:
+    """
+    校验批量采访参数
+
+    Returns:
+        错误信息，校验通过时返回空字符串
+    """
+    if not interviews or not isinstance(interviews, list):
+        return "请提供 interviews（采访列表）"
+
+    # 验证platform参数
+    if platform and platform not in ("twitter", "reddit"):
+        return "platform 参数只能是 'twitter' 或 'reddit'"
+
+    # 验证每个采访项
+    for i, interview in enumerate(interviews):
+        if 'agent_id' not in interview:
+            return f"采访列表第{i+1}项缺少 agent_id"
+        if 'prompt' not in interview:
+            return f"采访列表第{i+1}项缺少 prompt"
+        # 验证每项的platform（如果有）
+        item_platform = interview.get('platform')
+        if item_platform and item_platform not in ("twitter", "reddit"):
+            return f"采访列表第{i+1}项的platform只能是 'twitter' 或 'reddit'"
+
+    return ""
+
+
+def _optimize_batch_interviews(interviews):
+    """优化每个采访项的prompt，添加前缀避免Agent调用工具"""
+    optimized_interviews = []
+    for interview in interviews:
+        optimized_interview = interview.copy()
+        optimized_interview['prompt'] = optimize_interview_prompt(interview.get('prompt', ''))
+        optimized_interviews.append(optimized_interview)
+    return optimized_interviews
+
+
+def _submit_interview_task(simulation_id: str, coro):
+    """
+    后台执行采访并立即返回任务ID（"async": true 时使用）
+
+    采访在 IPC 调度器的事件循环中等待，不占用请求线程
+    """
+    task_id = SimulationRunner.submit_interview_task(simulation_id, coro)
+    return jsonify({
+        "success": True,
+        "data": {
+            "simulation_id": simulation_id,
+            "task_id": task_id,
+            "status": "processing",
+            "message": "采访已提交，请通过 /api/simulation/interview/task/<task_id> 查询结果"
+        }
+    })
+
+
+def _format_sse(event: str, data, event_id: Optional[str] = None) -> str:
+    """格式化一条 Server-Sent Events 消息"""
+    id_line = f"id: {event_id}\n" if event_id else ""
+    return f"{id_line}event: {event}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n"
+
+
 @simulation_bp.route('/interview/batch', methods=['POST'])
 def interview_agents_batch():
     """
@@ -2113,7 +2725,8 @@ def interview_agents_batch():
             ],
             "platform": "reddit",              // 可选，默认平台（被每项的platform覆盖）
                                                // 不指定时：双平台模拟每个Agent同时采访两个平台
-            "timeout": 120                     // 可选，超时时间（秒），默认120
+            "timeout": 120,                    // 可选，超时时间（秒），默认120
+            "async": false                     // 可选，为 true 时立即返回 task_id（同 /interview）
         }
 
     返回：
@@ -2148,39 +2761,13 @@ def interview_agents_batch():
                 "error": "请提供 simulation_id"
             }), 400
 
-        if not interviews or not isinstance(interviews, list):
+        validation_error = _validate_batch_interviews(interviews, platform)
+        if validation_error:
             return jsonify({
                 "success": False,
-                "error": "请提供 interviews（采访列表）"
+                "error": validation_error
             }), 400
 
-        # 验证platform参数
-        if platform and platform not in ("twitter", "reddit"):
-            return jsonify({
-                "success": False,
-                "error": "platform 参数只能是 'twitter' 或 'reddit'"
-            }), 400
-
-        # 验证每个采访项
-        for i, interview in enumerate(interviews):
-            if 'agent_id' not in interview:
-                return jsonify({
-                    "success": False,
-                    "error": f"采访列表第{i+1}项缺少 agent_id"
-                }), 400
-            if 'prompt' not in interview:
-                return jsonify({
-                    "success": False,
-                    "error": f"采访列表第{i+1}项缺少 prompt"
-                }), 400
-            # 验证每项的platform（如果有）
-            item_platform = interview.get('platform')
-            if item_platform and item_platform not in ("twitter", "reddit"):
-                return jsonify({
-                    "success": False,
-                    "error": f"采访列表第{i+1}项的platform只能是 'twitter' 或 'reddit'"
-                }), 400
-
         # 检查环境状态
         if not SimulationRunner.check_env_alive(simulation_id):
             return jsonify({
@@ -2188,16 +2775,17 @@ def interview_agents_batch():
                 "error": "模拟环境未运行或已关闭。请确保模拟已完成并进入等待命令模式。"
             }), 400
 
-        # 优化每个采访项的prompt，添加前缀避免Agent调用工具
-        optimized_interviews = []
-        for interview in interviews:
-            optimized_interview = interview.copy()
-            optimized_interview['prompt'] = optimize_interview_prompt(interview.get('prompt', ''))
-            optimized_interviews.append(optimized_interview)
+        if data.get('async'):
+            return _submit_interview_task(simulation_id, SimulationRunner.interview_agents_batch_async(
+                simulation_id=simulation_id,
+                interviews=_optimize_batch_interviews(interviews),
+                platform=platform,
+                timeout=timeout
+            ))
 
         result = SimulationRunner.interview_agents_batch(
             simulation_id=simulation_id,
-            interviews=optimized_interviews,
+            interviews=_optimize_batch_interviews(interviews),
             platform=platform,
             timeout=timeout
         )
@@ -2228,6 +2816,105 @@ def interview_agents_batch():
         }), 500
 
 
+@simulation_bp.route('/interview/batch/stream', methods=['POST'])
+def interview_agents_batch_stream():
+    """
+    批量采访多个Agent（流式返回）
+
+    每个Agent的回答完成后立即通过 Server-Sent Events 推送，无需等待整批结束
+
+    注意：此功能需要模拟环境处于运行状态
+
+    请求（JSON）：与 /interview/batch 相同
+
+    返回（text/event-stream）：
+        event: partial
+        data: {"key": "twitter_0", "agent_id": 0, "platform": "twitter", "response": "...", "timestamp": "..."}
+
+        event: done
+        data: {"success": true, "interviews_count": 2, "result": {...}, "timestamp": "..."}   // 同 /interview/batch 的 data
+
+        出错时以 error 事件结束：
+        event: error
+        data: {"success": false, "error": "..."}
+
+    参数错误或环境未运行时直接返回 JSON 错误（400）
+    """
+    try:
+        data = request.get_json() or {}
+
+        simulation_id = data.get('simulation_id')
+        interviews = data.get('interviews')
+        platform = data.get('platform')  # 可选：twitter/reddit/None
+        timeout = data.get('timeout', 120)
+
+        if not simulation_id:
+            return jsonify({
+                "success": False,
+                "error": "请提供 simulation_id"
+            }), 400
+
+        validation_error = _validate_batch_interviews(interviews, platform)
+        if validation_error:
+            return jsonify({
+                "success": False,
+                "error": validation_error
+            }), 400
+
+        # 检查环境状态
+        if not SimulationRunner.check_env_alive(simulation_id):
+            return jsonify({
+                "success": False,
+                "error": "模拟环境未运行或已关闭。请确保模拟已完成并进入等待命令模式。"
+            }), 400
+
+        events = SimulationRunner.interview_agents_batch_stream(
+            simulation_id=simulation_id,
+            interviews=_optimize_batch_interviews(interviews),
+            platform=platform,
+            timeout=timeout
+        )
+
+    except ValueError as e:
+        return jsonify({
+            "success": False,
+            "error": str(e)
+        }), 400
+
+    except Exception as e:
+        logger.error(f"批量Interview失败: {str(e)}")
+        return jsonify({
+            "success": False,
+            "error": str(e),
+            "traceback": traceback.format_exc()
+        }), 500
+
+    def generate():
+        try:
+            for item in events:
+                yield _format_sse(item["event"], item["data"])
+        except TimeoutError as e:
+            yield _format_sse("error", {
+                "success": False,
+                "error": f"等待批量Interview响应超时: {str(e)}"
+            })
+        except Exception as e:
+            logger.error(f"流式批量Interview失败: {str(e)}")
+            yield _format_sse("error", {
+                "success": False,
+                "error": str(e)
+            })
+
+    return Response(
+        stream_with_context(generate()),
+        mimetype='text/event-stream',
+        headers={
+            'Cache-Control': 'no-cache',
+            'X-Accel-Buffering': 'no'
+        }
+    )
+
+
 @simulation_bp.route('/interview/all', methods=['POST'])
 def interview_all_agents():
     """
@@ -2241,7 +2928,8 @@ def interview_all_agents():
             "prompt": "你对这件事整体有什么看法？",  // 必填，采访问题（所有Agent使用相同问题）
             "platform": "reddit",                   // 可选，指定平台（twitter/reddit）
                                                     // 不指定时：双平台模拟每个Agent同时采访两个平台
-            "timeout": 180                          // 可选，超时时间（秒），默认180
+            "timeout": 180,                         // 可选，超时时间（秒），默认180
+            "async": false                          // 可选，为 true 时立即返回 task_id（同 /interview）
         }
 
     返回：
@@ -2298,6 +2986,14 @@ def interview_all_agents():
         # 优化prompt，添加前缀避免Agent调用工具
         optimized_prompt = optimize_interview_prompt(prompt)
 
+        if data.get('async'):
+            return _submit_interview_task(simulation_id, SimulationRunner.interview_all_agents_async(
+                simulation_id=simulation_id,
+                prompt=optimized_prompt,
+                platform=platform,
+                timeout=timeout
+            ))
+
         result = SimulationRunner.interview_all_agents(
             simulation_id=simulation_id,
             prompt=optimized_prompt,
@@ -2331,6 +3027,37 @@ def interview_all_agents():
         }), 500
 
 
+@simulation_bp.route('/interview/task/<task_id>', methods=['GET'])
+def get_interview_task(task_id: str):
+    """
+    查询后台采访任务（/interview、/interview/batch、/interview/all 以 "async": true 提交）
+
+    返回：
+        {
+            "success": true,
+            "data": {
+                "task_id": "xxxx",
+                "status": "processing|completed|failed",
+                "result": {...},    // 完成时：与同步调用返回的 data 相同
+                "error": null       // 失败时（如等待响应超时）的错误信息
+            }
+        }
+    """
+    from ..models.task import TaskManager
+
+    task = TaskManager().get_task(task_id)
+    if not task or task.task_type != "simulation_interview":
+        return jsonify({
+            "success": False,
+            "error": f"任务不存在: {task_id}"
+        }), 404
+
+    return jsonify({
+        "success": True,
+        "data": task.to_dict()
+    })
+
+
 @simulation_bp.route('/interview/history', methods=['POST'])
 def get_interview_history():
     """
@@ -21,7 +21,8 @@ from .simulation_runner import (
     SimulationRunState,
     RunnerStatus,
     AgentAction,
-    RoundSummary
+    RoundSummary,
+    AgentStats
 )
 from .zep_graph_memory_updater import (
     ZepGraphMemoryUpdater,
@@ -30,6 +31,8 @@ from .zep_graph_memory_updater import (
 )
 from .simulation_ipc import (
     SimulationIPCClient,
+    AsyncSimulationIPCClient,
+    IPCDispatcher,
     SimulationIPCServer,
     IPCCommand,
     IPCResponse,
@@ -60,10 +63,13 @@ __all__ = [
     'RunnerStatus',
     'AgentAction',
     'RoundSummary',
+    'AgentStats',
     'ZepGraphMemoryUpdater',
     'ZepGraphMemoryManager',
     'AgentActivity',
     'SimulationIPCClient',
+    'AsyncSimulationIPCClient',
+    'IPCDispatcher',
     'SimulationIPCServer',
     'IPCCommand',
     'IPCResponse',
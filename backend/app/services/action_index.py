@@ -0,0 +1,418 @@
+"""
+模拟动作索引
+为每个模拟维护一个 SQLite 旁路索引（action_index.db），按平台、Agent、轮次、时间戳索引动作日志，
+使动作历史的过滤和分页查询不再需要每次重新解析全部 actions.jsonl
+
+索引按文件字节偏移增量同步：
+- 监控线程每个周期调用 sync()，只读取新追加的完整行
+- 查询前也会先 sync()，未被监控的模拟（如服务重启后）同样可用
+- 日志文件被替换或截断时（inode 变化或文件变小），该来源的索引自动重建
+- 日志被归档压缩后内容不变，沿用已有索引，偏移按解压后的原始位置计算；
+  按轮次分段的日志按各分段拼接后的偏移计算
+"""
+
+import os
+import json
+import sqlite3
+import threading
+from typing import Dict, Any, List, Optional, Set, Tuple
+
+from ..utils.logger import get_logger
+from ..utils.log_archive import resolve_log_path, is_plain_log, log_size, open_log
+
+logger = get_logger('mirofish.action_index')
+
+INDEX_DB_FILE = "action_index.db"
+
+# 索引结构版本，结构变化时递增以触发重建
+SCHEMA_VERSION = 2
+
+# 每批写入的行数
+INSERT_BATCH_SIZE = 5000
+
+# 按轮次查询时每条 SQL 的轮次数（不超过 SQLite 的参数个数上限）
+ROUND_QUERY_BATCH_SIZE = 500
+
+
+class ActionIndex:
+    """
+    单个模拟的动作索引
+
+    通过 ActionIndex.get(sim_dir) 获取（同一模拟共享一个实例和一条连接，内部加锁）
+    """
+
+    _instances: Dict[str, 'ActionIndex'] = {}
+    _instances_lock = threading.Lock()
+
+    def __init__(self, sim_dir: str):
+        self.sim_dir = sim_dir
+        self.db_path = os.path.join(sim_dir, INDEX_DB_FILE)
+        self._lock = threading.RLock()
+        self._conn: Optional[sqlite3.Connection] = None
+
+    @classmethod
+    def get(cls, sim_dir: str) -> 'ActionIndex':
+        """获取模拟的动作索引"""
+        key = os.path.abspath(sim_dir)
+        with cls._instances_lock:
+            index = cls._instances.get(key)
+            if index is None:
+                index = cls(key)
+                cls._instances[key] = index
+            return index
+
+    @classmethod
+    def discard(cls, sim_dir: str):
+        """关闭并移除模拟的动作索引实例（删除索引文件前调用）"""
+        key = os.path.abspath(sim_dir)
+        with cls._instances_lock:
+            index = cls._instances.pop(key, None)
+        if index is not None:
+            index.close()
+
+    def close(self):
+        with self._lock:
+            if self._conn is not None:
+                try:
+                    self._conn.close()
+                except sqlite3.Error:
+                    pass
+                self._conn = None
+
+    # ------------------------------------------------------------------
+    # 连接与表结构
+    # ------------------------------------------------------------------
+
+    def _get_conn(self) -> sqlite3.Connection:
+        if self._conn is None:
+            conn = sqlite3.connect(self.db_path, check_same_thread=False)
+            conn.execute("PRAGMA synchronous=NORMAL")
+            version = conn.execute("PRAGMA user_version").fetchone()[0]
+            if version != SCHEMA_VERSION:
+                self._create_schema(conn)
+            self._conn = conn
+        return self._conn
+
+    @staticmethod
+    def _create_schema(conn: sqlite3.Connection):
+        conn.executescript(f"""
+            DROP TABLE IF EXISTS actions;
+            DROP TABLE IF EXISTS cursors;
+
+            CREATE TABLE actions (
+                id INTEGER PRIMARY KEY,
+                source TEXT NOT NULL,
+                offset INTEGER NOT NULL,
+                seq INTEGER,
+                platform TEXT NOT NULL,
+                agent_id INTEGER NOT NULL,
+                round_num INTEGER NOT NULL,
+                timestamp TEXT NOT NULL,
+                agent_name TEXT,
+                action_type TEXT,
+                action_args TEXT,
+                result TEXT,
+                success INTEGER NOT NULL DEFAULT 1,
+                UNIQUE (source, offset)
+            );
+            CREATE INDEX idx_actions_timestamp ON actions(timestamp);
+            CREATE INDEX idx_actions_platform ON actions(platform, timestamp);
+            CREATE INDEX idx_actions_agent ON actions(agent_id, timestamp);
+            CREATE INDEX idx_actions_round ON actions(round_num, timestamp);
+            CREATE INDEX idx_actions_seq ON actions(source, seq);
+
+            -- 每个日志来源已索引到的字节位置
+            CREATE TABLE cursors (
+                source TEXT PRIMARY KEY,
+                inode INTEGER NOT NULL,
+                position INTEGER NOT NULL
+            );
+
+            PRAGMA user_version = {SCHEMA_VERSION};
+        """)
+        conn.commit()
+
+    # ------------------------------------------------------------------
+    # 增量同步
+    # ------------------------------------------------------------------
+
+    def _sources(self) -> List[Tuple[str, Optional[str], Optional[str]]]:
+        """
+        日志来源: [(来源名, 文件路径, 默认平台)]
+
+        分平台日志都不存在时才使用旧的单一 actions.jsonl（其中每条记录自带 platform）；
+        已归档的日志使用归档文件，文件不存在时路径为 None
+        """
+        twitter_log = resolve_log_path(os.path.join(self.sim_dir, "twitter", "actions.jsonl"))
+        reddit_log = resolve_log_path(os.path.join(self.sim_dir, "reddit", "actions.jsonl"))
+        if twitter_log or reddit_log:
+            return [
+                ("twitter", twitter_log, "twitter"),
+                ("reddit", reddit_log, "reddit"),
+            ]
+        return [("legacy", resolve_log_path(os.path.join(self.sim_dir, "actions.jsonl")), None)]
+
+    def sync(self) -> int:
+        """
+        把日志文件中新追加的动作写入索引
+
+        Returns:
+            本次新增的动作数
+        """
+        with self._lock:
+            conn = self._get_conn()
+            active_sources = set()
+            added = 0
+            for source, path, default_platform in self._sources():
+                active_sources.add(source)
+                added += self._sync_source(conn, source, path, default_platform)
+
+            # 不再使用的来源（例如从旧格式切换到分平台日志）
+            for (source,) in conn.execute("SELECT source FROM cursors").fetchall():
+                if source not in active_sources:
+                    self._reset_source(conn, source)
+            conn.commit()
+            return added
+
+    @staticmethod
+    def _reset_source(conn: sqlite3.Connection, source: str):
+        conn.execute("DELETE FROM actions WHERE source = ?", (source,))
+        conn.execute("DELETE FROM cursors WHERE source = ?", (source,))
+
+    def _sync_source(
+        self,
+        conn: sqlite3.Connection,
+        source: str,
+        path: Optional[str],
+        default_platform: Optional[str]
+    ) -> int:
+        row = conn.execute(
+            "SELECT inode, position FROM cursors WHERE source = ?", (source,)
+        ).fetchone()
+
+        try:
+            stat = os.stat(path) if path else None
+            size = log_size(path) if path else 0
+        except OSError:
+            stat = None
+        if stat is None:
+            if row is not None:
+                self._reset_source(conn, source)
+            return 0
+
+        position = 0
+        if row is not None:
+            inode, position = row
+            # 归档文件由原日志压缩而来、分段清单会整体替换（inode 必然变化），只检查大小
+            replaced = inode != stat.st_ino and is_plain_log(path)
+            if replaced or size < position:
+                # 日志被替换或截断，重建该来源
+                self._reset_source(conn, source)
+                position = 0
+
+        if size == position:
+            if row is not None and row[0] != stat.st_ino:
+                conn.execute(
+                    "UPDATE cursors SET inode = ? WHERE source = ?", (stat.st_ino, source)
+                )
+            return 0
+
+        added = 0
+        batch = []
+        with open_log(path, position) as f:
+            while True:
+                line = f.readline()
+                # 只处理完整的行，写到一半的行留到下次同步
+                if not line or not line.endswith(b"\n"):
+                    break
+                line_offset = position
+                position += len(line)
+
+                record = self._parse_line(line, default_platform)
+                if record is None:
+                    continue
+                batch.append((source, line_offset) + record)
+
+                if len(batch) >= INSERT_BATCH_SIZE:
+                    added += self._insert(conn, batch)
+                    batch = []
+
+        if batch:
+            added += self._insert(conn, batch)
+
+        conn.execute(
+            "INSERT OR REPLACE INTO cursors (source, inode, position) VALUES (?, ?, ?)",
+            (source, stat.st_ino, position)
+        )
+        return added
+
+    @staticmethod
+    def _parse_line(line: bytes, default_platform: Optional[str]) -> Optional[Tuple]:
+        """解析一行动作日志，非 Agent 动作（事件记录等）返回 None"""
+        try:
+            data = json.loads(line)
+        except (json.JSONDecodeError, UnicodeDecodeError):
+            return None
+
+        if not isinstance(data, dict) or "event_type" in data or "agent_id" not in data:
+            return None
+
+        result = data.get("result")
+        return (
+            data.get("seq"),
+            data.get("platform") or default_platform or "",
+            data.get("agent_id", 0),
+            data.get("round", 0),
+            data.get("timestamp", ""),
+            data.get("agent_name", ""),
+            data.get("action_type", ""),
+            json.dumps(data.get("action_args", {}), ensure_ascii=False),
+            None if result is None else json.dumps(result, ensure_ascii=False),
+            1 if data.get("success", True) else 0,
+        )
+
+    @staticmethod
+    def _insert(conn: sqlite3.Connection, batch: List[Tuple]) -> int:
+        before = conn.total_changes
+        conn.executemany("""
+            INSERT OR IGNORE INTO actions (
+                source, offset, seq, platform, agent_id, round_num, timestamp,
+                agent_name, action_type, action_args, result, success
+            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+        """, batch)
+        return conn.total_changes - before
+
+    # ------------------------------------------------------------------
+    # 查询
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def _build_filter(
+        platform: Optional[str],
+        agent_id: Optional[int],
+        round_num: Optional[int]
+    ) -> Tuple[str, List[Any]]:
+        conditions = []
+        params: List[Any] = []
+        if platform:
+            conditions.append("platform = ?")
+            params.append(platform)
+        if agent_id is not None:
+            conditions.append("agent_id = ?")
+            params.append(agent_id)
+        if round_num is not None:
+            conditions.append("round_num = ?")
+            params.append(round_num)
+        where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+        return where, params
+
+    def query(
+        self,
+        platform: Optional[str] = None,
+        agent_id: Optional[int] = None,
+        round_num: Optional[int] = None,
+        limit: Optional[int] = None,
+        offset: int = 0
+    ) -> List[Dict[str, Any]]:
+        """
+        查询动作（按时间戳倒序，新的在前）
+
+        Returns:
+            动作字典列表，字段与 AgentAction.to_dict() 相同
+        """
+        self.sync()
+
+        where, params = self._build_filter(platform, agent_id, round_num)
+        sql = f"""
+            SELECT round_num, timestamp, platform, agent_id, agent_name,
+                   action_type, action_args, result, success, seq
+            FROM actions
+            {where}
+            ORDER BY timestamp DESC, id DESC
+            LIMIT ? OFFSET ?
+        """
+        params.extend([limit if limit is not None else -1, max(offset, 0)])
+
+        with self._lock:
+            rows = self._get_conn().execute(sql, params).fetchall()
+
+        actions = []
+        for round_num_, timestamp, platform_, agent_id_, agent_name, action_type, action_args, result, success, seq in rows:
+            try:
+                args = json.loads(action_args) if action_args else {}
+                result = json.loads(result) if result is not None else None
+            except json.JSONDecodeError:
+                args = {}
+            actions.append({
+                "round_num": round_num_,
+                "timestamp": timestamp,
+                "platform": platform_,
+                "agent_id": agent_id_,
+                "agent_name": agent_name,
+                "action_type": action_type,
+                "action_args": args,
+                "result": result,
+                "success": bool(success),
+                "seq": seq,
+            })
+        return actions
+
+    def count(
+        self,
+        platform: Optional[str] = None,
+        agent_id: Optional[int] = None,
+        round_num: Optional[int] = None
+    ) -> int:
+        """统计符合条件的动作数"""
+        self.sync()
+
+        where, params = self._build_filter(platform, agent_id, round_num)
+        with self._lock:
+            return self._get_conn().execute(
+                f"SELECT COUNT(*) FROM actions {where}", params
+            ).fetchone()[0]
+
+    def round_agents(self, round_nums: List[int]) -> Dict[int, Set[int]]:
+        """
+        各轮有动作的 Agent
+
+        Returns:
+            {round_num: agent_id 集合}（没有动作的轮次不包含在内）
+        """
+        self.sync()
+
+        agents: Dict[int, Set[int]] = {}
+        round_nums = sorted(set(round_nums))
+        with self._lock:
+            conn = self._get_conn()
+            for start in range(0, len(round_nums), ROUND_QUERY_BATCH_SIZE):
+                batch = round_nums[start:start + ROUND_QUERY_BATCH_SIZE]
+                placeholders = ",".join("?" * len(batch))
+                rows = conn.execute(
+                    f"SELECT DISTINCT round_num, agent_id FROM actions WHERE round_num IN ({placeholders})",
+                    batch
+                ).fetchall()
+                for round_num, agent_id in rows:
+                    agents.setdefault(round_num, set()).add(agent_id)
+        return agents
+
+    def position_after_seq(self, source: str, since_seq: int) -> int:
+        """
+        序号大于 since_seq 的第一条动作在日志中的字节位置
+
+        没有更新的动作时返回该来源已索引到的位置（即下一条动作将出现的位置）
+        """
+        self.sync()
+
+        with self._lock:
+            conn = self._get_conn()
+            row = conn.execute(
+                "SELECT offset FROM actions WHERE source = ? AND seq > ? ORDER BY seq LIMIT 1",
+                (source, since_seq)
+            ).fetchone()
+            if row is not None:
+                return row[0]
+            row = conn.execute(
+                "SELECT position FROM cursors WHERE source = ?", (source,)
+            ).fetchone()
+            return row[0] if row is not None else 0
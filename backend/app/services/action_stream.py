@@ -0,0 +1,158 @@
+"""
+模拟动作实时推送
+进程内的发布/订阅：监控线程读取到新动作时发布，SSE 连接订阅后即时收到，不再需要前端轮询
+
+游标（cursor）记录每个平台动作日志已推送到的字节位置，格式为 "twitter:1024,reddit:2048"，
+断线重连时从游标位置补读日志文件，再衔接实时推送
+"""
+
+import queue
+import threading
+from typing import Any, Dict, Optional, Set, Tuple
+
+# 每个订阅者的队列长度上限，消费过慢导致队列满时标记溢出，由订阅方从日志文件补读
+STREAM_QUEUE_SIZE = 10000
+
+# 推送的平台（与游标中的键一致）
+STREAM_PLATFORMS = ("twitter", "reddit")
+
+
+def format_action_cursor(positions: Dict[str, int]) -> str:
+    """把各平台日志位置格式化为游标字符串"""
+    return ",".join(f"{platform}:{positions.get(platform, 0)}" for platform in STREAM_PLATFORMS)
+
+
+def parse_action_cursor(cursor: str) -> Dict[str, int]:
+    """
+    解析游标字符串
+
+    Raises:
+        ValueError: 游标格式错误
+    """
+    positions: Dict[str, int] = {}
+    for part in cursor.split(","):
+        part = part.strip()
+        if not part:
+            continue
+        platform, sep, position = part.partition(":")
+        if not sep or platform not in STREAM_PLATFORMS or not position.isdigit():
+            raise ValueError(f"无效的游标: {cursor}")
+        positions[platform] = int(position)
+    return positions
+
+
+def parse_since_seq(since_seq: str) -> Dict[str, int]:
+    """
+    解析增量查询的序号：一个整数（适用于所有平台）或 "twitter:12,reddit:30"
+
+    Raises:
+        ValueError: 序号格式错误或为负数
+    """
+    def to_seq(value: str) -> int:
+        try:
+            seq = int(value)
+        except ValueError:
+            raise ValueError(f"无效的 since_seq: {since_seq}")
+        if seq < 0:
+            raise ValueError(f"since_seq 不能为负数: {since_seq}")
+        return seq
+
+    since_seq = since_seq.strip()
+    if ":" not in since_seq:
+        seq = to_seq(since_seq)
+        return {platform: seq for platform in STREAM_PLATFORMS}
+
+    seqs: Dict[str, int] = {}
+    for part in since_seq.split(","):
+        part = part.strip()
+        if not part:
+            continue
+        platform, _, value = part.partition(":")
+        if platform not in STREAM_PLATFORMS:
+            raise ValueError(f"无效的 since_seq: {since_seq}")
+        seqs[platform] = to_seq(value)
+    return seqs
+
+
+class ActionSubscription:
+    """单个订阅（一个 SSE 连接）"""
+
+    def __init__(self, simulation_id: str, maxsize: int = STREAM_QUEUE_SIZE):
+        self.simulation_id = simulation_id
+        self.queue: "queue.Queue[Tuple[str, Optional[str], int, Any]]" = queue.Queue(maxsize)
+        # 队列满时丢弃了消息，订阅方需要从日志文件补读
+        self.overflowed = False
+        # 模拟已结束（结束消息可能因队列满而丢失，以此标记为准）
+        self.closed = False
+
+    def get(self, timeout: float) -> Tuple[str, Optional[str], int, Any]:
+        """
+        取下一条消息: (类型, 平台, 日志位置, 数据)，类型为 "action" 或 "end"
+
+        Raises:
+            queue.Empty: 超时
+        """
+        return self.queue.get(timeout=timeout)
+
+    def drain(self):
+        """丢弃队列中的全部消息"""
+        while True:
+            try:
+                self.queue.get_nowait()
+            except queue.Empty:
+                break
+
+    def _put(self, message: Tuple[str, Optional[str], int, Any]):
+        try:
+            self.queue.put_nowait(message)
+        except queue.Full:
+            self.overflowed = True
+
+
+class ActionBroker:
+    """按模拟分发动作消息（类方法，与 SimulationRunner 同生命周期）"""
+
+    _subscribers: Dict[str, Set[ActionSubscription]] = {}
+    _lock = threading.Lock()
+
+    @classmethod
+    def subscribe(cls, simulation_id: str) -> ActionSubscription:
+        subscription = ActionSubscription(simulation_id)
+        with cls._lock:
+            cls._subscribers.setdefault(simulation_id, set()).add(subscription)
+        return subscription
+
+    @classmethod
+    def unsubscribe(cls, subscription: ActionSubscription):
+        with cls._lock:
+            subscribers = cls._subscribers.get(subscription.simulation_id)
+            if subscribers is not None:
+                subscribers.discard(subscription)
+                if not subscribers:
+                    cls._subscribers.pop(subscription.simulation_id, None)
+
+    @classmethod
+    def has_subscribers(cls, simulation_id: str) -> bool:
+        return simulation_id in cls._subscribers
+
+    @classmethod
+    def publish(cls, simulation_id: str, platform: str, position: int, action: Dict[str, Any]):
+        """
+        发布一条动作
+
+        Args:
+            position: 该动作所在行结束处的日志字节位置
+        """
+        with cls._lock:
+            subscribers = list(cls._subscribers.get(simulation_id, ()))
+        for subscription in subscribers:
+            subscription._put(("action", platform, position, action))
+
+    @classmethod
+    def close(cls, simulation_id: str, data: Optional[Dict[str, Any]] = None):
+        """通知订阅者模拟已结束"""
+        with cls._lock:
+            subscribers = list(cls._subscribers.get(simulation_id, ()))
+        for subscription in subscribers:
+            subscription.closed = True
+            subscription._put(("end", None, 0, data or {}))
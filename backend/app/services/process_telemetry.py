@@ -0,0 +1,166 @@
+"""
+模拟子进程资源采样
+由监控线程定期从 /proc 读取模拟进程的 CPU、内存（RSS）、文件描述符、线程数，
+以及模拟数据库文件大小，保存在定长环形缓冲中，用于发现长时间运行的 OASIS 环境的内存泄漏和评估单机并发能力
+
+/proc 只在 Linux 上可用；其他平台上进程相关指标为 None，只记录数据库大小
+"""
+
+import os
+import time
+import threading
+from collections import deque
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any, Deque, Dict, List, Optional, Tuple
+
+# 采样间隔（秒）
+TELEMETRY_INTERVAL = 5.0
+
+# 环形缓冲保留的采样数（默认约 1 小时）
+TELEMETRY_HISTORY_SIZE = 720
+
+# 统计大小的数据库文件（含 SQLite 的 WAL/日志文件）
+DB_FILES = ("twitter_simulation.db", "reddit_simulation.db")
+DB_SUFFIXES = ("", "-wal", "-journal")
+
+try:
+    _CLK_TCK = os.sysconf('SC_CLK_TCK')
+    _PAGE_SIZE = os.sysconf('SC_PAGE_SIZE')
+except (AttributeError, ValueError, OSError):
+    _CLK_TCK = 100
+    _PAGE_SIZE = 4096
+
+
+@dataclass
+class ResourceSample:
+    """一次资源采样"""
+    timestamp: str
+    cpu_percent: Optional[float] = None      # 两次采样之间的平均 CPU 占用（单核为 100%）
+    rss_bytes: Optional[int] = None
+    num_fds: Optional[int] = None
+    num_threads: Optional[int] = None
+    db_size_bytes: Dict[str, int] = field(default_factory=dict)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "timestamp": self.timestamp,
+            "cpu_percent": self.cpu_percent,
+            "rss_bytes": self.rss_bytes,
+            "num_fds": self.num_fds,
+            "num_threads": self.num_threads,
+            "db_size_bytes": dict(self.db_size_bytes),
+            "db_total_bytes": sum(self.db_size_bytes.values()),
+        }
+
+
+def _read_proc_stat(pid: int) -> Optional[Tuple[int, int]]:
+    """读取 /proc/<pid>/stat: (utime + stime 时钟滴答数, 线程数)"""
+    try:
+        with open(f"/proc/{pid}/stat", 'r') as f:
+            content = f.read()
+    except OSError:
+        return None
+    # 进程名可能包含空格和括号，从最后一个 ')' 之后开始按空格切分
+    fields = content[content.rfind(')') + 2:].split()
+    # 切分后 fields[0] 是第 3 个字段 state；utime/stime/num_threads 分别是第 14/15/20 个字段
+    return int(fields[11]) + int(fields[12]), int(fields[17])
+
+
+def _read_rss(pid: int) -> Optional[int]:
+    try:
+        with open(f"/proc/{pid}/statm", 'r') as f:
+            return int(f.read().split()[1]) * _PAGE_SIZE
+    except (OSError, ValueError, IndexError):
+        return None
+
+
+def _count_fds(pid: int) -> Optional[int]:
+    try:
+        return len(os.listdir(f"/proc/{pid}/fd"))
+    except OSError:
+        return None
+
+
+class ProcessTelemetry:
+    """单个模拟进程的资源采样记录"""
+
+    def __init__(self, pid: int, sim_dir: str, history_size: int = TELEMETRY_HISTORY_SIZE):
+        self.pid = pid
+        self.sim_dir = sim_dir
+        self._samples: Deque[ResourceSample] = deque(maxlen=history_size)
+        self._lock = threading.Lock()
+        self._last_cpu: Optional[Tuple[float, int]] = None  # (单调时钟, CPU 时钟滴答)
+        self._last_sample_at = 0.0
+        self.peak_rss_bytes = 0
+
+    def maybe_sample(self, interval: float = TELEMETRY_INTERVAL) -> Optional[ResourceSample]:
+        """距上次采样超过 interval 时采样一次"""
+        if time.monotonic() - self._last_sample_at < interval:
+            return None
+        return self.sample()
+
+    def sample(self) -> ResourceSample:
+        """立即采样一次并记录"""
+        now = time.monotonic()
+        self._last_sample_at = now
+
+        sample = ResourceSample(timestamp=datetime.now().isoformat())
+
+        stat = _read_proc_stat(self.pid)
+        if stat is not None:
+            cpu_ticks, sample.num_threads = stat
+            if self._last_cpu is not None and now > self._last_cpu[0]:
+                elapsed = now - self._last_cpu[0]
+                used = (cpu_ticks - self._last_cpu[1]) / _CLK_TCK
+                sample.cpu_percent = round(used / elapsed * 100, 1)
+            self._last_cpu = (now, cpu_ticks)
+            sample.rss_bytes = _read_rss(self.pid)
+            sample.num_fds = _count_fds(self.pid)
+
+        for db_file in DB_FILES:
+            size = 0
+            for suffix in DB_SUFFIXES:
+                try:
+                    size += os.path.getsize(os.path.join(self.sim_dir, db_file + suffix))
+                except OSError:
+                    pass
+            if size:
+                sample.db_size_bytes[db_file] = size
+
+        with self._lock:
+            self._samples.append(sample)
+            if sample.rss_bytes and sample.rss_bytes > self.peak_rss_bytes:
+                self.peak_rss_bytes = sample.rss_bytes
+        return sample
+
+    def latest(self) -> Optional[ResourceSample]:
+        with self._lock:
+            return self._samples[-1] if self._samples else None
+
+    def history(self, limit: Optional[int] = None) -> List[ResourceSample]:
+        """采样历史（从旧到新），limit 指定时只返回最近的 limit 条"""
+        with self._lock:
+            samples = list(self._samples)
+        if limit is not None:
+            samples = samples[-limit:] if limit > 0 else []
+        return samples
+
+    def summary(self) -> Dict[str, Any]:
+        """最新采样和整体统计"""
+        samples = self.history()
+        cpu_values = [s.cpu_percent for s in samples if s.cpu_percent is not None]
+        latest = samples[-1] if samples else None
+        return {
+            "pid": self.pid,
+            "latest": latest.to_dict() if latest else None,
+            "peak_rss_bytes": self.peak_rss_bytes or None,
+            "avg_cpu_percent": round(sum(cpu_values) / len(cpu_values), 1) if cpu_values else None,
+            "samples_count": len(samples),
+        }
+
+    def to_dict(self, limit: Optional[int] = None) -> Dict[str, Any]:
+        result = self.summary()
+        result["interval_seconds"] = TELEMETRY_INTERVAL
+        result["history"] = [s.to_dict() for s in self.history(limit)]
+        return result
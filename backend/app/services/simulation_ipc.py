@@ -2,25 +2,45 @@
 模拟IPC通信模块
 用于Flask后端和模拟脚本之间的进程间通信
 
-通过文件系统实现简单的命令/响应模式：
+优先使用 Unix Domain Socket 传输（每帧一行 JSON，通过 command_id 关联请求和响应）：
+1. 模拟脚本进入等待命令模式时监听 socket，并把 socket 路径写入 env_status.json
+2. Flask连接 socket 发送命令，在同一连接上等待响应，无轮询延迟
+
+socket 不可用时自动回退到文件系统的命令/响应模式：
 1. Flask写入命令到 commands/ 目录
 2. 模拟脚本轮询命令目录，执行命令并写入响应到 responses/ 目录
 3. Flask轮询响应目录获取结果
+
+AsyncSimulationIPCClient / IPCDispatcher 提供异步接口：所有命令在一个后台事件循环中收发，
+每个模拟复用一条 socket 连接，等待中的命令以 command_id 为键的 Future 表示，不占用线程
 """
 
 import os
 import json
 import time
 import uuid
-from typing import Dict, Any, Optional, List
+import queue
+import asyncio
+import concurrent.futures
+import socket
+import threading
+from typing import Dict, Any, Optional, List, Iterator, Callable
 from dataclasses import dataclass, field
 from datetime import datetime
 from enum import Enum
 
 from ..utils.logger import get_logger
+from ..utils.dir_watcher import DirectoryWatcher
+from ..utils.script_modules import ensure_scripts_path
+
+ensure_scripts_path()
+from ipc_socket import MAX_FRAME_SIZE, get_socket_path, is_socket_supported
 
 logger = get_logger('mirofish.simulation_ipc')
 
+# 文件协议回退时，inotify 模式下的兜底检查间隔（秒）
+FILE_RESPONSE_CHECK_INTERVAL = 1.0
+
 
 class CommandType(str, Enum):
     """命令类型"""
@@ -124,11 +144,13 @@ class SimulationIPCClient:
         """
         发送命令并等待响应
         
+        优先通过 Unix Socket 发送；模拟进程未发布 socket 或连接失败时回退到文件协议
+        
         Args:
             command_type: 命令类型
             args: 命令参数
             timeout: 超时时间（秒）
-            poll_interval: 轮询间隔（秒）
+            poll_interval: 轮询间隔（秒，仅文件协议使用）
             
         Returns:
             IPCResponse
@@ -143,6 +165,208 @@ class SimulationIPCClient:
             args=args
         )
         
+        socket_path = self._get_socket_path()
+        if socket_path:
+            response = self._send_via_socket(socket_path, command, timeout)
+            if response is not None:
+                return response
+            logger.info(f"IPC Socket 不可用，回退到文件协议: command_id={command_id}")
+        
+        return self._send_via_file(command, timeout, poll_interval)
+    
+    def send_command_stream(
+        self,
+        command_type: CommandType,
+        args: Dict[str, Any],
+        timeout: float = 60.0,
+        poll_interval: float = 0.5
+    ) -> Iterator[IPCResponse]:
+        """
+        发送命令并逐帧返回响应（流式）
+        
+        通过 Unix Socket 发送时，先依次产出 status 为 processing 的中间结果，
+        最后产出最终响应；回退到文件协议时只产出最终响应
+        
+        Args:
+            command_type: 命令类型
+            args: 命令参数
+            timeout: 超时时间（秒，从发送命令开始计算）
+            poll_interval: 轮询间隔（秒，仅文件协议使用）
+            
+        Yields:
+            IPCResponse
+            
+        Raises:
+            TimeoutError: 等待响应超时
+        """
+        command = IPCCommand(
+            command_id=str(uuid.uuid4()),
+            command_type=command_type,
+            args=args
+        )
+        
+        socket_path = self._get_socket_path()
+        if socket_path:
+            sock = self._connect_socket(socket_path, command, timeout)
+            if sock is not None:
+                yield from self._iter_socket_responses(sock, command, timeout)
+                return
+            logger.info(f"IPC Socket 不可用，回退到文件协议: command_id={command.command_id}")
+        
+        yield self._send_via_file(command, timeout, poll_interval)
+    
+    def _get_socket_path(self) -> Optional[str]:
+        """从 env_status.json 读取模拟进程发布的 socket 路径"""
+        status = self._read_env_status()
+        if not status or status.get("status") != "alive":
+            return None
+        
+        socket_path = status.get("socket_path")
+        if socket_path and is_socket_supported() and os.path.exists(socket_path):
+            return socket_path
+        return None
+    
+    def _connect_socket(
+        self,
+        socket_path: str,
+        command: IPCCommand,
+        timeout: float
+    ) -> Optional[socket.socket]:
+        """
+        连接 Unix Socket 并发送命令
+        
+        Returns:
+            已发送命令的连接；命令未能送达时返回 None（调用方回退到文件协议）
+        """
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        
+        try:
+            sock.settimeout(timeout)
+            sock.connect(socket_path)
+            sock.sendall((json.dumps(command.to_dict(), ensure_ascii=False) + "\n").encode('utf-8'))
+        except OSError as e:
+            logger.debug(f"IPC Socket 发送失败: {socket_path}, {e}")
+            sock.close()
+            return None
+        
+        logger.info(f"发送IPC命令(socket): {command.command_type.value}, command_id={command.command_id}")
+        return sock
+    
+    def _send_via_socket(
+        self,
+        socket_path: str,
+        command: IPCCommand,
+        timeout: float
+    ) -> Optional[IPCResponse]:
+        """
+        通过 Unix Socket 发送命令并在同一连接上等待最终响应（忽略中间结果帧）
+        
+        Returns:
+            IPCResponse；命令未能送达时返回 None（调用方回退到文件协议）
+            
+        Raises:
+            TimeoutError: 等待响应超时
+        """
+        sock = self._connect_socket(socket_path, command, timeout)
+        if sock is None:
+            return None
+        
+        response = None
+        for response in self._iter_socket_responses(sock, command, timeout):
+            pass
+        return response
+    
+    def _iter_socket_responses(
+        self,
+        sock: socket.socket,
+        command: IPCCommand,
+        timeout: float
+    ) -> Iterator[IPCResponse]:
+        """
+        读取连接上属于该命令的响应帧，直到收到最终响应（completed/failed）
+        
+        Raises:
+            TimeoutError: 等待响应超时
+        """
+        command_id = command.command_id
+        deadline = time.time() + timeout
+        try:
+            with sock.makefile('rb') as reader:
+                while True:
+                    remaining = deadline - time.time()
+                    if remaining <= 0:
+                        raise TimeoutError
+                    sock.settimeout(remaining)
+                    
+                    line = reader.readline()
+                    if not line:
+                        yield IPCResponse(
+                            command_id=command_id,
+                            status=CommandStatus.FAILED,
+                            error="模拟进程关闭了IPC连接"
+                        )
+                        return
+                    
+                    try:
+                        response = IPCResponse.from_dict(json.loads(line))
+                    except (json.JSONDecodeError, KeyError, ValueError) as e:
+                        logger.warning(f"解析响应失败: {e}")
+                        continue
+                    
+                    if response.command_id != command_id:
+                        continue
+                    
+                    if response.status == CommandStatus.PROCESSING:
+                        yield response
+                        continue
+                    
+                    logger.info(f"收到IPC响应(socket): command_id={command_id}, status={response.status.value}")
+                    yield response
+                    return
+        except TimeoutError:
+            logger.error(f"等待IPC响应超时: command_id={command_id}")
+            raise TimeoutError(f"等待命令响应超时 ({timeout}秒)")
+        except OSError as e:
+            yield IPCResponse(
+                command_id=command_id,
+                status=CommandStatus.FAILED,
+                error=f"IPC连接异常: {e}"
+            )
+        finally:
+            sock.close()
+    
+    def _send_via_file(
+        self,
+        command: IPCCommand,
+        timeout: float,
+        poll_interval: float
+    ) -> IPCResponse:
+        """
+        通过文件协议发送命令并等待响应
+        
+        响应目录有新文件写入时立即唤醒（inotify）；不可用时自适应轮询，
+        间隔从 10ms 开始按指数增长，不超过 poll_interval
+        
+        Raises:
+            TimeoutError: 等待响应超时
+        """
+        # 先开始监听响应目录，避免错过在写入命令后立即到达的响应
+        watcher = DirectoryWatcher(self.responses_dir, max_interval=poll_interval)
+        watcher.start()
+        try:
+            return self._write_command_and_wait(command, watcher, timeout)
+        finally:
+            watcher.stop()
+    
+    def _write_command_and_wait(
+        self,
+        command: IPCCommand,
+        watcher: DirectoryWatcher,
+        timeout: float
+    ) -> IPCResponse:
+        command_id = command.command_id
+        command_type = command.command_type
+        
         # 写入命令文件
         command_file = os.path.join(self.commands_dir, f"{command_id}.json")
         with open(command_file, 'w', encoding='utf-8') as f:
@@ -155,7 +379,7 @@ class SimulationIPCClient:
         start_time = time.time()
         
         while time.time() - start_time < timeout:
-            if os.path.exists(response_file):
+            if watcher.has_changes() and os.path.exists(response_file):
                 try:
                     with open(response_file, 'r', encoding='utf-8') as f:
                         response_data = json.load(f)
@@ -173,7 +397,7 @@ class SimulationIPCClient:
                 except (json.JSONDecodeError, KeyError) as e:
                     logger.warning(f"解析响应失败: {e}")
             
-            time.sleep(poll_interval)
+            watcher.wait(timeout - (time.time() - start_time))
         
         # 超时
         logger.error(f"等待IPC响应超时: command_id={command_id}")
@@ -251,6 +475,35 @@ class SimulationIPCClient:
             timeout=timeout
         )
     
+    def send_batch_interview_stream(
+        self,
+        interviews: List[Dict[str, Any]],
+        platform: str = None,
+        timeout: float = 120.0
+    ) -> Iterator[IPCResponse]:
+        """
+        发送批量采访命令，每个Agent的回答完成后立即返回
+        
+        Args:
+            interviews: 采访列表，格式同 send_batch_interview
+            platform: 默认平台，同 send_batch_interview
+            timeout: 超时时间
+            
+        Yields:
+            IPCResponse：status 为 processing 时 result 是单个Agent的采访结果
+            {"key": "twitter_0", "agent_id": 0, "platform": "twitter", "response": "...", "timestamp": "..."}，
+            最后一帧为最终响应（格式同 send_batch_interview）
+        """
+        args = {"interviews": interviews, "stream": True}
+        if platform:
+            args["platform"] = platform
+        
+        yield from self.send_command_stream(
+            command_type=CommandType.BATCH_INTERVIEW,
+            args=args,
+            timeout=timeout
+        )
+    
     def send_close_env(self, timeout: float = 30.0) -> IPCResponse:
         """
         发送关闭环境命令
@@ -267,29 +520,443 @@ class SimulationIPCClient:
             timeout=timeout
         )
     
+    def _read_env_status(self) -> Optional[Dict[str, Any]]:
+        """读取 env_status.json，不存在或损坏时返回 None"""
+        status_file = os.path.join(self.simulation_dir, "env_status.json")
+        if not os.path.exists(status_file):
+            return None
+        
+        try:
+            with open(status_file, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (json.JSONDecodeError, OSError):
+            return None
+    
     def check_env_alive(self) -> bool:
         """
         检查模拟环境是否存活
         
         通过检查 env_status.json 文件来判断
         """
-        status_file = os.path.join(self.simulation_dir, "env_status.json")
-        if not os.path.exists(status_file):
-            return False
-        
+        status = self._read_env_status()
+        return bool(status) and status.get("status") == "alive"
+
+
+class _SocketChannel:
+    """
+    到单个模拟进程的持久 socket 连接
+
+    同一连接上可以同时有任意多个进行中的命令，响应帧按 command_id 分发到对应的 Future
+    """
+
+    def __init__(self, socket_path: str):
+        self.socket_path = socket_path
+        self._reader: Optional[asyncio.StreamReader] = None
+        self._writer: Optional[asyncio.StreamWriter] = None
+        self._read_task: Optional[asyncio.Task] = None
+        # command_id -> (最终响应 Future, 中间结果回调)
+        self._pending: Dict[str, tuple] = {}
+
+    @property
+    def is_open(self) -> bool:
+        return self._writer is not None and not self._writer.is_closing()
+
+    async def connect(self):
+        self._reader, self._writer = await asyncio.open_unix_connection(
+            self.socket_path, limit=MAX_FRAME_SIZE
+        )
+        self._read_task = asyncio.get_running_loop().create_task(self._read_loop())
+
+    async def send(
+        self,
+        command: IPCCommand,
+        on_partial: Optional[Callable[[IPCResponse], None]] = None
+    ) -> asyncio.Future:
+        """发送命令，返回最终响应的 Future"""
+        future = asyncio.get_running_loop().create_future()
+        self._pending[command.command_id] = (future, on_partial)
         try:
-            with open(status_file, 'r', encoding='utf-8') as f:
-                status = json.load(f)
-            return status.get("status") == "alive"
-        except (json.JSONDecodeError, OSError):
-            return False
+            self._writer.write((json.dumps(command.to_dict(), ensure_ascii=False) + "\n").encode('utf-8'))
+            await self._writer.drain()
+        except (OSError, RuntimeError):
+            self._pending.pop(command.command_id, None)
+            raise
+        return future
+
+    def discard(self, command_id: str):
+        self._pending.pop(command_id, None)
+
+    async def _read_loop(self):
+        error = "模拟进程关闭了IPC连接"
+        try:
+            while True:
+                line = await self._reader.readline()
+                if not line:
+                    break
+
+                try:
+                    response = IPCResponse.from_dict(json.loads(line))
+                except (json.JSONDecodeError, KeyError, ValueError) as e:
+                    logger.warning(f"解析响应失败: {e}")
+                    continue
+
+                entry = self._pending.get(response.command_id)
+                if entry is None:
+                    continue
+                future, on_partial = entry
+
+                if response.status == CommandStatus.PROCESSING:
+                    if on_partial is not None:
+                        try:
+                            on_partial(response)
+                        except Exception as e:
+                            logger.warning(f"处理中间结果失败: {e}")
+                    continue
+
+                self._pending.pop(response.command_id, None)
+                if not future.done():
+                    future.set_result(response)
+        except (OSError, ValueError, asyncio.IncompleteReadError) as e:
+            error = f"IPC连接异常: {e}"
+        finally:
+            self.close()
+            for command_id, (future, _) in list(self._pending.items()):
+                if not future.done():
+                    future.set_result(IPCResponse(
+                        command_id=command_id,
+                        status=CommandStatus.FAILED,
+                        error=error
+                    ))
+            self._pending.clear()
+
+    def close(self):
+        if self._writer is not None:
+            try:
+                self._writer.close()
+            except Exception:
+                pass
+
+
+class _FileChannel:
+    """
+    单个模拟的文件协议通道
+
+    所有进行中的命令共用一个响应目录监听，响应文件写入时唤醒并分发到对应的 Future
+    """
+
+    def __init__(self, simulation_dir: str):
+        self.commands_dir = os.path.join(simulation_dir, "ipc_commands")
+        self.responses_dir = os.path.join(simulation_dir, "ipc_responses")
+        os.makedirs(self.commands_dir, exist_ok=True)
+        os.makedirs(self.responses_dir, exist_ok=True)
+
+        self._pending: Dict[str, asyncio.Future] = {}
+        self._watch_task: Optional[asyncio.Task] = None
+
+    def send(self, command: IPCCommand, poll_interval: float) -> asyncio.Future:
+        """写入命令文件，返回最终响应的 Future"""
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending[command.command_id] = future
+
+        command_file = os.path.join(self.commands_dir, f"{command.command_id}.json")
+        with open(command_file, 'w', encoding='utf-8') as f:
+            json.dump(command.to_dict(), f, ensure_ascii=False, indent=2)
+
+        if self._watch_task is None or self._watch_task.done():
+            self._watch_task = loop.create_task(self._watch_loop(poll_interval))
+        return future
+
+    def discard(self, command_id: str):
+        """放弃等待（超时），清理命令文件"""
+        self._pending.pop(command_id, None)
+        try:
+            os.remove(os.path.join(self.commands_dir, f"{command_id}.json"))
+        except OSError:
+            pass
+
+    def _collect_responses(self) -> bool:
+        """检查所有进行中命令的响应文件，返回是否有命令完成"""
+        completed = False
+        for command_id, future in list(self._pending.items()):
+            response_file = os.path.join(self.responses_dir, f"{command_id}.json")
+            if not os.path.exists(response_file):
+                continue
+            try:
+                with open(response_file, 'r', encoding='utf-8') as f:
+                    response = IPCResponse.from_dict(json.load(f))
+            except (json.JSONDecodeError, KeyError, ValueError, OSError) as e:
+                # 响应文件可能尚未写完，等待下一次写入事件
+                logger.debug(f"解析响应失败: {e}")
+                continue
+
+            for path in (response_file, os.path.join(self.commands_dir, f"{command_id}.json")):
+                try:
+                    os.remove(path)
+                except OSError:
+                    pass
+
+            self._pending.pop(command_id, None)
+            if not future.done():
+                future.set_result(response)
+            logger.info(f"收到IPC响应: command_id={command_id}, status={response.status.value}")
+            completed = True
+        return completed
+
+    async def _watch_loop(self, poll_interval: float):
+        """有进行中的命令时监听响应目录"""
+        loop = asyncio.get_running_loop()
+        watcher = DirectoryWatcher(self.responses_dir, max_interval=poll_interval)
+        changed = asyncio.Event()
+
+        if watcher.start():
+            loop.add_reader(watcher.fileno(), changed.set)
+
+        try:
+            while self._pending:
+                if watcher.has_changes() and self._collect_responses():
+                    watcher.reset_backoff()
+                if not self._pending:
+                    break
+
+                changed.clear()
+                if watcher.is_inotify:
+                    timeout = FILE_RESPONSE_CHECK_INTERVAL
+                else:
+                    timeout = watcher.next_interval()
+                try:
+                    await asyncio.wait_for(changed.wait(), timeout=timeout)
+                except asyncio.TimeoutError:
+                    if watcher.is_inotify:
+                        watcher.mark_pending()
+        finally:
+            if watcher.is_inotify:
+                loop.remove_reader(watcher.fileno())
+            watcher.stop()
+
+
+class IPCDispatcher:
+    """
+    异步IPC调度器（Flask进程内单例）
+
+    在独立线程中运行一个 asyncio 事件循环，所有模拟的IPC命令都在这个循环中收发：
+    - 每个模拟进程只保持一条 socket 连接，多个命令在同一连接上并发，按 command_id 分发响应
+    - 文件协议回退时，每个模拟只有一个响应目录监听任务
+    - 等待中的命令只是一个 Future，不占用线程，可以同时有成百上千个
+    """
+
+    _instance: Optional['IPCDispatcher'] = None
+    _instance_lock = threading.Lock()
+
+    def __init__(self):
+        self.loop = asyncio.new_event_loop()
+        self._socket_channels: Dict[str, _SocketChannel] = {}
+        self._file_channels: Dict[str, _FileChannel] = {}
+        self._thread = threading.Thread(
+            target=self.loop.run_forever,
+            name="ipc-dispatcher",
+            daemon=True
+        )
+        self._thread.start()
+
+    @classmethod
+    def get(cls) -> 'IPCDispatcher':
+        """获取全局调度器（首次调用时启动事件循环线程）"""
+        if cls._instance is None:
+            with cls._instance_lock:
+                if cls._instance is None:
+                    cls._instance = cls()
+        return cls._instance
+
+    async def request(
+        self,
+        simulation_dir: str,
+        command: IPCCommand,
+        socket_path: Optional[str],
+        timeout: float,
+        poll_interval: float = 0.5,
+        on_partial: Optional[Callable[[IPCResponse], None]] = None
+    ) -> IPCResponse:
+        """
+        发送命令并等待最终响应（必须在调度器的事件循环中执行）
+
+        Raises:
+            TimeoutError: 等待响应超时
+        """
+        channel = None
+        future = None
+
+        if socket_path:
+            try:
+                channel = await self._get_socket_channel(socket_path)
+                future = await channel.send(command, on_partial)
+                logger.info(f"发送IPC命令(socket): {command.command_type.value}, command_id={command.command_id}")
+            except (OSError, RuntimeError) as e:
+                logger.info(f"IPC Socket 不可用，回退到文件协议: command_id={command.command_id}, {e}")
+                channel = None
+
+        if channel is None:
+            channel = self._file_channels.get(simulation_dir)
+            if channel is None:
+                channel = _FileChannel(simulation_dir)
+                self._file_channels[simulation_dir] = channel
+            future = channel.send(command, poll_interval)
+            logger.info(f"发送IPC命令: {command.command_type.value}, command_id={command.command_id}")
+
+        try:
+            return await asyncio.wait_for(future, timeout=timeout)
+        except asyncio.TimeoutError:
+            channel.discard(command.command_id)
+            logger.error(f"等待IPC响应超时: command_id={command.command_id}")
+            raise TimeoutError(f"等待命令响应超时 ({timeout}秒)")
+
+    async def _get_socket_channel(self, socket_path: str) -> _SocketChannel:
+        channel = self._socket_channels.get(socket_path)
+        if channel is not None and channel.is_open:
+            return channel
+
+        channel = _SocketChannel(socket_path)
+        await channel.connect()
+        self._socket_channels[socket_path] = channel
+        return channel
+
+    def submit(self, coro) -> 'asyncio.Future':
+        """
+        从任意事件循环提交协程到调度器，返回可在调用方事件循环中 await 的 Future
+        """
+        return asyncio.wrap_future(asyncio.run_coroutine_threadsafe(coro, self.loop))
+
+    def spawn(self, coro) -> 'concurrent.futures.Future':
+        """
+        从同步代码提交协程后立即返回，不等待结果
+
+        返回的 Future 完成时，add_done_callback 注册的回调在调度器线程中执行
+        """
+        return asyncio.run_coroutine_threadsafe(coro, self.loop)
+
+    def call(self, coro) -> Any:
+        """从同步代码（如 Flask 请求线程）提交协程并等待结果"""
+        return self.spawn(coro).result()
+
+
+class AsyncSimulationIPCClient:
+    """
+    异步IPC客户端
+
+    send_* 方法是协程，可以在任意事件循环中 await；命令实际由全局 IPCDispatcher 收发，
+    等待响应时不阻塞线程。同步代码可以使用 SimulationIPCClient，或通过 IPCDispatcher.call 调用
+    """
+
+    def __init__(self, simulation_dir: str):
+        """
+        初始化异步IPC客户端
+
+        Args:
+            simulation_dir: 模拟数据目录
+        """
+        self.simulation_dir = simulation_dir
+        self._status_client = SimulationIPCClient(simulation_dir)
+        self.dispatcher = IPCDispatcher.get()
+
+    def check_env_alive(self) -> bool:
+        """检查模拟环境是否存活"""
+        return self._status_client.check_env_alive()
+
+    async def send_command(
+        self,
+        command_type: CommandType,
+        args: Dict[str, Any],
+        timeout: float = 60.0,
+        poll_interval: float = 0.5,
+        on_partial: Optional[Callable[[IPCResponse], None]] = None
+    ) -> IPCResponse:
+        """
+        发送命令并等待响应
+
+        Args:
+            command_type: 命令类型
+            args: 命令参数
+            timeout: 超时时间（秒）
+            poll_interval: 文件协议回退时的最大轮询间隔（秒）
+            on_partial: 中间结果回调（在调度器线程中调用，仅 socket 传输）
+
+        Returns:
+            IPCResponse
+
+        Raises:
+            TimeoutError: 等待响应超时
+        """
+        command = IPCCommand(
+            command_id=str(uuid.uuid4()),
+            command_type=command_type,
+            args=args
+        )
+        socket_path = self._status_client._get_socket_path()
+
+        coro = self.dispatcher.request(
+            self.simulation_dir, command, socket_path, timeout, poll_interval, on_partial
+        )
+        try:
+            running_loop = asyncio.get_running_loop()
+        except RuntimeError:
+            running_loop = None
+
+        if running_loop is self.dispatcher.loop:
+            return await coro
+        return await self.dispatcher.submit(coro)
+
+    async def send_interview(
+        self,
+        agent_id: int,
+        prompt: str,
+        platform: str = None,
+        timeout: float = 60.0
+    ) -> IPCResponse:
+        """发送单个Agent采访命令，参数同 SimulationIPCClient.send_interview"""
+        args = {
+            "agent_id": agent_id,
+            "prompt": prompt
+        }
+        if platform:
+            args["platform"] = platform
+
+        return await self.send_command(
+            command_type=CommandType.INTERVIEW,
+            args=args,
+            timeout=timeout
+        )
+
+    async def send_batch_interview(
+        self,
+        interviews: List[Dict[str, Any]],
+        platform: str = None,
+        timeout: float = 120.0
+    ) -> IPCResponse:
+        """发送批量采访命令，参数同 SimulationIPCClient.send_batch_interview"""
+        args = {"interviews": interviews}
+        if platform:
+            args["platform"] = platform
+
+        return await self.send_command(
+            command_type=CommandType.BATCH_INTERVIEW,
+            args=args,
+            timeout=timeout
+        )
+
+    async def send_close_env(self, timeout: float = 30.0) -> IPCResponse:
+        """发送关闭环境命令"""
+        return await self.send_command(
+            command_type=CommandType.CLOSE_ENV,
+            args={},
+            timeout=timeout
+        )
 
 
 class SimulationIPCServer:
     """
     模拟IPC服务器（模拟脚本端使用）
     
-    轮询命令目录，执行命令并返回响应
+    监听 Unix Socket 并轮询命令目录，执行命令并返回响应
     """
     
     def __init__(self, simulation_dir: str):
@@ -309,33 +976,120 @@ class SimulationIPCServer:
         
         # 环境状态
         self._running = False
+        
+        # Socket 传输
+        self.socket_path = get_socket_path(simulation_dir)
+        self._socket: Optional[socket.socket] = None
+        self._socket_commands: "queue.Queue[IPCCommand]" = queue.Queue()
+        self._socket_conns: Dict[str, socket.socket] = {}  # command_id -> 发出命令的连接
+        self._socket_lock = threading.Lock()
+        
+        # 命令目录监听（没有新命令文件时 poll_commands 不扫描目录）
+        self._command_watcher = DirectoryWatcher(self.commands_dir)
     
     def start(self):
         """标记服务器为运行状态"""
         self._running = True
+        self._command_watcher.start()
+        self._start_socket()
         self._update_env_status("alive")
     
     def stop(self):
         """标记服务器为停止状态"""
         self._running = False
+        self._stop_socket()
+        self._command_watcher.stop()
         self._update_env_status("stopped")
     
+    def _start_socket(self):
+        """启动 socket 监听线程，失败时仅使用文件协议"""
+        if not is_socket_supported():
+            return
+        
+        try:
+            os.remove(self.socket_path)
+        except OSError:
+            pass
+        
+        try:
+            sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            sock.bind(self.socket_path)
+            sock.listen()
+        except OSError as e:
+            logger.warning(f"IPC Socket 启动失败，使用文件协议: {e}")
+            return
+        
+        self._socket = sock
+        threading.Thread(target=self._accept_loop, daemon=True).start()
+    
+    def _stop_socket(self):
+        """关闭 socket 监听"""
+        if self._socket is None:
+            return
+        
+        try:
+            self._socket.close()
+        except OSError:
+            pass
+        self._socket = None
+        
+        try:
+            os.remove(self.socket_path)
+        except OSError:
+            pass
+    
+    def _accept_loop(self):
+        """接受客户端连接"""
+        while self._running and self._socket is not None:
+            try:
+                conn, _ = self._socket.accept()
+            except OSError:
+                break
+            threading.Thread(target=self._read_connection, args=(conn,), daemon=True).start()
+    
+    def _read_connection(self, conn: socket.socket):
+        """读取单个连接上的命令帧"""
+        try:
+            with conn.makefile('rb') as reader:
+                for line in reader:
+                    try:
+                        command = IPCCommand.from_dict(json.loads(line))
+                    except (json.JSONDecodeError, KeyError, ValueError) as e:
+                        logger.warning(f"解析socket命令失败: {e}")
+                        continue
+                    
+                    with self._socket_lock:
+                        self._socket_conns[command.command_id] = conn
+                    self._socket_commands.put(command)
+        except OSError:
+            pass
+    
     def _update_env_status(self, status: str):
         """更新环境状态文件"""
         status_file = os.path.join(self.simulation_dir, "env_status.json")
+        socket_path = self.socket_path if self._socket is not None and status == "alive" else None
         with open(status_file, 'w', encoding='utf-8') as f:
             json.dump({
                 "status": status,
+                "socket_path": socket_path,
                 "timestamp": datetime.now().isoformat()
             }, f, ensure_ascii=False, indent=2)
     
     def poll_commands(self) -> Optional[IPCCommand]:
         """
-        轮询命令目录，返回第一个待处理的命令
+        获取第一个待处理的命令（socket 命令优先，其次轮询命令目录）
         
         Returns:
             IPCCommand 或 None
         """
+        try:
+            return self._socket_commands.get_nowait()
+        except queue.Empty:
+            pass
+        
+        if not self._command_watcher.has_changes():
+            return None
+        
         if not os.path.exists(self.commands_dir):
             return None
         
@@ -344,7 +1098,10 @@ class SimulationIPCServer:
         for filename in os.listdir(self.commands_dir):
             if filename.endswith('.json'):
                 filepath = os.path.join(self.commands_dir, filename)
-                command_files.append((filepath, os.path.getmtime(filepath)))
+                try:
+                    command_files.append((filepath, os.path.getmtime(filepath)))
+                except OSError:
+                    continue
         
         command_files.sort(key=lambda x: x[1])
         
@@ -352,6 +1109,8 @@ class SimulationIPCServer:
             try:
                 with open(filepath, 'r', encoding='utf-8') as f:
                     data = json.load(f)
+                # 命令文件在发送响应后才删除，下次仍需扫描目录
+                self._command_watcher.mark_pending()
                 return IPCCommand.from_dict(data)
             except (json.JSONDecodeError, KeyError, OSError) as e:
                 logger.warning(f"读取命令文件失败: {filepath}, {e}")
@@ -366,6 +1125,16 @@ class SimulationIPCServer:
         Args:
             response: IPC响应
         """
+        with self._socket_lock:
+            conn = self._socket_conns.pop(response.command_id, None)
+        
+        if conn is not None:
+            try:
+                conn.sendall((json.dumps(response.to_dict(), ensure_ascii=False) + "\n").encode('utf-8'))
+            except OSError as e:
+                logger.warning(f"通过socket发送响应失败: command_id={response.command_id}, {e}")
+            return
+        
         response_file = os.path.join(self.responses_dir, f"{response.command_id}.json")
         with open(response_file, 'w', encoding='utf-8') as f:
             json.dump(response.to_dict(), f, ensure_ascii=False, indent=2)
@@ -14,12 +14,16 @@ from enum import Enum
 
 from ..config import Config
 from ..utils.logger import get_logger
+from ..utils.script_modules import ensure_scripts_path
 from .zep_entity_reader import ZepEntityReader, FilteredEntities
 from .oasis_profile_generator import OasisProfileGenerator, OasisAgentProfile
 from .simulation_config_generator import SimulationConfigGenerator, SimulationParameters
 
 logger = get_logger('mirofish.simulation')
 
+# 激活计划文件（由 /schedule/preview 或 run_parallel_simulation.py --dry-run 生成，位于模拟目录）
+ACTIVATION_SCHEDULE_FILE = "activation_schedule.json"
+
 
 class SimulationStatus(str, Enum):
     """模拟状态"""
@@ -498,6 +502,78 @@ class SimulationManager:
         with open(config_path, 'r', encoding='utf-8') as f:
             return json.load(f)
     
+    def preview_activation_schedule(
+        self,
+        simulation_id: str,
+        platform: str = "parallel",
+        seed: Optional[int] = None,
+        max_rounds: Optional[int] = None,
+        llm_call_seconds: Optional[float] = None
+    ) -> Dict[str, Any]:
+        """
+        预览激活计划（不调用 LLM）
+        
+        以固定种子计算每轮激活的 Agent，写入模拟目录下的 activation_schedule.json，
+        之后启动模拟时可指定按该计划回放（仅双平台并行模拟支持回放）
+        
+        Args:
+            simulation_id: 模拟ID
+            platform: 运行平台（只支持 parallel）
+            seed: 随机种子（可选，未指定时随机生成并记录在计划中）
+            max_rounds: 最大模拟轮数（可选）
+            llm_call_seconds: 估算耗时使用的单次 LLM 调用平均耗时（秒，可选）
+            
+        Returns:
+            计划摘要：种子、每轮预计 LLM 调用数、峰值并发、预计耗时
+        """
+        if platform != "parallel":
+            raise ValueError("激活计划回放仅支持双平台并行模拟（platform=parallel）")
+        
+        config = self.get_simulation_config(simulation_id)
+        if config is None:
+            raise ValueError("模拟配置不存在，请先调用 /prepare 接口")
+        
+        # 调度模块与模拟进程共用（只依赖 numpy，不依赖 OASIS），直接在进程内计算
+        ensure_scripts_path()
+        from activation_scheduler import DEFAULT_LLM_CALL_SECONDS, build_schedule, save_schedule
+        
+        schedule = build_schedule(
+            config,
+            ["twitter", "reddit"],
+            seed=seed,
+            max_rounds=max_rounds if max_rounds is not None and max_rounds > 0 else None,
+            llm_call_seconds=llm_call_seconds if llm_call_seconds is not None else DEFAULT_LLM_CALL_SECONDS
+        )
+        save_schedule(schedule, os.path.join(self._get_simulation_dir(simulation_id), ACTIVATION_SCHEDULE_FILE))
+        
+        schedule = self.get_activation_schedule(simulation_id)
+        logger.info(
+            f"激活计划已生成: simulation_id={simulation_id}, seed={schedule.get('seed')}, "
+            f"预计LLM调用={schedule.get('summary', {}).get('total_llm_calls')}"
+        )
+        return schedule
+    
+    def get_activation_schedule(self, simulation_id: str) -> Optional[Dict[str, Any]]:
+        """获取已生成的激活计划摘要（不含每轮的 Agent 列表）"""
+        sim_dir = self._get_simulation_dir(simulation_id)
+        schedule_path = os.path.join(sim_dir, ACTIVATION_SCHEDULE_FILE)
+        
+        if not os.path.exists(schedule_path):
+            return None
+        
+        with open(schedule_path, 'r', encoding='utf-8') as f:
+            schedule = json.load(f)
+        
+        return {
+            "simulation_id": simulation_id,
+            "schedule_file": schedule_path,
+            "seed": schedule.get("seed"),
+            "created_at": schedule.get("created_at"),
+            "total_rounds": schedule.get("total_rounds"),
+            "platforms": list(schedule.get("platforms", {}).keys()),
+            "summary": schedule.get("summary", {}),
+        }
+    
     def get_run_instructions(self, simulation_id: str) -> Dict[str, str]:
         """获取运行说明"""
         sim_dir = self._get_simulation_dir(simulation_id)
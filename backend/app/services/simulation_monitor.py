@@ -0,0 +1,176 @@
+"""
+模拟监控服务
+所有运行中的模拟共用一个监控线程：通过 inotify 监听各模拟的动作日志目录，
+有新日志写入时才读取对应模拟，空闲时只按固定间隔检查进程是否结束
+
+每个模拟的读取位置（游标）由回调方自己维护（见 SimulationRunState.log_positions）
+"""
+
+import os
+import time
+import threading
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Optional
+
+from ..utils.logger import get_logger
+from ..utils.dir_watcher import MultiDirectoryWatcher
+
+logger = get_logger('mirofish.simulation_monitor')
+
+# 没有文件变化时检查进程状态的间隔（秒）
+POLL_INTERVAL = 2.0
+
+# 同一个模拟两次读取日志之间的最小间隔（秒），日志高频写入时合并为一次读取
+MIN_READ_INTERVAL = 0.5
+
+# 平台目录中只有动作日志（单一日志或按轮次分段的日志及其清单），目录内任何文件变化都需要读取
+WATCHED_FILENAMES = None
+
+
+@dataclass
+class _MonitoredSimulation:
+    simulation_id: str
+    callback: Callable[[bool], bool]
+    directories: List[str]
+    watched: set = field(default_factory=set)
+    pending: bool = True
+    last_poll: float = 0.0
+    last_read: float = 0.0
+
+
+class SimulationMonitor:
+    """
+    模拟监控服务（单例）
+
+    用法:
+        SimulationMonitor.get().add(simulation_id, [日志目录...], callback)
+
+    callback(changed) 在监控线程中调用：changed 表示日志可能有新内容；
+    返回 False 表示模拟已结束，停止监控
+    """
+
+    _instance: Optional['SimulationMonitor'] = None
+    _instance_lock = threading.Lock()
+
+    def __init__(self):
+        self._entries: Dict[str, _MonitoredSimulation] = {}
+        self._lock = threading.Lock()
+        self._watcher: Optional[MultiDirectoryWatcher] = None
+        self._thread: Optional[threading.Thread] = None
+
+    @classmethod
+    def get(cls) -> 'SimulationMonitor':
+        with cls._instance_lock:
+            if cls._instance is None:
+                cls._instance = cls()
+            return cls._instance
+
+    def _ensure_started(self):
+        if self._thread is not None and self._thread.is_alive():
+            return
+
+        if self._watcher is None:
+            self._watcher = MultiDirectoryWatcher()
+            if not self._watcher.start():
+                logger.info("inotify 不可用，模拟监控按固定间隔轮询")
+
+        self._thread = threading.Thread(
+            target=self._run,
+            name="simulation-monitor",
+            daemon=True
+        )
+        self._thread.start()
+
+    def add(self, simulation_id: str, directories: List[str], callback: Callable[[bool], bool]):
+        """开始监控模拟（同一模拟重复添加时替换原有监控）"""
+        with self._lock:
+            self._ensure_started()
+            if simulation_id in self._entries:
+                self._watcher.remove(simulation_id)
+            self._entries[simulation_id] = _MonitoredSimulation(
+                simulation_id=simulation_id,
+                callback=callback,
+                directories=list(directories)
+            )
+        self._watcher.wake()
+
+    def remove(self, simulation_id: str):
+        """停止监控模拟（不会再调用其回调）"""
+        with self._lock:
+            if self._entries.pop(simulation_id, None) is not None:
+                self._watcher.remove(simulation_id)
+
+    def is_monitoring(self, simulation_id: str) -> bool:
+        with self._lock:
+            return simulation_id in self._entries
+
+    def get_monitored_simulations(self) -> List[str]:
+        with self._lock:
+            return list(self._entries.keys())
+
+    # ------------------------------------------------------------------
+    # 监控线程
+    # ------------------------------------------------------------------
+
+    def _watch_directories(self, entry: _MonitoredSimulation) -> bool:
+        """为尚未监听的目录添加监听（目录由模拟进程创建，可能稍后才出现），返回是否全部在监听"""
+        for directory in entry.directories:
+            if directory in entry.watched or not os.path.isdir(directory):
+                continue
+            if self._watcher.add(directory, entry.simulation_id, WATCHED_FILENAMES):
+                entry.watched.add(directory)
+        return len(entry.watched) == len(entry.directories)
+
+    def _next_timeout(self, entries: List[_MonitoredSimulation], now: float) -> Optional[float]:
+        if not entries:
+            return None
+
+        deadline = min(entry.last_poll + POLL_INTERVAL for entry in entries)
+        for entry in entries:
+            if entry.pending:
+                deadline = min(deadline, entry.last_read + MIN_READ_INTERVAL)
+        return max(deadline - now, 0.0)
+
+    def _run(self):
+        while True:
+            with self._lock:
+                entries = list(self._entries.values())
+
+            changed = self._watcher.wait(self._next_timeout(entries, time.monotonic()))
+            now = time.monotonic()
+
+            for entry in entries:
+                # 回退模式下 changed 为 None，只在轮询时读取（见下）
+                if changed is not None and entry.simulation_id in changed:
+                    entry.pending = True
+
+                poll_due = now - entry.last_poll >= POLL_INTERVAL
+                read_due = entry.pending and now - entry.last_read >= MIN_READ_INTERVAL
+                if not poll_due and not read_due:
+                    continue
+
+                # 还有目录没有监听上时无法依赖通知，每次轮询都读取
+                with self._lock:
+                    if self._entries.get(entry.simulation_id) is not entry:
+                        continue
+                    all_watched = self._watch_directories(entry)
+                if not all_watched or not self._watcher.is_inotify:
+                    entry.pending = True
+
+                read = entry.pending and now - entry.last_read >= MIN_READ_INTERVAL
+                entry.last_poll = now
+                if read:
+                    entry.pending = False
+                    entry.last_read = now
+
+                try:
+                    keep = entry.callback(read)
+                except Exception as e:
+                    logger.error(f"监控回调异常: {entry.simulation_id}, error={e}")
+                    keep = False
+
+                if not keep:
+                    with self._lock:
+                        if self._entries.get(entry.simulation_id) is entry:
+                            self._entries.pop(entry.simulation_id, None)
+                            self._watcher.remove(entry.simulation_id)
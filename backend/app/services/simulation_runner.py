@@ -6,28 +6,63 @@ OASIS模拟运行器
 import os
 import sys
 import json
-import time
 import asyncio
 import threading
 import subprocess
 import signal
 import atexit
-from typing import Dict, Any, List, Optional, Union
+import tempfile
+import heapq
+import queue
+import time
+from itertools import islice
+from typing import Callable, Dict, Any, Deque, List, Optional, Set, Tuple, Union, Iterator
 from dataclasses import dataclass, field
 from datetime import datetime
 from enum import Enum
 from queue import Queue
+from collections import deque
 
 from ..config import Config
 from ..utils.logger import get_logger
+from ..utils.jsonl_reader import iter_jsonl_reverse
+from ..utils.log_archive import (
+    resolve_log_path, log_exists, log_size, open_log, log_files, compress_log, compress_segments,
+    compact_sqlite, check_truncate, truncate_log
+)
 from .zep_graph_memory_updater import ZepGraphMemoryManager
-from .simulation_ipc import SimulationIPCClient, CommandType, IPCResponse
+from .action_index import ActionIndex, INDEX_DB_FILE
+from .simulation_monitor import SimulationMonitor
+from .process_telemetry import ProcessTelemetry
+from .action_stream import (
+    ActionBroker, STREAM_PLATFORMS, format_action_cursor, parse_action_cursor, parse_since_seq
+)
+from .simulation_manager import ACTIVATION_SCHEDULE_FILE
+from ..models.task import TaskManager, TaskStatus
+from .simulation_ipc import SimulationIPCClient, AsyncSimulationIPCClient, IPCDispatcher, CommandType, IPCResponse
 
 logger = get_logger('mirofish.simulation_runner')
 
 # 标记是否已注册清理函数
 _cleanup_registered = False
 
+# 每轮摘要和Agent统计单独保存（随动作数增长，不随 run_state.json 每个监控周期重写）
+AGGREGATES_FILE = "run_aggregates.json"
+
+# 运行期间聚合结果的最短保存间隔（秒）；运行结束时立即保存
+AGGREGATES_SAVE_INTERVAL = 10.0
+
+# 模拟脚本保存的检查点（与 scripts/simulation_checkpoint.py 保持一致）
+CHECKPOINT_DIR = "checkpoints"
+CHECKPOINT_FILE_FORMAT = "{platform}_checkpoint.json"
+
+# 检查点记录的运行脚本 -> 运行平台
+CHECKPOINT_SCRIPT_PLATFORMS = {
+    "run_parallel_simulation.py": "parallel",
+    "run_twitter_simulation.py": "twitter",
+    "run_reddit_simulation.py": "reddit",
+}
+
 
 class RunnerStatus(str, Enum):
     """运行器状态"""
@@ -41,9 +76,9 @@ class RunnerStatus(str, Enum):
     FAILED = "failed"
 
 
-@dataclass
+@dataclass(slots=True)
 class AgentAction:
-    """Agent动作记录"""
+    """Agent动作记录（使用 __slots__，大量动作驻留内存时更省内存）"""
     round_num: int
     timestamp: str
     platform: str  # twitter / reddit
@@ -53,6 +88,7 @@ class AgentAction:
     action_args: Dict[str, Any] = field(default_factory=dict)
     result: Optional[str] = None
     success: bool = True
+    seq: Optional[int] = None  # 平台内单调递增的动作序号（旧日志中没有）
     
     def to_dict(self) -> Dict[str, Any]:
         return {
@@ -65,33 +101,150 @@ class AgentAction:
             "action_args": self.action_args,
             "result": self.result,
             "success": self.success,
+            "seq": self.seq,
         }
 
 
 @dataclass
 class RoundSummary:
-    """每轮摘要"""
+    """
+    每轮摘要（由监控线程随动作日志增量聚合）
+    
+    不保存动作本身，某一轮的动作列表通过 get_actions(round_num=...) 从动作索引查询；
+    持久化时只保存活跃Agent数量，从文件加载后 active_agents 为 None，需要时从动作索引补全
+    """
     round_num: int
     start_time: str
     end_time: Optional[str] = None
     simulated_hour: int = 0
     twitter_actions: int = 0
     reddit_actions: int = 0
-    active_agents: List[int] = field(default_factory=list)
-    actions: List[AgentAction] = field(default_factory=list)
+    active_agents: Optional[Set[int]] = field(default_factory=set)
+    action_types: Dict[str, int] = field(default_factory=dict)
+    first_action_time: Optional[str] = None
+    last_action_time: Optional[str] = None
+    # active_agents 未加载时使用的活跃Agent数量（来自持久化文件）
+    stored_active_agents_count: int = 0
     
-    def to_dict(self) -> Dict[str, Any]:
-        return {
+    @property
+    def total_actions(self) -> int:
+        return self.twitter_actions + self.reddit_actions
+    
+    @property
+    def active_agents_count(self) -> int:
+        if self.active_agents is None:
+            return self.stored_active_agents_count
+        return len(self.active_agents)
+    
+    def add_action(self, action: AgentAction):
+        """计入一条动作（active_agents 需已加载）"""
+        if action.platform == "twitter":
+            self.twitter_actions += 1
+        else:
+            self.reddit_actions += 1
+        self.active_agents.add(action.agent_id)
+        self.action_types[action.action_type] = self.action_types.get(action.action_type, 0) + 1
+        if self.first_action_time is None or action.timestamp < self.first_action_time:
+            self.first_action_time = action.timestamp
+        if self.last_action_time is None or action.timestamp > self.last_action_time:
+            self.last_action_time = action.timestamp
+    
+    def to_dict(self, include_agents: bool = True) -> Dict[str, Any]:
+        """
+        Args:
+            include_agents: 是否包含活跃Agent列表（持久化格式只保存数量）
+        """
+        data = {
             "round_num": self.round_num,
             "start_time": self.start_time,
             "end_time": self.end_time,
             "simulated_hour": self.simulated_hour,
             "twitter_actions": self.twitter_actions,
             "reddit_actions": self.reddit_actions,
-            "active_agents": self.active_agents,
-            "actions_count": len(self.actions),
-            "actions": [a.to_dict() for a in self.actions],
+            "total_actions": self.total_actions,
+            "active_agents_count": self.active_agents_count,
+            "action_types": dict(self.action_types),
+            "first_action_time": self.first_action_time,
+            "last_action_time": self.last_action_time,
+        }
+        if include_agents:
+            data["active_agents"] = sorted(self.active_agents or ())
+        return data
+    
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'RoundSummary':
+        # 旧版本的状态文件保存了完整的活跃Agent列表
+        active_agents = data.get("active_agents")
+        return cls(
+            round_num=data.get("round_num", 0),
+            start_time=data.get("start_time", ""),
+            end_time=data.get("end_time"),
+            simulated_hour=data.get("simulated_hour", 0),
+            twitter_actions=data.get("twitter_actions", 0),
+            reddit_actions=data.get("reddit_actions", 0),
+            active_agents=set(active_agents) if active_agents is not None else None,
+            action_types=data.get("action_types", {}),
+            first_action_time=data.get("first_action_time"),
+            last_action_time=data.get("last_action_time"),
+            stored_active_agents_count=data.get("active_agents_count", 0),
+        )
+
+
+@dataclass
+class AgentStats:
+    """单个Agent的动作统计（由监控线程随动作日志增量聚合）"""
+    agent_id: int
+    agent_name: str = ""
+    twitter_actions: int = 0
+    reddit_actions: int = 0
+    action_types: Dict[str, int] = field(default_factory=dict)
+    first_action_time: Optional[str] = None
+    last_action_time: Optional[str] = None
+    
+    @property
+    def total_actions(self) -> int:
+        return self.twitter_actions + self.reddit_actions
+    
+    def add_action(self, action: AgentAction):
+        if action.agent_name:
+            self.agent_name = action.agent_name
+        if action.platform == "twitter":
+            self.twitter_actions += 1
+        else:
+            self.reddit_actions += 1
+        self.action_types[action.action_type] = self.action_types.get(action.action_type, 0) + 1
+        if self.first_action_time is None or action.timestamp < self.first_action_time:
+            self.first_action_time = action.timestamp
+        if self.last_action_time is None or action.timestamp > self.last_action_time:
+            self.last_action_time = action.timestamp
+    
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "agent_id": self.agent_id,
+            "agent_name": self.agent_name,
+            "total_actions": self.total_actions,
+            "twitter_actions": self.twitter_actions,
+            "reddit_actions": self.reddit_actions,
+            "action_types": dict(self.action_types),
+            "first_action_time": self.first_action_time,
+            "last_action_time": self.last_action_time,
         }
+    
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'AgentStats':
+        return cls(
+            agent_id=data.get("agent_id", 0),
+            agent_name=data.get("agent_name", ""),
+            twitter_actions=data.get("twitter_actions", 0),
+            reddit_actions=data.get("reddit_actions", 0),
+            action_types=data.get("action_types", {}),
+            first_action_time=data.get("first_action_time"),
+            last_action_time=data.get("last_action_time"),
+        )
+
+
+# 聚合结果字段（保存到 AGGREGATES_FILE，其余字段保存到 run_state.json）
+_AGGREGATE_FIELDS = frozenset(("rounds", "agent_stats", "log_positions"))
 
 
 @dataclass
@@ -122,11 +275,20 @@ class SimulationRunState:
     twitter_completed: bool = False
     reddit_completed: bool = False
     
-    # 每轮摘要
+    # 每轮摘要（按轮次排序）和每个Agent的统计，随动作日志增量聚合
     rounds: List[RoundSummary] = field(default_factory=list)
+    agent_stats: Dict[int, AgentStats] = field(default_factory=dict)
     
-    # 最近动作（用于前端实时展示）
-    recent_actions: List[AgentAction] = field(default_factory=list)
+    # 聚合已消费到的动作日志位置 {来源: 字节偏移}，与聚合结果一起持久化
+    log_positions: Dict[str, int] = field(default_factory=dict)
+    
+    # 补全从文件加载的每轮活跃Agent: round_nums -> {round_num: agent_id 集合}（不持久化）
+    round_agents_loader: Optional[Callable[[List[int]], Dict[int, Set[int]]]] = field(
+        default=None, repr=False, compare=False
+    )
+    
+    # 最近动作（用于前端实时展示，新的在前；定长环形缓冲，超出 max_recent_actions 时自动丢弃最旧的）
+    recent_actions: Deque[AgentAction] = field(default_factory=deque)
     max_recent_actions: int = 50
     
     # 时间戳
@@ -140,11 +302,53 @@ class SimulationRunState:
     # 进程ID（用于停止）
     process_pid: Optional[int] = None
     
+    # 归档时间（日志已压缩、数据库已整理）
+    archived_at: Optional[str] = None
+    
+    def __post_init__(self):
+        self.recent_actions = deque(self.recent_actions, maxlen=self.max_recent_actions)
+    
+    def __setattr__(self, name: str, value: Any):
+        # 任何字段赋值都把状态（聚合字段则为聚合结果）标记为需要保存
+        object.__setattr__(self, name, value)
+        if name in _AGGREGATE_FIELDS:
+            object.__setattr__(self, "_aggregates_dirty", True)
+        elif not name.startswith("_") and name != "round_agents_loader":
+            object.__setattr__(self, "_dirty", True)
+    
+    @property
+    def dirty(self) -> bool:
+        """自上次保存以来状态（run_state.json 的内容）是否有变化"""
+        return getattr(self, "_dirty", True)
+    
+    def mark_dirty(self):
+        """列表/字典等原地修改后调用，标记为需要保存"""
+        self._dirty = True
+    
+    def mark_saved(self):
+        self._dirty = False
+    
+    @property
+    def aggregates_dirty(self) -> bool:
+        """自上次保存以来聚合结果（每轮摘要、Agent统计、读取位置）是否有变化"""
+        return getattr(self, "_aggregates_dirty", True)
+    
+    @property
+    def aggregates_saved_at(self) -> float:
+        """聚合结果上次保存的时间（time.monotonic()，未保存过为 0）"""
+        return getattr(self, "_aggregates_saved_at", 0.0)
+    
+    def mark_aggregates_dirty(self):
+        """聚合结果原地修改后调用"""
+        self._aggregates_dirty = True
+    
+    def mark_aggregates_saved(self):
+        self._aggregates_dirty = False
+        self._aggregates_saved_at = time.monotonic()
+    
     def add_action(self, action: AgentAction):
         """添加动作到最近动作列表"""
-        self.recent_actions.insert(0, action)
-        if len(self.recent_actions) > self.max_recent_actions:
-            self.recent_actions = self.recent_actions[:self.max_recent_actions]
+        self.recent_actions.appendleft(action)
         
         if action.platform == "twitter":
             self.twitter_actions_count += 1
@@ -153,6 +357,73 @@ class SimulationRunState:
         
         self.updated_at = datetime.now().isoformat()
     
+    def _get_round_summary(self, round_num: int, timestamp: str) -> RoundSummary:
+        """获取某一轮的摘要，不存在时按轮次顺序插入"""
+        if self.rounds and self.rounds[-1].round_num == round_num:
+            return self.rounds[-1]
+        
+        index = len(self.rounds)
+        while index > 0 and self.rounds[index - 1].round_num >= round_num:
+            if self.rounds[index - 1].round_num == round_num:
+                return self.rounds[index - 1]
+            index -= 1
+        
+        summary = RoundSummary(round_num=round_num, start_time=timestamp)
+        self.rounds.insert(index, summary)
+        return summary
+    
+    def record_action_stats(self, action: AgentAction):
+        """把一条动作计入每轮摘要和Agent统计"""
+        self.mark_aggregates_dirty()
+        summary = self._get_round_summary(action.round_num, action.timestamp)
+        if summary.active_agents is None:
+            self.load_round_agents([summary])
+        summary.add_action(action)
+        
+        stats = self.agent_stats.get(action.agent_id)
+        if stats is None:
+            stats = AgentStats(agent_id=action.agent_id, agent_name=action.agent_name)
+            self.agent_stats[action.agent_id] = stats
+        stats.add_action(action)
+    
+    def record_round_event(self, event_data: Dict[str, Any]):
+        """把 round_start / round_end 事件计入每轮摘要"""
+        event_type = event_data.get("event_type")
+        if event_type not in ("round_start", "round_end"):
+            return
+        
+        self.mark_aggregates_dirty()
+        timestamp = event_data.get("timestamp", "")
+        summary = self._get_round_summary(event_data.get("round", 0), timestamp)
+        if event_type == "round_start":
+            if timestamp and timestamp < summary.start_time:
+                summary.start_time = timestamp
+            if "simulated_hour" in event_data:
+                summary.simulated_hour = event_data["simulated_hour"]
+        elif timestamp and (summary.end_time is None or timestamp > summary.end_time):
+            summary.end_time = timestamp
+    
+    def reset_aggregates(self):
+        """清空聚合结果（日志被截断或替换后从头重建）"""
+        self.rounds = []
+        self.agent_stats = {}
+        self.log_positions = {}
+    
+    def load_round_agents(self, summaries: List[RoundSummary]):
+        """补全从文件加载的每轮摘要的活跃Agent集合（持久化格式只保存数量）"""
+        loader = self.round_agents_loader
+        agents = loader([summary.round_num for summary in summaries]) if loader else {}
+        for summary in summaries:
+            summary.active_agents = set(agents.get(summary.round_num, ()))
+    
+    def aggregates_to_dict(self) -> Dict[str, Any]:
+        """聚合结果的持久化格式（写入 run_aggregates.json，不含每轮的活跃Agent列表）"""
+        return {
+            "rounds": [r.to_dict(include_agents=False) for r in list(self.rounds)],
+            "agent_stats": [s.to_dict() for s in list(self.agent_stats.values())],
+            "log_positions": dict(self.log_positions),
+        }
+    
     def to_dict(self) -> Dict[str, Any]:
         return {
             "simulation_id": self.simulation_id,
@@ -179,16 +450,34 @@ class SimulationRunState:
             "completed_at": self.completed_at,
             "error": self.error,
             "process_pid": self.process_pid,
+            "archived_at": self.archived_at,
         }
     
     def to_detail_dict(self) -> Dict[str, Any]:
         """包含最近动作的详细信息"""
         result = self.to_dict()
-        result["recent_actions"] = [a.to_dict() for a in self.recent_actions]
+        # list() 先取快照，避免遍历时监控线程写入
+        result["recent_actions"] = [a.to_dict() for a in list(self.recent_actions)]
         result["rounds_count"] = len(self.rounds)
         return result
 
 
+def _write_json_atomic(path: str, data: Dict[str, Any]):
+    """先写入同目录的临时文件再重命名替换（紧凑编码）"""
+    content = json.dumps(data, ensure_ascii=False, separators=(',', ':'))
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), prefix=f".{os.path.basename(path)}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            f.write(content)
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.unlink(tmp_path)
+        except OSError:
+            pass
+        raise
+
+
 class SimulationRunner:
     """
     模拟运行器
@@ -216,13 +505,23 @@ class SimulationRunner:
     _run_states: Dict[str, SimulationRunState] = {}
     _processes: Dict[str, subprocess.Popen] = {}
     _action_queues: Dict[str, Queue] = {}
-    _monitor_threads: Dict[str, threading.Thread] = {}
     _stdout_files: Dict[str, Any] = {}  # 存储 stdout 文件句柄
     _stderr_files: Dict[str, Any] = {}  # 存储 stderr 文件句柄
     
     # 图谱记忆更新配置
     _graph_memory_enabled: Dict[str, bool] = {}  # simulation_id -> enabled
     
+    # 模拟进程的资源采样（进程结束后保留，供事后分析）
+    _telemetry: Dict[str, ProcessTelemetry] = {}
+    
+    # 未被监控的模拟补读聚合结果时使用的锁
+    _aggregate_lock = threading.Lock()
+    
+    # 读取动作日志的锁（每个模拟一个）：监控线程读取一批新动作并推进 log_positions 期间持有，
+    # 实时动作流在两批之间订阅，订阅时取得的读取位置与之后推送的动作正好衔接
+    _log_read_locks: Dict[str, threading.Lock] = {}
+    _log_read_locks_guard = threading.Lock()
+    
     @classmethod
     def get_run_state(cls, simulation_id: str) -> Optional[SimulationRunState]:
         """获取运行状态"""
@@ -269,6 +568,7 @@ class SimulationRunner:
                 completed_at=data.get("completed_at"),
                 error=data.get("error"),
                 process_pid=data.get("process_pid"),
+                archived_at=data.get("archived_at"),
             )
             
             # 加载最近动作
@@ -284,26 +584,88 @@ class SimulationRunner:
                     action_args=a.get("action_args", {}),
                     result=a.get("result"),
                     success=a.get("success", True),
+                    seq=a.get("seq"),
                 ))
             
+            # 加载聚合结果（旧版本保存在 run_state.json 中；都没有时查询时会从头重建）
+            aggregates = data
+            aggregates_file = os.path.join(cls.RUN_STATE_DIR, simulation_id, AGGREGATES_FILE)
+            if os.path.exists(aggregates_file):
+                with open(aggregates_file, 'r', encoding='utf-8') as f:
+                    aggregates = json.load(f)
+            state.rounds = [RoundSummary.from_dict(r) for r in aggregates.get("rounds", [])]
+            state.rounds.sort(key=lambda r: r.round_num)
+            for stats_data in aggregates.get("agent_stats", []):
+                stats = AgentStats.from_dict(stats_data)
+                state.agent_stats[stats.agent_id] = stats
+            state.log_positions = aggregates.get("log_positions", {})
+            state.round_agents_loader = lambda round_nums: cls._load_round_agents(simulation_id, round_nums)
+            
+            # 刚从文件加载，与文件内容一致
+            state.mark_saved()
+            if os.path.exists(aggregates_file):
+                state.mark_aggregates_saved()
             return state
         except Exception as e:
             logger.error(f"加载运行状态失败: {str(e)}")
             return None
     
     @classmethod
-    def _save_run_state(cls, state: SimulationRunState):
-        """保存运行状态到文件"""
+    def _load_round_agents(cls, simulation_id: str, round_nums: List[int]) -> Dict[int, Set[int]]:
+        """从动作索引查询各轮的活跃Agent（补全从文件加载的每轮摘要）"""
+        sim_dir = os.path.join(cls.RUN_STATE_DIR, simulation_id)
+        try:
+            return ActionIndex.get(sim_dir).round_agents(round_nums)
+        except Exception as e:
+            logger.warning(f"查询每轮活跃Agent失败: {simulation_id}, error={e}")
+            return {}
+    
+    @classmethod
+    def _save_run_state(cls, state: SimulationRunState, flush_aggregates: bool = False):
+        """
+        保存运行状态到文件
+        
+        - run_state.json 只包含状态和最近动作（大小固定），状态有变化时写入
+        - 每轮摘要、Agent统计和日志读取位置写入 run_aggregates.json：运行期间最多每
+          AGGREGATES_SAVE_INTERVAL 秒写一次，运行结束或 flush_aggregates 时立即写入；
+          读取位置与聚合结果在同一文件中，服务重启后从该位置补读即可追上
+        - 没有变化（且文件仍存在）时跳过写入
+        - 先写入同目录的临时文件再重命名替换，读取方不会读到写了一半的文件
+        - 使用紧凑的 JSON 编码
+        """
+        cls._run_states[state.simulation_id] = state
+        
         sim_dir = os.path.join(cls.RUN_STATE_DIR, state.simulation_id)
-        os.makedirs(sim_dir, exist_ok=True)
         state_file = os.path.join(sim_dir, "run_state.json")
+        aggregates_file = os.path.join(sim_dir, AGGREGATES_FILE)
+        
+        save_state = state.dirty or not os.path.exists(state_file)
+        save_aggregates = state.aggregates_dirty or not os.path.exists(aggregates_file)
+        if save_aggregates and not flush_aggregates and state.runner_status in (
+            RunnerStatus.STARTING, RunnerStatus.RUNNING
+        ):
+            save_aggregates = time.monotonic() - state.aggregates_saved_at >= AGGREGATES_SAVE_INTERVAL
+        if not save_state and not save_aggregates:
+            return
         
-        data = state.to_detail_dict()
+        os.makedirs(sim_dir, exist_ok=True)
         
-        with open(state_file, 'w', encoding='utf-8') as f:
-            json.dump(data, f, ensure_ascii=False, indent=2)
+        # 先清除标记再序列化，序列化期间发生的修改会在下次保存时写入
+        if save_state:
+            state.mark_saved()
+            try:
+                _write_json_atomic(state_file, state.to_detail_dict())
+            except BaseException:
+                state.mark_dirty()
+                raise
         
-        cls._run_states[state.simulation_id] = state
+        if save_aggregates:
+            state.mark_aggregates_saved()
+            try:
+                _write_json_atomic(aggregates_file, state.aggregates_to_dict())
+            except BaseException:
+                state.mark_aggregates_dirty()
+                raise
     
     @classmethod
     def start_simulation(
@@ -312,7 +674,11 @@ class SimulationRunner:
         platform: str = "parallel",  # twitter / reddit / parallel
         max_rounds: int = None,  # 最大模拟轮数（可选，用于截断过长的模拟）
         enable_graph_memory_update: bool = False,  # 是否将活动更新到Zep图谱
-        graph_id: str = None  # Zep图谱ID（启用图谱更新时必需）
+        graph_id: str = None,  # Zep图谱ID（启用图谱更新时必需）
+        log_segment_rounds: Optional[int] = None,  # 动作日志按轮次分段（每段轮数）
+        seed: Optional[int] = None,  # Agent 激活抽样的随机种子
+        use_activation_schedule: bool = False,  # 按预览生成的激活计划回放
+        resume_checkpoints: Optional[Dict[str, Dict[str, Any]]] = None  # 从这些检查点继续（由 resume_simulation 调用）
     ) -> SimulationRunState:
         """
         启动模拟
@@ -323,10 +689,19 @@ class SimulationRunner:
             max_rounds: 最大模拟轮数（可选，用于截断过长的模拟）
             enable_graph_memory_update: 是否将Agent活动动态更新到Zep图谱
             graph_id: Zep图谱ID（启用图谱更新时必需）
+            log_segment_rounds: 动作日志每个分段包含的轮数（可选，仅双平台并行模拟支持；
+                分段后按轮次查询只读取相关分段，已结束的分段可单独压缩）
+            seed: Agent 激活抽样的随机种子（可选，固定后每轮激活的 Agent 可复现）
+            use_activation_schedule: 按 SimulationManager.preview_activation_schedule 生成的激活计划回放
+                （仅双平台并行模拟支持）
+            resume_checkpoints: 从各平台最近的检查点继续运行（应通过 resume_simulation 调用）；
+                所有检查通过后、启动进程前把动作日志截断到检查点的位置
             
         Returns:
             SimulationRunState
         """
+        resume = resume_checkpoints is not None
+        
         # 检查是否已在运行
         existing = cls.get_run_state(simulation_id)
         if existing and existing.runner_status in [RunnerStatus.RUNNING, RunnerStatus.STARTING]:
@@ -342,6 +717,29 @@ class SimulationRunner:
         with open(config_path, 'r', encoding='utf-8') as f:
             config = json.load(f)
         
+        schedule_path = os.path.join(sim_dir, ACTIVATION_SCHEDULE_FILE)
+        if use_activation_schedule:
+            if platform in ("twitter", "reddit"):
+                raise ValueError("激活计划回放仅支持双平台并行模拟（platform=parallel）")
+            if not os.path.exists(schedule_path):
+                raise ValueError("激活计划不存在，请先调用 /schedule/preview 接口")
+        
+        # 确定运行哪个脚本（脚本位于 backend/scripts/ 目录）
+        if platform == "twitter":
+            script_name = "run_twitter_simulation.py"
+        elif platform == "reddit":
+            script_name = "run_reddit_simulation.py"
+        else:
+            script_name = "run_parallel_simulation.py"
+        
+        script_path = os.path.join(cls.SCRIPTS_DIR, script_name)
+        
+        if not os.path.exists(script_path):
+            raise ValueError(f"脚本不存在: {script_path}")
+        
+        if enable_graph_memory_update and not graph_id:
+            raise ValueError("启用图谱记忆更新时必须提供 graph_id")
+        
         # 初始化运行状态
         time_config = config.get("time_config", {})
         total_hours = time_config.get("total_simulation_hours", 72)
@@ -367,9 +765,6 @@ class SimulationRunner:
         
         # 如果启用图谱记忆更新，创建更新器
         if enable_graph_memory_update:
-            if not graph_id:
-                raise ValueError("启用图谱记忆更新时必须提供 graph_id")
-            
             try:
                 ZepGraphMemoryManager.create_updater(simulation_id, graph_id)
                 cls._graph_memory_enabled[simulation_id] = True
@@ -380,22 +775,8 @@ class SimulationRunner:
         else:
             cls._graph_memory_enabled[simulation_id] = False
         
-        # 确定运行哪个脚本（脚本位于 backend/scripts/ 目录）
-        if platform == "twitter":
-            script_name = "run_twitter_simulation.py"
-            state.twitter_running = True
-        elif platform == "reddit":
-            script_name = "run_reddit_simulation.py"
-            state.reddit_running = True
-        else:
-            script_name = "run_parallel_simulation.py"
-            state.twitter_running = True
-            state.reddit_running = True
-        
-        script_path = os.path.join(cls.SCRIPTS_DIR, script_name)
-        
-        if not os.path.exists(script_path):
-            raise ValueError(f"脚本不存在: {script_path}")
+        state.twitter_running = platform != "reddit"
+        state.reddit_running = platform != "twitter"
         
         # 创建动作队列
         action_queue = Queue()
@@ -419,9 +800,26 @@ class SimulationRunner:
             if max_rounds is not None and max_rounds > 0:
                 cmd.extend(["--max-rounds", str(max_rounds)])
             
-            # 创建主日志文件，避免 stdout/stderr 管道缓冲区满导致进程阻塞
+            # 动作日志按轮次分段（只有双平台脚本写入动作日志）
+            if log_segment_rounds and script_name == "run_parallel_simulation.py":
+                cmd.extend(["--log-segment-rounds", str(log_segment_rounds)])
+            
+            if seed is not None:
+                cmd.extend(["--seed", str(seed)])
+            
+            # 按激活计划回放（计划中的轮次与预览完全一致）
+            if use_activation_schedule:
+                cmd.extend(["--schedule", schedule_path])
+            
+            if resume:
+                cmd.append("--resume")
+                # 检查都已通过，丢弃检查点之后写入的动作日志（只有双平台脚本写入动作日志）
+                if script_name == "run_parallel_simulation.py":
+                    cls._rewind_action_logs(sim_dir, resume_checkpoints)
+            
+            # 创建主日志文件，避免 stdout/stderr 管道缓冲区满导致进程阻塞（恢复时追加到之前的日志）
             main_log_path = os.path.join(sim_dir, "simulation.log")
-            main_log_file = open(main_log_path, 'w', encoding='utf-8')
+            main_log_file = open(main_log_path, 'a' if resume else 'w', encoding='utf-8')
             
             # 设置子进程环境变量，确保 Windows 上使用 UTF-8 编码
             # 这可以修复第三方库（如 OASIS）读取文件时未指定编码的问题
@@ -450,18 +848,17 @@ class SimulationRunner:
             state.process_pid = process.pid
             state.runner_status = RunnerStatus.RUNNING
             cls._processes[simulation_id] = process
+            cls._telemetry[simulation_id] = ProcessTelemetry(process.pid, sim_dir)
             cls._save_run_state(state)
             
-            # 启动监控线程
-            monitor_thread = threading.Thread(
-                target=cls._monitor_simulation,
-                args=(simulation_id,),
-                daemon=True
+            # 加入共用的监控线程（监听分平台的动作日志目录）
+            SimulationMonitor.get().add(
+                simulation_id,
+                [os.path.join(sim_dir, "twitter"), os.path.join(sim_dir, "reddit")],
+                lambda changed: cls._poll_simulation(simulation_id, changed)
             )
-            monitor_thread.start()
-            cls._monitor_threads[simulation_id] = monitor_thread
             
-            logger.info(f"模拟启动成功: {simulation_id}, pid={process.pid}, platform={platform}")
+            logger.info(f"模拟启动成功: {simulation_id}, pid={process.pid}, platform={platform}, resume={resume}")
             
         except Exception as e:
             state.runner_status = RunnerStatus.FAILED
@@ -472,46 +869,223 @@ class SimulationRunner:
         return state
     
     @classmethod
-    def _monitor_simulation(cls, simulation_id: str):
-        """监控模拟进程，解析动作日志"""
-        sim_dir = os.path.join(cls.RUN_STATE_DIR, simulation_id)
+    def get_checkpoints(cls, simulation_id: str) -> Dict[str, Dict[str, Any]]:
+        """
+        读取各平台最近的检查点（模拟脚本每隔 N 轮、收到退出信号和模拟完成时保存）
         
-        # 新的日志结构：分平台的动作日志
-        twitter_actions_log = os.path.join(sim_dir, "twitter", "actions.jsonl")
-        reddit_actions_log = os.path.join(sim_dir, "reddit", "actions.jsonl")
+        Returns:
+            {platform: 检查点}，没有检查点或检查点无法解析的平台不包含在结果中
+        """
+        checkpoint_dir = os.path.join(cls.RUN_STATE_DIR, simulation_id, CHECKPOINT_DIR)
+        checkpoints = {}
+        for platform in STREAM_PLATFORMS:
+            path = os.path.join(checkpoint_dir, CHECKPOINT_FILE_FORMAT.format(platform=platform))
+            if not os.path.exists(path):
+                continue
+            try:
+                with open(path, 'r', encoding='utf-8') as f:
+                    checkpoints[platform] = json.load(f)
+            except (OSError, ValueError) as e:
+                logger.warning(f"读取检查点失败: {path}, error={e}")
+        return checkpoints
+    
+    @classmethod
+    def resume_simulation(
+        cls,
+        simulation_id: str,
+        enable_graph_memory_update: bool = False,
+        graph_id: str = None
+    ) -> SimulationRunState:
+        """
+        从最近的检查点继续运行中断（进程崩溃或被停止）的模拟，检查点之前的轮次不再重新调用 LLM
+        
+        使用中断前的运行平台、轮数和激活计划；各平台从各自的检查点继续，
+        双平台并行时没有检查点的平台从头开始。检查点之后写入的动作日志和数据库内容会被丢弃，
+        Agent 的对话记忆不在检查点中，恢复后从数据库中的社交网络状态继续
+        
+        Args:
+            simulation_id: 模拟ID
+            enable_graph_memory_update: 是否将Agent活动动态更新到Zep图谱
+            graph_id: Zep图谱ID（启用图谱更新时必需）
+            
+        Returns:
+            SimulationRunState
+            
+        Raises:
+            ValueError: 模拟正在运行、没有可恢复的检查点，或日志已归档无法回退
+        """
+        existing = cls.get_run_state(simulation_id)
+        if existing and existing.runner_status in [RunnerStatus.RUNNING, RunnerStatus.STARTING]:
+            raise ValueError(f"模拟已在运行中: {simulation_id}")
+        if simulation_id in cls._processes:
+            raise ValueError(f"模拟进程仍在运行，请先调用 /stop 接口停止: {simulation_id}")
+        
+        checkpoints = cls.get_checkpoints(simulation_id)
+        if not checkpoints:
+            raise ValueError(f"没有可恢复的检查点，请使用 /start 接口重新开始模拟: {simulation_id}")
+        
+        scripts = {checkpoint.get("script") for checkpoint in checkpoints.values()}
+        platform = CHECKPOINT_SCRIPT_PLATFORMS.get(scripts.pop()) if len(scripts) == 1 else None
+        if platform is None:
+            raise ValueError(f"检查点不完整或来自不同的运行脚本，无法恢复: {simulation_id}")
+        
+        # 截断在 start_simulation 的检查通过后才执行，这里先确认日志都能截断（已归档的无法回退）
+        if platform == "parallel":
+            sim_dir = os.path.join(cls.RUN_STATE_DIR, simulation_id)
+            for log_path, offset in cls._checkpoint_log_offsets(sim_dir, checkpoints):
+                check_truncate(log_path, offset)
+        
+        logger.info(
+            f"从检查点恢复模拟: {simulation_id}, platform={platform}, "
+            + ", ".join(f"{p}=第{c.get('round')}轮" for p, c in checkpoints.items())
+        )
+        
+        return cls.start_simulation(
+            simulation_id=simulation_id,
+            platform=platform,
+            max_rounds=max(checkpoint.get("total_rounds") or 0 for checkpoint in checkpoints.values()) or None,
+            enable_graph_memory_update=enable_graph_memory_update,
+            graph_id=graph_id,
+            use_activation_schedule=any(checkpoint.get("replay") for checkpoint in checkpoints.values()),
+            resume_checkpoints=checkpoints
+        )
+    
+    @classmethod
+    def _checkpoint_log_offsets(
+        cls,
+        sim_dir: str,
+        checkpoints: Dict[str, Dict[str, Any]]
+    ) -> List[Tuple[str, int]]:
+        """各平台动作日志及检查点记录的位置: [(日志路径, 偏移)]，没有检查点的平台截断到开头"""
+        offsets = []
+        for log_platform in STREAM_PLATFORMS:
+            log_path = resolve_log_path(os.path.join(sim_dir, log_platform, "actions.jsonl"))
+            if log_path is None:
+                continue
+            action_log = (checkpoints.get(log_platform) or {}).get("action_log") or {}
+            offsets.append((log_path, action_log.get("offset", 0)))
+        return offsets
+    
+    @classmethod
+    def _rewind_action_logs(cls, sim_dir: str, checkpoints: Dict[str, Dict[str, Any]]):
+        """
+        动作日志截断到检查点的位置，监控从头重建运行状态时不会读到检查点之后的旧内容；
+        动作索引随后从日志重建
+        """
+        for log_path, offset in cls._checkpoint_log_offsets(sim_dir, checkpoints):
+            truncate_log(log_path, offset)
+        ActionIndex.discard(sim_dir)
+        index_path = os.path.join(sim_dir, INDEX_DB_FILE)
+        if os.path.exists(index_path):
+            os.remove(index_path)
+    
+    @classmethod
+    def _poll_simulation(cls, simulation_id: str, changed: bool) -> bool:
+        """
+        监控回调（在共用的监控线程中调用）：日志有变化时读取动作日志，进程结束后做最后一次读取并收尾
+        
+        Returns:
+            是否继续监控
+        """
+        sim_dir = os.path.join(cls.RUN_STATE_DIR, simulation_id)
         
         process = cls._processes.get(simulation_id)
         state = cls.get_run_state(simulation_id)
         
         if not process or not state:
-            return
-        
-        twitter_position = 0
-        reddit_position = 0
+            return False
         
         try:
-            while process.poll() is None:  # 进程仍在运行
-                # 读取 Twitter 动作日志
-                if os.path.exists(twitter_actions_log):
-                    twitter_position = cls._read_action_log(
-                        twitter_actions_log, twitter_position, state, "twitter"
-                    )
+            if process.poll() is None:  # 进程仍在运行
+                if changed:
+                    # 读取 Twitter / Reddit 动作日志
+                    cls._read_platform_action_logs(sim_dir, state)
+                    
+                    # 增量更新动作索引
+                    cls._sync_action_index(ActionIndex.get(sim_dir))
                 
-                # 读取 Reddit 动作日志
-                if os.path.exists(reddit_actions_log):
-                    reddit_position = cls._read_action_log(
-                        reddit_actions_log, reddit_position, state, "reddit"
-                    )
+                # 资源采样
+                cls._sample_telemetry(simulation_id)
                 
                 # 更新状态
                 cls._save_run_state(state)
-                time.sleep(2)
+                return True
+        except Exception as e:
+            logger.error(f"监控线程异常: {simulation_id}, error={str(e)}")
+            state.runner_status = RunnerStatus.FAILED
+            state.error = str(e)
+            cls._save_run_state(state)
+            cls._finish_monitoring(simulation_id)
+            return False
+        
+        cls._on_process_exit(simulation_id, sim_dir, process, state)
+        return False
+    
+    @classmethod
+    def _sample_telemetry(cls, simulation_id: str):
+        """按采样间隔记录进程资源占用（失败不影响监控）"""
+        telemetry = cls._telemetry.get(simulation_id)
+        if telemetry is None:
+            return
+        try:
+            telemetry.maybe_sample()
+        except Exception as e:
+            logger.debug(f"资源采样失败: {simulation_id}, error={e}")
+    
+    @classmethod
+    def get_resource_metrics(cls, simulation_id: str, limit: Optional[int] = None) -> Optional[Dict[str, Any]]:
+        """
+        获取模拟进程的资源采样
+        
+        Args:
+            simulation_id: 模拟ID
+            limit: 只返回最近 limit 条采样（默认全部）
             
+        Returns:
+            {"pid", "latest", "peak_rss_bytes", "avg_cpu_percent", "samples_count", "interval_seconds", "history"}，
+            本次服务运行期间没有启动过该模拟时返回 None
+        """
+        telemetry = cls._telemetry.get(simulation_id)
+        if telemetry is None:
+            return None
+        result = telemetry.to_dict(limit)
+        result["running"] = simulation_id in cls._processes
+        return result
+    
+    @classmethod
+    def get_all_resource_metrics(cls) -> Dict[str, Any]:
+        """所有模拟进程的最新资源占用（用于评估单机可承载的并发模拟数）"""
+        simulations = {}
+        total_rss = 0
+        total_cpu = 0.0
+        for simulation_id, telemetry in list(cls._telemetry.items()):
+            summary = telemetry.summary()
+            summary["running"] = simulation_id in cls._processes
+            simulations[simulation_id] = summary
+            latest = summary["latest"]
+            if summary["running"] and latest:
+                total_rss += latest["rss_bytes"] or 0
+                total_cpu += latest["cpu_percent"] or 0.0
+        return {
+            "running_count": sum(1 for s in simulations.values() if s["running"]),
+            "total_rss_bytes": total_rss,
+            "total_cpu_percent": round(total_cpu, 1),
+            "simulations": simulations,
+        }
+    
+    @classmethod
+    def _on_process_exit(
+        cls,
+        simulation_id: str,
+        sim_dir: str,
+        process: subprocess.Popen,
+        state: SimulationRunState
+    ):
+        """模拟进程结束：最后读取一次日志并更新最终状态"""
+        try:
             # 进程结束后，最后读取一次日志
-            if os.path.exists(twitter_actions_log):
-                cls._read_action_log(twitter_actions_log, twitter_position, state, "twitter")
-            if os.path.exists(reddit_actions_log):
-                cls._read_action_log(reddit_actions_log, reddit_position, state, "reddit")
+            cls._read_platform_action_logs(sim_dir, state)
+            cls._sync_action_index(ActionIndex.get(sim_dir))
             
             # 进程结束
             exit_code = process.returncode
@@ -545,32 +1119,67 @@ class SimulationRunner:
             cls._save_run_state(state)
         
         finally:
-            # 停止图谱记忆更新器
-            if cls._graph_memory_enabled.get(simulation_id, False):
-                try:
-                    ZepGraphMemoryManager.stop_updater(simulation_id)
-                    logger.info(f"已停止图谱记忆更新: simulation_id={simulation_id}")
-                except Exception as e:
-                    logger.error(f"停止图谱记忆更新器失败: {e}")
-                cls._graph_memory_enabled.pop(simulation_id, None)
-            
-            # 清理进程资源
-            cls._processes.pop(simulation_id, None)
-            cls._action_queues.pop(simulation_id, None)
-            
-            # 关闭日志文件句柄
-            if simulation_id in cls._stdout_files:
-                try:
-                    cls._stdout_files[simulation_id].close()
-                except Exception:
-                    pass
-                cls._stdout_files.pop(simulation_id, None)
-            if simulation_id in cls._stderr_files and cls._stderr_files[simulation_id]:
-                try:
-                    cls._stderr_files[simulation_id].close()
-                except Exception:
-                    pass
-                cls._stderr_files.pop(simulation_id, None)
+            cls._finish_monitoring(simulation_id)
+    
+    @classmethod
+    def _finish_monitoring(cls, simulation_id: str):
+        """停止监控后释放模拟的运行资源"""
+        # 通知实时动作流的订阅者
+        state = cls._run_states.get(simulation_id)
+        ActionBroker.close(simulation_id, {
+            "simulation_id": simulation_id,
+            "runner_status": state.runner_status.value if state else None,
+        })
+        
+        # 停止图谱记忆更新器
+        if cls._graph_memory_enabled.get(simulation_id, False):
+            try:
+                ZepGraphMemoryManager.stop_updater(simulation_id)
+                logger.info(f"已停止图谱记忆更新: simulation_id={simulation_id}")
+            except Exception as e:
+                logger.error(f"停止图谱记忆更新器失败: {e}")
+            cls._graph_memory_enabled.pop(simulation_id, None)
+        
+        # 清理进程资源
+        cls._processes.pop(simulation_id, None)
+        cls._action_queues.pop(simulation_id, None)
+        
+        # 关闭日志文件句柄
+        if simulation_id in cls._stdout_files:
+            try:
+                cls._stdout_files[simulation_id].close()
+            except Exception:
+                pass
+            cls._stdout_files.pop(simulation_id, None)
+        if simulation_id in cls._stderr_files and cls._stderr_files[simulation_id]:
+            try:
+                cls._stderr_files[simulation_id].close()
+            except Exception:
+                pass
+            cls._stderr_files.pop(simulation_id, None)
+    
+    @classmethod
+    def _get_log_read_lock(cls, simulation_id: str) -> threading.Lock:
+        with cls._log_read_locks_guard:
+            lock = cls._log_read_locks.get(simulation_id)
+            if lock is None:
+                lock = threading.Lock()
+                cls._log_read_locks[simulation_id] = lock
+            return lock
+    
+    @classmethod
+    def _read_platform_action_logs(cls, sim_dir: str, state: SimulationRunState):
+        """读取各平台动作日志的新增内容（读取位置记录在 state.log_positions 中）"""
+        with cls._get_log_read_lock(state.simulation_id):
+            # 新的日志结构：分平台的动作日志
+            for platform in ("twitter", "reddit"):
+                log_path = resolve_log_path(os.path.join(sim_dir, platform, "actions.jsonl"))
+                if log_path:
+                    position = state.log_positions.get(platform, 0)
+                    new_position = cls._read_action_log(log_path, position, state, platform)
+                    if new_position != position:
+                        state.log_positions[platform] = new_position
+                        state.mark_aggregates_dirty()
     
     @classmethod
     def _read_action_log(
@@ -583,6 +1192,8 @@ class SimulationRunner:
         """
         读取动作日志文件
         
+        只处理完整的行（写到一半的行留到下次读取），每条动作同时计入每轮摘要和Agent统计
+        
         Args:
             log_path: 日志文件路径
             position: 上次读取位置
@@ -598,11 +1209,17 @@ class SimulationRunner:
         if graph_memory_enabled:
             graph_updater = ZepGraphMemoryManager.get_updater(state.simulation_id)
         
+        # 有 SSE 订阅时实时推送新动作（读取期间持有日志读取锁，不会有新的订阅者加入）
+        publish = ActionBroker.has_subscribers(state.simulation_id)
+        
         try:
-            with open(log_path, 'r', encoding='utf-8') as f:
-                f.seek(position)
-                for line in f:
-                    line = line.strip()
+            with open_log(log_path, position) as f:
+                while True:
+                    raw_line = f.readline()
+                    if not raw_line.endswith(b"\n"):
+                        break
+                    position += len(raw_line)
+                    line = raw_line.strip()
                     if line:
                         try:
                             action_data = json.loads(line)
@@ -633,6 +1250,7 @@ class SimulationRunner:
                                 
                                 # 更新轮次信息（从 round_end 事件）
                                 elif event_type == "round_end":
+                                    state.record_round_event(action_data)
                                     round_num = action_data.get("round", 0)
                                     simulated_hours = action_data.get("simulated_hours", 0)
                                     
@@ -652,6 +1270,9 @@ class SimulationRunner:
                                     # 总体时间取两个平台的最大值
                                     state.simulated_hours = max(state.twitter_simulated_hours, state.reddit_simulated_hours)
                                 
+                                elif event_type == "round_start":
+                                    state.record_round_event(action_data)
+                                
                                 continue
                             
                             action = AgentAction(
@@ -664,8 +1285,12 @@ class SimulationRunner:
                                 action_args=action_data.get("action_args", {}),
                                 result=action_data.get("result"),
                                 success=action_data.get("success", True),
+                                seq=action_data.get("seq"),
                             )
                             state.add_action(action)
+                            state.record_action_stats(action)
+                            if publish:
+                                ActionBroker.publish(state.simulation_id, platform, position, action.to_dict())
                             
                             # 更新轮次
                             if action.round_num and action.round_num > state.current_round:
@@ -675,19 +1300,27 @@ class SimulationRunner:
                             if graph_updater:
                                 graph_updater.add_activity_from_dict(action_data, platform)
                             
-                        except json.JSONDecodeError:
+                        except (json.JSONDecodeError, UnicodeDecodeError):
                             pass
-                return f.tell()
+                return position
         except Exception as e:
             logger.warning(f"读取动作日志失败: {log_path}, error={e}")
             return position
     
+    @classmethod
+    def _sync_action_index(cls, action_index: ActionIndex):
+        """增量同步动作索引（失败不影响监控）"""
+        try:
+            action_index.sync()
+        except Exception as e:
+            logger.warning(f"更新动作索引失败: {action_index.db_path}, error={e}")
+    
     @classmethod
     def _check_all_platforms_completed(cls, state: SimulationRunState) -> bool:
         """
         检查所有启用的平台是否都已完成模拟
         
-        通过检查对应的 actions.jsonl 文件是否存在来判断平台是否被启用
+        通过检查对应的 actions.jsonl 文件（或其归档）是否存在来判断平台是否被启用
         
         Returns:
             True 如果所有启用的平台都已完成
@@ -697,8 +1330,8 @@ class SimulationRunner:
         reddit_log = os.path.join(sim_dir, "reddit", "actions.jsonl")
         
         # 检查哪些平台被启用（通过文件是否存在判断）
-        twitter_enabled = os.path.exists(twitter_log)
-        reddit_enabled = os.path.exists(reddit_log)
+        twitter_enabled = log_exists(twitter_log)
+        reddit_enabled = log_exists(reddit_log)
         
         # 如果平台被启用但未完成，则返回 False
         if twitter_enabled and not state.twitter_completed:
@@ -773,73 +1406,116 @@ class SimulationRunner:
         return state
     
     @classmethod
-    def _read_actions_from_file(
+    def _parse_action_record(
         cls,
-        file_path: str,
+        data: Dict[str, Any],
         default_platform: Optional[str] = None,
         platform_filter: Optional[str] = None,
         agent_id: Optional[int] = None,
         round_num: Optional[int] = None
-    ) -> List[AgentAction]:
+    ) -> Optional[AgentAction]:
         """
-        从单个动作文件中读取动作
+        把一条动作日志记录转换为 AgentAction，不是 Agent 动作或不符合过滤条件时返回 None
         
         Args:
-            file_path: 动作日志文件路径
+            data: 动作日志记录
             default_platform: 默认平台（当动作记录中没有 platform 字段时使用）
             platform_filter: 过滤平台
             agent_id: 过滤 Agent ID
             round_num: 过滤轮次
         """
-        if not os.path.exists(file_path):
-            return []
+        # 跳过非动作记录（如 simulation_start, round_start, round_end 等事件）
+        if "event_type" in data:
+            return None
         
-        actions = []
+        # 跳过没有 agent_id 的记录（非 Agent 动作）
+        if "agent_id" not in data:
+            return None
         
-        with open(file_path, 'r', encoding='utf-8') as f:
-            for line in f:
-                line = line.strip()
-                if not line:
-                    continue
-                
-                try:
-                    data = json.loads(line)
-                    
-                    # 跳过非动作记录（如 simulation_start, round_start, round_end 等事件）
-                    if "event_type" in data:
-                        continue
-                    
-                    # 跳过没有 agent_id 的记录（非 Agent 动作）
-                    if "agent_id" not in data:
-                        continue
-                    
-                    # 获取平台：优先使用记录中的 platform，否则使用默认平台
-                    record_platform = data.get("platform") or default_platform or ""
-                    
-                    # 过滤
-                    if platform_filter and record_platform != platform_filter:
-                        continue
-                    if agent_id is not None and data.get("agent_id") != agent_id:
-                        continue
-                    if round_num is not None and data.get("round") != round_num:
-                        continue
-                    
-                    actions.append(AgentAction(
-                        round_num=data.get("round", 0),
-                        timestamp=data.get("timestamp", ""),
-                        platform=record_platform,
-                        agent_id=data.get("agent_id", 0),
-                        agent_name=data.get("agent_name", ""),
-                        action_type=data.get("action_type", ""),
-                        action_args=data.get("action_args", {}),
-                        result=data.get("result"),
-                        success=data.get("success", True),
+        # 获取平台：优先使用记录中的 platform，否则使用默认平台
+        record_platform = data.get("platform") or default_platform or ""
+        
+        # 过滤
+        if platform_filter and record_platform != platform_filter:
+            return None
+        if agent_id is not None and data.get("agent_id") != agent_id:
+            return None
+        if round_num is not None and data.get("round") != round_num:
+            return None
+        
+        return AgentAction(
+            round_num=data.get("round", 0),
+            timestamp=data.get("timestamp", ""),
+            platform=record_platform,
+            agent_id=data.get("agent_id", 0),
+            agent_name=data.get("agent_name", ""),
+            action_type=data.get("action_type", ""),
+            action_args=data.get("action_args", {}),
+            result=data.get("result"),
+            success=data.get("success", True),
+            seq=data.get("seq"),
+        )
+    
+    @classmethod
+    def _iter_actions_reverse(
+        cls,
+        file_path: str,
+        default_platform: Optional[str] = None,
+        platform_filter: Optional[str] = None,
+        agent_id: Optional[int] = None,
+        round_num: Optional[int] = None
+    ) -> Iterator[AgentAction]:
+        """从单个动作文件末尾开始倒序读取动作（新的在前），按轮次分段的日志只读取该轮所在的分段"""
+        rounds = None if round_num is None else (round_num, round_num)
+        for data in iter_jsonl_reverse(file_path, rounds=rounds):
+            action = cls._parse_action_record(
+                data, default_platform, platform_filter, agent_id, round_num
+            )
+            if action is not None:
+                yield action
+    
+    @classmethod
+    def _iter_actions_newest_first(
+        cls,
+        simulation_id: str,
+        platform: Optional[str] = None,
+        agent_id: Optional[int] = None,
+        round_num: Optional[int] = None
+    ) -> Iterator[AgentAction]:
+        """
+        按时间戳从新到旧遍历动作
+        
+        各平台日志按追加顺序写入，倒序读取后各自有序，再按时间戳做多路归并，
+        因此只取最新 N 条时只会读取每个文件末尾的少量数据
+        """
+        sim_dir = os.path.join(cls.RUN_STATE_DIR, simulation_id)
+        twitter_actions_log = resolve_log_path(os.path.join(sim_dir, "twitter", "actions.jsonl"))
+        reddit_actions_log = resolve_log_path(os.path.join(sim_dir, "reddit", "actions.jsonl"))
+        
+        streams = []
+        if twitter_actions_log or reddit_actions_log:
+            # 分平台文件（根据文件路径自动设置 platform）
+            for platform_name, log_path in (("twitter", twitter_actions_log), ("reddit", reddit_actions_log)):
+                if log_path and (not platform or platform == platform_name):
+                    streams.append(cls._iter_actions_reverse(
+                        log_path,
+                        default_platform=platform_name,
+                        platform_filter=platform,
+                        agent_id=agent_id,
+                        round_num=round_num
                     ))
-                    
-                except json.JSONDecodeError:
-                    continue
+        else:
+            # 旧的单一文件格式（文件中应该有 platform 字段）
+            actions_log = resolve_log_path(os.path.join(sim_dir, "actions.jsonl"))
+            if actions_log:
+                streams.append(cls._iter_actions_reverse(
+                    actions_log,
+                    platform_filter=platform,
+                    agent_id=agent_id,
+                    round_num=round_num
+                ))
         
-        return actions
+        return heapq.merge(*streams, key=lambda a: a.timestamp, reverse=True)
     
     @classmethod
     def get_all_actions(
@@ -861,46 +1537,51 @@ class SimulationRunner:
         Returns:
             完整的动作列表（按时间戳排序，新的在前）
         """
-        sim_dir = os.path.join(cls.RUN_STATE_DIR, simulation_id)
-        actions = []
+        return cls._query_actions(simulation_id, platform, agent_id, round_num)
+    
+    @classmethod
+    def _query_actions(
+        cls,
+        simulation_id: str,
+        platform: Optional[str] = None,
+        agent_id: Optional[int] = None,
+        round_num: Optional[int] = None,
+        limit: Optional[int] = None,
+        offset: int = 0
+    ) -> List[AgentAction]:
+        """
+        查询动作（按时间戳排序，新的在前）
         
-        # 读取 Twitter 动作文件（根据文件路径自动设置 platform 为 twitter）
-        twitter_actions_log = os.path.join(sim_dir, "twitter", "actions.jsonl")
-        if not platform or platform == "twitter":
-            actions.extend(cls._read_actions_from_file(
-                twitter_actions_log,
-                default_platform="twitter",  # 自动填充 platform 字段
-                platform_filter=platform,
-                agent_id=agent_id, 
-                round_num=round_num
-            ))
+        最新 N 条直接倒序读取日志；按 Agent / 轮次过滤或不分页时使用动作索引，
+        索引不可用时回退到直接解析日志文件
+        """
+        sim_dir = os.path.join(cls.RUN_STATE_DIR, simulation_id)
+        if not os.path.isdir(sim_dir):
+            return []
         
-        # 读取 Reddit 动作文件（根据文件路径自动设置 platform 为 reddit）
-        reddit_actions_log = os.path.join(sim_dir, "reddit", "actions.jsonl")
-        if not platform or platform == "reddit":
-            actions.extend(cls._read_actions_from_file(
-                reddit_actions_log,
-                default_platform="reddit",  # 自动填充 platform 字段
-                platform_filter=platform,
-                agent_id=agent_id,
-                round_num=round_num
+        # 只按平台过滤的最新 N 条：直接倒序读取日志，与日志大小无关
+        if limit is not None and agent_id is None and round_num is None:
+            return list(islice(
+                cls._iter_actions_newest_first(simulation_id, platform=platform),
+                max(offset, 0),
+                max(offset, 0) + limit
             ))
         
-        # 如果分平台文件不存在，尝试读取旧的单一文件格式
-        if not actions:
-            actions_log = os.path.join(sim_dir, "actions.jsonl")
-            actions = cls._read_actions_from_file(
-                actions_log,
-                default_platform=None,  # 旧格式文件中应该有 platform 字段
-                platform_filter=platform,
+        try:
+            rows = ActionIndex.get(sim_dir).query(
+                platform=platform,
                 agent_id=agent_id,
-                round_num=round_num
+                round_num=round_num,
+                limit=limit,
+                offset=offset
             )
+            return [AgentAction(**row) for row in rows]
+        except Exception as e:
+            logger.warning(f"动作索引查询失败，回退到解析日志文件: {simulation_id}, error={e}")
         
-        # 按时间戳排序（新的在前）
-        actions.sort(key=lambda x: x.timestamp, reverse=True)
-        
-        return actions
+        actions = cls._iter_actions_newest_first(simulation_id, platform, agent_id, round_num)
+        stop = None if limit is None else max(offset, 0) + limit
+        return list(islice(actions, max(offset, 0), stop))
     
     @classmethod
     def get_actions(
@@ -926,15 +1607,102 @@ class SimulationRunner:
         Returns:
             动作列表
         """
-        actions = cls.get_all_actions(
-            simulation_id=simulation_id,
+        return cls._query_actions(
+            simulation_id,
             platform=platform,
             agent_id=agent_id,
-            round_num=round_num
+            round_num=round_num,
+            limit=limit,
+            offset=offset
         )
+    
+    @classmethod
+    def _get_aggregated_state(cls, simulation_id: str) -> Optional[SimulationRunState]:
+        """
+        获取聚合结果已经追上动作日志的运行状态
+        
+        正在被监控的模拟直接使用监控线程维护的结果；
+        否则（例如服务重启后、旧版本的状态文件）从记录的读取位置补读日志并保存
+        """
+        state = cls.get_run_state(simulation_id)
+        if state is None:
+            return None
         
-        # 分页
-        return actions[offset:offset + limit]
+        if SimulationMonitor.get().is_monitoring(simulation_id):
+            return state
+        
+        with cls._aggregate_lock:
+            if cls._catch_up_aggregates(state):
+                cls._save_run_state(state, flush_aggregates=True)
+        return state
+    
+    @classmethod
+    def _catch_up_aggregates(cls, state: SimulationRunState) -> bool:
+        """
+        从 state.log_positions 补读动作日志，只更新聚合结果
+        
+        Returns:
+            聚合结果是否有变化
+        """
+        sim_dir = os.path.join(cls.RUN_STATE_DIR, state.simulation_id)
+        
+        # 日志来源：分平台日志，或旧的单一 actions.jsonl（其中每条记录自带 platform）
+        sources = []
+        for platform in ("twitter", "reddit"):
+            log_path = resolve_log_path(os.path.join(sim_dir, platform, "actions.jsonl"))
+            if log_path:
+                sources.append((platform, log_path))
+        if not sources:
+            legacy_log = resolve_log_path(os.path.join(sim_dir, "actions.jsonl"))
+            if legacy_log:
+                sources.append(("legacy", legacy_log))
+        
+        changed = False
+        
+        # 日志被截断或替换为其他来源时从头重建
+        active = {source for source, _ in sources}
+        if any(source not in active for source in state.log_positions) or any(
+            log_size(path) < state.log_positions.get(source, 0) for source, path in sources
+        ):
+            state.reset_aggregates()
+            changed = True
+        
+        for source, log_path in sources:
+            position = state.log_positions.get(source, 0)
+            with open_log(log_path, position) as f:
+                while True:
+                    raw_line = f.readline()
+                    if not raw_line.endswith(b"\n"):
+                        break
+                    position += len(raw_line)
+                    try:
+                        action_data = json.loads(raw_line)
+                    except (json.JSONDecodeError, UnicodeDecodeError):
+                        continue
+                    if not isinstance(action_data, dict):
+                        continue
+                    
+                    if "event_type" in action_data:
+                        state.record_round_event(action_data)
+                        continue
+                    if "agent_id" not in action_data:
+                        continue
+                    
+                    state.record_action_stats(AgentAction(
+                        round_num=action_data.get("round", 0),
+                        timestamp=action_data.get("timestamp", ""),
+                        platform=action_data.get("platform") or source,
+                        agent_id=action_data.get("agent_id", 0),
+                        agent_name=action_data.get("agent_name", ""),
+                        action_type=action_data.get("action_type", ""),
+                    ))
+            
+            if position != state.log_positions.get(source, 0):
+                state.log_positions[source] = position
+                state.mark_aggregates_dirty()
+                changed = True
+        
+        return changed
     
     @classmethod
     def get_timeline(
@@ -946,6 +1714,8 @@ class SimulationRunner:
         """
         获取模拟时间线（按轮次汇总）
         
+        直接返回增量聚合的每轮摘要，与动作总数无关
+        
         Args:
             simulation_id: 模拟ID
             start_round: 起始轮次
@@ -954,58 +1724,27 @@ class SimulationRunner:
         Returns:
             每轮的汇总信息
         """
-        actions = cls.get_actions(simulation_id, limit=10000)
-        
-        # 按轮次分组
-        rounds: Dict[int, Dict[str, Any]] = {}
+        state = cls._get_aggregated_state(simulation_id)
+        if state is None:
+            return []
         
-        for action in actions:
-            round_num = action.round_num
-            
-            if round_num < start_round:
+        summaries = []
+        for summary in list(state.rounds):
+            if summary.round_num < start_round:
                 continue
-            if end_round is not None and round_num > end_round:
+            if end_round is not None and summary.round_num > end_round:
+                break
+            # 只包含有动作的轮次
+            if summary.total_actions == 0:
                 continue
-            
-            if round_num not in rounds:
-                rounds[round_num] = {
-                    "round_num": round_num,
-                    "twitter_actions": 0,
-                    "reddit_actions": 0,
-                    "active_agents": set(),
-                    "action_types": {},
-                    "first_action_time": action.timestamp,
-                    "last_action_time": action.timestamp,
-                }
-            
-            r = rounds[round_num]
-            
-            if action.platform == "twitter":
-                r["twitter_actions"] += 1
-            else:
-                r["reddit_actions"] += 1
-            
-            r["active_agents"].add(action.agent_id)
-            r["action_types"][action.action_type] = r["action_types"].get(action.action_type, 0) + 1
-            r["last_action_time"] = action.timestamp
-        
-        # 转换为列表
-        result = []
-        for round_num in sorted(rounds.keys()):
-            r = rounds[round_num]
-            result.append({
-                "round_num": round_num,
-                "twitter_actions": r["twitter_actions"],
-                "reddit_actions": r["reddit_actions"],
-                "total_actions": r["twitter_actions"] + r["reddit_actions"],
-                "active_agents_count": len(r["active_agents"]),
-                "active_agents": list(r["active_agents"]),
-                "action_types": r["action_types"],
-                "first_action_time": r["first_action_time"],
-                "last_action_time": r["last_action_time"],
-            })
+            summaries.append(summary)
         
-        return result
+        # 从文件加载的每轮摘要只有活跃Agent数量，首次查询时从动作索引补全
+        unloaded = [summary for summary in summaries if summary.active_agents is None]
+        if unloaded:
+            state.load_round_agents(unloaded)
+        
+        return [summary.to_dict() for summary in summaries]
     
     @classmethod
     def get_agent_stats(cls, simulation_id: str) -> List[Dict[str, Any]]:
@@ -1015,40 +1754,362 @@ class SimulationRunner:
         Returns:
             Agent统计列表
         """
-        actions = cls.get_actions(simulation_id, limit=10000)
+        state = cls._get_aggregated_state(simulation_id)
+        if state is None:
+            return []
+        
+        # 按总动作数排序
+        agent_stats = list(state.agent_stats.values())
+        agent_stats.sort(key=lambda x: x.total_actions, reverse=True)
+        
+        return [stats.to_dict() for stats in agent_stats]
+    
+    @classmethod
+    def _iter_actions_forward(
+        cls,
+        log_path: str,
+        platform: str,
+        position: int
+    ) -> Iterator[tuple]:
+        """从指定字节位置顺序读取动作日志的完整行: (行结束位置, AgentAction)"""
+        log_path = resolve_log_path(log_path)
+        if log_path is None:
+            return
+        with open_log(log_path, position) as f:
+            while True:
+                raw_line = f.readline()
+                if not raw_line.endswith(b"\n"):
+                    break
+                position += len(raw_line)
+                try:
+                    data = json.loads(raw_line)
+                except (json.JSONDecodeError, UnicodeDecodeError):
+                    continue
+                if not isinstance(data, dict):
+                    continue
+                action = cls._parse_action_record(data, default_platform=platform)
+                if action is not None:
+                    yield position, action
+    
+    @classmethod
+    def _replay_actions(
+        cls,
+        simulation_id: str,
+        positions: Dict[str, int],
+        platforms: tuple = STREAM_PLATFORMS
+    ) -> Iterator[tuple]:
+        """
+        从游标位置补读各平台动作日志（按时间戳归并），读取过程中推进 positions
+        
+        Yields:
+            (平台, AgentAction)
+        """
+        sim_dir = os.path.join(cls.RUN_STATE_DIR, simulation_id)
+        streams = [
+            cls._iter_actions_forward(
+                os.path.join(sim_dir, platform, "actions.jsonl"), platform, positions.get(platform, 0)
+            )
+            for platform in platforms
+        ]
+        
+        for position, action in heapq.merge(*streams, key=lambda item: item[1].timestamp):
+            positions[action.platform] = position
+            yield action.platform, action
+    
+    @classmethod
+    def get_actions_since(
+        cls,
+        simulation_id: str,
+        cursor: Optional[str] = None,
+        since_seq: Optional[str] = None,
+        platform: Optional[str] = None,
+        agent_id: Optional[int] = None,
+        round_num: Optional[int] = None,
+        limit: int = 100
+    ) -> tuple:
+        """
+        增量获取动作：只返回游标或序号之后的新动作（按时间从旧到新）
         
-        agent_stats: Dict[int, Dict[str, Any]] = {}
+        游标直接记录各平台日志的字节位置；序号通过动作索引换算为字节位置，
+        之后都只从该位置顺序读取日志，开销只与新动作数量有关
         
-        for action in actions:
-            agent_id = action.agent_id
+        Args:
+            simulation_id: 模拟ID
+            cursor: 上一次返回的 next_cursor，如 "twitter:1024,reddit:2048"
+            since_seq: 已见过的最大序号，可以是一个整数（适用于所有平台）或 "twitter:12,reddit:30"
+            platform: 过滤平台（twitter/reddit）
+            agent_id: 过滤Agent
+            round_num: 过滤轮次
+            limit: 最多返回的动作数
             
-            if agent_id not in agent_stats:
-                agent_stats[agent_id] = {
-                    "agent_id": agent_id,
-                    "agent_name": action.agent_name,
-                    "total_actions": 0,
-                    "twitter_actions": 0,
-                    "reddit_actions": 0,
-                    "action_types": {},
-                    "first_action_time": action.timestamp,
-                    "last_action_time": action.timestamp,
-                }
+        Returns:
+            (动作列表, 下一次请求使用的游标)
             
-            stats = agent_stats[agent_id]
-            stats["total_actions"] += 1
+        Raises:
+            ValueError: 游标或序号格式错误
+        """
+        platforms = (platform,) if platform in STREAM_PLATFORMS else STREAM_PLATFORMS
+        sim_dir = os.path.join(cls.RUN_STATE_DIR, simulation_id)
+        
+        # 游标保留所有平台的位置，平台过滤只限制读取哪些日志，
+        # 返回的游标去掉过滤后继续使用时不会从头重读其他平台
+        if cursor:
+            positions = parse_action_cursor(cursor)
+        else:
+            seqs = parse_since_seq(str(since_seq if since_seq is not None else 0))
+            index = ActionIndex.get(sim_dir)
+            positions = {
+                p: index.position_after_seq(p, seqs.get(p, 0))
+                for p in STREAM_PLATFORMS
+            }
+        
+        actions = []
+        for _, action in cls._replay_actions(simulation_id, positions, platforms):
+            if agent_id is not None and action.agent_id != agent_id:
+                continue
+            if round_num is not None and action.round_num != round_num:
+                continue
+            actions.append(action)
+            if len(actions) >= limit:
+                break
+        
+        return actions, format_action_cursor(positions)
+    
+    @classmethod
+    def stream_actions(
+        cls,
+        simulation_id: str,
+        platform: Optional[str] = None,
+        agent_id: Optional[int] = None,
+        cursor: Optional[str] = None,
+        keepalive_interval: float = 15.0
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        实时动作流（供 SSE 接口使用）
+        
+        订阅监控线程发布的新动作；指定游标时先从日志补读游标之后的动作，再衔接实时推送。
+        模拟结束（或未在运行）时以 end 事件结束
+        
+        Args:
+            simulation_id: 模拟ID
+            platform: 过滤平台（twitter/reddit）
+            agent_id: 过滤Agent
+            cursor: 续传游标（上一次收到的事件 id）
+            keepalive_interval: 没有新动作时发送保活事件的间隔（秒）
             
-            if action.platform == "twitter":
-                stats["twitter_actions"] += 1
-            else:
-                stats["reddit_actions"] += 1
+        Returns:
+            事件迭代器: {"event": "cursor"/"action"/"keepalive"/"end", "id": 游标, "data": ...}
+            
+        Raises:
+            ValueError: 模拟不存在或游标格式错误
+        """
+        positions = parse_action_cursor(cursor) if cursor else None
+        
+        state = cls.get_run_state(simulation_id)
+        if state is None:
+            raise ValueError(f"模拟不存在: {simulation_id}")
+        
+        def matches(action: AgentAction) -> bool:
+            if platform and action.platform != platform:
+                return False
+            if agent_id is not None and action.agent_id != agent_id:
+                return False
+            return True
+        
+        def action_event(action: AgentAction) -> Dict[str, Any]:
+            return {"event": "action", "id": format_action_cursor(positions), "data": action.to_dict()}
+        
+        def replay() -> Iterator[Dict[str, Any]]:
+            for _, action in cls._replay_actions(simulation_id, positions):
+                if matches(action):
+                    yield action_event(action)
+        
+        def end_event() -> Dict[str, Any]:
+            current = cls._run_states.get(simulation_id, state)
+            return {"event": "end", "id": format_action_cursor(positions), "data": {
+                "simulation_id": simulation_id,
+                "runner_status": current.runner_status.value,
+            }}
+        
+        def events() -> Iterator[Dict[str, Any]]:
+            nonlocal positions
+            # 在监控线程两批读取之间订阅并取得当前位置：此前读取的动作已计入 log_positions，
+            # 此后读取的动作都会推送给本订阅（在生成器内订阅，保证一定会取消订阅）
+            with cls._get_log_read_lock(simulation_id):
+                subscription = ActionBroker.subscribe(simulation_id)
+                if positions is None:
+                    current = cls._run_states.get(simulation_id, state)
+                    start_positions = {p: current.log_positions.get(p, 0) for p in STREAM_PLATFORMS}
+            try:
+                running = SimulationMonitor.get().is_monitoring(simulation_id)
+                
+                if positions is None:
+                    # 没有游标：从监控线程当前已读取的位置开始
+                    positions = start_positions
+                    cursor_str = format_action_cursor(positions)
+                    yield {"event": "cursor", "id": cursor_str, "data": {"cursor": cursor_str}}
+                    if not running:
+                        yield end_event()
+                        return
+                else:
+                    yield from replay()
+                
+                if not running:
+                    subscription.closed = True
+                
+                while True:
+                    if subscription.overflowed:
+                        # 消费过慢丢失了消息，丢弃队列后从日志补读
+                        subscription.overflowed = False
+                        subscription.drain()
+                        yield from replay()
+                    
+                    if subscription.closed and subscription.queue.empty():
+                        # 补读结束前写入的最后一批动作
+                        yield from replay()
+                        yield end_event()
+                        return
+                    
+                    try:
+                        kind, action_platform, position, data = subscription.get(timeout=keepalive_interval)
+                    except queue.Empty:
+                        yield {"event": "keepalive", "id": None, "data": {}}
+                        continue
+                    
+                    if kind != "action":
+                        continue
+                    
+                    # 已经补读过的动作
+                    if position <= positions.get(action_platform, 0):
+                        continue
+                    positions[action_platform] = position
+                    
+                    action = AgentAction(**data)
+                    if matches(action):
+                        yield action_event(action)
+            finally:
+                ActionBroker.unsubscribe(subscription)
+        
+        return events()
+    
+    # 归档时压缩的日志文件（相对模拟目录）
+    ARCHIVE_LOG_FILES = [
+        os.path.join("twitter", "actions.jsonl"),
+        os.path.join("reddit", "actions.jsonl"),
+        "actions.jsonl",          # 旧的单一动作日志
+        "simulation.log",
+        "stdout.log",
+        "stderr.log",
+    ]
+    
+    # 归档时整理的数据库文件
+    ARCHIVE_DB_FILES = ["twitter_simulation.db", "reddit_simulation.db", INDEX_DB_FILE]
+    
+    @classmethod
+    def archive_simulation(cls, simulation_id: str) -> Dict[str, Any]:
+        """
+        归档已结束的模拟，节省磁盘空间
+        
+        - 动作日志和运行日志压缩为分帧的 gzip 文件（见 utils/log_archive），删除原文件
+        - 模拟数据库用 VACUUM INTO 整理后替换原文件（合并 WAL、回收空闲页）
+        - 删除检查点（归档后的日志无法回退，不能再从检查点恢复）
+        
+        归档后动作查询、时间线、实时动作流补读、帖子和采访历史等读取接口照常可用
+        
+        Args:
+            simulation_id: 模拟ID
             
-            stats["action_types"][action.action_type] = stats["action_types"].get(action.action_type, 0) + 1
-            stats["last_action_time"] = action.timestamp
+        Returns:
+            {"success", "archived_files", "bytes_before", "bytes_after", "errors"}
+            
+        Raises:
+            ValueError: 模拟不存在，或模拟/模拟环境仍在运行
+        """
+        sim_dir = os.path.join(cls.RUN_STATE_DIR, simulation_id)
+        if not os.path.isdir(sim_dir):
+            raise ValueError(f"模拟不存在: {simulation_id}")
         
-        # 按总动作数排序
-        result = sorted(agent_stats.values(), key=lambda x: x["total_actions"], reverse=True)
+        state = cls.get_run_state(simulation_id)
+        if simulation_id in cls._processes or (
+            state and state.runner_status in [RunnerStatus.STARTING, RunnerStatus.RUNNING, RunnerStatus.STOPPING]
+        ):
+            raise ValueError(f"模拟正在运行中，无法归档: {simulation_id}")
+        # 模拟环境仍在等待命令时会继续写入数据库
+        if cls.check_env_alive(simulation_id):
+            raise ValueError(f"模拟环境仍在运行，请先调用 /close-env 接口关闭: {simulation_id}")
+        
+        # 先让聚合结果和动作索引追上日志，归档后无需再读取
+        if state:
+            cls._get_aggregated_state(simulation_id)
+        cls._sync_action_index(ActionIndex.get(sim_dir))
+        ActionIndex.discard(sim_dir)
         
-        return result
+        archived_files = []
+        errors = []
+        bytes_before = 0
+        bytes_after = 0
+        
+        for filename in cls.ARCHIVE_LOG_FILES:
+            file_path = os.path.join(sim_dir, filename)
+            if not os.path.exists(file_path):
+                # 按轮次分段的动作日志逐个分段压缩
+                try:
+                    for segment_path, size, archived_size in compress_segments(file_path, include_open=True):
+                        bytes_before += size
+                        bytes_after += archived_size
+                        archived_files.append(os.path.relpath(segment_path, sim_dir))
+                except Exception as e:
+                    errors.append(f"压缩 {filename} 的分段失败: {str(e)}")
+                continue
+            try:
+                size = os.path.getsize(file_path)
+                archived = compress_log(file_path)
+                os.remove(file_path)
+                bytes_before += size
+                bytes_after += os.path.getsize(archived)
+                archived_files.append(filename)
+            except Exception as e:
+                errors.append(f"压缩 {filename} 失败: {str(e)}")
+        
+        for filename in cls.ARCHIVE_DB_FILES:
+            db_path = os.path.join(sim_dir, filename)
+            if not os.path.exists(db_path):
+                continue
+            try:
+                size = sum(
+                    os.path.getsize(db_path + suffix)
+                    for suffix in ("", "-wal", "-shm")
+                    if os.path.exists(db_path + suffix)
+                )
+                compact_sqlite(db_path)
+                bytes_before += size
+                bytes_after += os.path.getsize(db_path)
+                archived_files.append(filename)
+            except Exception as e:
+                errors.append(f"整理 {filename} 失败: {str(e)}")
+        
+        # 日志归档后无法回退到检查点，检查点的数据库备份不再需要
+        checkpoint_dir = os.path.join(sim_dir, CHECKPOINT_DIR)
+        if os.path.isdir(checkpoint_dir):
+            import shutil
+            shutil.rmtree(checkpoint_dir, ignore_errors=True)
+        
+        if state:
+            state.archived_at = datetime.now().isoformat()
+            cls._save_run_state(state)
+        
+        logger.info(
+            f"模拟归档完成: {simulation_id}, 文件: {archived_files}, "
+            f"{bytes_before} -> {bytes_after} bytes"
+        )
+        
+        return {
+            "success": len(errors) == 0,
+            "archived_files": archived_files,
+            "bytes_before": bytes_before,
+            "bytes_after": bytes_after,
+            "errors": errors if errors else None
+        }
     
     @classmethod
     def cleanup_simulation_logs(cls, simulation_id: str) -> Dict[str, Any]:
@@ -1056,7 +2117,8 @@ class SimulationRunner:
         清理模拟的运行日志（用于强制重新开始模拟）
         
         会删除以下文件：
-        - run_state.json
+        - run_state.json / run_aggregates.json
+        - action_index.db（动作索引）
         - twitter/actions.jsonl
         - reddit/actions.jsonl
         - simulation.log
@@ -1064,6 +2126,8 @@ class SimulationRunner:
         - twitter_simulation.db（模拟数据库）
         - reddit_simulation.db（模拟数据库）
         - env_status.json（环境状态）
+        - 以上日志归档后的 .gz 文件和帧索引
+        - checkpoints/（检查点）
         
         注意：不会删除配置文件（simulation_config.json）和 profile 文件
         
@@ -1083,9 +2147,15 @@ class SimulationRunner:
         cleaned_files = []
         errors = []
         
+        # 动作索引的连接需要先关闭
+        ActionIndex.discard(sim_dir)
+        cls._telemetry.pop(simulation_id, None)
+        
         # 要删除的文件列表（包括数据库文件）
         files_to_delete = [
             "run_state.json",
+            AGGREGATES_FILE,          # 每轮摘要和Agent统计
+            INDEX_DB_FILE,            # 动作索引
             "simulation.log",
             "stdout.log",
             "stderr.log",
@@ -1097,6 +2167,11 @@ class SimulationRunner:
         # 要删除的目录列表（包含动作日志）
         dirs_to_clean = ["twitter", "reddit"]
         
+        # 归档后的日志
+        for filename in cls.ARCHIVE_LOG_FILES:
+            for file_path in log_files(os.path.join(sim_dir, filename))[1:]:
+                files_to_delete.append(os.path.relpath(file_path, sim_dir))
+        
         # 删除文件
         for filename in files_to_delete:
             file_path = os.path.join(sim_dir, filename)
@@ -1119,6 +2194,15 @@ class SimulationRunner:
                     except Exception as e:
                         errors.append(f"删除 {dir_name}/actions.jsonl 失败: {str(e)}")
         
+        # 删除检查点（重新开始后旧的检查点不再有效）
+        checkpoint_dir = os.path.join(sim_dir, CHECKPOINT_DIR)
+        if os.path.isdir(checkpoint_dir):
+            try:
+                shutil.rmtree(checkpoint_dir)
+                cleaned_files.append(CHECKPOINT_DIR)
+            except Exception as e:
+                errors.append(f"删除 {CHECKPOINT_DIR} 失败: {str(e)}")
+        
         # 清理内存中的运行状态
         if simulation_id in cls._run_states:
             del cls._run_states[simulation_id]
@@ -1381,6 +2465,9 @@ class SimulationRunner:
         """
         采访单个Agent
 
+        命令由全局 IPCDispatcher 收发，调用线程阻塞到采访完成或超时（不轮询文件）；
+        不希望占用调用线程时使用 submit_interview_task(interview_agent_async(...))
+
         Args:
             simulation_id: 模拟ID
             agent_id: Agent ID
@@ -1398,18 +2485,32 @@ class SimulationRunner:
             ValueError: 模拟不存在或环境未运行
             TimeoutError: 等待响应超时
         """
+        return IPCDispatcher.get().call(cls.interview_agent_async(
+            simulation_id, agent_id, prompt, platform, timeout
+        ))
+
+    @classmethod
+    async def interview_agent_async(
+        cls,
+        simulation_id: str,
+        agent_id: int,
+        prompt: str,
+        platform: str = None,
+        timeout: float = 60.0
+    ) -> Dict[str, Any]:
+        """采访单个Agent（协程版本，参数和返回值同 interview_agent）"""
         sim_dir = os.path.join(cls.RUN_STATE_DIR, simulation_id)
         if not os.path.exists(sim_dir):
             raise ValueError(f"模拟不存在: {simulation_id}")
 
-        ipc_client = SimulationIPCClient(sim_dir)
+        ipc_client = AsyncSimulationIPCClient(sim_dir)
 
         if not ipc_client.check_env_alive():
             raise ValueError(f"模拟环境未运行或已关闭，无法执行Interview: {simulation_id}")
 
         logger.info(f"发送Interview命令: simulation_id={simulation_id}, agent_id={agent_id}, platform={platform}")
 
-        response = ipc_client.send_interview(
+        response = await ipc_client.send_interview(
             agent_id=agent_id,
             prompt=prompt,
             platform=platform,
@@ -1460,18 +2561,35 @@ class SimulationRunner:
             ValueError: 模拟不存在或环境未运行
             TimeoutError: 等待响应超时
         """
+        return IPCDispatcher.get().call(cls.interview_agents_batch_async(
+            simulation_id, interviews, platform, timeout
+        ))
+
+    @classmethod
+    async def interview_agents_batch_async(
+        cls,
+        simulation_id: str,
+        interviews: List[Dict[str, Any]],
+        platform: str = None,
+        timeout: float = 120.0
+    ) -> Dict[str, Any]:
+        """
+        批量采访多个Agent（协程版本，参数和返回值同 interview_agents_batch）
+
+        可以在任意事件循环中并发 await 多个采访，等待期间不占用线程
+        """
         sim_dir = os.path.join(cls.RUN_STATE_DIR, simulation_id)
         if not os.path.exists(sim_dir):
             raise ValueError(f"模拟不存在: {simulation_id}")
 
-        ipc_client = SimulationIPCClient(sim_dir)
+        ipc_client = AsyncSimulationIPCClient(sim_dir)
 
         if not ipc_client.check_env_alive():
             raise ValueError(f"模拟环境未运行或已关闭，无法执行Interview: {simulation_id}")
 
         logger.info(f"发送批量Interview命令: simulation_id={simulation_id}, count={len(interviews)}, platform={platform}")
 
-        response = ipc_client.send_batch_interview(
+        response = await ipc_client.send_batch_interview(
             interviews=interviews,
             platform=platform,
             timeout=timeout
@@ -1492,6 +2610,68 @@ class SimulationRunner:
                 "timestamp": response.timestamp
             }
     
+    @classmethod
+    def interview_agents_batch_stream(
+        cls,
+        simulation_id: str,
+        interviews: List[Dict[str, Any]],
+        platform: str = None,
+        timeout: float = 120.0
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        批量采访多个Agent，逐个返回已完成的回答
+
+        参数校验在调用时立即执行；返回的迭代器依次产出事件:
+            {"event": "partial", "data": {"key": "twitter_0", "agent_id": 0, "platform": "twitter", "response": "...", "timestamp": "..."}}
+            {"event": "done", "data": <与 interview_agents_batch 相同的结果字典>}
+
+        模拟进程不支持流式传输（文件协议回退）时只产出 done 事件
+
+        Args:
+            simulation_id: 模拟ID
+            interviews: 采访列表，格式同 interview_agents_batch
+            platform: 默认平台，同 interview_agents_batch
+            timeout: 超时时间（秒）
+
+        Raises:
+            ValueError: 模拟不存在或环境未运行
+        """
+        sim_dir = os.path.join(cls.RUN_STATE_DIR, simulation_id)
+        if not os.path.exists(sim_dir):
+            raise ValueError(f"模拟不存在: {simulation_id}")
+
+        ipc_client = SimulationIPCClient(sim_dir)
+
+        if not ipc_client.check_env_alive():
+            raise ValueError(f"模拟环境未运行或已关闭，无法执行Interview: {simulation_id}")
+
+        logger.info(f"发送流式批量Interview命令: simulation_id={simulation_id}, count={len(interviews)}, platform={platform}")
+
+        def _events() -> Iterator[Dict[str, Any]]:
+            for response in ipc_client.send_batch_interview_stream(
+                interviews=interviews,
+                platform=platform,
+                timeout=timeout
+            ):
+                if response.status.value == "processing":
+                    yield {"event": "partial", "data": response.result}
+                elif response.status.value == "completed":
+                    yield {"event": "done", "data": {
+                        "success": True,
+                        "interviews_count": len(interviews),
+                        "result": response.result,
+                        "timestamp": response.timestamp
+                    }}
+                else:
+                    yield {"event": "done", "data": {
+                        "success": False,
+                        "interviews_count": len(interviews),
+                        "error": response.error,
+                        "timestamp": response.timestamp
+                    }}
+
+        return _events()
+    
     @classmethod
     def interview_all_agents(
         cls,
@@ -1517,6 +2697,41 @@ class SimulationRunner:
         Returns:
             全局采访结果字典
         """
+        interviews = cls._build_all_agents_interviews(simulation_id, prompt, platform)
+
+        return cls.interview_agents_batch(
+            simulation_id=simulation_id,
+            interviews=interviews,
+            platform=platform,
+            timeout=timeout
+        )
+
+    @classmethod
+    async def interview_all_agents_async(
+        cls,
+        simulation_id: str,
+        prompt: str,
+        platform: str = None,
+        timeout: float = 180.0
+    ) -> Dict[str, Any]:
+        """采访所有Agent（协程版本，参数和返回值同 interview_all_agents）"""
+        interviews = cls._build_all_agents_interviews(simulation_id, prompt, platform)
+
+        return await cls.interview_agents_batch_async(
+            simulation_id=simulation_id,
+            interviews=interviews,
+            platform=platform,
+            timeout=timeout
+        )
+
+    @classmethod
+    def _build_all_agents_interviews(
+        cls,
+        simulation_id: str,
+        prompt: str,
+        platform: str = None
+    ) -> List[Dict[str, Any]]:
+        """从模拟配置构建全局采访的采访列表"""
         sim_dir = os.path.join(cls.RUN_STATE_DIR, simulation_id)
         if not os.path.exists(sim_dir):
             raise ValueError(f"模拟不存在: {simulation_id}")
@@ -1544,13 +2759,44 @@ class SimulationRunner:
                 })
 
         logger.info(f"发送全局Interview命令: simulation_id={simulation_id}, agent_count={len(interviews)}, platform={platform}")
+        return interviews
 
-        return cls.interview_agents_batch(
-            simulation_id=simulation_id,
-            interviews=interviews,
-            platform=platform,
-            timeout=timeout
+    @classmethod
+    def submit_interview_task(cls, simulation_id: str, coro) -> str:
+        """
+        在后台执行采访，立即返回任务ID
+
+        coro 为 interview_agent_async / interview_agents_batch_async / interview_all_agents_async
+        返回的协程，在 IPCDispatcher 的事件循环中执行；调用线程（Flask 请求线程）不等待采访完成，
+        等待中的采访也不占用线程。结果（与同步方法的返回值相同）写入 TaskManager，通过任务ID查询
+
+        Args:
+            simulation_id: 模拟ID
+            coro: 采访协程
+
+        Returns:
+            任务ID
+        """
+        task_manager = TaskManager()
+        task_id = task_manager.create_task(
+            task_type="simulation_interview",
+            metadata={"simulation_id": simulation_id}
         )
+        task_manager.update_task(task_id, status=TaskStatus.PROCESSING, message="等待Agent回答...")
+
+        def _on_done(future):
+            try:
+                result = future.result()
+            except TimeoutError as e:
+                task_manager.fail_task(task_id, f"等待Interview响应超时: {str(e)}")
+            except Exception as e:
+                logger.error(f"后台Interview失败: task_id={task_id}, error={e}")
+                task_manager.fail_task(task_id, str(e))
+            else:
+                task_manager.complete_task(task_id, result)
+
+        IPCDispatcher.get().spawn(coro).add_done_callback(_on_done)
+        return task_id
     
     @classmethod
     def close_simulation_env(
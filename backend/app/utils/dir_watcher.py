@@ -0,0 +1,231 @@
+"""
+目录变化监听
+用于IPC文件协议：有新文件写入时立即唤醒，替代固定间隔的 os.path.exists / os.listdir 轮询
+
+Linux 上使用 inotify，不可用时回退到自适应轮询：等待间隔从最小值开始按指数增长到上限
+（ctypes 绑定、事件解析和退避逻辑在 scripts/inotify_watch.py 中，与模拟进程共用）
+"""
+
+import os
+import time
+import select
+import selectors
+from typing import Dict, Hashable, Iterable, Optional, Set, Tuple
+
+from .logger import get_logger
+from .script_modules import ensure_scripts_path
+
+ensure_scripts_path()
+from inotify_watch import (
+    BaseDirectoryWatcher,
+    IN_CLOSE_WRITE,
+    IN_IGNORED,
+    IN_MODIFY,
+    IN_MOVED_TO,
+    MAX_POLL_INTERVAL,
+    MIN_POLL_INTERVAL,
+    inotify_add_watch,
+    inotify_init,
+    inotify_rm_watch,
+    read_events,
+)
+
+logger = get_logger('mirofish.dir_watcher')
+
+
+class DirectoryWatcher(BaseDirectoryWatcher):
+    """
+    目录变化监听器（同步阻塞版本，供 Flask 请求线程使用）
+
+    用法:
+        watcher = DirectoryWatcher(directory)
+        watcher.start()
+        try:
+            while ...:
+                if <检查目标文件>:
+                    break
+                watcher.wait(remaining)
+        finally:
+            watcher.stop()
+    """
+
+    def __init__(
+        self,
+        directory: str,
+        min_interval: float = MIN_POLL_INTERVAL,
+        max_interval: float = MAX_POLL_INTERVAL
+    ):
+        super().__init__(directory, min_interval, max_interval)
+
+    def start(self) -> bool:
+        """
+        开始监听
+
+        Returns:
+            True 表示使用 inotify，False 表示回退到自适应轮询
+        """
+        error = self._open()
+        if error:
+            logger.debug(error)
+            return False
+        return True
+
+    def stop(self):
+        """停止监听"""
+        self._close()
+
+    def wait(self, timeout: float) -> bool:
+        """
+        阻塞等待目录变化
+
+        inotify 模式下最多等待 timeout 秒；回退模式下按自适应间隔休眠（不超过 timeout）
+
+        Returns:
+            True 表示目录可能有变化（回退模式下每次都返回 True）
+        """
+        if timeout <= 0:
+            return self.has_changes()
+
+        if self._fd is None:
+            time.sleep(min(self.next_interval(), timeout))
+            return True
+
+        if self._pending:
+            return True
+
+        try:
+            readable, _, _ = select.select([self._fd], [], [], timeout)
+        except InterruptedError:
+            return False
+        if readable and self._drain():
+            self._pending = True
+        return self._pending
+
+
+class MultiDirectoryWatcher:
+    """
+    多目录变化监听器（一个 inotify 描述符监听任意多个目录，供单个后台线程使用）
+
+    每个被监听的目录对应一个调用方给定的 key，wait() 返回有变化的 key 集合；
+    可以只关心目录中的部分文件名。inotify 不可用时 wait() 按超时休眠并返回 None（表示全部可能有变化）
+
+    wake() 可以从其他线程调用，使正在等待的 wait() 立即返回
+    """
+
+    def __init__(self, mask: int = IN_MODIFY | IN_CLOSE_WRITE | IN_MOVED_TO):
+        self.mask = mask
+        self._fd: Optional[int] = None
+        self._wake_r, self._wake_w = os.pipe()
+        os.set_blocking(self._wake_r, False)
+        os.set_blocking(self._wake_w, False)
+        self._selector = selectors.DefaultSelector()
+        self._selector.register(self._wake_r, selectors.EVENT_READ)
+        # wd -> (key, 关心的文件名集合，None 表示全部)
+        self._watches: Dict[int, Tuple[Hashable, Optional[Set[str]]]] = {}
+
+    @property
+    def is_inotify(self) -> bool:
+        return self._fd is not None
+
+    def start(self) -> bool:
+        """
+        开始监听
+
+        Returns:
+            True 表示使用 inotify，False 表示回退到按超时轮询
+        """
+        fd, error = inotify_init()
+        if fd is None:
+            logger.debug(f"inotify 不可用，使用轮询: {error}")
+            return False
+
+        self._fd = fd
+        self._selector.register(fd, selectors.EVENT_READ)
+        return True
+
+    def add(self, directory: str, key: Hashable, filenames: Optional[Iterable[str]] = None) -> bool:
+        """
+        监听目录
+
+        Returns:
+            是否已开始监听（目录不存在或 inotify 不可用时返回 False，可稍后重试）
+        """
+        if self._fd is None:
+            return False
+
+        wd, error = inotify_add_watch(self._fd, directory, self.mask)
+        if error:
+            return False
+
+        self._watches[wd] = (key, set(filenames) if filenames is not None else None)
+        return True
+
+    def remove(self, key: Hashable):
+        """取消 key 对应的全部目录监听"""
+        for wd, (watch_key, _) in list(self._watches.items()):
+            if watch_key == key:
+                self._watches.pop(wd, None)
+                if self._fd is not None:
+                    inotify_rm_watch(self._fd, wd)
+
+    def wake(self):
+        """唤醒正在 wait() 的线程"""
+        try:
+            os.write(self._wake_w, b"\0")
+        except (BlockingIOError, OSError):
+            pass
+
+    def wait(self, timeout: Optional[float]) -> Optional[Set[Hashable]]:
+        """
+        等待目录变化（timeout 为 None 时一直等到有变化或被唤醒）
+
+        Returns:
+            有变化的 key 集合；回退模式下返回 None
+        """
+        changed: Set[Hashable] = set()
+        for selector_key, _ in self._selector.select(timeout):
+            if selector_key.fd == self._wake_r:
+                self._drain_wake()
+            else:
+                changed |= self._read_events()
+
+        if self._fd is None:
+            return None
+        return changed
+
+    def close(self):
+        """停止监听并释放描述符"""
+        self._selector.close()
+        for fd in (self._fd, self._wake_r, self._wake_w):
+            if fd is not None:
+                try:
+                    os.close(fd)
+                except OSError:
+                    pass
+        self._fd = None
+        self._watches.clear()
+
+    def _drain_wake(self):
+        while True:
+            try:
+                if not os.read(self._wake_r, 4096):
+                    break
+            except (BlockingIOError, InterruptedError, OSError):
+                break
+
+    def _read_events(self) -> Set[Hashable]:
+        changed: Set[Hashable] = set()
+        for wd, mask, name in read_events(self._fd):
+            watch = self._watches.get(wd)
+            if watch is None:
+                continue
+            if mask & IN_IGNORED:
+                # 目录被删除，监听已由内核移除
+                self._watches.pop(wd, None)
+                changed.add(watch[0])
+                continue
+
+            key, filenames = watch
+            if filenames is None or name in filenames:
+                changed.add(key)
+        return changed
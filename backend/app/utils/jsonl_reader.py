@@ -0,0 +1,71 @@
+"""
+JSONL 倒序读取
+从文件末尾按块向前读取，按从新到旧的顺序逐行返回，
+读取最新 N 条记录时只需要读取文件末尾的几个块，与文件大小无关
+
+已归档的日志（见 log_archive）按帧从后向前解压，同样只需解压末尾的几帧；
+按轮次分段的日志可以只读取指定轮次范围内的分段
+"""
+
+import json
+from typing import Any, Dict, Iterator, Optional, Tuple
+
+from .log_archive import iter_blocks_reverse
+
+# 每次向前读取的块大小（字节）
+DEFAULT_BLOCK_SIZE = 64 * 1024
+
+
+def iter_lines_reverse(
+    file_path: str,
+    block_size: int = DEFAULT_BLOCK_SIZE,
+    rounds: Optional[Tuple[int, int]] = None
+) -> Iterator[bytes]:
+    """
+    从文件末尾开始倒序逐行读取（不含换行符）
+
+    末尾没有换行符的行视为仍在写入，跳过；空行跳过
+
+    Args:
+        rounds: 轮次范围 (start, end)，分段日志只读取相交的分段，返回的行仍需调用方按轮次过滤
+    """
+    remainder = b""
+    # 是否已经越过末尾未写完的行
+    complete = False
+
+    for block in iter_blocks_reverse(file_path, block_size, rounds):
+        data = block + remainder
+        if not complete:
+            index = data.rfind(b"\n")
+            if index < 0:
+                # 整块都属于未写完的行
+                remainder = b""
+                continue
+            # 去掉换行符本身，避免 split 产生末尾的空段
+            data = data[:index]
+            complete = True
+
+        lines = data.split(b"\n")
+        # 第一段可能是被块边界截断的行，留到读取前一个块时拼接
+        remainder = lines[0]
+        for line in reversed(lines[1:]):
+            if line.strip():
+                yield line
+
+    if complete and remainder.strip():
+        yield remainder
+
+
+def iter_jsonl_reverse(
+    file_path: str,
+    block_size: int = DEFAULT_BLOCK_SIZE,
+    rounds: Optional[Tuple[int, int]] = None
+) -> Iterator[Dict[str, Any]]:
+    """倒序读取 JSONL 文件中的 JSON 对象（无法解析的行跳过）"""
+    for line in iter_lines_reverse(file_path, block_size, rounds):
+        try:
+            data = json.loads(line)
+        except (json.JSONDecodeError, UnicodeDecodeError):
+            continue
+        if isinstance(data, dict):
+            yield data
@@ -0,0 +1,552 @@
+"""
+模拟日志归档
+已完成模拟的日志（actions.jsonl、simulation.log 等）压缩为分帧的 gzip 文件：
+每帧是一个独立的 gzip member，并且在行边界结束；帧索引记录每帧的压缩偏移和原始偏移，
+按原始字节位置读取时只需解压所在的帧及之后的数据，倒序读取时逐帧从后向前解压
+
+归档文件仍是标准的 gzip 文件（多 member），可以直接用 zcat 查看；
+帧索引丢失或是外部工具生成的 gzip 文件时，扫描一遍文件重建帧信息
+
+读取方通过 resolve_log_path / open_log / log_size 访问日志，不需要区分是否已归档、
+是否按轮次分段（见 segmented_log），分段日志的每个分段也可以单独归档
+"""
+
+import io
+import os
+import bisect
+import gzip
+import json
+import zlib
+import tempfile
+import threading
+from contextlib import contextmanager, ExitStack
+from typing import BinaryIO, Dict, Iterator, List, Optional, Tuple
+
+from .segmented_log import LogSegment, manifest_path, is_segmented, load_segments
+
+# 归档文件后缀（actions.jsonl -> actions.jsonl.gz）
+ARCHIVE_SUFFIX = ".gz"
+
+# 帧索引文件后缀（actions.jsonl.gz -> actions.jsonl.gz.frames.json）
+FRAME_INDEX_SUFFIX = ".frames.json"
+
+# 每帧压缩前的大小（字节），越小随机读取越快，压缩率越低
+DEFAULT_FRAME_SIZE = 1024 * 1024
+
+COMPRESS_LEVEL = 6
+
+# 扫描 gzip 文件时每次读取的大小
+_SCAN_CHUNK_SIZE = 256 * 1024
+
+# 帧: (压缩数据偏移, 压缩数据长度, 原始数据偏移, 原始数据长度)
+Frame = Tuple[int, int, int, int]
+
+# 帧索引缓存 {归档路径: ((mtime_ns, size), 帧列表)}
+_frames_cache: Dict[str, Tuple[Tuple[int, int], List[Frame]]] = {}
+_frames_lock = threading.Lock()
+
+
+def archive_path(path: str) -> str:
+    return path + ARCHIVE_SUFFIX
+
+
+def frame_index_path(path: str) -> str:
+    """归档文件对应的帧索引文件"""
+    return path + FRAME_INDEX_SUFFIX
+
+
+def is_archive(path: str) -> bool:
+    return path.endswith(ARCHIVE_SUFFIX)
+
+
+def is_plain_log(path: str) -> bool:
+    """是否是只追加写入的普通日志文件（归档文件和分段清单会被整体替换，inode 会变化）"""
+    return not is_archive(path) and not is_segmented(path)
+
+
+def log_files(path: str) -> List[str]:
+    """日志可能存在的全部文件（原文件、归档文件、帧索引、分段清单及各分段），用于清理"""
+    archived = archive_path(path)
+    files = [path, archived, frame_index_path(archived)]
+
+    manifest = manifest_path(path)
+    if os.path.exists(manifest):
+        for segment in load_segments(manifest):
+            segment_archive = archive_path(segment.path)
+            files.extend([segment.path, segment_archive, frame_index_path(segment_archive)])
+        files.append(manifest)
+    return files
+
+
+def _resolve_file(path: str) -> Optional[str]:
+    """单个文件：未归档的原文件优先，其次是归档文件"""
+    if os.path.exists(path):
+        return path
+    archived = archive_path(path)
+    if os.path.exists(archived):
+        return archived
+    return None
+
+
+def resolve_log_path(path: str) -> Optional[str]:
+    """
+    日志的实际文件：未归档的原文件优先，其次是归档文件，最后是分段清单
+
+    Returns:
+        文件路径，都不存在时返回 None
+    """
+    resolved = _resolve_file(path)
+    if resolved is not None:
+        return resolved
+    manifest = manifest_path(path)
+    if os.path.exists(manifest):
+        return manifest
+    return None
+
+
+def log_exists(path: str) -> bool:
+    return resolve_log_path(path) is not None
+
+
+# ----------------------------------------------------------------------
+# 压缩
+# ----------------------------------------------------------------------
+
+def compress_log(path: str, frame_size: int = DEFAULT_FRAME_SIZE) -> str:
+    """
+    把日志压缩为分帧的归档文件（原文件保留，由调用方确认后删除）
+
+    先写临时文件再重命名，帧索引先于归档文件就位，读取方不会看到不完整的归档
+
+    Returns:
+        归档文件路径
+    """
+    archived = archive_path(path)
+    directory = os.path.dirname(archived) or "."
+    frames: List[Frame] = []
+
+    fd, tmp_archive = tempfile.mkstemp(dir=directory, prefix=".archive.", suffix=".tmp")
+    tmp_index = None
+    try:
+        with os.fdopen(fd, 'wb') as out, open(path, 'rb') as src:
+            raw_offset = 0
+            pending: List[bytes] = []
+            pending_size = 0
+
+            def flush_frame():
+                nonlocal raw_offset, pending, pending_size
+                data = b"".join(pending)
+                compressed = gzip.compress(data, compresslevel=COMPRESS_LEVEL, mtime=0)
+                frames.append((out.tell(), len(compressed), raw_offset, len(data)))
+                out.write(compressed)
+                raw_offset += len(data)
+                pending = []
+                pending_size = 0
+
+            for line in src:
+                pending.append(line)
+                pending_size += len(line)
+                if pending_size >= frame_size:
+                    flush_frame()
+            if pending:
+                flush_frame()
+
+        fd, tmp_index = tempfile.mkstemp(dir=directory, prefix=".archive.", suffix=".tmp")
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            json.dump({"version": 1, "frames": frames}, f, separators=(',', ':'))
+
+        os.replace(tmp_index, frame_index_path(archived))
+        tmp_index = None
+        os.replace(tmp_archive, archived)
+    except BaseException:
+        for tmp_path in (tmp_archive, tmp_index):
+            if tmp_path:
+                try:
+                    os.unlink(tmp_path)
+                except OSError:
+                    pass
+        raise
+
+    return archived
+
+
+# ----------------------------------------------------------------------
+# 帧索引
+# ----------------------------------------------------------------------
+
+def _scan_frames(path: str) -> List[Frame]:
+    """顺序解压整个文件，记录每个 gzip member 的位置（没有帧索引时使用）"""
+    frames: List[Frame] = []
+    with open(path, 'rb') as f:
+        decompressor = zlib.decompressobj(zlib.MAX_WBITS | 16)
+        member_start = 0
+        consumed = 0
+        raw_offset = 0
+        raw_length = 0
+
+        while True:
+            chunk = f.read(_SCAN_CHUNK_SIZE)
+            if not chunk:
+                break
+            while chunk:
+                raw_length += len(decompressor.decompress(chunk))
+                if not decompressor.eof:
+                    consumed += len(chunk)
+                    break
+
+                consumed += len(chunk) - len(decompressor.unused_data)
+                frames.append((member_start, consumed - member_start, raw_offset, raw_length))
+                raw_offset += raw_length
+                raw_length = 0
+                # gzip 文件末尾可能有补零
+                rest = decompressor.unused_data
+                chunk = rest.lstrip(b"\x00")
+                consumed += len(rest) - len(chunk)
+                member_start = consumed
+                decompressor = zlib.decompressobj(zlib.MAX_WBITS | 16)
+    return frames
+
+
+def _load_frame_index(path: str) -> Optional[List[Frame]]:
+    try:
+        with open(frame_index_path(path), 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        return [tuple(frame) for frame in data["frames"]]
+    except (OSError, ValueError, KeyError, TypeError):
+        return None
+
+
+def get_frames(path: str) -> List[Frame]:
+    """归档文件的帧列表（按文件修改时间缓存）"""
+    stat = os.stat(path)
+    key = (stat.st_mtime_ns, stat.st_size)
+    with _frames_lock:
+        cached = _frames_cache.get(path)
+        if cached is not None and cached[0] == key:
+            return cached[1]
+
+    frames = _load_frame_index(path)
+    if frames is None:
+        frames = _scan_frames(path)
+
+    with _frames_lock:
+        _frames_cache[path] = (key, frames)
+    return frames
+
+
+def compress_segments(path: str, include_open: bool = False) -> List[Tuple[str, int, int]]:
+    """
+    单独压缩分段日志中尚未压缩的分段（原分段文件压缩后删除）
+
+    Args:
+        path: 日志路径（actions.jsonl）或分段清单路径
+        include_open: 是否同时压缩仍在写入的最后一个分段（仅在模拟结束后使用）
+
+    Returns:
+        [(分段文件路径, 压缩前大小, 压缩后大小)]
+    """
+    manifest = path if is_segmented(path) else manifest_path(path)
+    if not os.path.exists(manifest):
+        return []
+
+    compressed = []
+    for segment in load_segments(manifest):
+        if not (segment.closed or include_open) or not os.path.exists(segment.path):
+            continue
+        size = os.path.getsize(segment.path)
+        archived = compress_log(segment.path)
+        os.remove(segment.path)
+        compressed.append((segment.path, size, os.path.getsize(archived)))
+    return compressed
+
+
+# ----------------------------------------------------------------------
+# 截断
+# ----------------------------------------------------------------------
+
+def check_truncate(path: str, size: int):
+    """
+    检查日志能否截断到原始大小 size（不修改任何文件）
+
+    Raises:
+        ValueError: 需要截断的部分已归档压缩，或日志比 size 短
+    """
+    if is_archive(path):
+        raise ValueError(f"日志已归档压缩，无法截断: {path}")
+    if not is_segmented(path):
+        if os.path.getsize(path) < size:
+            raise ValueError(f"日志比要保留的大小短: {path}")
+        return
+
+    with open(path, 'r', encoding='utf-8') as f:
+        manifest = json.load(f)
+    directory = os.path.dirname(path)
+    offset = 0
+    for entry in manifest.get("segments", []):
+        if offset >= size:
+            break
+        segment_path = os.path.join(directory, entry["file"])
+        segment_size = os.path.getsize(segment_path) if os.path.exists(segment_path) else int(entry.get("size", 0))
+        if offset + segment_size > size and not os.path.exists(segment_path):
+            raise ValueError(f"分段已归档压缩，无法截断: {segment_path}")
+        offset += segment_size
+    if offset < size:
+        raise ValueError(f"日志比要保留的大小短: {path}")
+
+
+def truncate_log(path: str, size: int):
+    """
+    把日志截断到原始大小 size（从检查点恢复模拟时丢弃检查点之后写入的内容）
+
+    分段日志截断 size 所在的分段，之后的分段连同清单中的记录一起删除；
+    修改任何文件之前先用 check_truncate 检查，无法截断时日志保持不变
+
+    Args:
+        path: resolve_log_path 返回的日志文件或分段清单
+        size: 保留的原始大小（分段日志为各分段拼接后的偏移）
+
+    Raises:
+        ValueError: 需要截断的部分已归档压缩，或日志比 size 短
+    """
+    check_truncate(path, size)
+    if not is_segmented(path):
+        with open(path, 'r+b') as f:
+            f.truncate(size)
+        return
+
+    with open(path, 'r', encoding='utf-8') as f:
+        manifest = json.load(f)
+    directory = os.path.dirname(path)
+    kept = []
+    offset = 0
+    for entry in manifest.get("segments", []):
+        segment_path = os.path.join(directory, entry["file"])
+        if offset >= size:
+            # 之后的分段全部删除
+            for file_path in (segment_path, archive_path(segment_path), frame_index_path(archive_path(segment_path))):
+                if os.path.exists(file_path):
+                    os.remove(file_path)
+            continue
+        segment_size = os.path.getsize(segment_path) if os.path.exists(segment_path) else int(entry.get("size", 0))
+        if offset + segment_size > size:
+            with open(segment_path, 'r+b') as f:
+                f.truncate(size - offset)
+            segment_size = size - offset
+        entry["size"] = segment_size
+        kept.append(entry)
+        offset += segment_size
+    if kept:
+        kept[-1]["closed"] = False
+    manifest["segments"] = kept
+
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=".segments.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            json.dump(manifest, f, ensure_ascii=False)
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.unlink(tmp_path)
+        except OSError:
+            pass
+        raise
+
+
+# ----------------------------------------------------------------------
+# 读取
+# ----------------------------------------------------------------------
+
+def _segment_pieces(path: str) -> List[Tuple[str, int, int, LogSegment]]:
+    """
+    分段日志的各分段: [(实际文件, 拼接后的起始偏移, 大小, 分段)]
+
+    已关闭的分段使用清单中记录的大小，仍在写入的分段使用文件当前的大小
+    """
+    pieces = []
+    offset = 0
+    for segment in load_segments(path):
+        resolved = _resolve_file(segment.path)
+        if resolved is None:
+            continue
+        size = segment.size if segment.closed else log_size(resolved)
+        pieces.append((resolved, offset, size, segment))
+        offset += size
+    return pieces
+
+
+def log_size(path: str) -> int:
+    """日志的原始大小（归档文件为解压后的大小，分段日志为各分段之和）"""
+    if is_segmented(path):
+        return sum(size for _, _, size, _ in _segment_pieces(path))
+    if not is_archive(path):
+        return os.path.getsize(path)
+    frames = get_frames(path)
+    if not frames:
+        return 0
+    _, _, raw_offset, raw_length = frames[-1]
+    return raw_offset + raw_length
+
+
+@contextmanager
+def open_log(path: str, position: int = 0) -> Iterator[BinaryIO]:
+    """
+    以二进制方式打开日志，并定位到原始字节位置 position
+
+    归档文件从 position 所在的帧开始解压，分段日志从 position 所在的分段开始依次读取，
+    返回的对象支持 read / readline
+    """
+    if is_segmented(path):
+        with _SegmentedReader(_segment_pieces(path), position) as f:
+            yield f
+        return
+
+    if not is_archive(path):
+        with open(path, 'rb') as f:
+            f.seek(position)
+            yield f
+        return
+
+    frames = get_frames(path)
+    index = bisect.bisect_right([frame[2] for frame in frames], position) - 1
+    if index < 0 or position >= log_size(path):
+        yield io.BytesIO(b"")
+        return
+
+    compressed_offset, _, raw_offset, _ = frames[index]
+    with open(path, 'rb') as raw:
+        raw.seek(compressed_offset)
+        # GzipFile 从当前位置开始读取，会连续解压后面的各个 member
+        with gzip.GzipFile(fileobj=raw, mode='rb') as f:
+            f.seek(position - raw_offset)
+            yield f
+
+
+class _SegmentedReader:
+    """把多个分段按顺序拼接读取"""
+
+    def __init__(self, pieces: List[Tuple[str, int, int, LogSegment]], position: int):
+        # 跳过 position 之前的分段（最后一个分段可能仍在写入，始终保留）
+        last = len(pieces) - 1
+        self._pending = [
+            (resolved, max(position - offset, 0))
+            for i, (resolved, offset, size, _) in enumerate(pieces)
+            if offset + size > position or i == last
+        ]
+        self._stack = ExitStack()
+        self._current: Optional[BinaryIO] = None
+
+    def __enter__(self) -> '_SegmentedReader':
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        self._stack.close()
+
+    def _next(self) -> bool:
+        if not self._pending:
+            return False
+        resolved, position = self._pending.pop(0)
+        self._current = self._stack.enter_context(open_log(resolved, position))
+        return True
+
+    def readline(self) -> bytes:
+        line = b""
+        while not line.endswith(b"\n"):
+            if self._current is None and not self._next():
+                break
+            chunk = self._current.readline()
+            if not chunk:
+                self._current = None
+                continue
+            line += chunk
+        return line
+
+    def read(self, size: int = -1) -> bytes:
+        chunks = []
+        while size != 0:
+            if self._current is None and not self._next():
+                break
+            chunk = self._current.read(size)
+            if not chunk:
+                self._current = None
+                continue
+            chunks.append(chunk)
+            if size > 0:
+                size -= len(chunk)
+        return b"".join(chunks)
+
+
+def iter_blocks_reverse(
+    path: str,
+    block_size: int,
+    rounds: Optional[Tuple[int, int]] = None
+) -> Iterator[bytes]:
+    """
+    从文件末尾向前逐块读取原始数据（归档文件按帧解压，分段日志从最后一个分段开始）
+
+    Args:
+        rounds: 轮次范围 (start, end)，分段日志只读取与之相交的分段（其他日志忽略该参数）
+    """
+    if is_segmented(path):
+        for resolved, _, _, segment in reversed(_segment_pieces(path)):
+            if rounds is None or segment.overlaps(rounds):
+                yield from iter_blocks_reverse(resolved, block_size)
+        return
+
+    if is_archive(path):
+        frames = get_frames(path)
+        with open(path, 'rb') as f:
+            for compressed_offset, compressed_length, _, _ in reversed(frames):
+                f.seek(compressed_offset)
+                yield zlib.decompress(f.read(compressed_length), zlib.MAX_WBITS | 16)
+        return
+
+    with open(path, 'rb') as f:
+        f.seek(0, os.SEEK_END)
+        position = f.tell()
+        while position > 0:
+            read_size = min(block_size, position)
+            position -= read_size
+            f.seek(position)
+            yield f.read(read_size)
+
+
+# ----------------------------------------------------------------------
+# SQLite
+# ----------------------------------------------------------------------
+
+def compact_sqlite(db_path: str):
+    """
+    用 VACUUM INTO 生成紧凑的数据库副本并替换原文件
+
+    WAL 中的内容会合并进副本，空闲页被回收；调用方需确保没有其他进程正在写入该数据库
+    """
+    import sqlite3
+
+    directory = os.path.dirname(db_path) or "."
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=".vacuum.", suffix=".db")
+    os.close(fd)
+    # VACUUM INTO 要求目标文件不存在
+    os.unlink(tmp_path)
+    try:
+        conn = sqlite3.connect(db_path)
+        try:
+            conn.execute("VACUUM INTO ?", (tmp_path,))
+        finally:
+            conn.close()
+
+        # 旧的 WAL 不能留给新文件，否则打开时会被错误地重放
+        for suffix in ("-wal", "-shm", "-journal"):
+            try:
+                os.unlink(db_path + suffix)
+            except FileNotFoundError:
+                pass
+        os.replace(tmp_path, db_path)
+    except BaseException:
+        try:
+            os.unlink(tmp_path)
+        except OSError:
+            pass
+        raise
@@ -0,0 +1,19 @@
+"""
+模拟脚本模块
+scripts/ 下的模块由模拟子进程独立运行（不导入 Flask 应用），
+其中与后端共用的部分（socket 路径、inotify 封装、检查点格式等）只依赖标准库，
+后端把 scripts/ 加入模块搜索路径后直接导入，两端共用同一份实现
+"""
+
+import os
+import sys
+
+
+# 模拟脚本目录
+SCRIPTS_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '../../scripts'))
+
+
+def ensure_scripts_path():
+    """把 scripts/ 加入模块搜索路径（追加在末尾，不遮蔽已安装的同名包）"""
+    if SCRIPTS_DIR not in sys.path:
+        sys.path.append(SCRIPTS_DIR)
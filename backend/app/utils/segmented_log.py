@@ -0,0 +1,70 @@
+"""
+分段动作日志
+模拟脚本可以按轮次把动作日志切分为多个分段文件（见 scripts/action_logger.py），
+由分段清单记录每个分段的轮次范围和大小：
+
+    twitter/
+    ├── actions.segments.json   # 分段清单
+    ├── actions-0000.jsonl      # 第 0 ~ N-1 轮
+    └── actions-0001.jsonl.gz   # 已单独压缩的分段
+
+各分段按顺序拼接即为完整的日志，读取位置使用拼接后的字节偏移，与单一日志一致；
+按轮次读取时只需读取轮次范围相交的分段
+"""
+
+import os
+import json
+from dataclasses import dataclass
+from typing import List, Optional, Tuple
+
+# 分段清单后缀（actions.jsonl -> actions.segments.json）
+SEGMENT_MANIFEST_SUFFIX = ".segments.json"
+
+
+@dataclass
+class LogSegment:
+    """一个日志分段"""
+    path: str                   # 分段文件路径（未压缩时的文件名）
+    start_round: int
+    end_round: Optional[int]    # 仍在写入的最后一个分段为 None（轮次范围未定）
+    size: int                   # 已关闭分段的大小（字节）
+    closed: bool
+
+    def overlaps(self, rounds: Tuple[int, int]) -> bool:
+        """是否与轮次范围 [start, end] 相交"""
+        start, end = rounds
+        return self.start_round <= end and (self.end_round is None or self.end_round >= start)
+
+
+def manifest_path(log_path: str) -> str:
+    """日志对应的分段清单路径"""
+    return os.path.splitext(log_path)[0] + SEGMENT_MANIFEST_SUFFIX
+
+
+def is_segmented(path: str) -> bool:
+    return path.endswith(SEGMENT_MANIFEST_SUFFIX)
+
+
+def load_segments(path: str) -> List[LogSegment]:
+    """读取分段清单（清单无法解析时返回空列表）"""
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            entries = json.load(f).get("segments", [])
+    except (OSError, ValueError, AttributeError):
+        return []
+
+    directory = os.path.dirname(path)
+    segments = []
+    for i, entry in enumerate(entries):
+        try:
+            closed = bool(entry.get("closed")) or i < len(entries) - 1
+            segments.append(LogSegment(
+                path=os.path.join(directory, entry["file"]),
+                start_round=int(entry.get("start_round", 0)),
+                end_round=int(entry["end_round"]) if closed and entry.get("end_round") is not None else None,
+                size=int(entry.get("size", 0)),
+                closed=closed,
+            ))
+        except (KeyError, TypeError, ValueError):
+            return []
+    return segments
@@ -0,0 +1,9 @@
+"""
+离线性能基准
+使用确定性的 LLM 桩服务（OpenAI 兼容）和内存版 Zep，在不消耗真实 LLM / Zep 调用的情况下
+端到端运行 准备模拟 -> 运行模拟 -> 生成报告，输出各阶段耗时
+
+用法（在 backend 目录下）:
+    python -m benchmarks.run_benchmark --entities 50 --rounds 10
+    python -m benchmarks.stub_llm --port 8900 --latency-ms 200   # 单独启动 LLM 桩服务
+"""
@@ -0,0 +1,270 @@
+"""
+内存版 Zep 图谱（替代 zep_cloud.client.Zep）
+
+只实现 MiroFish 用到的接口：
+- graph.node.get_by_graph_id / get / get_entity_edges
+- graph.edge.get_by_graph_id
+- graph.search（关键词匹配打分）
+- graph.add（只记录，不抽取实体）
+
+install_memory_zep() 会替换各服务模块中导入的 Zep 符号，所有客户端共享同一个 MemoryGraphStore
+"""
+
+import functools
+import importlib
+import random
+import threading
+import time
+import uuid
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional
+
+
+# 导入了 Zep 的服务模块
+ZEP_MODULES = [
+    "app.services.zep_entity_reader",
+    "app.services.zep_tools",
+    "app.services.oasis_profile_generator",
+    "app.services.zep_graph_memory_updater",
+    "app.services.graph_builder",
+]
+
+ENTITY_TYPES = ["Student", "MediaOutlet", "University", "Person", "GovernmentAgency", "Alumni"]
+RELATION_TYPES = ["SUPPORTS", "OPPOSES", "REPORTS_ON", "MEMBER_OF", "COMMENTS_ON"]
+
+
+@dataclass
+class MemoryNode:
+    uuid_: str
+    name: str
+    labels: List[str]
+    summary: str = ""
+    attributes: Dict[str, Any] = field(default_factory=dict)
+    created_at: Optional[str] = None
+
+    @property
+    def uuid(self) -> str:
+        return self.uuid_
+
+
+@dataclass
+class MemoryEdge:
+    uuid_: str
+    name: str
+    fact: str
+    source_node_uuid: str
+    target_node_uuid: str
+    attributes: Dict[str, Any] = field(default_factory=dict)
+    created_at: Optional[str] = None
+    valid_at: Optional[str] = None
+    invalid_at: Optional[str] = None
+    expired_at: Optional[str] = None
+
+    @property
+    def uuid(self) -> str:
+        return self.uuid_
+
+
+@dataclass
+class MemorySearchResults:
+    edges: List[MemoryEdge] = field(default_factory=list)
+    nodes: List[MemoryNode] = field(default_factory=list)
+
+
+class MemoryGraphStore:
+    """内存图谱存储（线程安全），记录调用次数并可注入固定延迟"""
+
+    def __init__(self, latency_ms: float = 0.0):
+        self.latency_ms = latency_ms
+        self._lock = threading.Lock()
+        self._nodes: Dict[str, List[MemoryNode]] = {}
+        self._edges: Dict[str, List[MemoryEdge]] = {}
+        self._node_index: Dict[str, MemoryNode] = {}
+        self._node_edges: Dict[str, List[MemoryEdge]] = {}
+        self._episodes: Dict[str, List[Dict[str, Any]]] = {}
+        self.calls = 0
+        self.wait_seconds = 0.0
+
+    def add_graph(self, graph_id: str, nodes: List[MemoryNode], edges: List[MemoryEdge]):
+        with self._lock:
+            self._nodes[graph_id] = list(nodes)
+            self._edges[graph_id] = list(edges)
+            for node in nodes:
+                self._node_index[node.uuid_] = node
+            for edge in edges:
+                self._node_edges.setdefault(edge.source_node_uuid, []).append(edge)
+                if edge.target_node_uuid != edge.source_node_uuid:
+                    self._node_edges.setdefault(edge.target_node_uuid, []).append(edge)
+
+    def record_call(self):
+        delay = self.latency_ms / 1000
+        if delay > 0:
+            time.sleep(delay)
+        with self._lock:
+            self.calls += 1
+            self.wait_seconds += delay
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            return {"requests": self.calls, "wait_seconds": round(self.wait_seconds, 3)}
+
+    def nodes(self, graph_id: str) -> List[MemoryNode]:
+        return list(self._nodes.get(graph_id, []))
+
+    def edges(self, graph_id: str) -> List[MemoryEdge]:
+        return list(self._edges.get(graph_id, []))
+
+    def node(self, node_uuid: str) -> MemoryNode:
+        node = self._node_index.get(node_uuid)
+        if node is None:
+            raise KeyError(f"node not found: {node_uuid}")
+        return node
+
+    def node_edges(self, node_uuid: str) -> List[MemoryEdge]:
+        return list(self._node_edges.get(node_uuid, []))
+
+    def add_episode(self, graph_id: str, episode: Dict[str, Any]):
+        with self._lock:
+            self._episodes.setdefault(graph_id, []).append(episode)
+
+    def episodes(self, graph_id: str) -> List[Dict[str, Any]]:
+        return list(self._episodes.get(graph_id, []))
+
+
+def _match_score(query: str, text: str) -> int:
+    """关键词匹配得分：完整包含查询 > 包含查询中的词 > 包含查询中的字"""
+    if not text:
+        return 0
+    text = text.lower()
+    query = query.lower()
+    if query in text:
+        return 100
+    score = sum(10 for word in query.split() if len(word) > 1 and word in text)
+    return score + sum(1 for char in set(query) if not char.isspace() and char in text)
+
+
+class _NodeClient:
+    def __init__(self, store: MemoryGraphStore):
+        self._store = store
+
+    def get_by_graph_id(self, graph_id: str, **kwargs) -> List[MemoryNode]:
+        self._store.record_call()
+        return self._store.nodes(graph_id)
+
+    def get(self, uuid_: str, **kwargs) -> MemoryNode:
+        self._store.record_call()
+        return self._store.node(uuid_)
+
+    def get_entity_edges(self, node_uuid: str, **kwargs) -> List[MemoryEdge]:
+        self._store.record_call()
+        return self._store.node_edges(node_uuid)
+
+
+class _EdgeClient:
+    def __init__(self, store: MemoryGraphStore):
+        self._store = store
+
+    def get_by_graph_id(self, graph_id: str, **kwargs) -> List[MemoryEdge]:
+        self._store.record_call()
+        return self._store.edges(graph_id)
+
+
+class _GraphClient:
+    def __init__(self, store: MemoryGraphStore):
+        self._store = store
+        self.node = _NodeClient(store)
+        self.edge = _EdgeClient(store)
+
+    def search(self, graph_id: str, query: str, limit: int = 10, scope: str = "edges", **kwargs) -> MemorySearchResults:
+        self._store.record_call()
+        if scope == "nodes":
+            items = self._store.nodes(graph_id)
+            scored = [(_match_score(query, f"{n.name} {n.summary}"), n) for n in items]
+        else:
+            items = self._store.edges(graph_id)
+            scored = [(_match_score(query, f"{e.name} {e.fact}"), e) for e in items]
+        ranked = [item for score, item in sorted(scored, key=lambda pair: -pair[0]) if score > 0][:limit]
+        if scope == "nodes":
+            return MemorySearchResults(nodes=ranked)
+        return MemorySearchResults(edges=ranked)
+
+    def add(self, graph_id: str, type: str = "text", data: str = "", **kwargs) -> Dict[str, Any]:
+        self._store.record_call()
+        episode = {"uuid": uuid.uuid4().hex, "type": type, "data": data}
+        self._store.add_episode(graph_id, episode)
+        return episode
+
+
+class MemoryZep:
+    """与 zep_cloud.client.Zep 构造方式一致的内存客户端"""
+
+    def __init__(self, store: MemoryGraphStore, api_key: Optional[str] = None, **kwargs):
+        self.graph = _GraphClient(store)
+
+
+def build_synthetic_graph(
+    store: MemoryGraphStore,
+    graph_id: str,
+    entity_count: int,
+    edges_per_entity: int = 3,
+    seed: int = 0
+):
+    """
+    生成合成图谱：entity_count 个实体（轮流使用 ENTITY_TYPES），另有约 10% 只带 Entity 标签的节点（会被过滤），
+    每个实体随机连接 edges_per_entity 条边，约 20% 的边已过期
+    """
+    rng = random.Random(seed)
+    base_time = datetime(2025, 1, 1)
+
+    nodes = []
+    for index in range(entity_count):
+        entity_type = ENTITY_TYPES[index % len(ENTITY_TYPES)]
+        nodes.append(MemoryNode(
+            uuid_=f"node-{index:06d}",
+            name=f"{entity_type}_{index:04d}",
+            labels=["Entity", entity_type],
+            summary=f"{entity_type}_{index:04d} 是参与本次事件讨论的{entity_type}，关注事件进展并在社交媒体上表达观点。",
+            attributes={"index": index},
+            created_at=(base_time + timedelta(minutes=index)).isoformat(),
+        ))
+    for index in range(max(1, entity_count // 10)):
+        nodes.append(MemoryNode(
+            uuid_=f"node-plain-{index:06d}",
+            name=f"Concept_{index:04d}",
+            labels=["Entity"],
+            summary="未分类节点",
+        ))
+
+    edges = []
+    if entity_count > 1:
+        for index in range(entity_count):
+            for k in range(edges_per_entity):
+                target = rng.randrange(entity_count - 1)
+                if target >= index:
+                    target += 1
+                relation = RELATION_TYPES[rng.randrange(len(RELATION_TYPES))]
+                created = base_time + timedelta(hours=index + k)
+                expired = rng.random() < 0.2
+                edges.append(MemoryEdge(
+                    uuid_=f"edge-{index:06d}-{k}",
+                    name=relation,
+                    fact=f"{nodes[index].name} {relation} {nodes[target].name}：围绕事件的第{k + 1}条相关事实",
+                    source_node_uuid=nodes[index].uuid_,
+                    target_node_uuid=nodes[target].uuid_,
+                    created_at=created.isoformat(),
+                    valid_at=created.isoformat(),
+                    invalid_at=(created + timedelta(days=1)).isoformat() if expired else None,
+                    expired_at=(created + timedelta(days=1)).isoformat() if expired else None,
+                ))
+
+    store.add_graph(graph_id, nodes, edges)
+
+
+def install_memory_zep(store: MemoryGraphStore):
+    """将各服务模块中的 Zep 替换为共享 store 的内存客户端（需在创建服务对象之前调用）"""
+    factory = functools.partial(MemoryZep, store)
+    for module_name in ZEP_MODULES:
+        module = importlib.import_module(module_name)
+        if hasattr(module, "Zep"):
+            module.Zep = factory
@@ -0,0 +1,336 @@
+"""
+离线端到端基准
+启动 LLM 桩服务和内存版 Zep，依次运行：
+1. prepare   - SimulationManager.prepare_simulation（读取实体、生成人设、生成模拟配置）
+2. run       - scripts/run_parallel_simulation.py（子进程，--no-wait）
+3. report    - ReportAgent.generate_report
+
+每个阶段输出耗时、子步骤耗时（来自进度回调）以及该阶段的 LLM / Zep 请求数和注入的等待时间。
+固定桩服务延迟后，阶段耗时的变化即 MiroFish 自身代码的变化
+
+用法（在 backend 目录下）:
+    python -m benchmarks.run_benchmark --entities 50 --rounds 10
+    python -m benchmarks.run_benchmark --entities 200 --rounds 24 --latency-ms 300 --output bench.json
+
+注意：
+- 运行模拟阶段需要完整安装 OASIS 依赖；离线运行时需预先缓存 tiktoken 编码文件（TIKTOKEN_CACHE_DIR）
+  和 OASIS 推荐系统使用的 HuggingFace 模型，否则会在联网重试上耗时
+- 所有数据写入临时工作目录，不影响 uploads/
+"""
+
+import argparse
+import json
+import os
+import re
+import shutil
+import sqlite3
+import subprocess
+import sys
+import tempfile
+import time
+import traceback
+from contextlib import contextmanager
+from typing import Any, Dict, List, Optional
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if BACKEND_DIR not in sys.path:
+    sys.path.insert(0, BACKEND_DIR)
+
+from benchmarks.memory_zep import MemoryGraphStore, build_synthetic_graph, install_memory_zep
+from benchmarks.stub_llm import StubLLMConfig, StubLLMServer
+
+
+RUN_SCRIPT = os.path.join(BACKEND_DIR, "scripts", "run_parallel_simulation.py")
+GRAPH_ID = "benchmark_graph"
+SIMULATION_REQUIREMENT = "基准测试：模拟高校发布新政策后各类群体在社交媒体上的讨论与舆论演变"
+DOCUMENT_TEXT = "某高校发布了新的校园管理政策，引发学生、校友、媒体和相关机构的广泛讨论。" * 20
+
+# run_parallel_simulation.py 输出的模拟循环总耗时
+LOOP_SECONDS_PATTERN = re.compile(r"模拟循环完成! 总耗时: ([\d.]+)秒")
+
+
+def _diff_stats(before: Dict[str, Any], after: Dict[str, Any]) -> Dict[str, Any]:
+    """两次统计快照之差"""
+    result = {}
+    for key, value in after.items():
+        if isinstance(value, dict):
+            prev = before.get(key, {})
+            result[key] = {k: v - prev.get(k, 0) for k, v in value.items() if v - prev.get(k, 0)}
+        elif isinstance(value, float):
+            result[key] = round(value - before.get(key, 0.0), 3)
+        else:
+            result[key] = value - before.get(key, 0)
+    return result
+
+
+class StageRecorder:
+    """记录各阶段耗时及对应的桩服务统计"""
+
+    def __init__(self, llm_server: StubLLMServer, zep_store: MemoryGraphStore):
+        self.llm_server = llm_server
+        self.zep_store = zep_store
+        self.stages: List[Dict[str, Any]] = []
+        self._steps: Dict[str, float] = {}
+
+    def mark(self, step: str, *args, **kwargs):
+        """进度回调：记录每个子步骤首次出现的时间"""
+        self._steps.setdefault(step, time.perf_counter())
+
+    @contextmanager
+    def stage(self, name: str):
+        result = {"stage": name, "status": "ok"}
+        self._steps = {}
+        llm_before = self.llm_server.stats.snapshot()
+        zep_before = self.zep_store.snapshot()
+        start = time.perf_counter()
+        try:
+            yield result
+        except Exception as e:
+            result["status"] = "failed"
+            result["error"] = str(e)
+            traceback.print_exc()
+        end = time.perf_counter()
+
+        result["seconds"] = round(end - start, 3)
+        marks = sorted(self._steps.items(), key=lambda item: item[1])
+        if marks:
+            result["steps"] = {
+                step: round((marks[index + 1][1] if index + 1 < len(marks) else end) - at, 3)
+                for index, (step, at) in enumerate(marks)
+            }
+        result["llm"] = _diff_stats(llm_before, self.llm_server.stats.snapshot())
+        result["zep"] = _diff_stats(zep_before, self.zep_store.snapshot())
+        self.stages.append(result)
+
+
+def _count_actions(db_path: str) -> Optional[int]:
+    if not os.path.exists(db_path):
+        return None
+    try:
+        conn = sqlite3.connect(db_path)
+        try:
+            return conn.execute("SELECT COUNT(*) FROM trace").fetchone()[0]
+        finally:
+            conn.close()
+    except sqlite3.Error:
+        return None
+
+
+def run_prepare(args, recorder: StageRecorder) -> Optional[str]:
+    """准备阶段，返回 simulation_id（失败时返回 None）"""
+    from app.services.simulation_manager import SimulationManager, SimulationStatus
+
+    simulation_id = None
+    with recorder.stage("prepare") as result:
+        manager = SimulationManager()
+        state = manager.create_simulation(
+            project_id="benchmark",
+            graph_id=GRAPH_ID,
+            enable_twitter=args.platform != "reddit",
+            enable_reddit=args.platform != "twitter",
+        )
+        state = manager.prepare_simulation(
+            simulation_id=state.simulation_id,
+            simulation_requirement=SIMULATION_REQUIREMENT,
+            document_text=DOCUMENT_TEXT,
+            use_llm_for_profiles=True,
+            progress_callback=recorder.mark,
+            parallel_profile_count=args.profile_parallel,
+        )
+        result["simulation_id"] = state.simulation_id
+        result["entities"] = state.entities_count
+        result["profiles"] = state.profiles_count
+        if state.status != SimulationStatus.READY:
+            raise RuntimeError(f"准备失败: {state.error}")
+        simulation_id = state.simulation_id
+    return simulation_id
+
+
+def run_simulation(args, recorder: StageRecorder, simulation_id: str, env: Dict[str, str]):
+    """运行模拟阶段（子进程）"""
+    from app.services.simulation_manager import SimulationManager
+
+    sim_dir = os.path.join(SimulationManager.SIMULATION_DATA_DIR, simulation_id)
+    cmd = [
+        sys.executable, RUN_SCRIPT,
+        "--config", os.path.join(sim_dir, "simulation_config.json"),
+        "--max-rounds", str(args.rounds),
+        "--seed", str(args.seed),
+        "--no-wait",
+    ]
+    if args.platform == "twitter":
+        cmd.append("--twitter-only")
+    elif args.platform == "reddit":
+        cmd.append("--reddit-only")
+
+    with recorder.stage("run") as result:
+        started = time.perf_counter()
+        log_path = os.path.join(sim_dir, "simulation.log")
+        result["log"] = log_path
+        with open(log_path, 'w', encoding='utf-8') as log_file:
+            completed = subprocess.run(
+                cmd,
+                cwd=sim_dir,
+                stdout=log_file,
+                stderr=subprocess.STDOUT,
+                env=env,
+                timeout=args.run_timeout,
+            )
+        result["returncode"] = completed.returncode
+        result["rounds"] = args.rounds
+
+        # 拆分为 环境启动/关闭 与 模拟循环 两部分
+        with open(log_path, 'r', encoding='utf-8', errors='replace') as f:
+            match = LOOP_SECONDS_PATTERN.search(f.read())
+        if match:
+            loop_seconds = float(match.group(1))
+            result["steps"] = {
+                "rounds": loop_seconds,
+                "startup_shutdown": round(time.perf_counter() - started - loop_seconds, 3),
+            }
+        for platform in ("twitter", "reddit"):
+            actions = _count_actions(os.path.join(sim_dir, f"{platform}_simulation.db"))
+            if actions is not None:
+                result[f"{platform}_actions"] = actions
+        if completed.returncode != 0:
+            raise RuntimeError(f"模拟进程退出码 {completed.returncode}，详见 {log_path}")
+
+
+def run_report(args, recorder: StageRecorder, simulation_id: str):
+    """生成报告阶段"""
+    from app.services.report_agent import ReportAgent, ReportStatus
+
+    with recorder.stage("report") as result:
+        agent = ReportAgent(
+            graph_id=GRAPH_ID,
+            simulation_id=simulation_id,
+            simulation_requirement=SIMULATION_REQUIREMENT,
+        )
+        report = agent.generate_report(progress_callback=recorder.mark)
+        result["report_id"] = report.report_id
+        result["sections"] = len(report.outline.sections) if report.outline else 0
+        if report.status != ReportStatus.COMPLETED:
+            raise RuntimeError(f"报告生成失败: {report.error}")
+
+
+def print_summary(summary: Dict[str, Any]):
+    print("\n" + "=" * 72)
+    print(f"{'阶段':<10}{'状态':<8}{'耗时(s)':>10}{'LLM请求':>10}{'LLM等待(s)':>12}{'Zep请求':>10}")
+    print("-" * 72)
+    for stage in summary["stages"]:
+        print(
+            f"{stage['stage']:<10}{stage['status']:<8}{stage['seconds']:>10.3f}"
+            f"{stage['llm'].get('requests', 0):>10}{stage['llm'].get('wait_seconds', 0.0):>12.3f}"
+            f"{stage['zep'].get('requests', 0):>10}"
+        )
+        for step, seconds in stage.get("steps", {}).items():
+            print(f"  - {step:<30}{seconds:>10.3f}")
+    print("=" * 72)
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description='MiroFish 离线端到端基准（LLM 桩服务 + 内存 Zep）')
+    parser.add_argument('--entities', type=int, default=30, help='合成图谱的实体数（即 Agent 数）')
+    parser.add_argument('--rounds', type=int, default=10, help='模拟轮数')
+    parser.add_argument('--platform', choices=['parallel', 'twitter', 'reddit'], default='parallel')
+    parser.add_argument('--profile-parallel', type=int, default=3, help='并行生成人设的数量')
+    parser.add_argument('--seed', type=int, default=42, help='合成图谱和 Agent 激活的随机种子')
+    parser.add_argument('--latency-ms', type=float, default=0.0, help='LLM 桩服务每次请求的固定延迟（毫秒）')
+    parser.add_argument('--jitter-ms', type=float, default=0.0, help='LLM 桩服务的延迟抖动上限（毫秒）')
+    parser.add_argument('--ms-per-token', type=float, default=0.0, help='LLM 桩服务每个输出 token 的延迟（毫秒）')
+    parser.add_argument('--completion-tokens', type=int, default=64, help='LLM 桩服务每次回复的输出 token 数')
+    parser.add_argument('--zep-latency-ms', type=float, default=0.0, help='内存 Zep 每次调用的固定延迟（毫秒）')
+    parser.add_argument('--model', type=str, default='gpt-4o-mini', help='传给各客户端的模型名称')
+    parser.add_argument('--skip-run', action='store_true', help='跳过运行模拟阶段')
+    parser.add_argument('--skip-report', action='store_true', help='跳过生成报告阶段')
+    parser.add_argument('--run-timeout', type=float, default=3600, help='运行模拟阶段的超时时间（秒）')
+    parser.add_argument('--workdir', type=str, default=None, help='工作目录（默认使用临时目录，结束后删除）')
+    parser.add_argument('--output', type=str, default=None, help='将结果写入 JSON 文件')
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+
+    workdir = args.workdir or tempfile.mkdtemp(prefix="mirofish_bench_")
+    os.makedirs(workdir, exist_ok=True)
+
+    llm_server = StubLLMServer(StubLLMConfig(
+        latency_ms=args.latency_ms,
+        jitter_ms=args.jitter_ms,
+        ms_per_token=args.ms_per_token,
+        completion_tokens=args.completion_tokens,
+    ))
+    base_url = llm_server.start()
+
+    # 必须在导入 app 之前设置（Config 在导入时读取环境变量，.env 不会覆盖已有的值）
+    os.environ.update({
+        "LLM_API_KEY": "stub",
+        "LLM_BASE_URL": base_url,
+        "LLM_MODEL_NAME": args.model,
+        "LLM_BOOST_API_KEY": "",
+        "LLM_BOOST_BASE_URL": "",
+        "LLM_BOOST_MODEL_NAME": "",
+        "ZEP_API_KEY": "memory",
+        "PYTHONUTF8": "1",
+        "PYTHONIOENCODING": "utf-8",
+    })
+    # OASIS 推荐系统使用的 HuggingFace 模型只从本地缓存加载，避免联网重试计入运行耗时
+    os.environ.setdefault("HF_HUB_OFFLINE", "1")
+
+    from app.config import Config
+    from app.services.simulation_manager import SimulationManager
+    from app.services.report_agent import ReportManager
+
+    # 所有数据写入工作目录
+    Config.UPLOAD_FOLDER = os.path.join(workdir, "uploads")
+    Config.OASIS_SIMULATION_DATA_DIR = os.path.join(Config.UPLOAD_FOLDER, "simulations")
+    SimulationManager.SIMULATION_DATA_DIR = Config.OASIS_SIMULATION_DATA_DIR
+    ReportManager.REPORTS_DIR = os.path.join(Config.UPLOAD_FOLDER, "reports")
+
+    zep_store = MemoryGraphStore(latency_ms=args.zep_latency_ms)
+    build_synthetic_graph(zep_store, GRAPH_ID, args.entities, seed=args.seed)
+    install_memory_zep(zep_store)
+
+    recorder = StageRecorder(llm_server, zep_store)
+    started = time.perf_counter()
+    try:
+        simulation_id = run_prepare(args, recorder)
+        if simulation_id and not args.skip_run:
+            run_simulation(args, recorder, simulation_id, os.environ.copy())
+        if simulation_id and not args.skip_report:
+            run_report(args, recorder, simulation_id)
+    finally:
+        llm_server.stop()
+
+    summary = {
+        "parameters": {
+            key: getattr(args, key)
+            for key in (
+                "entities", "rounds", "platform", "profile_parallel", "seed", "latency_ms",
+                "jitter_ms", "ms_per_token", "completion_tokens", "zep_latency_ms", "model",
+            )
+        },
+        "total_seconds": round(time.perf_counter() - started, 3),
+        "stages": recorder.stages,
+        "llm": llm_server.stats.snapshot(),
+        "zep": zep_store.snapshot(),
+    }
+
+    print_summary(summary)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(summary, f, ensure_ascii=False, indent=2)
+        print(f"结果已写入: {args.output}")
+
+    if args.workdir:
+        print(f"工作目录: {workdir}")
+    else:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    if any(stage["status"] != "ok" for stage in recorder.stages):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,404 @@
+"""
+确定性 LLM 桩服务（OpenAI 兼容的 /v1/chat/completions）
+
+按请求内容生成固定的回复，覆盖 MiroFish 用到的几种调用方式：
+- JSON 模式（response_format=json_object）：按提示词识别调用方（人设、时间/事件/Agent配置、报告大纲、子问题等），返回对应结构
+- 函数调用（tools）：OASIS Agent 的动作选择，按参数 schema 生成参数；收到工具结果后返回普通文本结束
+- Report Agent 的 ReACT 文本协议：先输出 <tool_call>，达到最少工具调用次数后输出 Final Answer
+- 其他：普通文本
+
+延迟 = latency_ms + 抖动（由请求内容哈希决定，可复现）+ ms_per_token * completion_tokens，
+用于模拟服务商延迟；latency_ms=0 时测得的耗时即 MiroFish 自身的开销
+"""
+
+import argparse
+import json
+import re
+import threading
+import time
+import zlib
+from collections import Counter
+from dataclasses import dataclass
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, Optional, Tuple
+
+
+# Report Agent 每个章节要求的最少工具调用次数（与 ReportAgent._generate_section_react 一致）
+REACT_TOOL_CALLS = 2
+# ReACT 模式依次使用的检索工具（不使用需要运行中模拟环境的 interview_agents）
+REACT_TOOLS = ["insight_forge", "panorama_search", "quick_search"]
+
+ENTITY_TYPES_PATTERN = re.compile(r"^- ([^:\n]+):", re.MULTILINE)
+AGENT_ID_PATTERN = re.compile(r'"agent_id":\s*(\d+)')
+MAX_AGENTS_PATTERN = re.compile(r"取值范围: 1-(\d+)")
+
+FILLER_WORDS = [
+    "模拟", "舆论", "话题", "观点", "讨论", "回应", "关注", "事件", "平台", "用户",
+    "趋势", "影响", "发布", "评论", "转发", "立场", "信息", "传播", "热度", "分析",
+]
+
+
+@dataclass
+class StubLLMConfig:
+    """桩服务配置"""
+    latency_ms: float = 0.0
+    jitter_ms: float = 0.0
+    ms_per_token: float = 0.0
+    completion_tokens: int = 64
+
+
+class StubStats:
+    """请求统计（线程安全）"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.requests = 0
+        self.kinds: Counter = Counter()
+        self.prompt_tokens = 0
+        self.completion_tokens = 0
+        self.wait_seconds = 0.0
+
+    def record(self, kind: str, prompt_tokens: int, completion_tokens: int, wait_seconds: float):
+        with self._lock:
+            self.requests += 1
+            self.kinds[kind] += 1
+            self.prompt_tokens += prompt_tokens
+            self.completion_tokens += completion_tokens
+            self.wait_seconds += wait_seconds
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "requests": self.requests,
+                "kinds": dict(self.kinds),
+                "prompt_tokens": self.prompt_tokens,
+                "completion_tokens": self.completion_tokens,
+                "wait_seconds": round(self.wait_seconds, 3),
+            }
+
+
+def _hash(text: str) -> int:
+    return zlib.crc32(text.encode("utf-8"))
+
+
+def _message_text(message: Dict[str, Any]) -> str:
+    content = message.get("content")
+    if isinstance(content, list):
+        return "".join(part.get("text", "") for part in content if isinstance(part, dict))
+    return content or ""
+
+
+def _filler(word_count: int, salt: int) -> str:
+    """生成固定长度的填充文本（约每个词一个 token）"""
+    return "".join(
+        FILLER_WORDS[(salt + index * 7) % len(FILLER_WORDS)]
+        for index in range(max(1, word_count))
+    )
+
+
+# ============================================================
+# JSON 模式
+# ============================================================
+
+def _json_response(prompt: str, config: StubLLMConfig, salt: int) -> Dict[str, Any]:
+    """按提示词中的字段名识别调用方，返回对应结构"""
+    short = _filler(8, salt)
+
+    if '"agent_configs"' in prompt:
+        return {
+            "agent_configs": [
+                {
+                    "agent_id": int(agent_id),
+                    "activity_level": 0.5 + (int(agent_id) % 5) / 10,
+                    "posts_per_hour": 1.0,
+                    "comments_per_hour": 2.0,
+                    "active_hours": list(range(24)),
+                    "response_delay_min": 1,
+                    "response_delay_max": 30,
+                    "sentiment_bias": 0.0,
+                    "stance": "neutral",
+                    "influence_weight": 1.0,
+                }
+                for agent_id in AGENT_ID_PATTERN.findall(prompt)
+            ]
+        }
+
+    if '"agents_per_hour_min"' in prompt:
+        match = MAX_AGENTS_PATTERN.search(prompt)
+        max_agents = int(match.group(1)) if match else 10
+        return {
+            "total_simulation_hours": 24,
+            "minutes_per_round": 60,
+            "agents_per_hour_min": max(1, max_agents // 2),
+            "agents_per_hour_max": max_agents,
+            "peak_hours": [19, 20, 21, 22],
+            # 不设低谷时段，基准从第 0 小时开始，每轮都有 Agent 激活
+            "off_peak_hours": [],
+            "morning_hours": [6, 7, 8],
+            "work_hours": list(range(9, 19)),
+            "reasoning": short,
+        }
+
+    if '"initial_posts"' in prompt:
+        section = prompt.split("## 可用实体类型及示例", 1)[-1].split("## 任务", 1)[0]
+        entity_types = ENTITY_TYPES_PATTERN.findall(section)
+        return {
+            "hot_topics": [_filler(2, salt + index) for index in range(3)],
+            "narrative_direction": short,
+            "initial_posts": [
+                {"content": _filler(config.completion_tokens // 2, salt + index), "poster_type": entity_type.strip()}
+                for index, entity_type in enumerate(entity_types)
+            ],
+            "reasoning": short,
+        }
+
+    if '"sections"' in prompt:
+        return {
+            "title": "基准测试报告",
+            "summary": short,
+            "sections": [
+                {"title": f"章节{index + 1}", "description": short, "subsections": []}
+                for index in range(3)
+            ],
+        }
+
+    if '"sub_queries"' in prompt:
+        return {"sub_queries": [_filler(6, salt + index) for index in range(4)]}
+
+    if '"selected_indices"' in prompt:
+        return {"selected_indices": [0, 1, 2], "reasoning": short}
+
+    if '"questions"' in prompt:
+        return {"questions": [_filler(10, salt + index) + "？" for index in range(3)]}
+
+    if "mbti" in prompt:
+        is_group = '"other"' in prompt
+        return {
+            "bio": _filler(20, salt),
+            "persona": _filler(config.completion_tokens, salt),
+            "age": 30 if is_group else 20 + salt % 40,
+            "gender": "other" if is_group else ("male" if salt % 2 else "female"),
+            "mbti": "INTJ",
+            "country": "中国",
+            "profession": _filler(2, salt),
+            "interested_topics": [_filler(2, salt + index) for index in range(3)],
+        }
+
+    return {"result": _filler(config.completion_tokens, salt)}
+
+
+# ============================================================
+# 函数调用（OASIS Agent）
+# ============================================================
+
+def _fake_value(schema: Dict[str, Any], salt: int) -> Any:
+    value_type = schema.get("type")
+    if isinstance(value_type, list):
+        value_type = next((t for t in value_type if t != "null"), "string")
+    if value_type == "integer":
+        return 1 + salt % 3
+    if value_type == "number":
+        return 1.0
+    if value_type == "boolean":
+        return True
+    if value_type == "array":
+        return []
+    if value_type == "object":
+        return {}
+    return _filler(12, salt)
+
+
+def _tool_call_message(tools: List[Dict[str, Any]], salt: int) -> Dict[str, Any]:
+    function = tools[salt % len(tools)].get("function", {})
+    properties = (function.get("parameters") or {}).get("properties") or {}
+    arguments = {name: _fake_value(schema, salt + index) for index, (name, schema) in enumerate(properties.items())}
+    return {
+        "role": "assistant",
+        "content": None,
+        "tool_calls": [{
+            "id": f"call_{salt:08x}",
+            "type": "function",
+            "function": {"name": function.get("name", ""), "arguments": json.dumps(arguments, ensure_ascii=False)},
+        }],
+    }
+
+
+# ============================================================
+# 回复构造
+# ============================================================
+
+def build_completion(request: Dict[str, Any], config: StubLLMConfig) -> Tuple[Dict[str, Any], str]:
+    """
+    构造 chat.completions 响应
+
+    Returns:
+        (响应体, 请求类型)
+    """
+    messages = request.get("messages") or []
+    prompt = "\n".join(_message_text(message) for message in messages)
+    salt = _hash(prompt)
+    completion_tokens = config.completion_tokens
+    finish_reason = "stop"
+
+    tools = request.get("tools") or []
+    response_format = request.get("response_format") or {}
+    last_role = messages[-1].get("role") if messages else None
+
+    if tools and last_role != "tool":
+        kind = "tool_call"
+        message = _tool_call_message(tools, salt)
+        finish_reason = "tool_calls"
+    elif tools:
+        kind = "tool_result"
+        message = {"role": "assistant", "content": _filler(completion_tokens, salt)}
+    elif response_format.get("type") == "json_object":
+        kind = "json"
+        message = {"role": "assistant", "content": json.dumps(_json_response(prompt, config, salt), ensure_ascii=False)}
+    elif "<tool_call>" in prompt and "Final Answer" in prompt:
+        calls = sum(
+            1 for m in messages
+            if m.get("role") == "assistant" and "<tool_call>" in _message_text(m)
+        )
+        if calls < REACT_TOOL_CALLS:
+            kind = "react_tool"
+            call = {"name": REACT_TOOLS[calls % len(REACT_TOOLS)], "parameters": {"query": _filler(6, salt)}}
+            content = f"Thought: {_filler(10, salt)}\n<tool_call>\n{json.dumps(call, ensure_ascii=False)}\n</tool_call>"
+        else:
+            kind = "react_final"
+            content = f"Final Answer: {_filler(completion_tokens, salt)}\n\n> {_filler(12, salt + 1)}"
+        message = {"role": "assistant", "content": content}
+    else:
+        kind = "text"
+        message = {"role": "assistant", "content": _filler(completion_tokens, salt)}
+
+    prompt_tokens = max(1, len(prompt) // 4)
+    response = {
+        "id": f"chatcmpl-{salt:08x}",
+        "object": "chat.completion",
+        "created": int(time.time()),
+        "model": request.get("model", "stub"),
+        "choices": [{"index": 0, "message": message, "finish_reason": finish_reason}],
+        "usage": {
+            "prompt_tokens": prompt_tokens,
+            "completion_tokens": completion_tokens,
+            "total_tokens": prompt_tokens + completion_tokens,
+        },
+    }
+    return response, kind
+
+
+def request_delay(body: bytes, config: StubLLMConfig) -> float:
+    """本次请求的模拟延迟（秒）"""
+    delay_ms = config.latency_ms + config.ms_per_token * config.completion_tokens
+    if config.jitter_ms > 0:
+        delay_ms += zlib.crc32(body) % int(config.jitter_ms + 1)
+    return delay_ms / 1000
+
+
+class _StubHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format, *args):
+        pass
+
+    def _send_json(self, status: int, payload: Dict[str, Any]):
+        body = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        if self.path.rstrip("/").endswith("/models"):
+            self._send_json(200, {"object": "list", "data": [{"id": "stub", "object": "model"}]})
+        else:
+            self._send_json(404, {"error": {"message": f"not found: {self.path}"}})
+
+    def do_POST(self):
+        body = self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        if not self.path.rstrip("/").endswith("/chat/completions"):
+            self._send_json(404, {"error": {"message": f"not found: {self.path}"}})
+            return
+        try:
+            request = json.loads(body)
+        except ValueError:
+            self._send_json(400, {"error": {"message": "invalid JSON body"}})
+            return
+        if request.get("stream"):
+            self._send_json(400, {"error": {"message": "stream is not supported by the stub server"}})
+            return
+
+        stub: StubLLMServer = self.server.stub
+        response, kind = build_completion(request, stub.config)
+        delay = request_delay(body, stub.config)
+        if delay > 0:
+            time.sleep(delay)
+        usage = response["usage"]
+        stub.stats.record(kind, usage["prompt_tokens"], usage["completion_tokens"], delay)
+        self._send_json(200, response)
+
+
+class StubLLMServer:
+    """在后台线程运行的 LLM 桩服务"""
+
+    def __init__(self, config: Optional[StubLLMConfig] = None, host: str = "127.0.0.1", port: int = 0):
+        self.config = config or StubLLMConfig()
+        self.stats = StubStats()
+        self._httpd = ThreadingHTTPServer((host, port), _StubHandler)
+        self._httpd.daemon_threads = True
+        self._httpd.stub = self
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def base_url(self) -> str:
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}/v1"
+
+    def start(self) -> str:
+        self._thread = threading.Thread(target=self._httpd.serve_forever, name="stub-llm", daemon=True)
+        self._thread.start()
+        return self.base_url
+
+    def stop(self):
+        self._httpd.shutdown()
+        self._httpd.server_close()
+        if self._thread:
+            self._thread.join(timeout=5)
+
+    def serve_forever(self):
+        self._httpd.serve_forever()
+
+
+def main():
+    parser = argparse.ArgumentParser(description='确定性 LLM 桩服务（OpenAI 兼容）')
+    parser.add_argument('--host', type=str, default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8900)
+    parser.add_argument('--latency-ms', type=float, default=0.0, help='每次请求的固定延迟（毫秒）')
+    parser.add_argument('--jitter-ms', type=float, default=0.0, help='按请求内容哈希附加的延迟上限（毫秒）')
+    parser.add_argument('--ms-per-token', type=float, default=0.0, help='每个输出 token 的延迟（毫秒）')
+    parser.add_argument('--completion-tokens', type=int, default=64, help='每次回复的输出 token 数')
+    args = parser.parse_args()
+
+    server = StubLLMServer(
+        StubLLMConfig(
+            latency_ms=args.latency_ms,
+            jitter_ms=args.jitter_ms,
+            ms_per_token=args.ms_per_token,
+            completion_tokens=args.completion_tokens,
+        ),
+        host=args.host,
+        port=args.port,
+    )
+    print(f"LLM 桩服务已启动: {server.base_url}")
+    print("设置 LLM_BASE_URL 为以上地址，LLM_API_KEY 为任意非空值即可使用")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        print(json.dumps(server.stats.snapshot(), ensure_ascii=False, indent=2))
+
+
+if __name__ == "__main__":
+    main()
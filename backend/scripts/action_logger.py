@@ -10,36 +10,374 @@
     │   └── actions.jsonl    # Reddit 平台动作日志
     ├── simulation.log       # 主模拟进程日志
     └── run_state.json       # 运行状态（API 查询用）
+
+按轮次分段时（segment_rounds），每个平台目录下改为:
+    ├── actions.segments.json  # 分段清单（各分段的轮次范围和大小）
+    ├── actions-0000.jsonl     # 第 0 ~ N-1 轮
+    └── actions-0001.jsonl     # 第 N ~ 2N-1 轮 ...
+各分段按顺序拼接即为完整的 actions.jsonl（格式与 backend/app/utils/segmented_log.py 保持一致）
+
+写入方式：日志文件保持打开，每轮的日志行先在内存中缓冲，在轮次结束时一次性写入，
+读取方只会看到完整的行；可选按时间间隔 fsync
 """
 
+import atexit
+import gzip
 import json
 import os
 import logging
+import tempfile
+import time
 from datetime import datetime
-from typing import Dict, Any, Optional
+from typing import Dict, Any, List, Optional
+
+
+# 从日志末尾查找最后一个序号时每次向前读取的块大小
+_TAIL_BLOCK_SIZE = 64 * 1024
+
+# 分段清单文件名和分段文件名格式
+SEGMENT_MANIFEST_FILE = "actions.segments.json"
+SEGMENT_FILE_FORMAT = "actions-{index:04d}.jsonl"
+
+# 缓冲超过该大小（字节）时即使轮次未结束也写入文件，避免单轮动作过多时占用过多内存
+MAX_BUFFER_BYTES = 4 * 1024 * 1024
+
+
+class BufferedLineWriter:
+    """
+    JSONL 缓冲写入器
+
+    文件以追加模式保持打开，append 只写入内存缓冲，flush 时将缓冲的所有行合并为一次 write，
+    因此文件中只会出现完整的行
+    """
+
+    def __init__(self, path: str, fsync_interval: Optional[float] = None):
+        """
+        Args:
+            path: 日志文件路径
+            fsync_interval: fsync 的最小间隔（秒，可选，默认不 fsync，由操作系统决定落盘时机）
+        """
+        self.path = path
+        self.fsync_interval = fsync_interval
+        self._file = None
+        self._buffer: List[bytes] = []
+        self._buffer_size = 0
+        self._last_fsync = time.monotonic()
+
+    def _open(self):
+        if self._file is None:
+            # 打开时即创建文件，新分段登记到清单后文件立即存在
+            self._file = open(self.path, 'ab')
+        return self._file
+
+    def append(self, entry: Dict[str, Any]):
+        """缓冲一条日志"""
+        line = (json.dumps(entry, ensure_ascii=False) + '\n').encode('utf-8')
+        self._buffer.append(line)
+        self._buffer_size += len(line)
+        if self._buffer_size >= MAX_BUFFER_BYTES:
+            self.flush()
+
+    def flush(self, fsync: bool = False):
+        """写入缓冲的所有行；到达 fsync 间隔（或 fsync=True 且启用了 fsync）时同步到磁盘"""
+        f = self._open()
+        if self._buffer:
+            f.write(b''.join(self._buffer))
+            self._buffer.clear()
+            self._buffer_size = 0
+            f.flush()
+        if self.fsync_interval is not None and (
+            fsync or time.monotonic() - self._last_fsync >= self.fsync_interval
+        ):
+            os.fsync(f.fileno())
+            self._last_fsync = time.monotonic()
+
+    def close(self):
+        """写入剩余的缓冲并关闭文件"""
+        if self._file is None and not self._buffer:
+            return
+        try:
+            self.flush(fsync=True)
+        finally:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+
+
+def _read_last_seq(log_path: str) -> int:
+    """从已有日志末尾向前查找最后一条动作的序号（没有时返回 0）"""
+    if not os.path.exists(log_path):
+        # 已单独压缩的分段
+        if os.path.exists(log_path + ".gz"):
+            last_seq = 0
+            with gzip.open(log_path + ".gz", 'rb') as f:
+                for line in f:
+                    if b'"seq"' in line:
+                        try:
+                            seq = json.loads(line).get("seq")
+                        except (json.JSONDecodeError, UnicodeDecodeError, AttributeError):
+                            continue
+                        if isinstance(seq, int):
+                            last_seq = seq
+            return last_seq
+        return 0
+
+    with open(log_path, 'rb') as f:
+        f.seek(0, os.SEEK_END)
+        position = f.tell()
+        remainder = b""
+        while position > 0:
+            read_size = min(_TAIL_BLOCK_SIZE, position)
+            position -= read_size
+            f.seek(position)
+            lines = (f.read(read_size) + remainder).split(b"\n")
+            # 第一段可能是被块边界截断的行，留到读取前一个块时拼接
+            remainder = lines[0] if position > 0 else b""
+            candidates = lines[1:] if position > 0 else lines
+            for line in reversed(candidates):
+                if b'"seq"' not in line:
+                    continue
+                try:
+                    seq = json.loads(line).get("seq")
+                except (json.JSONDecodeError, UnicodeDecodeError, AttributeError):
+                    continue
+                if isinstance(seq, int):
+                    return seq
+    return 0
 
 
 class PlatformActionLogger:
-    """单平台动作日志记录器"""
+    """
+    单平台动作日志记录器
+    
+    每条动作带有本平台内单调递增的序号 seq（从 1 开始，追加到已有日志时接着最后一个序号），
+    客户端可以据此只获取某个序号之后的新动作
     
-    def __init__(self, platform: str, base_dir: str):
+    指定 segment_rounds 时每 N 轮写入一个新的分段文件，并维护分段清单，
+    后端按轮次查询时只需读取相关分段，已结束的分段也可以单独压缩
+    
+    同一轮的日志在 log_round_end 时一次性写入（模拟开始/结束事件立即写入）
+    """
+    
+    def __init__(
+        self,
+        platform: str,
+        base_dir: str,
+        segment_rounds: Optional[int] = None,
+        fsync_interval: Optional[float] = None
+    ):
         """
         初始化日志记录器
         
         Args:
             platform: 平台名称 (twitter/reddit)
             base_dir: 模拟目录的基础路径
+            segment_rounds: 每个分段包含的轮数（可选，默认写入单一的 actions.jsonl；
+                已存在单一日志时继续追加到单一日志）
+            fsync_interval: 写入后 fsync 的最小间隔（秒，可选，默认不 fsync）
         """
         self.platform = platform
         self.base_dir = base_dir
         self.log_dir = os.path.join(base_dir, platform)
         self.log_path = os.path.join(self.log_dir, "actions.jsonl")
+        self.fsync_interval = fsync_interval
+        self._writer: Optional[BufferedLineWriter] = None
         self._ensure_dir()
+        
+        self.segment_rounds = None
+        if segment_rounds and segment_rounds > 0 and not os.path.exists(self.log_path):
+            self.segment_rounds = segment_rounds
+        self._manifest_path = os.path.join(self.log_dir, SEGMENT_MANIFEST_FILE)
+        self._segments: List[Dict[str, Any]] = self._load_manifest() if self.segment_rounds else []
+        
+        self._seq = 0
+        if self.segment_rounds:
+            for segment in reversed(self._segments):
+                self._seq = _read_last_seq(os.path.join(self.log_dir, segment["file"]))
+                if self._seq:
+                    break
+        else:
+            self._seq = _read_last_seq(self.log_path)
     
     def _ensure_dir(self):
         """确保目录存在"""
         os.makedirs(self.log_dir, exist_ok=True)
     
+    def _load_manifest(self) -> List[Dict[str, Any]]:
+        """读取已有的分段清单（追加到已有的分段日志）"""
+        if not os.path.exists(self._manifest_path):
+            return []
+        try:
+            with open(self._manifest_path, 'r', encoding='utf-8') as f:
+                segments = json.load(f).get("segments", [])
+        except (OSError, ValueError, AttributeError):
+            return []
+        # 最后一个分段在下次写入时重新打开（见 _segment_path）
+        return segments
+    
+    def _save_manifest(self):
+        """更新分段清单（先写临时文件再替换，读取方不会读到写了一半的清单）"""
+        # 已单独压缩的分段不再有原文件，保留清单中记录的大小
+        for segment in self._segments:
+            segment_path = os.path.join(self.log_dir, segment["file"])
+            if os.path.exists(segment_path):
+                segment["size"] = os.path.getsize(segment_path)
+        
+        manifest = {
+            "version": 1,
+            "segment_rounds": self.segment_rounds,
+            "segments": self._segments,
+        }
+        fd, tmp_path = tempfile.mkstemp(dir=self.log_dir, prefix=".segments.", suffix=".tmp")
+        try:
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                json.dump(manifest, f, ensure_ascii=False)
+            os.replace(tmp_path, self._manifest_path)
+        except BaseException:
+            try:
+                os.unlink(tmp_path)
+            except OSError:
+                pass
+            raise
+    
+    def _segment_path(self, round_num: Optional[int]) -> str:
+        """
+        写入该轮次的分段文件路径，需要时切换到新的分段
+        
+        新分段先登记到清单再写入，读取方只读取清单中登记的分段
+        """
+        current = self._segments[-1] if self._segments else None
+        
+        index = None if round_num is None else round_num // self.segment_rounds
+        if current is None or (index is not None and index > current["index"]):
+            if index is None:
+                index = 0
+            if current is not None:
+                # 先写入旧分段的缓冲，清单中记录的大小才是最终大小
+                self.flush()
+                current["closed"] = True
+            current = {
+                "index": index,
+                "file": SEGMENT_FILE_FORMAT.format(index=index),
+                "start_round": index * self.segment_rounds,
+                "end_round": (index + 1) * self.segment_rounds - 1,
+                "size": 0,
+                "closed": False,
+            }
+            self._segments.append(current)
+            self._save_manifest()
+        else:
+            changed = False
+            if current["closed"]:
+                # 模拟结束后又有写入，重新打开最后一个分段
+                current["closed"] = False
+                changed = True
+            if round_num is not None and round_num < current["start_round"]:
+                # 轮次倒退时写入当前分段，扩大其轮次范围
+                current["start_round"] = round_num
+                changed = True
+            if changed:
+                self._save_manifest()
+        
+        return os.path.join(self.log_dir, current["file"])
+    
+    def _write(self, entry: Dict[str, Any], round_num: Optional[int] = None):
+        """缓冲一条日志（写入目标切换到新分段时，先写入旧分段的缓冲）"""
+        log_path = self._segment_path(round_num) if self.segment_rounds else self.log_path
+        if self._writer is None or self._writer.path != log_path:
+            if self._writer is not None:
+                self._writer.close()
+            self._writer = BufferedLineWriter(log_path, self.fsync_interval)
+            self._writer.flush()
+        self._writer.append(entry)
+    
+    def flush(self, fsync: bool = False):
+        """将缓冲的日志写入文件"""
+        if self._writer is not None:
+            self._writer.flush(fsync)
+    
+    def close(self):
+        """写入剩余的缓冲并关闭日志文件"""
+        if self._writer is not None:
+            self._writer.close()
+            self._writer = None
+
+    def position(self) -> Dict[str, Any]:
+        """
+        当前写入位置（写入缓冲后），记录在检查点中，恢复时用 restore_position 回退到该位置
+
+        Returns:
+            {"file": 当前日志文件名, "size": 文件大小, "offset": 各分段拼接后的偏移, "seq": 最后一个序号,
+             "segments": 分段数, "segment_rounds": 每个分段的轮数（后两项仅分段模式）}
+        """
+        self.flush()
+        if self.segment_rounds:
+            current = self._segments[-1]["file"] if self._segments else None
+        else:
+            current = os.path.basename(self.log_path)
+        path = os.path.join(self.log_dir, current) if current else None
+        size = os.path.getsize(path) if path and os.path.exists(path) else 0
+        position = {
+            "file": current,
+            "size": size,
+            "offset": size,
+            "seq": self._seq,
+        }
+        if self.segment_rounds:
+            position["offset"] += sum(segment.get("size", 0) for segment in self._segments[:-1])
+            position["segments"] = len(self._segments)
+            position["segment_rounds"] = self.segment_rounds
+        return position
+
+    def restore_position(self, position: Dict[str, Any]):
+        """
+        回退到检查点记录的写入位置：截断日志文件，删除之后新建的分段，
+        检查点之后写入的轮次从恢复的轮次重新写入，日志中不会出现重复的轮次
+
+        需在写入任何日志之前调用
+
+        Raises:
+            ValueError: 日志已归档压缩或比检查点记录的短，无法回退
+        """
+        self.close()
+        if self.segment_rounds:
+            if "segments" not in position:
+                raise ValueError(f"{self.platform} 动作日志已改为分段写入，与检查点不一致")
+            keep = position["segments"]
+            for segment in self._segments[keep:]:
+                segment_path = os.path.join(self.log_dir, segment["file"])
+                for path in (segment_path, segment_path + ".gz"):
+                    if os.path.exists(path):
+                        os.remove(path)
+            self._segments = self._segments[:keep]
+        elif "segments" in position:
+            raise ValueError(f"{self.platform} 动作日志未分段写入，与检查点不一致")
+
+        if position.get("file"):
+            log_path = os.path.join(self.log_dir, position["file"])
+            if not os.path.exists(log_path):
+                if position.get("size", 0) or os.path.exists(log_path + ".gz"):
+                    raise ValueError(f"动作日志不存在或已归档压缩，无法回退: {log_path}")
+            else:
+                size = position.get("size", 0)
+                if os.path.getsize(log_path) < size:
+                    raise ValueError(f"动作日志比检查点记录的短，无法回退: {log_path}")
+                with open(log_path, 'r+b') as f:
+                    f.truncate(size)
+
+        if self.segment_rounds:
+            if self._segments:
+                self._segments[-1]["closed"] = False
+            self._save_manifest()
+        self._seq = position.get("seq", 0)
+
+    def reset(self):
+        """清空已有的动作日志（从检查点恢复时，没有检查点的平台从头开始运行）"""
+        if self.segment_rounds:
+            self.restore_position({"file": None, "size": 0, "seq": 0, "segments": 0})
+        else:
+            self.restore_position({"file": os.path.basename(self.log_path), "size": 0, "seq": 0})
+
     def log_action(
         self,
         round_num: int,
@@ -51,7 +389,9 @@ class PlatformActionLogger:
         success: bool = True
     ):
         """记录一个动作"""
+        self._seq += 1
         entry = {
+            "seq": self._seq,
             "round": round_num,
             "timestamp": datetime.now().isoformat(),
             "agent_id": agent_id,
@@ -62,8 +402,7 @@ class PlatformActionLogger:
             "success": success,
         }
         
-        with open(self.log_path, 'a', encoding='utf-8') as f:
-            f.write(json.dumps(entry, ensure_ascii=False) + '\n')
+        self._write(entry, round_num)
     
     def log_round_start(self, round_num: int, simulated_hour: int):
         """记录轮次开始"""
@@ -74,8 +413,7 @@ class PlatformActionLogger:
             "simulated_hour": simulated_hour,
         }
         
-        with open(self.log_path, 'a', encoding='utf-8') as f:
-            f.write(json.dumps(entry, ensure_ascii=False) + '\n')
+        self._write(entry, round_num)
     
     def log_round_end(self, round_num: int, actions_count: int):
         """记录轮次结束"""
@@ -86,8 +424,12 @@ class PlatformActionLogger:
             "actions_count": actions_count,
         }
         
-        with open(self.log_path, 'a', encoding='utf-8') as f:
-            f.write(json.dumps(entry, ensure_ascii=False) + '\n')
+        self._write(entry, round_num)
+        # 整轮日志一次性写入
+        self.flush()
+        if self.segment_rounds:
+            # 每轮结束时更新清单中当前分段的大小
+            self._save_manifest()
     
     def log_simulation_start(self, config: Dict[str, Any]):
         """记录模拟开始"""
@@ -99,8 +441,8 @@ class PlatformActionLogger:
             "agents_count": len(config.get("agent_configs", [])),
         }
         
-        with open(self.log_path, 'a', encoding='utf-8') as f:
-            f.write(json.dumps(entry, ensure_ascii=False) + '\n')
+        self._write(entry)
+        self.flush()
     
     def log_simulation_end(self, total_rounds: int, total_actions: int):
         """记录模拟结束"""
@@ -112,8 +454,11 @@ class PlatformActionLogger:
             "total_actions": total_actions,
         }
         
-        with open(self.log_path, 'a', encoding='utf-8') as f:
-            f.write(json.dumps(entry, ensure_ascii=False) + '\n')
+        self._write(entry)
+        self.flush(fsync=True)
+        if self.segment_rounds and self._segments:
+            self._segments[-1]["closed"] = True
+            self._save_manifest()
 
 
 class SimulationLogManager:
@@ -122,20 +467,35 @@ class SimulationLogManager:
     统一管理所有日志文件，按平台分离
     """
     
-    def __init__(self, simulation_dir: str):
+    def __init__(
+        self,
+        simulation_dir: str,
+        segment_rounds: Optional[int] = None,
+        fsync_interval: Optional[float] = None,
+        append: bool = False
+    ):
         """
         初始化日志管理器
-        
+
         Args:
             simulation_dir: 模拟目录路径
+            segment_rounds: 动作日志每个分段包含的轮数（可选，默认不分段）
+            fsync_interval: 动作日志 fsync 的最小间隔（秒，可选，默认不 fsync）
+            append: 主日志追加写入（从检查点恢复时保留之前的日志）
         """
         self.simulation_dir = simulation_dir
+        self.segment_rounds = segment_rounds
+        self.fsync_interval = fsync_interval
+        self.append = append
         self.twitter_logger: Optional[PlatformActionLogger] = None
         self.reddit_logger: Optional[PlatformActionLogger] = None
         self._main_logger: Optional[logging.Logger] = None
         
         # 设置主日志
         self._setup_main_logger()
+        
+        # 进程异常退出时也写入已缓冲的动作日志
+        atexit.register(self.close)
     
     def _setup_main_logger(self):
         """设置主模拟日志"""
@@ -147,7 +507,7 @@ class SimulationLogManager:
         self._main_logger.handlers.clear()
         
         # 文件处理器
-        file_handler = logging.FileHandler(log_path, encoding='utf-8', mode='w')
+        file_handler = logging.FileHandler(log_path, encoding='utf-8', mode='a' if self.append else 'w')
         file_handler.setLevel(logging.INFO)
         file_handler.setFormatter(logging.Formatter(
             '%(asctime)s - %(levelname)s - %(message)s',
@@ -169,15 +529,25 @@ class SimulationLogManager:
     def get_twitter_logger(self) -> PlatformActionLogger:
         """获取 Twitter 平台日志记录器"""
         if self.twitter_logger is None:
-            self.twitter_logger = PlatformActionLogger("twitter", self.simulation_dir)
+            self.twitter_logger = PlatformActionLogger(
+                "twitter", self.simulation_dir, self.segment_rounds, self.fsync_interval
+            )
         return self.twitter_logger
     
     def get_reddit_logger(self) -> PlatformActionLogger:
         """获取 Reddit 平台日志记录器"""
         if self.reddit_logger is None:
-            self.reddit_logger = PlatformActionLogger("reddit", self.simulation_dir)
+            self.reddit_logger = PlatformActionLogger(
+                "reddit", self.simulation_dir, self.segment_rounds, self.fsync_interval
+            )
         return self.reddit_logger
     
+    def close(self):
+        """关闭各平台的动作日志"""
+        for platform_logger in (self.twitter_logger, self.reddit_logger):
+            if platform_logger is not None:
+                platform_logger.close()
+    
     def log(self, message: str, level: str = "info"):
         """记录主日志"""
         if self._main_logger:
@@ -202,11 +572,15 @@ class ActionLogger:
     """
     动作日志记录器（兼容旧接口）
     建议使用 SimulationLogManager 代替
+    
+    与 PlatformActionLogger 相同，同一轮的日志在 log_round_end 时一次性写入
     """
     
-    def __init__(self, log_path: str):
+    def __init__(self, log_path: str, fsync_interval: Optional[float] = None):
         self.log_path = log_path
         self._ensure_dir()
+        self._writer = BufferedLineWriter(log_path, fsync_interval)
+        atexit.register(self.close)
     
     def _ensure_dir(self):
         log_dir = os.path.dirname(self.log_path)
@@ -236,8 +610,7 @@ class ActionLogger:
             "success": success,
         }
         
-        with open(self.log_path, 'a', encoding='utf-8') as f:
-            f.write(json.dumps(entry, ensure_ascii=False) + '\n')
+        self._writer.append(entry)
     
     def log_round_start(self, round_num: int, simulated_hour: int, platform: str):
         entry = {
@@ -248,8 +621,7 @@ class ActionLogger:
             "simulated_hour": simulated_hour,
         }
         
-        with open(self.log_path, 'a', encoding='utf-8') as f:
-            f.write(json.dumps(entry, ensure_ascii=False) + '\n')
+        self._writer.append(entry)
     
     def log_round_end(self, round_num: int, actions_count: int, platform: str):
         entry = {
@@ -260,8 +632,9 @@ class ActionLogger:
             "actions_count": actions_count,
         }
         
-        with open(self.log_path, 'a', encoding='utf-8') as f:
-            f.write(json.dumps(entry, ensure_ascii=False) + '\n')
+        self._writer.append(entry)
+        # 整轮日志一次性写入
+        self._writer.flush()
     
     def log_simulation_start(self, platform: str, config: Dict[str, Any]):
         entry = {
@@ -272,8 +645,8 @@ class ActionLogger:
             "agents_count": len(config.get("agent_configs", [])),
         }
         
-        with open(self.log_path, 'a', encoding='utf-8') as f:
-            f.write(json.dumps(entry, ensure_ascii=False) + '\n')
+        self._writer.append(entry)
+        self._writer.flush()
     
     def log_simulation_end(self, platform: str, total_rounds: int, total_actions: int):
         entry = {
@@ -284,8 +657,16 @@ class ActionLogger:
             "total_actions": total_actions,
         }
         
-        with open(self.log_path, 'a', encoding='utf-8') as f:
-            f.write(json.dumps(entry, ensure_ascii=False) + '\n')
+        self._writer.append(entry)
+        self._writer.flush(fsync=True)
+    
+    def flush(self):
+        """将缓冲的日志写入文件"""
+        self._writer.flush()
+    
+    def close(self):
+        """写入剩余的缓冲并关闭日志文件"""
+        self._writer.close()
 
 
 # 全局日志实例（兼容旧接口）
@@ -0,0 +1,429 @@
+"""
+动作记录读取
+每轮 env.step 之后从 OASIS 数据库的 trace 表读取新增的动作，并补充上下文信息（帖子内容、用户名等）
+
+- 每个平台使用一个持久化的只读连接，不再每轮重新打开数据库
+- 上下文按轮批量查询：先收集本轮所有动作涉及的帖子/评论/关注/用户 ID，
+  每类只执行一次 IN (...) 查询，查询次数与本轮动作数无关
+- 帖子、评论创建后内容和作者不再变化，用户名称也不变，查询结果放入有上限的 LRU 缓存，
+  热门帖子/用户在后续轮次中被反复点赞、转发、评论时不再查询数据库
+"""
+
+import json
+import os
+import sqlite3
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, Any, Iterable, List, Optional, Set, Tuple
+
+from interview_results import MAX_SQL_PARAMS
+
+
+# 需要过滤掉的动作类型（这些动作对分析价值较低）
+FILTERED_ACTIONS = {'refresh', 'sign_up'}
+
+# 动作类型映射表（数据库中的名称 -> 标准名称）
+ACTION_TYPE_MAP = {
+    'create_post': 'CREATE_POST',
+    'like_post': 'LIKE_POST',
+    'dislike_post': 'DISLIKE_POST',
+    'repost': 'REPOST',
+    'quote_post': 'QUOTE_POST',
+    'follow': 'FOLLOW',
+    'mute': 'MUTE',
+    'create_comment': 'CREATE_COMMENT',
+    'like_comment': 'LIKE_COMMENT',
+    'dislike_comment': 'DISLIKE_COMMENT',
+    'search_posts': 'SEARCH_POSTS',
+    'search_user': 'SEARCH_USER',
+    'trend': 'TREND',
+    'do_nothing': 'DO_NOTHING',
+    'interview': 'INTERVIEW',
+}
+
+# 写入动作日志的 action_args 字段（保留完整内容，不截断）
+KEPT_ARG_KEYS = (
+    'content', 'post_id', 'comment_id', 'quoted_id', 'new_post_id',
+    'follow_id', 'query', 'like_id', 'dislike_id',
+)
+
+# 每类查询结果缓存的最大条目数
+DEFAULT_LOOKUP_CACHE_SIZE = 10000
+
+
+class LookupCache:
+    """有上限的 LRU 缓存，记录命中/未命中次数"""
+
+    def __init__(self, maxsize: int = DEFAULT_LOOKUP_CACHE_SIZE):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._data: OrderedDict = OrderedDict()
+
+    def get(self, key: Any, default: Any = None) -> Any:
+        try:
+            value = self._data[key]
+        except KeyError:
+            self.misses += 1
+            return default
+        self._data.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def put(self, key: Any, value: Any):
+        if self.maxsize <= 0:
+            return
+        self._data[key] = value
+        self._data.move_to_end(key)
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def stats(self) -> Dict[str, Any]:
+        total = self.hits + self.misses
+        return {
+            "size": len(self._data),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / total, 4) if total else 0.0,
+        }
+
+
+class ActionTraceReader:
+    """
+    单个平台数据库的动作读取器
+
+    持有一个只读连接（数据库在 env.reset 之后才存在，首次读取时打开），在模拟的事件循环中使用
+    """
+
+    def __init__(
+        self,
+        db_path: str,
+        agent_names: Dict[int, str],
+        cache_size: int = DEFAULT_LOOKUP_CACHE_SIZE
+    ):
+        """
+        Args:
+            db_path: 数据库文件路径
+            agent_names: agent_id -> agent_name 映射
+            cache_size: 帖子/评论/用户查询缓存各自的最大条目数（0 表示不缓存）
+        """
+        self.db_path = db_path
+        self.agent_names = agent_names
+        self._conn: Optional[sqlite3.Connection] = None
+
+        # post_id -> (content, author_name)
+        self._post_cache = LookupCache(cache_size)
+        # comment_id -> (content, author_name)
+        self._comment_cache = LookupCache(cache_size)
+        # user_id -> name
+        self._user_cache = LookupCache(cache_size)
+
+    def _get_conn(self) -> Optional[sqlite3.Connection]:
+        if self._conn is None:
+            if not os.path.exists(self.db_path):
+                return None
+            uri = f"{Path(self.db_path).resolve().as_uri()}?mode=ro"
+            self._conn = sqlite3.connect(uri, uri=True)
+        return self._conn
+
+    def close(self):
+        if self._conn is not None:
+            try:
+                self._conn.close()
+            except sqlite3.Error:
+                pass
+            self._conn = None
+
+    def cache_stats(self) -> Dict[str, Dict[str, Any]]:
+        """各查询缓存的命中统计"""
+        return {
+            "posts": self._post_cache.stats(),
+            "comments": self._comment_cache.stats(),
+            "users": self._user_cache.stats(),
+        }
+
+    def format_cache_stats(self) -> str:
+        """用于写入模拟日志的缓存统计摘要"""
+        return ", ".join(
+            f"{name} {stats['hits']}/{stats['hits'] + stats['misses']} 命中 ({stats['hit_rate']:.0%}, 缓存 {stats['size']} 条)"
+            for name, stats in self.cache_stats().items()
+        )
+
+    def _query_in(self, sql: str, ids: Iterable[Any]) -> List[Tuple]:
+        """执行带 IN ({placeholders}) 的查询，参数过多时分批"""
+        ids = list(ids)
+        rows = []
+        for start in range(0, len(ids), MAX_SQL_PARAMS):
+            chunk = ids[start:start + MAX_SQL_PARAMS]
+            placeholders = ",".join("?" * len(chunk))
+            rows.extend(self._conn.execute(sql.format(placeholders=placeholders), chunk).fetchall())
+        return rows
+
+    def fetch_new_actions(self, last_rowid: int) -> Tuple[List[Dict[str, Any]], int]:
+        """
+        获取新的动作记录，并补充完整的上下文信息
+
+        Args:
+            last_rowid: 上次读取的最大 rowid 值（使用 rowid 而不是 created_at，因为不同平台的 created_at 格式不同）
+
+        Returns:
+            (actions_list, new_last_rowid)
+            - actions_list: 动作列表，每个元素包含 agent_id, agent_name, action_type, action_args（含上下文信息）
+            - new_last_rowid: 新的最大 rowid 值
+        """
+        actions = []
+        new_last_rowid = last_rowid
+
+        try:
+            conn = self._get_conn()
+            if conn is None:
+                return actions, new_last_rowid
+
+            # 使用 rowid 来追踪已处理的记录（rowid 是 SQLite 的内置自增字段）
+            # 这样可以避免 created_at 格式差异问题（Twitter 用整数，Reddit 用日期时间字符串）
+            rows = conn.execute("""
+                SELECT rowid, user_id, action, info
+                FROM trace
+                WHERE rowid > ?
+                ORDER BY rowid ASC
+            """, (last_rowid,)).fetchall()
+
+            for rowid, user_id, action, info_json in rows:
+                # 更新最大 rowid
+                new_last_rowid = rowid
+
+                # 过滤非核心动作
+                if action in FILTERED_ACTIONS:
+                    continue
+
+                # 解析动作参数
+                try:
+                    action_args = json.loads(info_json) if info_json else {}
+                except json.JSONDecodeError:
+                    action_args = {}
+                if not isinstance(action_args, dict):
+                    action_args = {}
+
+                # 精简 action_args，只保留关键字段
+                simplified_args = {key: action_args[key] for key in KEPT_ARG_KEYS if key in action_args}
+                # 屏蔽用户的目标（OASIS 记录为 mutee_id；只用于补充上下文，不写入日志）
+                mute_target = action_args.get('mutee_id')
+
+                actions.append({
+                    'agent_id': user_id,
+                    'agent_name': self.agent_names.get(user_id, f'Agent_{user_id}'),
+                    # 转换动作类型名称
+                    'action_type': ACTION_TYPE_MAP.get(action, action.upper()),
+                    'action_args': simplified_args,
+                    '_mute_target': mute_target,
+                })
+        except sqlite3.Error as e:
+            print(f"读取数据库动作失败: {e}")
+            # 连接可能已失效（例如数据库被替换），下次读取时重新打开
+            self.close()
+            return [], last_rowid
+
+        # 补充上下文信息（帖子内容、用户名等）
+        try:
+            self._enrich_actions(actions)
+        except sqlite3.Error as e:
+            # 补充上下文失败不影响主流程
+            print(f"补充动作上下文失败: {e}")
+
+        for action_data in actions:
+            action_data.pop('_mute_target', None)
+        return actions, new_last_rowid
+
+    # ------------------------------------------------------------------
+    # 上下文补充（按轮批量查询）
+    # ------------------------------------------------------------------
+
+    def _enrich_actions(self, actions: List[Dict[str, Any]]):
+        """为一批动作补充上下文信息（会修改各动作的 action_args）"""
+        post_ids: Set[int] = set()
+        new_post_ids: Set[int] = set()
+        comment_ids: Set[int] = set()
+        follow_ids: Set[int] = set()
+        user_ids: Set[int] = set()
+
+        # 第一步：收集本轮需要查询的 ID
+        for action_data in actions:
+            action_type = action_data['action_type']
+            args = action_data['action_args']
+            if action_type in ('LIKE_POST', 'DISLIKE_POST', 'CREATE_COMMENT'):
+                if args.get('post_id'):
+                    post_ids.add(args['post_id'])
+            elif action_type == 'REPOST':
+                if args.get('new_post_id'):
+                    new_post_ids.add(args['new_post_id'])
+            elif action_type == 'QUOTE_POST':
+                if args.get('quoted_id'):
+                    post_ids.add(args['quoted_id'])
+                if args.get('new_post_id'):
+                    new_post_ids.add(args['new_post_id'])
+            elif action_type == 'FOLLOW':
+                if args.get('follow_id'):
+                    follow_ids.add(args['follow_id'])
+            elif action_type == 'MUTE':
+                if action_data['_mute_target'] is not None:
+                    user_ids.add(action_data['_mute_target'])
+            elif action_type in ('LIKE_COMMENT', 'DISLIKE_COMMENT'):
+                if args.get('comment_id'):
+                    comment_ids.add(args['comment_id'])
+
+        if not (post_ids or new_post_ids or comment_ids or follow_ids or user_ids):
+            return
+
+        # 第二步：转发/引用产生的新帖子 -> 原帖ID、引用评论
+        new_posts = self._get_new_posts(new_post_ids)
+        post_ids.update(original_id for original_id, _ in new_posts.values() if original_id)
+
+        # 关注记录 -> 被关注用户ID
+        followees = self._get_followees(follow_ids)
+        user_ids.update(followee_id for followee_id in followees.values() if followee_id is not None)
+
+        # 第三步：批量获取帖子、评论、用户信息
+        posts = self._get_posts(post_ids)
+        comments = self._get_comments(comment_ids)
+        user_names = self._get_user_names(user_ids)
+
+        # 第四步：填充上下文
+        for action_data in actions:
+            action_type = action_data['action_type']
+            args = action_data['action_args']
+
+            # 点赞/踩帖子、发表评论：补充帖子内容和作者
+            if action_type in ('LIKE_POST', 'DISLIKE_POST', 'CREATE_COMMENT'):
+                post_info = posts.get(args.get('post_id'))
+                if post_info:
+                    args['post_content'], args['post_author_name'] = post_info
+
+            # 转发帖子：补充原帖内容和作者（转发帖子的 original_post_id 指向原帖）
+            elif action_type == 'REPOST':
+                original_id, _ = new_posts.get(args.get('new_post_id'), (None, None))
+                original_info = posts.get(original_id) if original_id else None
+                if original_info:
+                    args['original_content'], args['original_author_name'] = original_info
+
+            # 引用帖子：补充原帖内容、作者和引用评论
+            elif action_type == 'QUOTE_POST':
+                original_info = posts.get(args.get('quoted_id'))
+                if original_info:
+                    args['original_content'], args['original_author_name'] = original_info
+                _, quote_content = new_posts.get(args.get('new_post_id'), (None, None))
+                if quote_content:
+                    args['quote_content'] = quote_content
+
+            # 关注用户：补充被关注用户的名称
+            elif action_type == 'FOLLOW':
+                followee_id = followees.get(args.get('follow_id'))
+                target_name = user_names.get(followee_id) if followee_id is not None else None
+                if target_name:
+                    args['target_user_name'] = target_name
+
+            # 屏蔽用户：补充被屏蔽用户的名称
+            elif action_type == 'MUTE':
+                target_name = user_names.get(action_data['_mute_target'])
+                if target_name:
+                    args['target_user_name'] = target_name
+
+            # 点赞/踩评论：补充评论内容和作者
+            elif action_type in ('LIKE_COMMENT', 'DISLIKE_COMMENT'):
+                comment_info = comments.get(args.get('comment_id'))
+                if comment_info:
+                    args['comment_content'], args['comment_author_name'] = comment_info
+
+    def _author_name(self, agent_id: Optional[int], name: Optional[str], user_name: Optional[str]) -> str:
+        """作者名称：优先使用 agent_names 中的名称，否则使用 user 表中的名称"""
+        if agent_id is not None and agent_id in self.agent_names:
+            return self.agent_names[agent_id]
+        return name or user_name or ''
+
+    def _get_new_posts(self, post_ids: Set[int]) -> Dict[int, Tuple[Optional[int], Optional[str]]]:
+        """转发/引用产生的帖子: {post_id: (original_post_id, quote_content)}"""
+        if not post_ids:
+            return {}
+        rows = self._query_in("""
+            SELECT post_id, original_post_id, quote_content
+            FROM post
+            WHERE post_id IN ({placeholders})
+        """, post_ids)
+        return {post_id: (original_id, quote_content) for post_id, original_id, quote_content in rows}
+
+    def _get_followees(self, follow_ids: Set[int]) -> Dict[int, int]:
+        """关注记录: {follow_id: followee_id}"""
+        if not follow_ids:
+            return {}
+        rows = self._query_in("""
+            SELECT follow_id, followee_id
+            FROM follow
+            WHERE follow_id IN ({placeholders})
+        """, follow_ids)
+        return {follow_id: followee_id for follow_id, followee_id in rows}
+
+    def _cached_lookup(self, cache: LookupCache, ids: Set[Any], loader) -> Dict[Any, Any]:
+        """先查缓存，未命中的 ID 批量查询数据库后放入缓存（不存在的记录不缓存，之后可能被创建）"""
+        result = {}
+        missing = set()
+        for key in ids:
+            value = cache.get(key)
+            if value is None:
+                missing.add(key)
+            else:
+                result[key] = value
+        if missing:
+            loaded = loader(missing)
+            for key, value in loaded.items():
+                cache.put(key, value)
+            result.update(loaded)
+        return result
+
+    def _get_posts(self, post_ids: Set[int]) -> Dict[int, Tuple[str, str]]:
+        """帖子信息: {post_id: (content, author_name)}"""
+        return self._cached_lookup(self._post_cache, post_ids, self._load_posts)
+
+    def _get_comments(self, comment_ids: Set[int]) -> Dict[int, Tuple[str, str]]:
+        """评论信息: {comment_id: (content, author_name)}"""
+        return self._cached_lookup(self._comment_cache, comment_ids, self._load_comments)
+
+    def _get_user_names(self, user_ids: Set[int]) -> Dict[int, str]:
+        """用户名称: {user_id: name}"""
+        return self._cached_lookup(self._user_cache, user_ids, self._load_user_names)
+
+    def _load_posts(self, post_ids: Set[int]) -> Dict[int, Tuple[str, str]]:
+        rows = self._query_in("""
+            SELECT p.post_id, p.content, u.agent_id, u.name, u.user_name
+            FROM post p
+            LEFT JOIN user u ON p.user_id = u.user_id
+            WHERE p.post_id IN ({placeholders})
+        """, post_ids)
+        return {
+            post_id: (content or '', self._author_name(agent_id, name, user_name))
+            for post_id, content, agent_id, name, user_name in rows
+        }
+
+    def _load_comments(self, comment_ids: Set[int]) -> Dict[int, Tuple[str, str]]:
+        rows = self._query_in("""
+            SELECT c.comment_id, c.content, u.agent_id, u.name, u.user_name
+            FROM comment c
+            LEFT JOIN user u ON c.user_id = u.user_id
+            WHERE c.comment_id IN ({placeholders})
+        """, comment_ids)
+        return {
+            comment_id: (content or '', self._author_name(agent_id, name, user_name))
+            for comment_id, content, agent_id, name, user_name in rows
+        }
+
+    def _load_user_names(self, user_ids: Set[int]) -> Dict[int, str]:
+        rows = self._query_in("""
+            SELECT user_id, agent_id, name, user_name
+            FROM user
+            WHERE user_id IN ({placeholders})
+        """, user_ids)
+        return {
+            user_id: self._author_name(agent_id, name, user_name)
+            for user_id, agent_id, name, user_name in rows
+        }
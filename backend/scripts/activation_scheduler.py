@@ -0,0 +1,289 @@
+"""
+Agent 激活调度
+根据 simulation_config.json 的 time_config / agent_configs 决定每轮激活哪些 Agent，
+供 run_parallel_simulation.py、run_twitter_simulation.py、run_reddit_simulation.py 共用
+
+初始化时预先计算：
+- 每个小时可激活的 Agent（小时 -> Agent 位图，以及对应的下标和活跃度向量）
+- 每个小时的激活倍数（高峰 / 低谷 / 普通）
+
+每轮只需一次向量化的随机抽样，不再逐个遍历 agent_configs；
+Agent 对象在首次激活后缓存，避免每轮调用 agent_graph.get_agent
+
+激活计划：固定种子后可以在不调用 LLM 的情况下预先计算每轮激活的 Agent（--dry-run），
+写入 activation_schedule.json 并估算 LLM 调用量和耗时；正式运行时可以按该文件回放（--schedule）
+"""
+
+import json
+import math
+import os
+import zlib
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+
+HOURS_PER_DAY = 24
+
+# 与配置缺省值保持一致
+DEFAULT_ACTIVE_HOURS = list(range(8, 23))
+DEFAULT_ACTIVITY_LEVEL = 0.5
+DEFAULT_PEAK_HOURS = [9, 10, 11, 14, 15, 20, 21, 22]
+DEFAULT_OFF_PEAK_HOURS = [0, 1, 2, 3, 4, 5]
+
+# 激活计划文件（位于模拟目录）
+SCHEDULE_FILE = "activation_schedule.json"
+SCHEDULE_VERSION = 1
+
+# 每个平台环境的最大并发 LLM 请求数（与创建 OASIS 环境时的 semaphore 一致）
+DEFAULT_LLM_CONCURRENCY = 30
+# 估算耗时使用的单次 LLM 调用平均耗时（秒）
+DEFAULT_LLM_CALL_SECONDS = 10.0
+
+
+class ActivationScheduler:
+    """
+    Agent 激活调度器
+
+    每个平台的模拟使用一个实例（缓存的 Agent 对象属于该平台的环境）
+    """
+
+    def __init__(
+        self,
+        config: Dict[str, Any],
+        seed: Optional[int] = None,
+        platform: str = "",
+        replay: Optional[List[List[int]]] = None
+    ):
+        """
+        Args:
+            config: simulation_config.json 的内容
+            seed: 随机种子（None 表示不固定）
+            platform: 平台名称，同一种子下不同平台使用不同的随机序列
+            replay: 按轮次回放的 Agent ID 列表（来自激活计划，超出计划的轮次仍按配置抽样）
+        """
+        time_config = config.get("time_config", {})
+        agent_configs = config.get("agent_configs", [])
+
+        self.base_min = time_config.get("agents_per_hour_min", 5)
+        self.base_max = time_config.get("agents_per_hour_max", 20)
+
+        # 每个小时的激活倍数（高峰时段优先）
+        self.hour_multipliers = np.ones(HOURS_PER_DAY)
+        for hour in time_config.get("off_peak_hours", DEFAULT_OFF_PEAK_HOURS):
+            if 0 <= hour < HOURS_PER_DAY:
+                self.hour_multipliers[hour] = time_config.get("off_peak_activity_multiplier", 0.3)
+        for hour in time_config.get("peak_hours", DEFAULT_PEAK_HOURS):
+            if 0 <= hour < HOURS_PER_DAY:
+                self.hour_multipliers[hour] = time_config.get("peak_activity_multiplier", 1.5)
+
+        # Agent 向量：ID、活跃度，以及小时 -> 可激活 Agent 位图
+        count = len(agent_configs)
+        self.agent_ids = np.empty(count, dtype=np.int64)
+        self.activity_levels = np.empty(count, dtype=np.float64)
+        self.hour_mask = np.zeros((HOURS_PER_DAY, count), dtype=bool)
+        for index, cfg in enumerate(agent_configs):
+            self.agent_ids[index] = cfg.get("agent_id", 0)
+            self.activity_levels[index] = cfg.get("activity_level", DEFAULT_ACTIVITY_LEVEL)
+            for hour in cfg.get("active_hours", DEFAULT_ACTIVE_HOURS):
+                if isinstance(hour, (int, float)) and hour == int(hour) and 0 <= hour < HOURS_PER_DAY:
+                    self.hour_mask[int(hour), index] = True
+
+        # 每个小时可激活 Agent 的下标及其活跃度（抽样时直接使用）
+        self._eligible = [np.flatnonzero(self.hour_mask[hour]) for hour in range(HOURS_PER_DAY)]
+        self._eligible_levels = [self.activity_levels[indices] for indices in self._eligible]
+
+        self.seed = seed
+        self.platform = platform
+        if seed is None:
+            self.rng = np.random.default_rng()
+        else:
+            # 同一种子下各平台的随机序列互不相同且可复现
+            self.rng = np.random.default_rng([seed, zlib.crc32(platform.encode("utf-8"))])
+
+        self.replay = replay
+
+        # agent_id -> Agent 对象
+        self._agent_cache: Dict[int, Any] = {}
+
+    def sample_agent_ids(self, current_hour: int) -> List[int]:
+        """
+        抽样本轮激活的 Agent ID
+
+        与原逐个遍历的逻辑等价：目标数量在 [agents_per_hour_min, agents_per_hour_max] 间均匀抽取并乘以时段倍数，
+        当前小时可激活的 Agent 各自以 activity_level 的概率成为候选，再从候选中无放回抽取目标数量
+        """
+        hour = current_hour % HOURS_PER_DAY
+        target_count = int(self.rng.uniform(self.base_min, self.base_max) * self.hour_multipliers[hour])
+
+        eligible = self._eligible[hour]
+        if eligible.size == 0:
+            return []
+        candidates = eligible[self.rng.random(eligible.size) < self._eligible_levels[hour]]
+
+        count = min(target_count, candidates.size)
+        if count <= 0:
+            return []
+        selected = self.rng.choice(candidates, size=count, replace=False)
+        return self.agent_ids[selected].tolist()
+
+    def resolve_agents(self, env, agent_ids: List[int]) -> List[Tuple[int, Any]]:
+        """将 Agent ID 转换为 (agent_id, agent) 列表（无法获取的 Agent 跳过）"""
+        active_agents = []
+        for agent_id in agent_ids:
+            agent = self._agent_cache.get(agent_id)
+            if agent is None:
+                try:
+                    agent = env.agent_graph.get_agent(agent_id)
+                except Exception:
+                    continue
+                self._agent_cache[agent_id] = agent
+            active_agents.append((agent_id, agent))
+        return active_agents
+
+    def get_active_agents(self, env, current_hour: int, round_num: Optional[int] = None) -> List[Tuple[int, Any]]:
+        """
+        根据时间和配置决定本轮激活哪些Agent
+
+        Args:
+            round_num: 当前轮次（从 0 开始），回放激活计划时使用
+        """
+        if self.replay is not None and round_num is not None and 0 <= round_num < len(self.replay):
+            return self.resolve_agents(env, self.replay[round_num])
+        return self.resolve_agents(env, self.sample_agent_ids(current_hour))
+
+    def get_state(self) -> Dict[str, Any]:
+        """随机数生成器的当前状态（可 JSON 序列化，写入检查点）"""
+        return self.rng.bit_generator.state
+
+    def set_state(self, state: Dict[str, Any]):
+        """恢复 get_state 保存的随机数生成器状态，之后的抽样与中断前的运行一致"""
+        self.rng.bit_generator.state = state
+
+
+def count_total_rounds(config: Dict[str, Any], max_rounds: Optional[int] = None) -> int:
+    """模拟总轮数（指定 max_rounds 时截断）"""
+    time_config = config.get("time_config", {})
+    total_hours = time_config.get("total_simulation_hours", 72)
+    minutes_per_round = time_config.get("minutes_per_round", 30)
+    total_rounds = (total_hours * 60) // minutes_per_round
+    if max_rounds is not None and max_rounds > 0:
+        total_rounds = min(total_rounds, max_rounds)
+    return int(total_rounds)
+
+
+def round_hour(config: Dict[str, Any], round_num: int) -> int:
+    """第 round_num 轮（从 0 开始）对应的模拟小时（0-23）"""
+    minutes_per_round = config.get("time_config", {}).get("minutes_per_round", 30)
+    return int((round_num * minutes_per_round // 60) % HOURS_PER_DAY)
+
+
+def build_schedule(
+    config: Dict[str, Any],
+    platforms: List[str],
+    seed: Optional[int] = None,
+    max_rounds: Optional[int] = None,
+    llm_concurrency: int = DEFAULT_LLM_CONCURRENCY,
+    llm_call_seconds: float = DEFAULT_LLM_CALL_SECONDS
+) -> Dict[str, Any]:
+    """
+    计算完整的激活计划（不调用 LLM）
+
+    使用相同种子的正式运行（--seed）抽样结果与计划一致；未指定种子时随机生成一个并记录在计划中
+
+    Returns:
+        激活计划，platforms[platform]["rounds"][i] 为第 i 轮（从 0 开始）激活的 Agent ID
+    """
+    if seed is None:
+        seed = int(np.random.SeedSequence().entropy % (2 ** 32))
+
+    total_rounds = count_total_rounds(config, max_rounds)
+    schedule = {
+        "version": SCHEDULE_VERSION,
+        "simulation_id": config.get("simulation_id"),
+        "seed": seed,
+        "created_at": datetime.now().isoformat(),
+        "total_rounds": total_rounds,
+        "minutes_per_round": config.get("time_config", {}).get("minutes_per_round", 30),
+        "platforms": {},
+    }
+    for platform in platforms:
+        scheduler = ActivationScheduler(config, seed=seed, platform=platform)
+        schedule["platforms"][platform] = {
+            "rounds": [
+                scheduler.sample_agent_ids(round_hour(config, round_num))
+                for round_num in range(total_rounds)
+            ]
+        }
+
+    schedule["summary"] = summarize_schedule(schedule, llm_concurrency, llm_call_seconds)
+    return schedule
+
+
+def summarize_schedule(
+    schedule: Dict[str, Any],
+    llm_concurrency: int = DEFAULT_LLM_CONCURRENCY,
+    llm_call_seconds: float = DEFAULT_LLM_CALL_SECONDS
+) -> Dict[str, Any]:
+    """
+    估算激活计划的负载
+
+    每个激活的 Agent 每轮至少发起一次 LLM 调用；每个平台的并发受 llm_concurrency 限制，
+    一轮耗时约为 ceil(激活数 / 并发数) 次 LLM 调用，两个平台并行运行，总耗时取较长的平台
+    """
+    platforms = schedule.get("platforms", {})
+    total_rounds = schedule.get("total_rounds", 0)
+    concurrency = max(1, llm_concurrency)
+
+    per_round = []
+    platform_seconds = {platform: 0.0 for platform in platforms}
+    for round_num in range(total_rounds):
+        entry = {"round": round_num + 1, "llm_calls": 0, "concurrency": 0}
+        for platform, data in platforms.items():
+            rounds = data.get("rounds", [])
+            count = len(rounds[round_num]) if round_num < len(rounds) else 0
+            entry[platform] = count
+            entry["llm_calls"] += count
+            entry["concurrency"] += min(count, concurrency)
+            platform_seconds[platform] += math.ceil(count / concurrency) * llm_call_seconds
+        per_round.append(entry)
+
+    total_calls = sum(entry["llm_calls"] for entry in per_round)
+    return {
+        "total_rounds": total_rounds,
+        "total_llm_calls": total_calls,
+        "platform_llm_calls": {
+            platform: sum(len(ids) for ids in data.get("rounds", []))
+            for platform, data in platforms.items()
+        },
+        "avg_llm_calls_per_round": round(total_calls / total_rounds, 2) if total_rounds else 0,
+        "max_llm_calls_per_round": max((entry["llm_calls"] for entry in per_round), default=0),
+        "peak_concurrency": max((entry["concurrency"] for entry in per_round), default=0),
+        "llm_concurrency": concurrency,
+        "llm_call_seconds": llm_call_seconds,
+        "estimated_duration_seconds": round(max(platform_seconds.values(), default=0.0), 1),
+        "platform_duration_seconds": {platform: round(seconds, 1) for platform, seconds in platform_seconds.items()},
+        "per_round": per_round,
+    }
+
+
+def save_schedule(schedule: Dict[str, Any], path: str):
+    """写入激活计划（先写临时文件再替换）"""
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(schedule, f, ensure_ascii=False)
+    os.replace(tmp_path, path)
+
+
+def load_schedule(path: str) -> Dict[str, Any]:
+    """读取激活计划（格式不正确时抛出 ValueError）"""
+    with open(path, 'r', encoding='utf-8') as f:
+        schedule = json.load(f)
+    if not isinstance(schedule, dict) or schedule.get("version") != SCHEDULE_VERSION:
+        raise ValueError(f"不支持的激活计划文件: {path}")
+    for platform, data in schedule.get("platforms", {}).items():
+        rounds = data.get("rounds") if isinstance(data, dict) else None
+        if not isinstance(rounds, list) or not all(isinstance(ids, list) for ids in rounds):
+            raise ValueError(f"激活计划格式错误: platform={platform}")
+    return schedule
@@ -0,0 +1,83 @@
+"""
+IPC 命令目录监听
+等待命令模式下用 inotify 监听 ipc_commands/ 目录，有新命令文件写入时立即唤醒，
+空闲时不再周期性地 listdir + getmtime
+
+平台不支持 inotify（非 Linux、fd 数量耗尽等）时回退到自适应轮询：
+空闲时轮询间隔按指数增长到上限，收到命令后重置为最小间隔
+（inotify 底层封装见 inotify_watch.py，与 Flask 后端共用）
+"""
+
+import asyncio
+from typing import Optional
+
+from inotify_watch import BaseDirectoryWatcher, MIN_POLL_INTERVAL, MAX_POLL_INTERVAL
+
+
+class DirectoryWatcher(BaseDirectoryWatcher):
+    """
+    目录变化监听器（在模拟进程的事件循环中使用）
+
+    - inotify 可用时: has_changes() 只在目录有新文件写入后返回 True，
+      changed 事件可与其他等待条件一起 await
+    - 回退模式: has_changes() 总是返回 True，next_interval() 给出下一次轮询的等待时间
+    """
+
+    def __init__(
+        self,
+        directory: str,
+        min_interval: float = MIN_POLL_INTERVAL,
+        max_interval: float = MAX_POLL_INTERVAL
+    ):
+        super().__init__(directory, min_interval, max_interval)
+        self.changed: Optional[asyncio.Event] = None
+        self._loop = None
+
+    def start(self) -> bool:
+        """
+        开始监听（需要在事件循环中调用）
+
+        Returns:
+            True 表示使用 inotify，False 表示回退到自适应轮询
+        """
+        self.changed = asyncio.Event()
+
+        error = self._open()
+        if error:
+            print(error)
+            return False
+
+        self._loop = asyncio.get_running_loop()
+        self._loop.add_reader(self._fd, self._on_readable)
+        return True
+
+    def stop(self):
+        """停止监听"""
+        if self._fd is None:
+            return
+        try:
+            self._loop.remove_reader(self._fd)
+        except Exception:
+            pass
+        self._close()
+        self._loop = None
+
+    def _on_readable(self):
+        if self._drain():
+            self._pending = True
+            self.changed.set()
+
+    def has_changes(self) -> bool:
+        """
+        自上次调用以来目录是否可能有新文件（返回 True 时调用方需要扫描目录）
+        """
+        pending = super().has_changes()
+        if self.changed is not None:
+            self.changed.clear()
+        return pending
+
+    def mark_pending(self):
+        """要求下一次 has_changes() 返回 True（例如本次扫描还有未取完的命令）"""
+        super().mark_pending()
+        if self.changed is not None:
+            self.changed.set()
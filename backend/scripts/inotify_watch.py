@@ -0,0 +1,189 @@
+"""
+inotify 目录监听（底层封装）
+通过 ctypes 调用 libc 的 inotify 接口（无额外依赖），不可用时回退到自适应轮询：
+等待间隔从最小值开始按指数增长到上限
+
+模拟进程（scripts/dir_watcher.py，asyncio 版本）和 Flask 后端
+（app/utils/dir_watcher.py，阻塞版本）共用本模块，只各自实现等待方式
+"""
+
+import ctypes
+import ctypes.util
+import os
+import struct
+import sys
+from typing import Iterator, Optional, Tuple
+
+
+# inotify 事件掩码（见 <sys/inotify.h>）
+IN_MODIFY = 0x00000002
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_TO = 0x00000080
+IN_IGNORED = 0x00008000
+IN_NONBLOCK = 0o4000
+IN_CLOEXEC = 0o2000000
+
+# 自适应轮询间隔（秒）
+MIN_POLL_INTERVAL = 0.01
+MAX_POLL_INTERVAL = 1.0
+
+# struct inotify_event 的固定头部: wd, mask, cookie, len
+_EVENT_HEADER = struct.Struct("iIII")
+
+_libc = None
+
+
+def _load_libc():
+    global _libc
+    if _libc is None and sys.platform.startswith("linux"):
+        try:
+            _libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+        except OSError:
+            _libc = False
+    return _libc or None
+
+
+def inotify_init() -> Tuple[Optional[int], Optional[str]]:
+    """
+    创建非阻塞的 inotify 描述符
+
+    Returns:
+        (fd, None)；不可用时返回 (None, 原因)
+    """
+    libc = _load_libc()
+    if libc is None:
+        return None, "当前平台不支持 inotify"
+
+    fd = libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+    if fd < 0:
+        return None, os.strerror(ctypes.get_errno())
+    return fd, None
+
+
+def inotify_add_watch(fd: int, directory: str, mask: int) -> Tuple[int, Optional[str]]:
+    """
+    监听目录
+
+    Returns:
+        (wd, None)；失败时返回 (-1, 原因)
+    """
+    wd = _load_libc().inotify_add_watch(fd, os.fsencode(directory), mask)
+    if wd < 0:
+        return -1, os.strerror(ctypes.get_errno())
+    return wd, None
+
+
+def inotify_rm_watch(fd: int, wd: int):
+    """取消目录监听"""
+    _load_libc().inotify_rm_watch(fd, wd)
+
+
+def read_events(fd: int) -> Iterator[Tuple[int, int, str]]:
+    """读空 inotify 事件队列，逐个返回 (wd, mask, 文件名)"""
+    while True:
+        try:
+            data = os.read(fd, 65536)
+        except (BlockingIOError, InterruptedError, OSError):
+            break
+        if not data:
+            break
+
+        offset = 0
+        while offset + _EVENT_HEADER.size <= len(data):
+            wd, mask, _, name_len = _EVENT_HEADER.unpack_from(data, offset)
+            name = data[offset + _EVENT_HEADER.size:offset + _EVENT_HEADER.size + name_len]
+            offset += _EVENT_HEADER.size + name_len
+            yield wd, mask, os.fsdecode(name.rstrip(b"\0"))
+
+
+class BaseDirectoryWatcher:
+    """
+    单目录变化监听（只关心有新文件写入）
+
+    - inotify 可用时: has_changes() 只在目录有新文件写入后返回 True
+    - 回退模式: has_changes() 总是返回 True，next_interval() 给出下一次轮询的等待时间
+
+    子类实现 start() / stop()，决定如何等待描述符可读
+    """
+
+    def __init__(
+        self,
+        directory: str,
+        min_interval: float = MIN_POLL_INTERVAL,
+        max_interval: float = MAX_POLL_INTERVAL
+    ):
+        self.directory = directory
+        self.min_interval = min_interval
+        self.max_interval = max(min_interval, max_interval)
+        self._fd: Optional[int] = None
+        self._interval = min_interval
+        # 启动前已经存在的文件也需要扫描一次
+        self._pending = True
+
+    @property
+    def is_inotify(self) -> bool:
+        return self._fd is not None
+
+    def fileno(self) -> Optional[int]:
+        """inotify 文件描述符（可注册到事件循环 add_reader），回退模式下为 None"""
+        return self._fd
+
+    def _open(self) -> Optional[str]:
+        """
+        创建 inotify 描述符并监听目录
+
+        Returns:
+            None 表示使用 inotify；否则为回退到轮询的原因
+        """
+        self._pending = True
+
+        fd, error = inotify_init()
+        if fd is None:
+            return f"inotify 不可用，使用轮询: {error}"
+
+        _, error = inotify_add_watch(fd, self.directory, IN_CLOSE_WRITE | IN_MOVED_TO)
+        if error:
+            os.close(fd)
+            return f"inotify 监听目录失败，使用轮询: {self.directory}, {error}"
+
+        self._fd = fd
+        return None
+
+    def _close(self):
+        if self._fd is not None:
+            os.close(self._fd)
+            self._fd = None
+
+    def _drain(self) -> bool:
+        """读空 inotify 事件队列，返回是否读到了事件"""
+        got_events = False
+        for _ in read_events(self._fd):
+            got_events = True
+        return got_events
+
+    def has_changes(self) -> bool:
+        """
+        自上次调用以来目录是否可能有新文件（非阻塞；返回 True 时调用方需要扫描目录）
+        """
+        if self._fd is None:
+            return True
+
+        if self._drain():
+            self._pending = True
+        pending = self._pending
+        self._pending = False
+        return pending
+
+    def mark_pending(self):
+        """要求下一次 has_changes() 返回 True（例如本次扫描还有未取完的文件）"""
+        self._pending = True
+
+    def next_interval(self) -> float:
+        """回退模式下下一次轮询前的等待时间（每次调用后按指数增长）"""
+        interval = self._interval
+        self._interval = min(self._interval * 2, self.max_interval)
+        return interval
+
+    def reset_backoff(self):
+        """目录有活动后把轮询间隔重置为最小值"""
+        self._interval = self.min_interval
@@ -0,0 +1,149 @@
+"""
+Interview 结果读取
+从 OASIS 数据库的 trace 表读取采访结果，供各模拟脚本的 IPC 处理器共用
+
+- 环境启动时为 trace 表创建 (action, user_id, created_at) 索引
+- 使用持久化的只读连接，批量采访后每个平台只执行一次查询
+"""
+
+import json
+import os
+import sqlite3
+from pathlib import Path
+from typing import Dict, Any, Iterable, List, Optional, Tuple
+
+
+# trace 表中采访记录的 action 值（与 oasis.ActionType.INTERVIEW.value 一致）
+INTERVIEW_ACTION = "interview"
+
+INTERVIEW_INDEX_NAME = "idx_trace_action_user_created"
+
+# 单条 SQL 中 IN (...) 参数个数上限（SQLite 默认限制为 999）
+MAX_SQL_PARAMS = 900
+
+
+def create_interview_index(db_path: str):
+    """为 trace 表创建采访查询索引（在环境 reset 之后调用，已存在时跳过）"""
+    if not os.path.exists(db_path):
+        return
+
+    try:
+        conn = sqlite3.connect(db_path)
+        try:
+            conn.execute(
+                f"CREATE INDEX IF NOT EXISTS {INTERVIEW_INDEX_NAME} "
+                f"ON trace(action, user_id, created_at)"
+            )
+            conn.commit()
+        finally:
+            conn.close()
+    except sqlite3.Error as e:
+        print(f"  创建trace索引失败: {e}")
+
+
+def parse_interview_row(agent_id: int, info_json: Optional[str], created_at) -> Dict[str, Any]:
+    """把 trace 表中的采访记录转换为结果字典"""
+    result = {
+        "agent_id": agent_id,
+        "response": None,
+        "timestamp": created_at
+    }
+    try:
+        info = json.loads(info_json) if info_json else {}
+        result["response"] = info.get("response", info)
+    except json.JSONDecodeError:
+        result["response"] = info_json
+    return result
+
+
+class InterviewResultReader:
+    """
+    单个平台数据库的采访结果读取器
+
+    持有一个只读连接（首次查询时打开），在模拟进程的事件循环线程中使用
+    """
+
+    def __init__(self, db_path: str):
+        self.db_path = db_path
+        self._conn: Optional[sqlite3.Connection] = None
+
+    def _get_conn(self) -> Optional[sqlite3.Connection]:
+        if self._conn is None:
+            if not os.path.exists(self.db_path):
+                return None
+            uri = f"{Path(self.db_path).resolve().as_uri()}?mode=ro"
+            self._conn = sqlite3.connect(uri, uri=True)
+        return self._conn
+
+    def close(self):
+        if self._conn is not None:
+            try:
+                self._conn.close()
+            except sqlite3.Error:
+                pass
+            self._conn = None
+
+    def _query(self, sql: str, params: Tuple) -> List[Tuple]:
+        try:
+            conn = self._get_conn()
+            if conn is None:
+                return []
+            return conn.execute(sql, params).fetchall()
+        except sqlite3.Error as e:
+            print(f"  读取Interview结果失败: {e}")
+            # 连接可能已失效（例如数据库被替换），下次查询时重新打开
+            self.close()
+            return []
+
+    def get_latest_results(self, agent_ids: Iterable[int]) -> Dict[int, Dict[str, Any]]:
+        """
+        批量获取每个Agent最新的采访结果
+
+        Returns:
+            {agent_id: {"agent_id", "response", "timestamp"}}，没有记录的Agent返回空结果
+        """
+        agent_ids = list(dict.fromkeys(agent_ids))
+        results = {
+            agent_id: {"agent_id": agent_id, "response": None, "timestamp": None}
+            for agent_id in agent_ids
+        }
+
+        for start in range(0, len(agent_ids), MAX_SQL_PARAMS):
+            chunk = agent_ids[start:start + MAX_SQL_PARAMS]
+            placeholders = ",".join("?" * len(chunk))
+            rows = self._query(f"""
+                SELECT user_id, info, created_at FROM (
+                    SELECT user_id, info, created_at,
+                           ROW_NUMBER() OVER (
+                               PARTITION BY user_id
+                               ORDER BY created_at DESC, rowid DESC
+                           ) AS rn
+                    FROM trace
+                    WHERE action = ? AND user_id IN ({placeholders})
+                )
+                WHERE rn = 1
+            """, (INTERVIEW_ACTION, *chunk))
+
+            for user_id, info_json, created_at in rows:
+                if user_id in results:
+                    results[user_id] = parse_interview_row(user_id, info_json, created_at)
+
+        return results
+
+    def get_latest_result(self, agent_id: int) -> Dict[str, Any]:
+        """获取单个Agent最新的采访结果"""
+        return self.get_latest_results([agent_id])[agent_id]
+
+    def get_max_rowid(self) -> int:
+        """获取 trace 表当前最大 rowid"""
+        rows = self._query("SELECT MAX(rowid) FROM trace", ())
+        return (rows[0][0] or 0) if rows else 0
+
+    def fetch_since(self, since_rowid: int) -> List[Tuple]:
+        """读取 rowid 大于 since_rowid 的采访记录: [(rowid, user_id, info, created_at), ...]"""
+        return self._query("""
+            SELECT rowid, user_id, info, created_at
+            FROM trace
+            WHERE rowid > ? AND action = ?
+            ORDER BY rowid ASC
+        """, (since_rowid, INTERVIEW_ACTION))
@@ -0,0 +1,224 @@
+"""
+IPC Socket 传输层
+为模拟脚本提供基于 Unix Domain Socket 的命令通道，避免文件轮询带来的延迟
+
+协议（每帧一行 JSON，以换行符分隔，通过 command_id 关联请求和响应）:
+    请求帧: {"command_id": "...", "command_type": "...", "args": {...}, "timestamp": "..."}
+    响应帧: {"command_id": "...", "status": "...", "result": {...}, "error": null, "timestamp": "..."}
+
+    status 为 completed/failed 的帧是最终响应；流式命令在最终响应之前
+    可以发送任意个 status 为 processing 的中间结果帧
+
+文件协议（ipc_commands/ + ipc_responses/）保留为自动回退方案：
+- 平台不支持 AF_UNIX 或 socket 创建失败时，仅使用文件协议
+- Flask 端连接 socket 失败时，自动改用文件协议发送命令
+"""
+
+import asyncio
+import hashlib
+import json
+import os
+import socket
+import sys
+import tempfile
+from typing import Dict, Any, Optional, Set
+
+
+IPC_SOCKET_FILE = "ipc.sock"
+
+# AF_UNIX 路径长度上限（Linux 为 108，macOS 为 104），留出余量
+MAX_SOCKET_PATH_LENGTH = 100
+
+# 单帧最大长度（批量采访的命令/响应可能较大）
+MAX_FRAME_SIZE = 16 * 1024 * 1024
+
+
+def is_socket_supported() -> bool:
+    """当前平台是否支持 Unix Domain Socket"""
+    return hasattr(socket, "AF_UNIX") and sys.platform != "win32"
+
+
+def get_socket_path(simulation_dir: str) -> str:
+    """
+    获取模拟的 socket 文件路径
+
+    默认放在模拟目录下；路径过长时改放到系统临时目录（以模拟目录的哈希命名）
+    """
+    socket_path = os.path.join(os.path.abspath(simulation_dir), IPC_SOCKET_FILE)
+    if len(socket_path.encode("utf-8")) <= MAX_SOCKET_PATH_LENGTH:
+        return socket_path
+
+    digest = hashlib.sha1(os.path.abspath(simulation_dir).encode("utf-8")).hexdigest()[:16]
+    return os.path.join(tempfile.gettempdir(), f"mirofish_{digest}.sock")
+
+
+class IPCSocketServer:
+    """
+    IPC Socket 服务端（模拟脚本端使用）
+
+    接收到的命令放入队列，由 IPC 处理器与文件命令统一消费；
+    响应通过 send_response 写回发出该命令的连接
+    """
+
+    def __init__(self, simulation_dir: str):
+        self.socket_path = get_socket_path(simulation_dir)
+        self.commands: Optional[asyncio.Queue] = None
+        self.command_arrived: Optional[asyncio.Event] = None
+        self._server = None
+        # command_id -> 发出该命令的连接
+        self._writers: Dict[str, asyncio.StreamWriter] = {}
+        # 所有打开的连接（Flask 端的调度器会保持长连接）
+        self._connections: Set[asyncio.StreamWriter] = set()
+
+    @property
+    def is_running(self) -> bool:
+        return self._server is not None
+
+    async def start(self) -> bool:
+        """
+        启动 socket 服务
+
+        Returns:
+            True 表示启动成功，False 表示不可用（使用文件协议回退）
+        """
+        if not is_socket_supported():
+            return False
+
+        self.commands = asyncio.Queue()
+        self.command_arrived = asyncio.Event()
+
+        # 清理上次异常退出残留的 socket 文件
+        self._remove_socket_file()
+
+        try:
+            self._server = await asyncio.start_unix_server(
+                self._handle_connection,
+                path=self.socket_path,
+                limit=MAX_FRAME_SIZE
+            )
+        except OSError as e:
+            print(f"IPC Socket 启动失败，使用文件协议: {e}")
+            self._server = None
+            return False
+
+        print(f"IPC Socket 已启动: {self.socket_path}")
+        return True
+
+    async def stop(self):
+        """停止 socket 服务"""
+        if self._server is None:
+            return
+
+        self._server.close()
+        try:
+            await self._server.wait_closed()
+        except Exception:
+            pass
+        self._server = None
+
+        for writer in set(self._writers.values()) | self._connections:
+            try:
+                writer.close()
+            except Exception:
+                pass
+        self._writers.clear()
+        self._connections.clear()
+
+        self._remove_socket_file()
+
+    def _remove_socket_file(self):
+        try:
+            os.remove(self.socket_path)
+        except OSError:
+            pass
+
+    async def _handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        """处理单个客户端连接（一个连接上可以有多个进行中的命令）"""
+        self._connections.add(writer)
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+
+                try:
+                    command = json.loads(line)
+                except json.JSONDecodeError:
+                    continue
+
+                command_id = command.get("command_id") if isinstance(command, dict) else None
+                if not command_id:
+                    continue
+
+                self._writers[command_id] = writer
+                self.commands.put_nowait(command)
+                self.command_arrived.set()
+        except (ConnectionError, asyncio.IncompleteReadError, ValueError):
+            pass
+        except asyncio.CancelledError:
+            # 环境关闭时事件循环取消仍然打开的长连接
+            pass
+        finally:
+            self._connections.discard(writer)
+            # 保留 _writers 中的记录：命令完成时发现连接已关闭会直接丢弃响应，
+            # 避免回退写入无人读取的响应文件
+            try:
+                writer.close()
+            except Exception:
+                pass
+
+    def get_command_nowait(self) -> Optional[Dict[str, Any]]:
+        """取出一个通过 socket 收到的命令，没有则返回 None"""
+        if self.commands is None:
+            return None
+        try:
+            command = self.commands.get_nowait()
+        except asyncio.QueueEmpty:
+            return None
+        if self.commands.empty():
+            self.command_arrived.clear()
+        return command
+
+    def is_socket_command(self, command_id: str) -> bool:
+        """命令是否通过仍然连接着的 socket 收到（可以发送中间结果帧）"""
+        writer = self._writers.get(command_id)
+        return writer is not None and not writer.is_closing()
+
+    def send_partial(self, response: Dict[str, Any]) -> bool:
+        """
+        发送中间结果帧（不结束命令）
+
+        Returns:
+            True 表示已发送
+        """
+        writer = self._writers.get(response.get("command_id"))
+        if writer is None or writer.is_closing():
+            return False
+
+        try:
+            writer.write((json.dumps(response, ensure_ascii=False) + "\n").encode("utf-8"))
+        except Exception as e:
+            print(f"IPC Socket 发送中间结果失败: {e}")
+            return False
+        return True
+
+    def send_response(self, response: Dict[str, Any]) -> bool:
+        """
+        将响应写回发出命令的连接
+
+        Returns:
+            True 表示该命令由 socket 处理（已发送，或连接已断开而丢弃）；
+            False 表示该命令不是通过 socket 收到的，需要走文件协议
+        """
+        writer = self._writers.pop(response.get("command_id"), None)
+        if writer is None:
+            return False
+        if writer.is_closing():
+            print(f"IPC Socket 连接已断开，丢弃响应: command_id={response.get('command_id')}")
+            return True
+
+        try:
+            writer.write((json.dumps(response, ensure_ascii=False) + "\n").encode("utf-8"))
+        except Exception as e:
+            print(f"IPC Socket 发送响应失败: {e}")
+        return True
@@ -5,8 +5,8 @@ OASIS 双平台并行模拟预设脚本
 功能特性:
 - 双平台（Twitter + Reddit）并行模拟
 - 完成模拟后不立即关闭环境，进入等待命令模式
-- 支持通过IPC接收Interview命令
-- 支持单个Agent采访和批量采访
+- 支持通过IPC接收Interview命令（优先 Unix Socket，不可用时回退到文件协议）
+- 支持单个Agent采访和批量采访（多个命令并发执行）
 - 支持远程关闭环境命令
 
 使用方式:
@@ -14,6 +14,8 @@ OASIS 双平台并行模拟预设脚本
     python run_parallel_simulation.py --config simulation_config.json --no-wait  # 完成后立即关闭
     python run_parallel_simulation.py --config simulation_config.json --twitter-only
     python run_parallel_simulation.py --config simulation_config.json --reddit-only
+    python run_parallel_simulation.py --config simulation_config.json --ipc-concurrency 8  # 同时执行的采访命令数
+    python run_parallel_simulation.py --config simulation_config.json --resume  # 从最近的检查点继续
 
 日志结构:
     sim_xxx/
@@ -22,6 +24,7 @@ OASIS 双平台并行模拟预设脚本
     ├── reddit/
     │   └── actions.jsonl    # Reddit 平台动作日志
     ├── simulation.log       # 主模拟进程日志
+    ├── checkpoints/         # 各平台的检查点（见 simulation_checkpoint）
     └── run_state.json       # 运行状态（API 查询用）
 """
 
@@ -66,12 +69,11 @@ if sys.platform == 'win32':
 
 import argparse
 import asyncio
+import contextlib
 import json
 import logging
 import multiprocessing
-import random
 import signal
-import sqlite3
 import warnings
 from datetime import datetime
 from typing import Dict, Any, List, Optional, Tuple
@@ -156,6 +158,20 @@ def init_logging_for_simulation(simulation_dir: str):
 
 
 from action_logger import SimulationLogManager, PlatformActionLogger
+from ipc_socket import IPCSocketServer
+from dir_watcher import DirectoryWatcher
+from interview_results import InterviewResultReader, create_interview_index, parse_interview_row
+from action_trace_reader import ActionTraceReader
+from activation_scheduler import (
+    ActivationScheduler,
+    DEFAULT_LLM_CALL_SECONDS,
+    DEFAULT_LLM_CONCURRENCY,
+    SCHEDULE_FILE,
+    build_schedule,
+    load_schedule,
+    save_schedule,
+)
+from simulation_checkpoint import PlatformCheckpointer, DEFAULT_CHECKPOINT_INTERVAL
 
 try:
     from camel.models import ModelFactory
@@ -207,6 +223,12 @@ IPC_COMMANDS_DIR = "ipc_commands"
 IPC_RESPONSES_DIR = "ipc_responses"
 ENV_STATUS_FILE = "env_status.json"
 
+# 等待命令模式下同时执行的IPC命令数上限（可通过 --ipc-concurrency 调整）
+DEFAULT_IPC_CONCURRENCY = 4
+
+# 流式批量采访时检查 trace 表新结果的间隔（秒）
+STREAM_POLL_INTERVAL = 0.5
+
 class CommandType:
     """命令类型常量"""
     INTERVIEW = "interview"
@@ -219,6 +241,10 @@ class ParallelIPCHandler:
     双平台IPC命令处理器
     
     管理两个平台的环境，处理Interview命令
+    
+    命令以并发 asyncio 任务执行（数量受 max_concurrent_commands 限制），
+    同一平台上的同一个Agent通过锁保证同一时刻只参与一次 env.step，
+    因此不同Agent的采访可以并行进行，长时间的批量采访不会阻塞其他命令
     """
     
     def __init__(
@@ -227,7 +253,8 @@ class ParallelIPCHandler:
         twitter_env=None,
         twitter_agent_graph=None,
         reddit_env=None,
-        reddit_agent_graph=None
+        reddit_agent_graph=None,
+        max_concurrent_commands: int = DEFAULT_IPC_CONCURRENCY
     ):
         self.simulation_dir = simulation_dir
         self.twitter_env = twitter_env
@@ -242,19 +269,67 @@ class ParallelIPCHandler:
         # 确保目录存在
         os.makedirs(self.commands_dir, exist_ok=True)
         os.makedirs(self.responses_dir, exist_ok=True)
+        
+        # Socket 传输（不可用时回退到文件协议）
+        self.socket_server = IPCSocketServer(simulation_dir)
+        
+        # 命令目录监听（inotify，不可用时回退到自适应轮询）
+        self.command_watcher = DirectoryWatcher(self.commands_dir)
+        
+        # 并发执行控制
+        self._command_semaphore = asyncio.Semaphore(max(1, max_concurrent_commands))
+        self._inflight: Dict[str, asyncio.Task] = {}  # command_id -> 执行中的任务
+        self._agent_locks: Dict[Tuple[str, int], asyncio.Lock] = {}  # (platform, agent_id) -> 锁
+        
+        # 采访结果读取器（每个平台一个持久化只读连接）
+        self._result_readers: Dict[str, InterviewResultReader] = {}
+    
+    def _get_result_reader(self, platform: str) -> InterviewResultReader:
+        reader = self._result_readers.get(platform)
+        if reader is None:
+            db_path = os.path.join(self.simulation_dir, f"{platform}_simulation.db")
+            reader = InterviewResultReader(db_path)
+            self._result_readers[platform] = reader
+        return reader
+    
+    def close_result_readers(self):
+        """关闭采访结果读取连接"""
+        for reader in self._result_readers.values():
+            reader.close()
+        self._result_readers.clear()
+    
+    async def start_ipc(self) -> bool:
+        """
+        启动命令通道：IPC Socket 服务和命令目录监听
+        
+        Returns:
+            True 表示 socket 可用
+        """
+        if self.command_watcher.start():
+            print(f"命令目录监听已启动(inotify): {self.commands_dir}")
+        return await self.socket_server.start()
+    
+    async def stop_ipc(self):
+        """停止 IPC Socket 服务和命令目录监听"""
+        self.command_watcher.stop()
+        await self.socket_server.stop()
     
     def update_status(self, status: str):
         """更新环境状态"""
+        socket_path = self.socket_server.socket_path if self.socket_server.is_running and status == "alive" else None
         with open(self.status_file, 'w', encoding='utf-8') as f:
             json.dump({
                 "status": status,
                 "twitter_available": self.twitter_env is not None,
                 "reddit_available": self.reddit_env is not None,
+                "socket_path": socket_path,
                 "timestamp": datetime.now().isoformat()
             }, f, ensure_ascii=False, indent=2)
     
     def poll_command(self) -> Optional[Dict[str, Any]]:
-        """轮询获取待处理命令"""
+        """获取待处理的文件命令（命令目录没有新文件写入时不扫描目录）"""
+        if not self.command_watcher.has_changes():
+            return None
         if not os.path.exists(self.commands_dir):
             return None
         
@@ -262,20 +337,72 @@ class ParallelIPCHandler:
         command_files = []
         for filename in os.listdir(self.commands_dir):
             if filename.endswith('.json'):
+                # 跳过正在执行的命令（命令文件在发送响应后才删除）
+                if filename[:-len('.json')] in self._inflight:
+                    continue
                 filepath = os.path.join(self.commands_dir, filename)
-                command_files.append((filepath, os.path.getmtime(filepath)))
+                try:
+                    command_files.append((filepath, os.path.getmtime(filepath)))
+                except OSError:
+                    continue
         
         command_files.sort(key=lambda x: x[1])
         
         for filepath, _ in command_files:
             try:
                 with open(filepath, 'r', encoding='utf-8') as f:
-                    return json.load(f)
+                    command = json.load(f)
             except (json.JSONDecodeError, OSError):
                 continue
+            # 目录中可能还有其他命令，下次继续扫描
+            self.command_watcher.mark_pending()
+            return command
         
         return None
     
+    def _agent_lock(self, platform: str, agent_id: int) -> asyncio.Lock:
+        """获取 (平台, Agent) 对应的锁"""
+        key = (platform, agent_id)
+        lock = self._agent_locks.get(key)
+        if lock is None:
+            lock = asyncio.Lock()
+            self._agent_locks[key] = lock
+        return lock
+    
+    @contextlib.asynccontextmanager
+    async def _lock_agents(self, platform: str, agent_ids: List[int]):
+        """按固定顺序获取一组Agent的锁，避免并发批量采访之间死锁"""
+        async with contextlib.AsyncExitStack() as stack:
+            for agent_id in sorted(set(agent_ids), key=str):
+                await stack.enter_async_context(self._agent_lock(platform, agent_id))
+            yield
+    
+    async def wait_for_command(self, shutdown_event: asyncio.Event) -> bool:
+        """
+        等待下一个命令：socket 命令到达或命令目录有新文件时立即返回；
+        inotify 不可用时按自适应轮询间隔（空闲越久间隔越长）返回
+        
+        Returns:
+            True 表示收到退出信号
+        """
+        waiters = [asyncio.ensure_future(shutdown_event.wait())]
+        if self.socket_server.is_running:
+            waiters.append(asyncio.ensure_future(self.socket_server.command_arrived.wait()))
+        
+        timeout = None
+        if self.command_watcher.is_inotify:
+            waiters.append(asyncio.ensure_future(self.command_watcher.changed.wait()))
+        else:
+            timeout = self.command_watcher.next_interval()
+        
+        try:
+            await asyncio.wait(waiters, timeout=timeout, return_when=asyncio.FIRST_COMPLETED)
+        finally:
+            for waiter in waiters:
+                waiter.cancel()
+        
+        return shutdown_event.is_set()
+    
     def send_response(self, command_id: str, status: str, result: Dict = None, error: str = None):
         """发送响应"""
         response = {
@@ -286,6 +413,10 @@ class ParallelIPCHandler:
             "timestamp": datetime.now().isoformat()
         }
         
+        # 通过 socket 收到的命令直接写回连接
+        if self.socket_server.send_response(response):
+            return
+        
         response_file = os.path.join(self.responses_dir, f"{command_id}.json")
         with open(response_file, 'w', encoding='utf-8') as f:
             json.dump(response, f, ensure_ascii=False, indent=2)
@@ -333,9 +464,12 @@ class ParallelIPCHandler:
                 action_args={"prompt": prompt}
             )
             actions = {agent: interview_action}
-            await env.step(actions)
             
-            result = self._get_interview_result(agent_id, actual_platform)
+            # 锁住该Agent，直到读取到本次采访的结果
+            async with self._lock_agents(actual_platform, [agent_id]):
+                await env.step(actions)
+                result = self._get_result_reader(actual_platform).get_latest_result(agent_id)
+            
             result["platform"] = actual_platform
             return result
             
@@ -413,7 +547,13 @@ class ParallelIPCHandler:
             print(f"  Interview失败: agent_id={agent_id}, 所有平台都失败")
             return False
     
-    async def handle_batch_interview(self, command_id: str, interviews: List[Dict], platform: str = None) -> bool:
+    async def handle_batch_interview(
+        self,
+        command_id: str,
+        interviews: List[Dict],
+        platform: str = None,
+        stream: bool = False
+    ) -> bool:
         """
         处理批量采访命令
         
@@ -424,6 +564,8 @@ class ParallelIPCHandler:
                 - "twitter": 只采访Twitter平台
                 - "reddit": 只采访Reddit平台
                 - None/不指定: 每个Agent同时采访两个平台
+            stream: 是否流式返回（仅 socket 命令有效）：每个Agent的回答写入 trace 表后
+                立即作为中间结果帧发送，最终响应仍包含全部结果
         """
         # 按平台分组
         twitter_interviews = []
@@ -447,61 +589,20 @@ class ParallelIPCHandler:
             if self.reddit_env:
                 reddit_interviews.extend(both_platforms_interviews)
         
-        results = {}
-        
-        # 处理Twitter平台的采访
+        # 两个平台的环境互相独立，并行采访
+        tasks = []
         if twitter_interviews and self.twitter_env:
-            try:
-                twitter_actions = {}
-                for interview in twitter_interviews:
-                    agent_id = interview.get("agent_id")
-                    prompt = interview.get("prompt", "")
-                    try:
-                        agent = self.twitter_agent_graph.get_agent(agent_id)
-                        twitter_actions[agent] = ManualAction(
-                            action_type=ActionType.INTERVIEW,
-                            action_args={"prompt": prompt}
-                        )
-                    except Exception as e:
-                        print(f"  警告: 无法获取Twitter Agent {agent_id}: {e}")
-                
-                if twitter_actions:
-                    await self.twitter_env.step(twitter_actions)
-                    
-                    for interview in twitter_interviews:
-                        agent_id = interview.get("agent_id")
-                        result = self._get_interview_result(agent_id, "twitter")
-                        result["platform"] = "twitter"
-                        results[f"twitter_{agent_id}"] = result
-            except Exception as e:
-                print(f"  Twitter批量Interview失败: {e}")
-        
-        # 处理Reddit平台的采访
+            tasks.append(self._batch_interview_single_platform(
+                command_id, "twitter", twitter_interviews, stream
+            ))
         if reddit_interviews and self.reddit_env:
-            try:
-                reddit_actions = {}
-                for interview in reddit_interviews:
-                    agent_id = interview.get("agent_id")
-                    prompt = interview.get("prompt", "")
-                    try:
-                        agent = self.reddit_agent_graph.get_agent(agent_id)
-                        reddit_actions[agent] = ManualAction(
-                            action_type=ActionType.INTERVIEW,
-                            action_args={"prompt": prompt}
-                        )
-                    except Exception as e:
-                        print(f"  警告: 无法获取Reddit Agent {agent_id}: {e}")
-                
-                if reddit_actions:
-                    await self.reddit_env.step(reddit_actions)
-                    
-                    for interview in reddit_interviews:
-                        agent_id = interview.get("agent_id")
-                        result = self._get_interview_result(agent_id, "reddit")
-                        result["platform"] = "reddit"
-                        results[f"reddit_{agent_id}"] = result
-            except Exception as e:
-                print(f"  Reddit批量Interview失败: {e}")
+            tasks.append(self._batch_interview_single_platform(
+                command_id, "reddit", reddit_interviews, stream
+            ))
+        
+        results = {}
+        for platform_results in await asyncio.gather(*tasks):
+            results.update(platform_results)
         
         if results:
             self.send_response(command_id, "completed", result={
@@ -514,91 +615,195 @@ class ParallelIPCHandler:
             self.send_response(command_id, "failed", error="没有成功的采访")
             return False
     
-    def _get_interview_result(self, agent_id: int, platform: str) -> Dict[str, Any]:
-        """从数据库获取最新的Interview结果"""
-        db_path = os.path.join(self.simulation_dir, f"{platform}_simulation.db")
-        
-        result = {
-            "agent_id": agent_id,
-            "response": None,
-            "timestamp": None
-        }
+    async def _batch_interview_single_platform(
+        self,
+        command_id: str,
+        platform: str,
+        interviews: List[Dict],
+        stream: bool
+    ) -> Dict[str, Dict[str, Any]]:
+        """
+        在单个平台上执行批量采访
         
-        if not os.path.exists(db_path):
-            return result
+        Returns:
+            {"<platform>_<agent_id>": 采访结果}，失败时返回空字典
+        """
+        if platform == "twitter":
+            env, agent_graph, platform_name = self.twitter_env, self.twitter_agent_graph, "Twitter"
+        else:
+            env, agent_graph, platform_name = self.reddit_env, self.reddit_agent_graph, "Reddit"
         
+        results = {}
         try:
-            conn = sqlite3.connect(db_path)
-            cursor = conn.cursor()
-            
-            # 查询最新的Interview记录
-            cursor.execute("""
-                SELECT user_id, info, created_at
-                FROM trace
-                WHERE action = ? AND user_id = ?
-                ORDER BY created_at DESC
-                LIMIT 1
-            """, (ActionType.INTERVIEW.value, agent_id))
-            
-            row = cursor.fetchone()
-            if row:
-                user_id, info_json, created_at = row
+            actions = {}
+            for interview in interviews:
+                agent_id = interview.get("agent_id")
+                prompt = interview.get("prompt", "")
                 try:
-                    info = json.loads(info_json) if info_json else {}
-                    result["response"] = info.get("response", info)
-                    result["timestamp"] = created_at
-                except json.JSONDecodeError:
-                    result["response"] = info_json
-            
-            conn.close()
+                    agent = agent_graph.get_agent(agent_id)
+                    actions[agent] = ManualAction(
+                        action_type=ActionType.INTERVIEW,
+                        action_args={"prompt": prompt}
+                    )
+                except Exception as e:
+                    print(f"  警告: 无法获取{platform_name} Agent {agent_id}: {e}")
             
+            if actions:
+                agent_ids = [interview.get("agent_id") for interview in interviews]
+                async with self._lock_agents(platform, agent_ids):
+                    await self._step_with_partial_results(
+                        command_id, platform, env, actions, agent_ids, stream
+                    )
+                    
+                    latest = self._get_result_reader(platform).get_latest_results(agent_ids)
+                    for agent_id, result in latest.items():
+                        result["platform"] = platform
+                        results[f"{platform}_{agent_id}"] = result
         except Exception as e:
-            print(f"  读取Interview结果失败: {e}")
+            print(f"  {platform_name}批量Interview失败: {e}")
         
-        return result
+        return results
+    
+    async def _step_with_partial_results(
+        self,
+        command_id: str,
+        platform: str,
+        env,
+        actions: Dict,
+        agent_ids: List[int],
+        stream: bool
+    ):
+        """
+        执行采访 step；流式模式下同时监视 trace 表，把已完成的回答作为中间结果发送
+        """
+        if not stream or not self.socket_server.is_socket_command(command_id):
+            await env.step(actions)
+            return
+        
+        since_rowid = self._get_result_reader(platform).get_max_rowid()
+        step_done = asyncio.Event()
+        watcher = asyncio.create_task(self._stream_interview_results(
+            command_id, platform, set(agent_ids), since_rowid, step_done
+        ))
+        
+        try:
+            await env.step(actions)
+        finally:
+            step_done.set()
+            await watcher
+    
+    async def _stream_interview_results(
+        self,
+        command_id: str,
+        platform: str,
+        agent_ids: set,
+        since_rowid: int,
+        step_done: asyncio.Event
+    ):
+        """轮询 trace 表中新写入的采访记录，每个Agent的回答只发送一次"""
+        emitted = set()
+        
+        while True:
+            # 先读取 step 状态再查询，保证 step 结束后至少再查询一次
+            finished = step_done.is_set()
+            
+            for rowid, user_id, info_json, created_at in self._get_result_reader(platform).fetch_since(since_rowid):
+                since_rowid = max(since_rowid, rowid)
+                if user_id not in agent_ids or user_id in emitted:
+                    continue
+                emitted.add(user_id)
+                
+                result = parse_interview_row(user_id, info_json, created_at)
+                result["platform"] = platform
+                self.socket_server.send_partial({
+                    "command_id": command_id,
+                    "status": "processing",
+                    "result": {"key": f"{platform}_{user_id}", **result},
+                    "error": None,
+                    "timestamp": datetime.now().isoformat()
+                })
+            
+            if finished or emitted >= agent_ids:
+                return
+            
+            try:
+                await asyncio.wait_for(step_done.wait(), timeout=STREAM_POLL_INTERVAL)
+            except asyncio.TimeoutError:
+                pass
     
     async def process_commands(self) -> bool:
         """
-        处理所有待处理命令
+        取出所有待处理命令，并分发为并发任务执行
         
         Returns:
             True 表示继续运行，False 表示应该退出
         """
-        command = self.poll_command()
-        if not command:
-            return True
-        
-        command_id = command.get("command_id")
-        command_type = command.get("command_type")
-        args = command.get("args", {})
-        
-        print(f"\n收到IPC命令: {command_type}, id={command_id}")
-        
-        if command_type == CommandType.INTERVIEW:
-            await self.handle_interview(
-                command_id,
-                args.get("agent_id", 0),
-                args.get("prompt", ""),
-                args.get("platform")
-            )
-            return True
+        while True:
+            command = self.socket_server.get_command_nowait() or self.poll_command()
+            if not command:
+                return True
             
-        elif command_type == CommandType.BATCH_INTERVIEW:
-            await self.handle_batch_interview(
-                command_id,
-                args.get("interviews", []),
-                args.get("platform")
-            )
-            return True
+            self.command_watcher.reset_backoff()
+            command_id = command.get("command_id")
+            command_type = command.get("command_type")
+            args = command.get("args", {})
             
-        elif command_type == CommandType.CLOSE_ENV:
-            print("收到关闭环境命令")
-            self.send_response(command_id, "completed", result={"message": "环境即将关闭"})
-            return False
+            print(f"\n收到IPC命令: {command_type}, id={command_id}")
+            
+            if command_type == CommandType.CLOSE_ENV:
+                print("收到关闭环境命令")
+                self.send_response(command_id, "completed", result={"message": "环境即将关闭"})
+                return False
+            
+            if command_type not in (CommandType.INTERVIEW, CommandType.BATCH_INTERVIEW):
+                self.send_response(command_id, "failed", error=f"未知命令类型: {command_type}")
+                continue
+            
+            task = asyncio.create_task(self._execute_command(command_id, command_type, args))
+            self._inflight[command_id] = task
+            task.add_done_callback(lambda _, cid=command_id: self._inflight.pop(cid, None))
+    
+    async def _execute_command(self, command_id: str, command_type: str, args: Dict[str, Any]):
+        """在并发数限制内执行单个命令"""
+        async with self._command_semaphore:
+            try:
+                if command_type == CommandType.INTERVIEW:
+                    await self.handle_interview(
+                        command_id,
+                        args.get("agent_id", 0),
+                        args.get("prompt", ""),
+                        args.get("platform")
+                    )
+                else:
+                    await self.handle_batch_interview(
+                        command_id,
+                        args.get("interviews", []),
+                        args.get("platform"),
+                        stream=bool(args.get("stream", False))
+                    )
+            except asyncio.CancelledError:
+                self.send_response(command_id, "failed", error="模拟环境正在关闭，命令已取消")
+                raise
+            except Exception as e:
+                print(f"  命令执行出错: {command_type}, id={command_id}, error={e}")
+                self.send_response(command_id, "failed", error=str(e))
+    
+    async def finish_pending(self, cancel: bool = False):
+        """
+        等待（或取消）所有执行中的命令，在关闭环境前调用
         
-        else:
-            self.send_response(command_id, "failed", error=f"未知命令类型: {command_type}")
-            return True
+        Args:
+            cancel: True 表示直接取消执行中的命令（收到退出信号时）
+        """
+        tasks = list(self._inflight.values())
+        if not tasks:
+            return
+        
+        print(f"{'取消' if cancel else '等待'} {len(tasks)} 个执行中的命令...")
+        if cancel:
+            for task in tasks:
+                task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
 
 
 def load_config(config_path: str) -> Dict[str, Any]:
@@ -607,29 +812,6 @@ def load_config(config_path: str) -> Dict[str, Any]:
         return json.load(f)
 
 
-# 需要过滤掉的非核心动作类型（这些动作对分析价值较低）
-FILTERED_ACTIONS = {'refresh', 'sign_up'}
-
-# 动作类型映射表（数据库中的名称 -> 标准名称）
-ACTION_TYPE_MAP = {
-    'create_post': 'CREATE_POST',
-    'like_post': 'LIKE_POST',
-    'dislike_post': 'DISLIKE_POST',
-    'repost': 'REPOST',
-    'quote_post': 'QUOTE_POST',
-    'follow': 'FOLLOW',
-    'mute': 'MUTE',
-    'create_comment': 'CREATE_COMMENT',
-    'like_comment': 'LIKE_COMMENT',
-    'dislike_comment': 'DISLIKE_COMMENT',
-    'search_posts': 'SEARCH_POSTS',
-    'search_user': 'SEARCH_USER',
-    'trend': 'TREND',
-    'do_nothing': 'DO_NOTHING',
-    'interview': 'INTERVIEW',
-}
-
-
 def get_agent_names_from_config(config: Dict[str, Any]) -> Dict[int, str]:
     """
     从 simulation_config 中获取 agent_id -> entity_name 的映射
@@ -654,333 +836,6 @@ def get_agent_names_from_config(config: Dict[str, Any]) -> Dict[int, str]:
     return agent_names
 
 
-def fetch_new_actions_from_db(
-    db_path: str,
-    last_rowid: int,
-    agent_names: Dict[int, str]
-) -> Tuple[List[Dict[str, Any]], int]:
-    """
-    从数据库中获取新的动作记录，并补充完整的上下文信息
-    
-    Args:
-        db_path: 数据库文件路径
-        last_rowid: 上次读取的最大 rowid 值（使用 rowid 而不是 created_at，因为不同平台的 created_at 格式不同）
-        agent_names: agent_id -> agent_name 映射
-        
-    Returns:
-        (actions_list, new_last_rowid)
-        - actions_list: 动作列表，每个元素包含 agent_id, agent_name, action_type, action_args（含上下文信息）
-        - new_last_rowid: 新的最大 rowid 值
-    """
-    actions = []
-    new_last_rowid = last_rowid
-    
-    if not os.path.exists(db_path):
-        return actions, new_last_rowid
-    
-    try:
-        conn = sqlite3.connect(db_path)
-        cursor = conn.cursor()
-        
-        # 使用 rowid 来追踪已处理的记录（rowid 是 SQLite 的内置自增字段）
-        # 这样可以避免 created_at 格式差异问题（Twitter 用整数，Reddit 用日期时间字符串）
-        cursor.execute("""
-            SELECT rowid, user_id, action, info
-            FROM trace
-            WHERE rowid > ?
-            ORDER BY rowid ASC
-        """, (last_rowid,))
-        
-        for rowid, user_id, action, info_json in cursor.fetchall():
-            # 更新最大 rowid
-            new_last_rowid = rowid
-            
-            # 过滤非核心动作
-            if action in FILTERED_ACTIONS:
-                continue
-            
-            # 解析动作参数
-            try:
-                action_args = json.loads(info_json) if info_json else {}
-            except json.JSONDecodeError:
-                action_args = {}
-            
-            # 精简 action_args，只保留关键字段（保留完整内容，不截断）
-            simplified_args = {}
-            if 'content' in action_args:
-                simplified_args['content'] = action_args['content']
-            if 'post_id' in action_args:
-                simplified_args['post_id'] = action_args['post_id']
-            if 'comment_id' in action_args:
-                simplified_args['comment_id'] = action_args['comment_id']
-            if 'quoted_id' in action_args:
-                simplified_args['quoted_id'] = action_args['quoted_id']
-            if 'new_post_id' in action_args:
-                simplified_args['new_post_id'] = action_args['new_post_id']
-            if 'follow_id' in action_args:
-                simplified_args['follow_id'] = action_args['follow_id']
-            if 'query' in action_args:
-                simplified_args['query'] = action_args['query']
-            if 'like_id' in action_args:
-                simplified_args['like_id'] = action_args['like_id']
-            if 'dislike_id' in action_args:
-                simplified_args['dislike_id'] = action_args['dislike_id']
-            
-            # 转换动作类型名称
-            action_type = ACTION_TYPE_MAP.get(action, action.upper())
-            
-            # 补充上下文信息（帖子内容、用户名等）
-            _enrich_action_context(cursor, action_type, simplified_args, agent_names)
-            
-            actions.append({
-                'agent_id': user_id,
-                'agent_name': agent_names.get(user_id, f'Agent_{user_id}'),
-                'action_type': action_type,
-                'action_args': simplified_args,
-            })
-        
-        conn.close()
-    except Exception as e:
-        print(f"读取数据库动作失败: {e}")
-    
-    return actions, new_last_rowid
-
-
-def _enrich_action_context(
-    cursor,
-    action_type: str,
-    action_args: Dict[str, Any],
-    agent_names: Dict[int, str]
-) -> None:
-    """
-    为动作补充上下文信息（帖子内容、用户名等）
-    
-    Args:
-        cursor: 数据库游标
-        action_type: 动作类型
-        action_args: 动作参数（会被修改）
-        agent_names: agent_id -> agent_name 映射
-    """
-    try:
-        # 点赞/踩帖子：补充帖子内容和作者
-        if action_type in ('LIKE_POST', 'DISLIKE_POST'):
-            post_id = action_args.get('post_id')
-            if post_id:
-                post_info = _get_post_info(cursor, post_id, agent_names)
-                if post_info:
-                    action_args['post_content'] = post_info.get('content', '')
-                    action_args['post_author_name'] = post_info.get('author_name', '')
-        
-        # 转发帖子：补充原帖内容和作者
-        elif action_type == 'REPOST':
-            new_post_id = action_args.get('new_post_id')
-            if new_post_id:
-                # 转发帖子的 original_post_id 指向原帖
-                cursor.execute("""
-                    SELECT original_post_id FROM post WHERE post_id = ?
-                """, (new_post_id,))
-                row = cursor.fetchone()
-                if row and row[0]:
-                    original_post_id = row[0]
-                    original_info = _get_post_info(cursor, original_post_id, agent_names)
-                    if original_info:
-                        action_args['original_content'] = original_info.get('content', '')
-                        action_args['original_author_name'] = original_info.get('author_name', '')
-        
-        # 引用帖子：补充原帖内容、作者和引用评论
-        elif action_type == 'QUOTE_POST':
-            quoted_id = action_args.get('quoted_id')
-            new_post_id = action_args.get('new_post_id')
-            
-            if quoted_id:
-                original_info = _get_post_info(cursor, quoted_id, agent_names)
-                if original_info:
-                    action_args['original_content'] = original_info.get('content', '')
-                    action_args['original_author_name'] = original_info.get('author_name', '')
-            
-            # 获取引用帖子的评论内容（quote_content）
-            if new_post_id:
-                cursor.execute("""
-                    SELECT quote_content FROM post WHERE post_id = ?
-                """, (new_post_id,))
-                row = cursor.fetchone()
-                if row and row[0]:
-                    action_args['quote_content'] = row[0]
-        
-        # 关注用户：补充被关注用户的名称
-        elif action_type == 'FOLLOW':
-            follow_id = action_args.get('follow_id')
-            if follow_id:
-                # 从 follow 表获取 followee_id
-                cursor.execute("""
-                    SELECT followee_id FROM follow WHERE follow_id = ?
-                """, (follow_id,))
-                row = cursor.fetchone()
-                if row:
-                    followee_id = row[0]
-                    target_name = _get_user_name(cursor, followee_id, agent_names)
-                    if target_name:
-                        action_args['target_user_name'] = target_name
-        
-        # 屏蔽用户：补充被屏蔽用户的名称
-        elif action_type == 'MUTE':
-            # 从 action_args 中获取 user_id 或 target_id
-            target_id = action_args.get('user_id') or action_args.get('target_id')
-            if target_id:
-                target_name = _get_user_name(cursor, target_id, agent_names)
-                if target_name:
-                    action_args['target_user_name'] = target_name
-        
-        # 点赞/踩评论：补充评论内容和作者
-        elif action_type in ('LIKE_COMMENT', 'DISLIKE_COMMENT'):
-            comment_id = action_args.get('comment_id')
-            if comment_id:
-                comment_info = _get_comment_info(cursor, comment_id, agent_names)
-                if comment_info:
-                    action_args['comment_content'] = comment_info.get('content', '')
-                    action_args['comment_author_name'] = comment_info.get('author_name', '')
-        
-        # 发表评论：补充所评论的帖子信息
-        elif action_type == 'CREATE_COMMENT':
-            post_id = action_args.get('post_id')
-            if post_id:
-                post_info = _get_post_info(cursor, post_id, agent_names)
-                if post_info:
-                    action_args['post_content'] = post_info.get('content', '')
-                    action_args['post_author_name'] = post_info.get('author_name', '')
-    
-    except Exception as e:
-        # 补充上下文失败不影响主流程
-        print(f"补充动作上下文失败: {e}")
-
-
-def _get_post_info(
-    cursor,
-    post_id: int,
-    agent_names: Dict[int, str]
-) -> Optional[Dict[str, str]]:
-    """
-    获取帖子信息
-    
-    Args:
-        cursor: 数据库游标
-        post_id: 帖子ID
-        agent_names: agent_id -> agent_name 映射
-        
-    Returns:
-        包含 content 和 author_name 的字典，或 None
-    """
-    try:
-        cursor.execute("""
-            SELECT p.content, p.user_id, u.agent_id
-            FROM post p
-            LEFT JOIN user u ON p.user_id = u.user_id
-            WHERE p.post_id = ?
-        """, (post_id,))
-        row = cursor.fetchone()
-        if row:
-            content = row[0] or ''
-            user_id = row[1]
-            agent_id = row[2]
-            
-            # 优先使用 agent_names 中的名称
-            author_name = ''
-            if agent_id is not None and agent_id in agent_names:
-                author_name = agent_names[agent_id]
-            elif user_id:
-                # 从 user 表获取名称
-                cursor.execute("SELECT name, user_name FROM user WHERE user_id = ?", (user_id,))
-                user_row = cursor.fetchone()
-                if user_row:
-                    author_name = user_row[0] or user_row[1] or ''
-            
-            return {'content': content, 'author_name': author_name}
-    except Exception:
-        pass
-    return None
-
-
-def _get_user_name(
-    cursor,
-    user_id: int,
-    agent_names: Dict[int, str]
-) -> Optional[str]:
-    """
-    获取用户名称
-    
-    Args:
-        cursor: 数据库游标
-        user_id: 用户ID
-        agent_names: agent_id -> agent_name 映射
-        
-    Returns:
-        用户名称，或 None
-    """
-    try:
-        cursor.execute("""
-            SELECT agent_id, name, user_name FROM user WHERE user_id = ?
-        """, (user_id,))
-        row = cursor.fetchone()
-        if row:
-            agent_id = row[0]
-            name = row[1]
-            user_name = row[2]
-            
-            # 优先使用 agent_names 中的名称
-            if agent_id is not None and agent_id in agent_names:
-                return agent_names[agent_id]
-            return name or user_name or ''
-    except Exception:
-        pass
-    return None
-
-
-def _get_comment_info(
-    cursor,
-    comment_id: int,
-    agent_names: Dict[int, str]
-) -> Optional[Dict[str, str]]:
-    """
-    获取评论信息
-    
-    Args:
-        cursor: 数据库游标
-        comment_id: 评论ID
-        agent_names: agent_id -> agent_name 映射
-        
-    Returns:
-        包含 content 和 author_name 的字典，或 None
-    """
-    try:
-        cursor.execute("""
-            SELECT c.content, c.user_id, u.agent_id
-            FROM comment c
-            LEFT JOIN user u ON c.user_id = u.user_id
-            WHERE c.comment_id = ?
-        """, (comment_id,))
-        row = cursor.fetchone()
-        if row:
-            content = row[0] or ''
-            user_id = row[1]
-            agent_id = row[2]
-            
-            # 优先使用 agent_names 中的名称
-            author_name = ''
-            if agent_id is not None and agent_id in agent_names:
-                author_name = agent_names[agent_id]
-            elif user_id:
-                # 从 user 表获取名称
-                cursor.execute("SELECT name, user_name FROM user WHERE user_id = ?", (user_id,))
-                user_row = cursor.fetchone()
-                if user_row:
-                    author_name = user_row[0] or user_row[1] or ''
-            
-            return {'content': content, 'author_name': author_name}
-    except Exception:
-        pass
-    return None
-
-
 def create_model(config: Dict[str, Any], use_boost: bool = False):
     """
     创建LLM模型
@@ -1037,59 +892,6 @@ def create_model(config: Dict[str, Any], use_boost: bool = False):
     )
 
 
-def get_active_agents_for_round(
-    env,
-    config: Dict[str, Any],
-    current_hour: int,
-    round_num: int
-) -> List:
-    """根据时间和配置决定本轮激活哪些Agent"""
-    time_config = config.get("time_config", {})
-    agent_configs = config.get("agent_configs", [])
-    
-    base_min = time_config.get("agents_per_hour_min", 5)
-    base_max = time_config.get("agents_per_hour_max", 20)
-    
-    peak_hours = time_config.get("peak_hours", [9, 10, 11, 14, 15, 20, 21, 22])
-    off_peak_hours = time_config.get("off_peak_hours", [0, 1, 2, 3, 4, 5])
-    
-    if current_hour in peak_hours:
-        multiplier = time_config.get("peak_activity_multiplier", 1.5)
-    elif current_hour in off_peak_hours:
-        multiplier = time_config.get("off_peak_activity_multiplier", 0.3)
-    else:
-        multiplier = 1.0
-    
-    target_count = int(random.uniform(base_min, base_max) * multiplier)
-    
-    candidates = []
-    for cfg in agent_configs:
-        agent_id = cfg.get("agent_id", 0)
-        active_hours = cfg.get("active_hours", list(range(8, 23)))
-        activity_level = cfg.get("activity_level", 0.5)
-        
-        if current_hour not in active_hours:
-            continue
-        
-        if random.random() < activity_level:
-            candidates.append(agent_id)
-    
-    selected_ids = random.sample(
-        candidates, 
-        min(target_count, len(candidates))
-    ) if candidates else []
-    
-    active_agents = []
-    for agent_id in selected_ids:
-        try:
-            agent = env.agent_graph.get_agent(agent_id)
-            active_agents.append((agent_id, agent))
-        except Exception:
-            pass
-    
-    return active_agents
-
-
 class PlatformSimulation:
     """平台模拟结果容器"""
     def __init__(self):
@@ -1098,12 +900,46 @@ class PlatformSimulation:
         self.total_actions = 0
 
 
+def build_checkpoint_state(
+    env,
+    scheduler: ActivationScheduler,
+    action_logger: Optional[PlatformActionLogger],
+    last_rowid: int,
+    total_actions: int,
+    total_rounds: int,
+    replay: Optional[List[List[int]]] = None
+) -> Dict[str, Any]:
+    """检查点需要恢复的运行状态（在轮次结束、本轮动作日志写入之后调用）"""
+    return {
+        "script": os.path.basename(__file__),
+        "total_rounds": total_rounds,
+        "seed": scheduler.seed,
+        "replay": replay is not None,
+        "last_rowid": last_rowid,
+        "total_actions": total_actions,
+        "time_step": getattr(env.platform.sandbox_clock, "time_step", None),
+        "scheduler_state": scheduler.get_state(),
+        "action_log": action_logger.position() if action_logger else None,
+    }
+
+
+def restore_checkpoint_state(checkpoint: Dict[str, Any], env, scheduler: ActivationScheduler):
+    """恢复激活调度器的随机数状态和平台的模拟时钟（数据库已在创建环境前恢复）"""
+    scheduler.set_state(checkpoint["scheduler_state"])
+    if checkpoint.get("time_step") is not None:
+        env.platform.sandbox_clock.time_step = checkpoint["time_step"]
+
+
 async def run_twitter_simulation(
     config: Dict[str, Any], 
     simulation_dir: str,
     action_logger: Optional[PlatformActionLogger] = None,
     main_logger: Optional[SimulationLogManager] = None,
-    max_rounds: Optional[int] = None
+    max_rounds: Optional[int] = None,
+    seed: Optional[int] = None,
+    replay: Optional[List[List[int]]] = None,
+    checkpointer: Optional[PlatformCheckpointer] = None,
+    checkpoint: Optional[Dict[str, Any]] = None
 ) -> PlatformSimulation:
     """运行Twitter模拟
     
@@ -1113,6 +949,10 @@ async def run_twitter_simulation(
         action_logger: 动作日志记录器
         main_logger: 主日志管理器
         max_rounds: 最大模拟轮数（可选，用于截断过长的模拟）
+        seed: Agent 激活抽样的随机种子（可选）
+        replay: 按轮次回放的激活计划（可选，见 activation_scheduler）
+        checkpointer: 本平台的检查点（可选，每隔 N 轮、收到退出信号和模拟完成时保存）
+        checkpoint: 要恢复的检查点（可选，指定时从检查点的轮次继续，不再执行初始事件）
         
     Returns:
         PlatformSimulation: 包含env和agent_graph的结果对象
@@ -1149,31 +989,38 @@ async def run_twitter_simulation(
             agent_names[agent_id] = getattr(agent, 'name', f'Agent_{agent_id}')
     
     db_path = os.path.join(simulation_dir, "twitter_simulation.db")
-    if os.path.exists(db_path):
+    if checkpoint:
+        # 用检查点的数据库备份替换中断时的数据库（丢弃检查点之后的写入）
+        checkpointer.restore(checkpoint, db_path)
+    elif os.path.exists(db_path):
         os.remove(db_path)
     
     result.env = oasis.make(
         agent_graph=result.agent_graph,
         platform=oasis.DefaultPlatformType.TWITTER,
         database_path=db_path,
-        semaphore=30,  # 限制最大并发 LLM 请求数，防止 API 过载
+        semaphore=DEFAULT_LLM_CONCURRENCY,  # 限制最大并发 LLM 请求数，防止 API 过载
     )
     
     await result.env.reset()
+    create_interview_index(db_path)
     log_info("环境已启动")
     
-    if action_logger:
+    if action_logger and not checkpoint:
         action_logger.log_simulation_start(config)
     
     total_actions = 0
     last_rowid = 0  # 跟踪数据库中最后处理的行号（使用 rowid 避免 created_at 格式差异）
+    # 整个模拟过程复用同一个只读连接读取新动作
+    trace_reader = ActionTraceReader(db_path, agent_names)
+    scheduler = ActivationScheduler(config, seed=seed, platform="twitter", replay=replay)
     
-    # 执行初始事件
+    # 执行初始事件（从检查点恢复时已执行过）
     event_config = config.get("event_config", {})
-    initial_posts = event_config.get("initial_posts", [])
+    initial_posts = [] if checkpoint else event_config.get("initial_posts", [])
     
     # 记录 round 0 开始（初始事件阶段）
-    if action_logger:
+    if action_logger and not checkpoint:
         action_logger.log_round_start(0, 0)  # round 0, simulated_hour 0
     
     initial_action_count = 0
@@ -1207,9 +1054,18 @@ async def run_twitter_simulation(
             log_info(f"已发布 {len(initial_actions)} 条初始帖子")
     
     # 记录 round 0 结束
-    if action_logger:
+    if action_logger and not checkpoint:
         action_logger.log_round_end(0, initial_action_count)
     
+    # 从检查点恢复运行状态
+    start_round = 0
+    if checkpoint:
+        restore_checkpoint_state(checkpoint, result.env, scheduler)
+        start_round = checkpoint["round"]
+        last_rowid = checkpoint["last_rowid"]
+        total_actions = checkpoint["total_actions"]
+        log_info(f"从检查点恢复: 已完成 {start_round} 轮, 总动作: {total_actions}")
+    
     # 主模拟循环
     time_config = config.get("time_config", {})
     total_hours = time_config.get("total_simulation_hours", 72)
@@ -1223,22 +1079,29 @@ async def run_twitter_simulation(
         if total_rounds < original_rounds:
             log_info(f"轮数已截断: {original_rounds} -> {total_rounds} (max_rounds={max_rounds})")
     
+    def save_checkpoint(completed_rounds: int):
+        checkpointer.save(db_path, completed_rounds, build_checkpoint_state(
+            result.env, scheduler, action_logger, last_rowid, total_actions, total_rounds, replay
+        ))
+        log_info(f"已保存检查点: 第 {completed_rounds} 轮")
+    
     start_time = datetime.now()
     
-    for round_num in range(total_rounds):
+    for round_num in range(start_round, total_rounds):
         # 检查是否收到退出信号
         if _shutdown_event and _shutdown_event.is_set():
             if main_logger:
                 main_logger.info(f"收到退出信号，在第 {round_num + 1} 轮停止模拟")
+            # 保存已完成的轮次，之后可以用 --resume 继续
+            if checkpointer and checkpointer.interval > 0 and round_num > start_round:
+                save_checkpoint(round_num)
             break
         
         simulated_minutes = round_num * minutes_per_round
         simulated_hour = (simulated_minutes // 60) % 24
         simulated_day = simulated_minutes // (60 * 24) + 1
         
-        active_agents = get_active_agents_for_round(
-            result.env, config, simulated_hour, round_num
-        )
+        active_agents = scheduler.get_active_agents(result.env, simulated_hour, round_num)
         
         # 无论是否有活跃agent，都记录round开始
         if action_logger:
@@ -1248,15 +1111,15 @@ async def run_twitter_simulation(
             # 没有活跃agent时也记录round结束（actions_count=0）
             if action_logger:
                 action_logger.log_round_end(round_num + 1, 0)
+            if checkpointer and checkpointer.due(round_num + 1, total_rounds):
+                save_checkpoint(round_num + 1)
             continue
         
         actions = {agent: LLMAction() for _, agent in active_agents}
         await result.env.step(actions)
         
         # 从数据库获取实际执行的动作并记录
-        actual_actions, last_rowid = fetch_new_actions_from_db(
-            db_path, last_rowid, agent_names
-        )
+        actual_actions, last_rowid = trace_reader.fetch_new_actions(last_rowid)
         
         round_action_count = 0
         for action_data in actual_actions:
@@ -1274,10 +1137,17 @@ async def run_twitter_simulation(
         if action_logger:
             action_logger.log_round_end(round_num + 1, round_action_count)
         
+        if checkpointer and checkpointer.due(round_num + 1, total_rounds):
+            save_checkpoint(round_num + 1)
+        
         if (round_num + 1) % 20 == 0:
             progress = (round_num + 1) / total_rounds * 100
             log_info(f"Day {simulated_day}, {simulated_hour:02d}:00 - Round {round_num + 1}/{total_rounds} ({progress:.1f}%)")
+            log_info(f"上下文查询缓存: {trace_reader.format_cache_stats()}")
     
+    log_info(f"上下文查询缓存: {trace_reader.format_cache_stats()}")
+    trace_reader.close()
+
     # 注意：不关闭环境，保留给Interview使用
     
     if action_logger:
@@ -1295,7 +1165,11 @@ async def run_reddit_simulation(
     simulation_dir: str,
     action_logger: Optional[PlatformActionLogger] = None,
     main_logger: Optional[SimulationLogManager] = None,
-    max_rounds: Optional[int] = None
+    max_rounds: Optional[int] = None,
+    seed: Optional[int] = None,
+    replay: Optional[List[List[int]]] = None,
+    checkpointer: Optional[PlatformCheckpointer] = None,
+    checkpoint: Optional[Dict[str, Any]] = None
 ) -> PlatformSimulation:
     """运行Reddit模拟
     
@@ -1305,6 +1179,10 @@ async def run_reddit_simulation(
         action_logger: 动作日志记录器
         main_logger: 主日志管理器
         max_rounds: 最大模拟轮数（可选，用于截断过长的模拟）
+        seed: Agent 激活抽样的随机种子（可选）
+        replay: 按轮次回放的激活计划（可选，见 activation_scheduler）
+        checkpointer: 本平台的检查点（可选，每隔 N 轮、收到退出信号和模拟完成时保存）
+        checkpoint: 要恢复的检查点（可选，指定时从检查点的轮次继续，不再执行初始事件）
         
     Returns:
         PlatformSimulation: 包含env和agent_graph的结果对象
@@ -1340,31 +1218,38 @@ async def run_reddit_simulation(
             agent_names[agent_id] = getattr(agent, 'name', f'Agent_{agent_id}')
     
     db_path = os.path.join(simulation_dir, "reddit_simulation.db")
-    if os.path.exists(db_path):
+    if checkpoint:
+        # 用检查点的数据库备份替换中断时的数据库（丢弃检查点之后的写入）
+        checkpointer.restore(checkpoint, db_path)
+    elif os.path.exists(db_path):
         os.remove(db_path)
     
     result.env = oasis.make(
         agent_graph=result.agent_graph,
         platform=oasis.DefaultPlatformType.REDDIT,
         database_path=db_path,
-        semaphore=30,  # 限制最大并发 LLM 请求数，防止 API 过载
+        semaphore=DEFAULT_LLM_CONCURRENCY,  # 限制最大并发 LLM 请求数，防止 API 过载
     )
     
     await result.env.reset()
+    create_interview_index(db_path)
     log_info("环境已启动")
     
-    if action_logger:
+    if action_logger and not checkpoint:
         action_logger.log_simulation_start(config)
     
     total_actions = 0
     last_rowid = 0  # 跟踪数据库中最后处理的行号（使用 rowid 避免 created_at 格式差异）
+    # 整个模拟过程复用同一个只读连接读取新动作
+    trace_reader = ActionTraceReader(db_path, agent_names)
+    scheduler = ActivationScheduler(config, seed=seed, platform="reddit", replay=replay)
     
-    # 执行初始事件
+    # 执行初始事件（从检查点恢复时已执行过）
     event_config = config.get("event_config", {})
-    initial_posts = event_config.get("initial_posts", [])
+    initial_posts = [] if checkpoint else event_config.get("initial_posts", [])
     
     # 记录 round 0 开始（初始事件阶段）
-    if action_logger:
+    if action_logger and not checkpoint:
         action_logger.log_round_start(0, 0)  # round 0, simulated_hour 0
     
     initial_action_count = 0
@@ -1406,9 +1291,18 @@ async def run_reddit_simulation(
             log_info(f"已发布 {len(initial_actions)} 条初始帖子")
     
     # 记录 round 0 结束
-    if action_logger:
+    if action_logger and not checkpoint:
         action_logger.log_round_end(0, initial_action_count)
     
+    # 从检查点恢复运行状态
+    start_round = 0
+    if checkpoint:
+        restore_checkpoint_state(checkpoint, result.env, scheduler)
+        start_round = checkpoint["round"]
+        last_rowid = checkpoint["last_rowid"]
+        total_actions = checkpoint["total_actions"]
+        log_info(f"从检查点恢复: 已完成 {start_round} 轮, 总动作: {total_actions}")
+    
     # 主模拟循环
     time_config = config.get("time_config", {})
     total_hours = time_config.get("total_simulation_hours", 72)
@@ -1422,22 +1316,29 @@ async def run_reddit_simulation(
         if total_rounds < original_rounds:
             log_info(f"轮数已截断: {original_rounds} -> {total_rounds} (max_rounds={max_rounds})")
     
+    def save_checkpoint(completed_rounds: int):
+        checkpointer.save(db_path, completed_rounds, build_checkpoint_state(
+            result.env, scheduler, action_logger, last_rowid, total_actions, total_rounds, replay
+        ))
+        log_info(f"已保存检查点: 第 {completed_rounds} 轮")
+    
     start_time = datetime.now()
     
-    for round_num in range(total_rounds):
+    for round_num in range(start_round, total_rounds):
         # 检查是否收到退出信号
         if _shutdown_event and _shutdown_event.is_set():
             if main_logger:
                 main_logger.info(f"收到退出信号，在第 {round_num + 1} 轮停止模拟")
+            # 保存已完成的轮次，之后可以用 --resume 继续
+            if checkpointer and checkpointer.interval > 0 and round_num > start_round:
+                save_checkpoint(round_num)
             break
         
         simulated_minutes = round_num * minutes_per_round
         simulated_hour = (simulated_minutes // 60) % 24
         simulated_day = simulated_minutes // (60 * 24) + 1
         
-        active_agents = get_active_agents_for_round(
-            result.env, config, simulated_hour, round_num
-        )
+        active_agents = scheduler.get_active_agents(result.env, simulated_hour, round_num)
         
         # 无论是否有活跃agent，都记录round开始
         if action_logger:
@@ -1447,15 +1348,15 @@ async def run_reddit_simulation(
             # 没有活跃agent时也记录round结束（actions_count=0）
             if action_logger:
                 action_logger.log_round_end(round_num + 1, 0)
+            if checkpointer and checkpointer.due(round_num + 1, total_rounds):
+                save_checkpoint(round_num + 1)
             continue
         
         actions = {agent: LLMAction() for _, agent in active_agents}
         await result.env.step(actions)
         
         # 从数据库获取实际执行的动作并记录
-        actual_actions, last_rowid = fetch_new_actions_from_db(
-            db_path, last_rowid, agent_names
-        )
+        actual_actions, last_rowid = trace_reader.fetch_new_actions(last_rowid)
         
         round_action_count = 0
         for action_data in actual_actions:
@@ -1473,10 +1374,17 @@ async def run_reddit_simulation(
         if action_logger:
             action_logger.log_round_end(round_num + 1, round_action_count)
         
+        if checkpointer and checkpointer.due(round_num + 1, total_rounds):
+            save_checkpoint(round_num + 1)
+        
         if (round_num + 1) % 20 == 0:
             progress = (round_num + 1) / total_rounds * 100
             log_info(f"Day {simulated_day}, {simulated_hour:02d}:00 - Round {round_num + 1}/{total_rounds} ({progress:.1f}%)")
+            log_info(f"上下文查询缓存: {trace_reader.format_cache_stats()}")
     
+    log_info(f"上下文查询缓存: {trace_reader.format_cache_stats()}")
+    trace_reader.close()
+
     # 注意：不关闭环境，保留给Interview使用
     
     if action_logger:
@@ -1489,6 +1397,40 @@ async def run_reddit_simulation(
     return result
 
 
+def run_dry_run(config: Dict[str, Any], simulation_dir: str, args):
+    """计算并写入激活计划，输出每轮预计的 LLM 调用量、峰值并发和预计耗时"""
+    platforms = []
+    if not args.reddit_only:
+        platforms.append("twitter")
+    if not args.twitter_only:
+        platforms.append("reddit")
+    
+    schedule = build_schedule(
+        config,
+        platforms,
+        seed=args.seed,
+        max_rounds=args.max_rounds,
+        llm_call_seconds=args.llm_call_seconds
+    )
+    schedule_path = args.schedule or os.path.join(simulation_dir, SCHEDULE_FILE)
+    save_schedule(schedule, schedule_path)
+    
+    summary = schedule["summary"]
+    print("=" * 60)
+    print("激活计划预览（未调用 LLM）")
+    print(f"  - 平台: {', '.join(platforms)}")
+    print(f"  - 随机种子: {schedule['seed']}")
+    print(f"  - 总轮数: {summary['total_rounds']}")
+    print(f"  - 预计 LLM 调用: {summary['total_llm_calls']} (平均每轮 {summary['avg_llm_calls_per_round']}, 最多 {summary['max_llm_calls_per_round']})")
+    print(f"  - 峰值并发: {summary['peak_concurrency']} (每平台上限 {summary['llm_concurrency']})")
+    print(f"  - 预计耗时: {summary['estimated_duration_seconds'] / 3600:.2f} 小时 (按每次调用 {summary['llm_call_seconds']} 秒估算)")
+    print(f"  - 计划文件: {schedule_path}")
+    print("=" * 60)
+    for entry in summary["per_round"]:
+        counts = ", ".join(f"{platform}={entry[platform]}" for platform in platforms)
+        print(f"Round {entry['round']}: {entry['llm_calls']} 次调用 ({counts})")
+
+
 async def main():
     parser = argparse.ArgumentParser(description='OASIS双平台并行模拟')
     parser.add_argument(
@@ -1513,12 +1455,66 @@ async def main():
         default=None,
         help='最大模拟轮数（可选，用于截断过长的模拟）'
     )
+    parser.add_argument(
+        '--log-segment-rounds',
+        type=int,
+        default=None,
+        help='动作日志按轮次分段，每个分段包含的轮数（可选，默认写入单一的 actions.jsonl）'
+    )
+    parser.add_argument(
+        '--log-fsync-interval',
+        type=float,
+        default=None,
+        help='动作日志每轮写入后 fsync 的最小间隔（秒，可选，默认不 fsync）'
+    )
+    parser.add_argument(
+        '--seed',
+        type=int,
+        default=None,
+        help='Agent 激活抽样的随机种子（可选，固定后每轮激活的 Agent 可复现）'
+    )
+    parser.add_argument(
+        '--dry-run',
+        action='store_true',
+        default=False,
+        help=f'只计算每轮的激活计划并估算 LLM 调用量，不调用 LLM（写入 {SCHEDULE_FILE}）'
+    )
+    parser.add_argument(
+        '--schedule',
+        type=str,
+        default=None,
+        help=f'激活计划文件路径：--dry-run 时为输出路径（默认模拟目录下的 {SCHEDULE_FILE}），正式运行时按该计划回放'
+    )
+    parser.add_argument(
+        '--llm-call-seconds',
+        type=float,
+        default=DEFAULT_LLM_CALL_SECONDS,
+        help=f'--dry-run 估算耗时使用的单次 LLM 调用平均耗时（秒，默认{DEFAULT_LLM_CALL_SECONDS}）'
+    )
+    parser.add_argument(
+        '--checkpoint-interval',
+        type=int,
+        default=DEFAULT_CHECKPOINT_INTERVAL,
+        help=f'每隔多少轮保存一次检查点（默认{DEFAULT_CHECKPOINT_INTERVAL}，0 表示不保存）'
+    )
+    parser.add_argument(
+        '--resume',
+        action='store_true',
+        default=False,
+        help='从各平台最近的检查点继续运行（没有检查点的平台从头开始）'
+    )
     parser.add_argument(
         '--no-wait',
         action='store_true',
         default=False,
         help='模拟完成后立即关闭环境，不进入等待命令模式'
     )
+    parser.add_argument(
+        '--ipc-concurrency',
+        type=int,
+        default=DEFAULT_IPC_CONCURRENCY,
+        help=f'等待命令模式下同时执行的IPC命令数上限（默认{DEFAULT_IPC_CONCURRENCY}）'
+    )
     
     args = parser.parse_args()
     
@@ -1534,14 +1530,88 @@ async def main():
     simulation_dir = os.path.dirname(args.config) or "."
     wait_for_commands = not args.no_wait
     
+    # 预览模式：只计算激活计划，不启动环境，也不改动已有的日志和数据库
+    if args.dry_run:
+        run_dry_run(config, simulation_dir, args)
+        return
+    
+    # 回放激活计划
+    replay_schedule = None
+    if args.schedule:
+        try:
+            replay_schedule = load_schedule(args.schedule)
+        except (OSError, ValueError) as e:
+            print(f"错误: 无法读取激活计划: {e}")
+            sys.exit(1)
+        if args.seed is None:
+            # 超出计划的轮次沿用计划的种子抽样
+            args.seed = replay_schedule.get("seed")
+    
+    def platform_replay(platform: str) -> Optional[List[List[int]]]:
+        if not replay_schedule:
+            return None
+        return replay_schedule.get("platforms", {}).get(platform, {}).get("rounds")
+    
+    # 检查点：--resume 时读取各平台最近的检查点，否则删除旧的检查点
+    platforms = [
+        platform for platform, skipped in (("twitter", args.reddit_only), ("reddit", args.twitter_only))
+        if not skipped
+    ]
+    checkpointers = {
+        platform: PlatformCheckpointer(simulation_dir, platform, args.checkpoint_interval)
+        for platform in platforms
+    }
+    checkpoints: Dict[str, Optional[Dict[str, Any]]] = {platform: None for platform in platforms}
+    if args.resume:
+        try:
+            for platform in platforms:
+                checkpoints[platform] = checkpointers[platform].load()
+        except ValueError as e:
+            print(f"错误: {e}")
+            sys.exit(1)
+        if not any(checkpoints.values()):
+            print("错误: 没有可恢复的检查点")
+            sys.exit(1)
+        if args.max_rounds is None:
+            # 沿用中断前的轮数
+            args.max_rounds = max(c["total_rounds"] for c in checkpoints.values() if c)
+        if args.log_segment_rounds is None:
+            # 沿用中断前的动作日志分段
+            args.log_segment_rounds = next(
+                (c["action_log"].get("segment_rounds") for c in checkpoints.values() if c and c.get("action_log")),
+                None
+            )
+    else:
+        for checkpointer in checkpointers.values():
+            checkpointer.clear()
+    
     # 初始化日志配置（禁用 OASIS 日志，清理旧文件）
     init_logging_for_simulation(simulation_dir)
     
-    # 创建日志管理器
-    log_manager = SimulationLogManager(simulation_dir)
+    # 创建日志管理器（恢复时追加到之前的主日志）
+    log_manager = SimulationLogManager(
+        simulation_dir,
+        segment_rounds=args.log_segment_rounds,
+        fsync_interval=args.log_fsync_interval,
+        append=args.resume
+    )
     twitter_logger = log_manager.get_twitter_logger()
     reddit_logger = log_manager.get_reddit_logger()
     
+    # 恢复时将动作日志回退到检查点的位置，之后的轮次重新写入
+    if args.resume:
+        platform_loggers = {"twitter": twitter_logger, "reddit": reddit_logger}
+        try:
+            for platform in platforms:
+                checkpoint = checkpoints[platform]
+                if checkpoint is None:
+                    platform_loggers[platform].reset()
+                elif checkpoint.get("action_log"):
+                    platform_loggers[platform].restore_position(checkpoint["action_log"])
+        except ValueError as e:
+            log_manager.error(f"错误: {e}")
+            sys.exit(1)
+    
     log_manager.info("=" * 60)
     log_manager.info("OASIS 双平台并行模拟")
     log_manager.info(f"配置文件: {args.config}")
@@ -1562,12 +1632,27 @@ async def main():
         log_manager.info(f"  - 最大轮数限制: {args.max_rounds}")
         if args.max_rounds < config_total_rounds:
             log_manager.info(f"  - 实际执行轮数: {args.max_rounds} (已截断)")
+    if replay_schedule:
+        log_manager.info(f"  - 激活计划: {args.schedule} (seed={replay_schedule.get('seed')}, 共 {replay_schedule.get('total_rounds')} 轮)")
+    elif args.seed is not None:
+        log_manager.info(f"  - 随机种子: {args.seed}")
     log_manager.info(f"  - Agent数量: {len(config.get('agent_configs', []))}")
+    if args.resume:
+        for platform in platforms:
+            checkpoint = checkpoints[platform]
+            resumed = f"第 {checkpoint['round']} 轮 ({checkpoint['created_at']})" if checkpoint else "无检查点，从头开始"
+            log_manager.info(f"  - 从检查点恢复 [{platform}]: {resumed}")
+    if args.checkpoint_interval > 0:
+        log_manager.info(f"  - 检查点间隔: {args.checkpoint_interval} 轮")
     
     log_manager.info("日志结构:")
     log_manager.info(f"  - 主日志: simulation.log")
-    log_manager.info(f"  - Twitter动作: twitter/actions.jsonl")
-    log_manager.info(f"  - Reddit动作: reddit/actions.jsonl")
+    if args.log_segment_rounds:
+        log_manager.info(f"  - Twitter动作: twitter/actions-*.jsonl（每 {args.log_segment_rounds} 轮一个分段）")
+        log_manager.info(f"  - Reddit动作: reddit/actions-*.jsonl（每 {args.log_segment_rounds} 轮一个分段）")
+    else:
+        log_manager.info(f"  - Twitter动作: twitter/actions.jsonl")
+        log_manager.info(f"  - Reddit动作: reddit/actions.jsonl")
     log_manager.info("=" * 60)
     
     start_time = datetime.now()
@@ -1576,15 +1661,18 @@ async def main():
     twitter_result: Optional[PlatformSimulation] = None
     reddit_result: Optional[PlatformSimulation] = None
     
+    def platform_checkpoint_args(platform: str) -> Dict[str, Any]:
+        return {"checkpointer": checkpointers[platform], "checkpoint": checkpoints[platform]}
+    
     if args.twitter_only:
-        twitter_result = await run_twitter_simulation(config, simulation_dir, twitter_logger, log_manager, args.max_rounds)
+        twitter_result = await run_twitter_simulation(config, simulation_dir, twitter_logger, log_manager, args.max_rounds, args.seed, platform_replay("twitter"), **platform_checkpoint_args("twitter"))
     elif args.reddit_only:
-        reddit_result = await run_reddit_simulation(config, simulation_dir, reddit_logger, log_manager, args.max_rounds)
+        reddit_result = await run_reddit_simulation(config, simulation_dir, reddit_logger, log_manager, args.max_rounds, args.seed, platform_replay("reddit"), **platform_checkpoint_args("reddit"))
     else:
         # 并行运行（每个平台使用独立的日志记录器）
         results = await asyncio.gather(
-            run_twitter_simulation(config, simulation_dir, twitter_logger, log_manager, args.max_rounds),
-            run_reddit_simulation(config, simulation_dir, reddit_logger, log_manager, args.max_rounds),
+            run_twitter_simulation(config, simulation_dir, twitter_logger, log_manager, args.max_rounds, args.seed, platform_replay("twitter"), **platform_checkpoint_args("twitter")),
+            run_reddit_simulation(config, simulation_dir, reddit_logger, log_manager, args.max_rounds, args.seed, platform_replay("reddit"), **platform_checkpoint_args("reddit")),
         )
         twitter_result, reddit_result = results
     
@@ -1606,8 +1694,10 @@ async def main():
             twitter_env=twitter_result.env if twitter_result else None,
             twitter_agent_graph=twitter_result.agent_graph if twitter_result else None,
             reddit_env=reddit_result.env if reddit_result else None,
-            reddit_agent_graph=reddit_result.agent_graph if reddit_result else None
+            reddit_agent_graph=reddit_result.agent_graph if reddit_result else None,
+            max_concurrent_commands=args.ipc_concurrency
         )
+        await ipc_handler.start_ipc()
         ipc_handler.update_status("alive")
         
         # 等待命令循环（使用全局 _shutdown_event）
@@ -1616,12 +1706,9 @@ async def main():
                 should_continue = await ipc_handler.process_commands()
                 if not should_continue:
                     break
-                # 使用 wait_for 替代 sleep，这样可以响应 shutdown_event
-                try:
-                    await asyncio.wait_for(_shutdown_event.wait(), timeout=0.5)
+                # 有新命令时立即唤醒，同时响应 shutdown_event
+                if await ipc_handler.wait_for_command(_shutdown_event):
                     break  # 收到退出信号
-                except asyncio.TimeoutError:
-                    pass  # 超时继续循环
         except KeyboardInterrupt:
             print("\n收到中断信号")
         except asyncio.CancelledError:
@@ -1631,6 +1718,10 @@ async def main():
         
         log_manager.info("\n关闭环境...")
         ipc_handler.update_status("stopped")
+        # close_env：等待执行中的采访完成；收到退出信号：直接取消
+        await ipc_handler.finish_pending(cancel=_shutdown_event.is_set())
+        await ipc_handler.stop_ipc()
+        ipc_handler.close_result_readers()
     
     # 关闭环境
     if twitter_result and twitter_result.env:
@@ -1648,6 +1739,7 @@ async def main():
     log_manager.info(f"  - {os.path.join(simulation_dir, 'twitter', 'actions.jsonl')}")
     log_manager.info(f"  - {os.path.join(simulation_dir, 'reddit', 'actions.jsonl')}")
     log_manager.info("=" * 60)
+    log_manager.close()
 
 
 def setup_signal_handlers(loop=None):
@@ -4,13 +4,14 @@ OASIS Reddit模拟预设脚本
 
 功能特性:
 - 完成模拟后不立即关闭环境，进入等待命令模式
-- 支持通过IPC接收Interview命令
+- 支持通过IPC接收Interview命令（优先 Unix Socket，不可用时回退到文件协议）
 - 支持单个Agent采访和批量采访
 - 支持远程关闭环境命令
 
 使用方式:
     python run_reddit_simulation.py --config /path/to/simulation_config.json
     python run_reddit_simulation.py --config /path/to/simulation_config.json --no-wait  # 完成后立即关闭
+    python run_reddit_simulation.py --config /path/to/simulation_config.json --resume   # 从最近的检查点继续
 """
 
 import argparse
@@ -18,10 +19,8 @@ import asyncio
 import json
 import logging
 import os
-import random
 import signal
 import sys
-import sqlite3
 from datetime import datetime
 from typing import Dict, Any, List, Optional
 
@@ -130,6 +129,12 @@ except ImportError as e:
     print("请先安装: pip install oasis-ai camel-ai")
     sys.exit(1)
 
+from ipc_socket import IPCSocketServer
+from dir_watcher import DirectoryWatcher
+from interview_results import InterviewResultReader, create_interview_index
+from activation_scheduler import ActivationScheduler
+from simulation_checkpoint import PlatformCheckpointer, DEFAULT_CHECKPOINT_INTERVAL
+
 
 # IPC相关常量
 IPC_COMMANDS_DIR = "ipc_commands"
@@ -158,17 +163,48 @@ class IPCHandler:
         # 确保目录存在
         os.makedirs(self.commands_dir, exist_ok=True)
         os.makedirs(self.responses_dir, exist_ok=True)
+        
+        # Socket 传输（不可用时回退到文件协议）
+        self.socket_server = IPCSocketServer(simulation_dir)
+        
+        # 命令目录监听（inotify，不可用时回退到自适应轮询）
+        self.command_watcher = DirectoryWatcher(self.commands_dir)
+        
+        # 采访结果读取器（持久化只读连接）
+        self.result_reader = InterviewResultReader(
+            os.path.join(simulation_dir, "reddit_simulation.db")
+        )
+    
+    async def start_ipc(self) -> bool:
+        """
+        启动命令通道：IPC Socket 服务和命令目录监听
+        
+        Returns:
+            True 表示 socket 可用
+        """
+        if self.command_watcher.start():
+            print(f"命令目录监听已启动(inotify): {self.commands_dir}")
+        return await self.socket_server.start()
+    
+    async def stop_ipc(self):
+        """停止 IPC Socket 服务和命令目录监听"""
+        self.command_watcher.stop()
+        await self.socket_server.stop()
     
     def update_status(self, status: str):
         """更新环境状态"""
+        socket_path = self.socket_server.socket_path if self.socket_server.is_running and status == "alive" else None
         with open(self.status_file, 'w', encoding='utf-8') as f:
             json.dump({
                 "status": status,
+                "socket_path": socket_path,
                 "timestamp": datetime.now().isoformat()
             }, f, ensure_ascii=False, indent=2)
     
     def poll_command(self) -> Optional[Dict[str, Any]]:
-        """轮询获取待处理命令"""
+        """获取待处理的文件命令（命令目录没有新文件写入时不扫描目录）"""
+        if not self.command_watcher.has_changes():
+            return None
         if not os.path.exists(self.commands_dir):
             return None
         
@@ -177,19 +213,51 @@ class IPCHandler:
         for filename in os.listdir(self.commands_dir):
             if filename.endswith('.json'):
                 filepath = os.path.join(self.commands_dir, filename)
-                command_files.append((filepath, os.path.getmtime(filepath)))
+                try:
+                    command_files.append((filepath, os.path.getmtime(filepath)))
+                except OSError:
+                    continue
         
         command_files.sort(key=lambda x: x[1])
         
         for filepath, _ in command_files:
             try:
                 with open(filepath, 'r', encoding='utf-8') as f:
-                    return json.load(f)
+                    command = json.load(f)
             except (json.JSONDecodeError, OSError):
                 continue
+            # 目录中可能还有其他命令，下次继续扫描
+            self.command_watcher.mark_pending()
+            return command
         
         return None
     
+    async def wait_for_command(self, shutdown_event: asyncio.Event) -> bool:
+        """
+        等待下一个命令：socket 命令到达或命令目录有新文件时立即返回；
+        inotify 不可用时按自适应轮询间隔（空闲越久间隔越长）返回
+        
+        Returns:
+            True 表示收到退出信号
+        """
+        waiters = [asyncio.ensure_future(shutdown_event.wait())]
+        if self.socket_server.is_running:
+            waiters.append(asyncio.ensure_future(self.socket_server.command_arrived.wait()))
+        
+        timeout = None
+        if self.command_watcher.is_inotify:
+            waiters.append(asyncio.ensure_future(self.command_watcher.changed.wait()))
+        else:
+            timeout = self.command_watcher.next_interval()
+        
+        try:
+            await asyncio.wait(waiters, timeout=timeout, return_when=asyncio.FIRST_COMPLETED)
+        finally:
+            for waiter in waiters:
+                waiter.cancel()
+        
+        return shutdown_event.is_set()
+    
     def send_response(self, command_id: str, status: str, result: Dict = None, error: str = None):
         """发送响应"""
         response = {
@@ -200,6 +268,10 @@ class IPCHandler:
             "timestamp": datetime.now().isoformat()
         }
         
+        # 通过 socket 收到的命令直接写回连接
+        if self.socket_server.send_response(response):
+            return
+        
         response_file = os.path.join(self.responses_dir, f"{command_id}.json")
         with open(response_file, 'w', encoding='utf-8') as f:
             json.dump(response, f, ensure_ascii=False, indent=2)
@@ -278,11 +350,8 @@ class IPCHandler:
             # 执行批量Interview
             await self.env.step(actions)
             
-            # 获取所有结果
-            results = {}
-            for agent_id in agent_prompts.keys():
-                result = self._get_interview_result(agent_id)
-                results[agent_id] = result
+            # 获取所有结果（单次批量查询）
+            results = self.result_reader.get_latest_results(agent_prompts.keys())
             
             self.send_response(command_id, "completed", result={
                 "interviews_count": len(results),
@@ -299,46 +368,7 @@ class IPCHandler:
     
     def _get_interview_result(self, agent_id: int) -> Dict[str, Any]:
         """从数据库获取最新的Interview结果"""
-        db_path = os.path.join(self.simulation_dir, "reddit_simulation.db")
-        
-        result = {
-            "agent_id": agent_id,
-            "response": None,
-            "timestamp": None
-        }
-        
-        if not os.path.exists(db_path):
-            return result
-        
-        try:
-            conn = sqlite3.connect(db_path)
-            cursor = conn.cursor()
-            
-            # 查询最新的Interview记录
-            cursor.execute("""
-                SELECT user_id, info, created_at
-                FROM trace
-                WHERE action = ? AND user_id = ?
-                ORDER BY created_at DESC
-                LIMIT 1
-            """, (ActionType.INTERVIEW.value, agent_id))
-            
-            row = cursor.fetchone()
-            if row:
-                user_id, info_json, created_at = row
-                try:
-                    info = json.loads(info_json) if info_json else {}
-                    result["response"] = info.get("response", info)
-                    result["timestamp"] = created_at
-                except json.JSONDecodeError:
-                    result["response"] = info_json
-            
-            conn.close()
-            
-        except Exception as e:
-            print(f"  读取Interview结果失败: {e}")
-        
-        return result
+        return self.result_reader.get_latest_result(agent_id)
     
     async def process_commands(self) -> bool:
         """
@@ -347,10 +377,11 @@ class IPCHandler:
         Returns:
             True 表示继续运行，False 表示应该退出
         """
-        command = self.poll_command()
+        command = self.socket_server.get_command_nowait() or self.poll_command()
         if not command:
             return True
         
+        self.command_watcher.reset_backoff()
         command_id = command.get("command_id")
         command_type = command.get("command_type")
         args = command.get("args", {})
@@ -402,18 +433,31 @@ class RedditSimulationRunner:
         ActionType.MUTE,
     ]
     
-    def __init__(self, config_path: str, wait_for_commands: bool = True):
+    def __init__(
+        self,
+        config_path: str,
+        wait_for_commands: bool = True,
+        seed: Optional[int] = None,
+        checkpoint_interval: int = DEFAULT_CHECKPOINT_INTERVAL,
+        resume: bool = False
+    ):
         """
         初始化模拟运行器
         
         Args:
             config_path: 配置文件路径 (simulation_config.json)
             wait_for_commands: 模拟完成后是否等待命令（默认True）
+            seed: Agent 激活抽样的随机种子（可选）
+            checkpoint_interval: 每隔多少轮保存一次检查点（0 表示不保存）
+            resume: 从最近的检查点继续运行
         """
         self.config_path = config_path
         self.config = self._load_config()
         self.simulation_dir = os.path.dirname(config_path)
         self.wait_for_commands = wait_for_commands
+        self.scheduler = ActivationScheduler(self.config, seed=seed, platform="reddit")
+        self.checkpointer = PlatformCheckpointer(self.simulation_dir, "reddit", checkpoint_interval)
+        self.resume = resume
         self.env = None
         self.agent_graph = None
         self.ipc_handler = None
@@ -475,51 +519,19 @@ class RedditSimulationRunner:
         """
         根据时间和配置决定本轮激活哪些Agent
         """
-        time_config = self.config.get("time_config", {})
-        agent_configs = self.config.get("agent_configs", [])
-        
-        base_min = time_config.get("agents_per_hour_min", 5)
-        base_max = time_config.get("agents_per_hour_max", 20)
-        
-        peak_hours = time_config.get("peak_hours", [9, 10, 11, 14, 15, 20, 21, 22])
-        off_peak_hours = time_config.get("off_peak_hours", [0, 1, 2, 3, 4, 5])
-        
-        if current_hour in peak_hours:
-            multiplier = time_config.get("peak_activity_multiplier", 1.5)
-        elif current_hour in off_peak_hours:
-            multiplier = time_config.get("off_peak_activity_multiplier", 0.3)
-        else:
-            multiplier = 1.0
-        
-        target_count = int(random.uniform(base_min, base_max) * multiplier)
-        
-        candidates = []
-        for cfg in agent_configs:
-            agent_id = cfg.get("agent_id", 0)
-            active_hours = cfg.get("active_hours", list(range(8, 23)))
-            activity_level = cfg.get("activity_level", 0.5)
-            
-            if current_hour not in active_hours:
-                continue
-            
-            if random.random() < activity_level:
-                candidates.append(agent_id)
-        
-        selected_ids = random.sample(
-            candidates, 
-            min(target_count, len(candidates))
-        ) if candidates else []
-        
-        active_agents = []
-        for agent_id in selected_ids:
-            try:
-                agent = env.agent_graph.get_agent(agent_id)
-                active_agents.append((agent_id, agent))
-            except Exception:
-                pass
-        
-        return active_agents
+        return self.scheduler.get_active_agents(env, current_hour)
     
+    def _save_checkpoint(self, db_path: str, completed_rounds: int, total_rounds: int):
+        """保存检查点（本脚本不写动作日志，只需恢复数据库、随机数状态和模拟时钟）"""
+        self.checkpointer.save(db_path, completed_rounds, {
+            "script": os.path.basename(__file__),
+            "total_rounds": total_rounds,
+            "seed": self.scheduler.seed,
+            "replay": False,
+            "time_step": getattr(self.env.platform.sandbox_clock, "time_step", None),
+            "scheduler_state": self.scheduler.get_state(),
+        })
+
     async def run(self, max_rounds: int = None):
         """运行Reddit模拟
         
@@ -533,6 +545,23 @@ class RedditSimulationRunner:
         print(f"等待命令模式: {'启用' if self.wait_for_commands else '禁用'}")
         print("=" * 60)
         
+        # 检查点：--resume 时读取最近的检查点，否则删除旧的检查点
+        checkpoint = None
+        if self.resume:
+            try:
+                checkpoint = self.checkpointer.load()
+            except ValueError as e:
+                print(f"错误: {e}")
+                return
+            if checkpoint is None:
+                print("错误: 没有可恢复的检查点")
+                return
+            if max_rounds is None:
+                # 沿用中断前的轮数
+                max_rounds = checkpoint["total_rounds"]
+        else:
+            self.checkpointer.clear()
+        
         time_config = self.config.get("time_config", {})
         total_hours = time_config.get("total_simulation_hours", 72)
         minutes_per_round = time_config.get("minutes_per_round", 30)
@@ -569,7 +598,11 @@ class RedditSimulationRunner:
         )
         
         db_path = self._get_db_path()
-        if os.path.exists(db_path):
+        if checkpoint:
+            # 用检查点的数据库备份替换中断时的数据库（丢弃检查点之后的写入）
+            self.checkpointer.restore(checkpoint, db_path)
+            print(f"已从检查点恢复数据库: 第 {checkpoint['round']} 轮")
+        elif os.path.exists(db_path):
             os.remove(db_path)
             print(f"已删除旧数据库: {db_path}")
         
@@ -582,15 +615,16 @@ class RedditSimulationRunner:
         )
         
         await self.env.reset()
+        create_interview_index(db_path)
         print("环境初始化完成\n")
         
         # 初始化IPC处理器
         self.ipc_handler = IPCHandler(self.simulation_dir, self.env, self.agent_graph)
         self.ipc_handler.update_status("running")
         
-        # 执行初始事件
+        # 执行初始事件（从检查点恢复时已执行过）
         event_config = self.config.get("event_config", {})
-        initial_posts = event_config.get("initial_posts", [])
+        initial_posts = [] if checkpoint else event_config.get("initial_posts", [])
         
         if initial_posts:
             print(f"执行初始事件 ({len(initial_posts)}条初始帖子)...")
@@ -619,11 +653,28 @@ class RedditSimulationRunner:
                 await self.env.step(initial_actions)
                 print(f"  已发布 {len(initial_actions)} 条初始帖子")
         
+        # 从检查点恢复激活调度器的随机数状态和平台的模拟时钟
+        start_round = 0
+        if checkpoint:
+            self.scheduler.set_state(checkpoint["scheduler_state"])
+            if checkpoint.get("time_step") is not None:
+                self.env.platform.sandbox_clock.time_step = checkpoint["time_step"]
+            start_round = checkpoint["round"]
+            print(f"从检查点恢复: 已完成 {start_round} 轮")
+        
         # 主模拟循环
         print("\n开始模拟循环...")
         start_time = datetime.now()
         
-        for round_num in range(total_rounds):
+        for round_num in range(start_round, total_rounds):
+            # 检查是否收到退出信号
+            if _shutdown_event and _shutdown_event.is_set():
+                print(f"\n收到退出信号，在第 {round_num + 1} 轮停止模拟")
+                # 保存已完成的轮次，之后可以用 --resume 继续
+                if self.checkpointer.interval > 0 and round_num > start_round:
+                    self._save_checkpoint(db_path, round_num, total_rounds)
+                break
+            
             simulated_minutes = round_num * minutes_per_round
             simulated_hour = (simulated_minutes // 60) % 24
             simulated_day = simulated_minutes // (60 * 24) + 1
@@ -633,6 +684,8 @@ class RedditSimulationRunner:
             )
             
             if not active_agents:
+                if self.checkpointer.due(round_num + 1, total_rounds):
+                    self._save_checkpoint(db_path, round_num + 1, total_rounds)
                 continue
             
             actions = {
@@ -649,6 +702,9 @@ class RedditSimulationRunner:
                       f"Round {round_num + 1}/{total_rounds} ({progress:.1f}%) "
                       f"- {len(active_agents)} agents active "
                       f"- elapsed: {elapsed:.1f}s")
+            
+            if self.checkpointer.due(round_num + 1, total_rounds):
+                self._save_checkpoint(db_path, round_num + 1, total_rounds)
         
         total_elapsed = (datetime.now() - start_time).total_seconds()
         print(f"\n模拟循环完成!")
@@ -662,6 +718,7 @@ class RedditSimulationRunner:
             print("支持的命令: interview, batch_interview, close_env")
             print("=" * 60)
             
+            await self.ipc_handler.start_ipc()
             self.ipc_handler.update_status("alive")
             
             # 等待命令循环（使用全局 _shutdown_event）
@@ -670,11 +727,9 @@ class RedditSimulationRunner:
                     should_continue = await self.ipc_handler.process_commands()
                     if not should_continue:
                         break
-                    try:
-                        await asyncio.wait_for(_shutdown_event.wait(), timeout=0.5)
+                    # 有新命令时立即唤醒，同时响应 shutdown_event
+                    if await self.ipc_handler.wait_for_command(_shutdown_event):
                         break  # 收到退出信号
-                    except asyncio.TimeoutError:
-                        pass
             except KeyboardInterrupt:
                 print("\n收到中断信号")
             except asyncio.CancelledError:
@@ -686,6 +741,8 @@ class RedditSimulationRunner:
         
         # 关闭环境
         self.ipc_handler.update_status("stopped")
+        await self.ipc_handler.stop_ipc()
+        self.ipc_handler.result_reader.close()
         await self.env.close()
         
         print("环境已关闭")
@@ -706,6 +763,24 @@ async def main():
         default=None,
         help='最大模拟轮数（可选，用于截断过长的模拟）'
     )
+    parser.add_argument(
+        '--seed',
+        type=int,
+        default=None,
+        help='Agent 激活抽样的随机种子（可选，固定后每轮激活的 Agent 可复现）'
+    )
+    parser.add_argument(
+        '--checkpoint-interval',
+        type=int,
+        default=DEFAULT_CHECKPOINT_INTERVAL,
+        help=f'每隔多少轮保存一次检查点（默认{DEFAULT_CHECKPOINT_INTERVAL}，0 表示不保存）'
+    )
+    parser.add_argument(
+        '--resume',
+        action='store_true',
+        default=False,
+        help='从最近的检查点继续运行'
+    )
     parser.add_argument(
         '--no-wait',
         action='store_true',
@@ -729,7 +804,10 @@ async def main():
     
     runner = RedditSimulationRunner(
         config_path=args.config,
-        wait_for_commands=not args.no_wait
+        wait_for_commands=not args.no_wait,
+        seed=args.seed,
+        checkpoint_interval=args.checkpoint_interval,
+        resume=args.resume
     )
     await runner.run(max_rounds=args.max_rounds)
 
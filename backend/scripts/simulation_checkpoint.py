@@ -0,0 +1,186 @@
+"""
+模拟检查点
+每隔 N 轮在轮次结束时保存各平台的检查点（收到退出信号和模拟完成时也会保存），
+模拟进程中途退出后可以从最近的检查点继续运行（--resume），
+不必从第 0 轮重新开始、重新消耗之前所有轮次的 LLM 调用
+
+检查点结构:
+    sim_xxx/
+    └── checkpoints/
+        ├── twitter_checkpoint.json       # 最近一次检查点的状态
+        ├── twitter_round_00130.db        # 该检查点的数据库备份（SQLite backup API，一致的快照）
+        ├── reddit_checkpoint.json
+        └── reddit_round_00130.db
+
+检查点状态记录：已完成的轮数、激活调度器的随机数状态、动作追踪表的 last_rowid、
+累计动作数、平台的模拟时钟、动作日志的写入位置
+
+注意：Agent 的对话记忆（内存中的上下文）不在检查点中，恢复后从数据库中的社交网络状态继续
+"""
+
+import json
+import os
+import shutil
+import sqlite3
+import tempfile
+from datetime import datetime
+from typing import Any, Dict, Optional
+
+
+# 检查点目录（位于模拟目录）
+CHECKPOINT_DIR = "checkpoints"
+CHECKPOINT_FILE_FORMAT = "{platform}_checkpoint.json"
+CHECKPOINT_DB_FORMAT = "{platform}_round_{round:05d}.db"
+CHECKPOINT_VERSION = 1
+
+# 默认每 10 轮保存一次检查点（0 表示不保存）
+DEFAULT_CHECKPOINT_INTERVAL = 10
+
+# SQLite 附带的临时文件（恢复数据库时一并删除）
+_SQLITE_SIDE_FILES = ("-wal", "-shm", "-journal")
+
+
+class PlatformCheckpointer:
+    """
+    单平台检查点
+
+    数据库备份先写入临时文件再替换，检查点状态最后写入，
+    保存过程中进程退出时上一个检查点仍然完整可用
+    """
+
+    def __init__(self, simulation_dir: str, platform: str, interval: int = DEFAULT_CHECKPOINT_INTERVAL):
+        """
+        Args:
+            simulation_dir: 模拟目录
+            platform: 平台名称 (twitter/reddit)
+            interval: 每隔多少轮保存一次检查点（0 表示不保存）
+        """
+        self.platform = platform
+        self.interval = interval
+        self.checkpoint_dir = os.path.join(simulation_dir, CHECKPOINT_DIR)
+        self.state_path = os.path.join(self.checkpoint_dir, CHECKPOINT_FILE_FORMAT.format(platform=platform))
+
+    def due(self, completed_rounds: int, total_rounds: int) -> bool:
+        """
+        完成 completed_rounds 轮后是否需要保存检查点
+
+        最后一轮结束后也保存：双平台并行时先完成的平台恢复后不必重跑，只需重新进入等待命令模式
+        """
+        return (
+            self.interval > 0
+            and completed_rounds > 0
+            and (completed_rounds % self.interval == 0 or completed_rounds >= total_rounds)
+        )
+
+    def save(self, db_path: str, completed_rounds: int, state: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        保存检查点
+
+        Args:
+            db_path: 平台数据库路径（在轮次之间调用，此时没有进行中的写入）
+            completed_rounds: 已完成的轮数，恢复后从该轮次（从 0 开始）继续
+            state: 需要恢复的运行状态（需可 JSON 序列化）
+
+        Returns:
+            写入的检查点
+        """
+        os.makedirs(self.checkpoint_dir, exist_ok=True)
+        db_file = CHECKPOINT_DB_FORMAT.format(platform=self.platform, round=completed_rounds)
+        backup_path = os.path.join(self.checkpoint_dir, db_file)
+
+        fd, tmp_db = tempfile.mkstemp(dir=self.checkpoint_dir, prefix=f".{self.platform}.", suffix=".db.tmp")
+        os.close(fd)
+        try:
+            source = sqlite3.connect(db_path)
+            try:
+                target = sqlite3.connect(tmp_db)
+                try:
+                    source.backup(target)
+                finally:
+                    target.close()
+            finally:
+                source.close()
+            os.replace(tmp_db, backup_path)
+        except BaseException:
+            try:
+                os.unlink(tmp_db)
+            except OSError:
+                pass
+            raise
+
+        checkpoint = {
+            "version": CHECKPOINT_VERSION,
+            "platform": self.platform,
+            "round": completed_rounds,
+            "db_file": db_file,
+            "created_at": datetime.now().isoformat(),
+            **state,
+        }
+        _write_json(self.state_path, checkpoint)
+
+        # 只保留最近一次检查点的数据库备份
+        prefix = f"{self.platform}_round_"
+        for filename in os.listdir(self.checkpoint_dir):
+            if filename.startswith(prefix) and filename.endswith(".db") and filename != db_file:
+                try:
+                    os.remove(os.path.join(self.checkpoint_dir, filename))
+                except OSError:
+                    pass
+        return checkpoint
+
+    def load(self) -> Optional[Dict[str, Any]]:
+        """
+        读取最近一次检查点（没有时返回 None）
+
+        Raises:
+            ValueError: 检查点损坏、版本不符或数据库备份缺失
+        """
+        if not os.path.exists(self.state_path):
+            return None
+        try:
+            with open(self.state_path, 'r', encoding='utf-8') as f:
+                checkpoint = json.load(f)
+        except (OSError, ValueError) as e:
+            raise ValueError(f"检查点读取失败: {self.state_path}, error={e}")
+
+        if not isinstance(checkpoint, dict) or checkpoint.get("version") != CHECKPOINT_VERSION:
+            raise ValueError(f"不支持的检查点版本: {self.state_path}")
+        if checkpoint.get("platform") != self.platform or not isinstance(checkpoint.get("round"), int):
+            raise ValueError(f"检查点内容无效: {self.state_path}")
+        if not os.path.exists(os.path.join(self.checkpoint_dir, checkpoint.get("db_file") or "")):
+            raise ValueError(f"检查点的数据库备份不存在: {checkpoint.get('db_file')}")
+        return checkpoint
+
+    def restore(self, checkpoint: Dict[str, Any], db_path: str):
+        """用检查点的数据库备份覆盖平台数据库（检查点之后写入的内容全部丢弃）"""
+        for suffix in _SQLITE_SIDE_FILES:
+            if os.path.exists(db_path + suffix):
+                os.remove(db_path + suffix)
+        shutil.copyfile(os.path.join(self.checkpoint_dir, checkpoint["db_file"]), db_path)
+
+    def clear(self):
+        """删除本平台的检查点（重新开始模拟时调用）"""
+        if not os.path.isdir(self.checkpoint_dir):
+            return
+        prefix = f"{self.platform}_"
+        for filename in os.listdir(self.checkpoint_dir):
+            if filename.startswith(prefix):
+                try:
+                    os.remove(os.path.join(self.checkpoint_dir, filename))
+                except OSError:
+                    pass
+
+
+def _write_json(path: str, data: Dict[str, Any]):
+    """先写临时文件再替换，读取方不会读到写了一半的文件"""
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), prefix=".checkpoint.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            json.dump(data, f, ensure_ascii=False)
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.unlink(tmp_path)
+        except OSError:
+            pass
+        raise
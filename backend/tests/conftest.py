@@ -0,0 +1,8 @@
+"""
+测试公共配置
+scripts/ 下的模块（模拟脚本与后端共用的部分）与后端一样通过 ensure_scripts_path 导入
+"""
+
+from app.utils.script_modules import ensure_scripts_path
+
+ensure_scripts_path()
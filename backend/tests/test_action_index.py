@@ -0,0 +1,93 @@
+"""
+动作索引测试
+"""
+
+import json
+
+import pytest
+
+from app.services.action_index import ActionIndex
+
+
+def _action(round_num, agent_id, action_type="CREATE_POST", timestamp=None, **extra):
+    record = {
+        "round": round_num,
+        "timestamp": timestamp or f"2025-01-01T00:{round_num:02d}:{agent_id:02d}",
+        "agent_id": agent_id,
+        "agent_name": f"Agent_{agent_id}",
+        "action_type": action_type,
+        "action_args": {"content": f"r{round_num}a{agent_id}"},
+        "success": True,
+    }
+    record.update(extra)
+    return json.dumps(record, ensure_ascii=False) + "\n"
+
+
+def _append(path, *lines):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "a", encoding="utf-8") as f:
+        f.write("".join(lines))
+
+
+@pytest.fixture
+def sim_dir(tmp_path):
+    _append(
+        tmp_path / "twitter" / "actions.jsonl",
+        _action(1, 0),
+        _action(1, 1, "LIKE_POST"),
+        json.dumps({"round": 1, "event_type": "round_end"}) + "\n",
+        _action(2, 0),
+    )
+    _append(tmp_path / "reddit" / "actions.jsonl", _action(1, 2, "CREATE_COMMENT"))
+    return tmp_path
+
+
+@pytest.fixture
+def index(sim_dir):
+    index = ActionIndex(str(sim_dir))
+    yield index
+    index.close()
+
+
+def test_sync_indexes_agent_actions_only(index):
+    assert index.sync() == 4
+    assert index.sync() == 0
+    assert index.count() == 4
+    assert index.count(platform="twitter") == 3
+
+
+def test_sync_picks_up_appended_lines_and_waits_for_complete_ones(sim_dir, index):
+    index.sync()
+    log_path = sim_dir / "twitter" / "actions.jsonl"
+    line = _action(3, 5)
+    _append(log_path, line[:20])
+    assert index.sync() == 0
+
+    _append(log_path, line[20:])
+    assert index.sync() == 1
+    assert index.count(agent_id=5) == 1
+
+
+def test_truncated_log_is_reindexed(sim_dir, index):
+    index.sync()
+    (sim_dir / "twitter" / "actions.jsonl").write_text(_action(1, 7), encoding="utf-8")
+
+    assert index.count(platform="twitter") == 1
+    assert index.query(platform="twitter")[0]["agent_id"] == 7
+
+
+def test_query_filters_and_orders_newest_first(index):
+    actions = index.query(platform="twitter")
+    assert [(a["round_num"], a["agent_id"]) for a in actions] == [(2, 0), (1, 1), (1, 0)]
+
+    first = index.query(platform="twitter", agent_id=0, round_num=1)
+    assert len(first) == 1
+    assert first[0]["action_args"] == {"content": "r1a0"}
+    assert first[0]["success"] is True
+
+    page = index.query(limit=2, offset=1)
+    assert [a["agent_id"] for a in page] == [2, 1]
+
+
+def test_round_agents(index):
+    assert index.round_agents([1, 2, 3]) == {1: {0, 1, 2}, 2: {0}}
@@ -0,0 +1,119 @@
+"""
+动作日志缓冲写入测试
+"""
+
+import json
+import os
+
+import action_logger
+from action_logger import BufferedLineWriter, PlatformActionLogger
+
+
+def _read_lines(path):
+    with open(path, 'rb') as f:
+        return [json.loads(line) for line in f.read().splitlines()]
+
+
+def test_lines_are_written_on_flush(tmp_path):
+    path = str(tmp_path / "actions.jsonl")
+    writer = BufferedLineWriter(path)
+    writer.append({"n": 1})
+    writer.append({"n": 2, "content": "中文"})
+
+    assert not os.path.exists(path)
+    writer.flush()
+    assert _read_lines(path) == [{"n": 1}, {"n": 2, "content": "中文"}]
+    writer.close()
+
+
+def test_large_buffer_is_flushed_early(tmp_path, monkeypatch):
+    monkeypatch.setattr(action_logger, "MAX_BUFFER_BYTES", 32)
+    path = str(tmp_path / "actions.jsonl")
+    writer = BufferedLineWriter(path)
+    for n in range(5):
+        writer.append({"n": n, "pad": "x" * 10})
+
+    # 每两行超过上限写入一次，最后一行仍在缓冲中
+    assert [entry["n"] for entry in _read_lines(path)] == [0, 1, 2, 3]
+    writer.close()
+    assert [entry["n"] for entry in _read_lines(path)] == [0, 1, 2, 3, 4]
+
+
+def test_close_writes_remaining_lines_and_appends_to_existing_file(tmp_path):
+    path = tmp_path / "actions.jsonl"
+    path.write_bytes(b'{"n": 0}\n')
+    writer = BufferedLineWriter(str(path))
+    writer.append({"n": 1})
+    writer.close()
+    writer.close()
+
+    assert _read_lines(path) == [{"n": 0}, {"n": 1}]
+
+
+def test_unused_writer_creates_no_file(tmp_path):
+    path = str(tmp_path / "actions.jsonl")
+    BufferedLineWriter(path).close()
+
+    assert not os.path.exists(path)
+
+
+def test_fsync_follows_interval(tmp_path, monkeypatch):
+    synced = []
+    monkeypatch.setattr(action_logger.os, "fsync", synced.append)
+    writer = BufferedLineWriter(str(tmp_path / "actions.jsonl"), fsync_interval=3600)
+
+    writer.append({"n": 1})
+    writer.flush()
+    assert synced == []
+    writer.flush(fsync=True)
+    assert len(synced) == 1
+    writer.close()
+    assert len(synced) == 2
+
+    # 未设置间隔时不 fsync
+    unsynced = BufferedLineWriter(str(tmp_path / "other.jsonl"))
+    unsynced.append({"n": 1})
+    unsynced.close()
+    assert len(synced) == 2
+
+
+def test_round_is_written_at_round_end_and_seq_continues(tmp_path):
+    logger = PlatformActionLogger("twitter", str(tmp_path))
+    logger.log_round_start(0, 8)
+    logger.log_action(0, 1, "Agent_1", "CREATE_POST", {"content": "hi"})
+    log_path = tmp_path / "twitter" / "actions.jsonl"
+    assert log_path.read_bytes() == b""
+
+    logger.log_round_end(0, 1)
+    logger.close()
+    assert [entry.get("event_type", entry.get("action_type")) for entry in _read_lines(log_path)] == \
+        ["round_start", "CREATE_POST", "round_end"]
+
+    reopened = PlatformActionLogger("twitter", str(tmp_path))
+    reopened.log_action(1, 2, "Agent_2", "LIKE_POST")
+    reopened.close()
+    assert [entry["seq"] for entry in _read_lines(log_path) if "seq" in entry] == [1, 2]
+
+
+def test_restore_position_discards_later_rounds(tmp_path):
+    logger = PlatformActionLogger("reddit", str(tmp_path), segment_rounds=2)
+    for round_num in range(2):
+        logger.log_action(round_num, 0, "Agent_0", "CREATE_POST")
+        logger.log_round_end(round_num, 1)
+    position = logger.position()
+    for round_num in range(2, 5):
+        logger.log_action(round_num, 0, "Agent_0", "CREATE_POST")
+        logger.log_round_end(round_num, 1)
+    logger.close()
+
+    resumed = PlatformActionLogger("reddit", str(tmp_path), segment_rounds=2)
+    resumed.restore_position(position)
+    resumed.log_action(2, 1, "Agent_1", "LIKE_POST")
+    resumed.log_round_end(2, 1)
+    resumed.close()
+
+    log_dir = tmp_path / "reddit"
+    assert sorted(name for name in os.listdir(log_dir) if name.endswith(".jsonl")) == \
+        ["actions-0000.jsonl", "actions-0001.jsonl"]
+    actions = [entry for entry in _read_lines(log_dir / "actions-0001.jsonl") if "seq" in entry]
+    assert [(entry["round"], entry["seq"]) for entry in actions] == [(2, 3)]
@@ -0,0 +1,79 @@
+"""
+动作推送测试：游标格式与订阅分发
+"""
+
+import queue
+
+import pytest
+
+from app.services.action_stream import (
+    ActionBroker,
+    ActionSubscription,
+    format_action_cursor,
+    parse_action_cursor,
+    parse_since_seq,
+)
+
+
+def test_cursor_round_trip():
+    cursor = format_action_cursor({"twitter": 1024, "reddit": 0})
+
+    assert cursor == "twitter:1024,reddit:0"
+    assert parse_action_cursor(cursor) == {"twitter": 1024, "reddit": 0}
+
+
+def test_cursor_missing_platform_formats_as_zero():
+    assert format_action_cursor({"reddit": 5}) == "twitter:0,reddit:5"
+
+
+def test_parse_partial_cursor():
+    assert parse_action_cursor(" reddit:12 ,") == {"reddit": 12}
+    assert parse_action_cursor("") == {}
+
+
+@pytest.mark.parametrize("cursor", ["twitter", "twitter:-1", "twitter:abc", "facebook:10", "twitter=10"])
+def test_parse_invalid_cursor(cursor):
+    with pytest.raises(ValueError):
+        parse_action_cursor(cursor)
+
+
+def test_parse_since_seq():
+    assert parse_since_seq(" 12 ") == {"twitter": 12, "reddit": 12}
+    assert parse_since_seq("reddit:30,") == {"reddit": 30}
+
+
+@pytest.mark.parametrize("since_seq", ["-1", "abc", "twitter:-1", "facebook:10", "twitter:"])
+def test_parse_invalid_since_seq(since_seq):
+    with pytest.raises(ValueError, match="since_seq"):
+        parse_since_seq(since_seq)
+
+
+def test_publish_reaches_subscribers_of_the_simulation_only():
+    subscription = ActionBroker.subscribe("sim_a")
+    other = ActionBroker.subscribe("sim_b")
+    try:
+        assert ActionBroker.has_subscribers("sim_a")
+        ActionBroker.publish("sim_a", "twitter", 100, {"agent_id": 0})
+        ActionBroker.close("sim_a", {"status": "completed"})
+
+        assert subscription.get(timeout=1) == ("action", "twitter", 100, {"agent_id": 0})
+        assert subscription.get(timeout=1) == ("end", None, 0, {"status": "completed"})
+        assert subscription.closed
+        with pytest.raises(queue.Empty):
+            other.get(timeout=0)
+    finally:
+        ActionBroker.unsubscribe(subscription)
+        ActionBroker.unsubscribe(other)
+
+    assert not ActionBroker.has_subscribers("sim_a")
+
+
+def test_full_queue_marks_overflow():
+    subscription = ActionSubscription("sim_a", maxsize=1)
+    subscription._put(("action", "twitter", 1, {}))
+    subscription._put(("action", "twitter", 2, {}))
+
+    assert subscription.overflowed
+    subscription.drain()
+    with pytest.raises(queue.Empty):
+        subscription.get(timeout=0)
@@ -0,0 +1,99 @@
+"""
+动作记录读取测试（使用与 OASIS 相同结构的最小数据库）
+"""
+
+import json
+import sqlite3
+
+import pytest
+
+from action_trace_reader import ActionTraceReader
+
+
+AGENT_NAMES = {0: "Alice", 1: "Bob", 2: "Carol"}
+
+
+def _add_trace(db_path, user_id, action, info):
+    with sqlite3.connect(db_path) as conn:
+        conn.execute(
+            "INSERT INTO trace (user_id, created_at, action, info) VALUES (?, ?, ?, ?)",
+            (user_id, 0, action, json.dumps(info))
+        )
+
+
+@pytest.fixture
+def db_path(tmp_path):
+    path = str(tmp_path / "twitter_simulation.db")
+    with sqlite3.connect(path) as conn:
+        conn.executescript("""
+            CREATE TABLE user (user_id INTEGER PRIMARY KEY, agent_id INTEGER, name TEXT, user_name TEXT);
+            CREATE TABLE post (post_id INTEGER PRIMARY KEY, user_id INTEGER, content TEXT,
+                               original_post_id INTEGER, quote_content TEXT);
+            CREATE TABLE comment (comment_id INTEGER PRIMARY KEY, user_id INTEGER, content TEXT);
+            CREATE TABLE follow (follow_id INTEGER PRIMARY KEY, follower_id INTEGER, followee_id INTEGER);
+            CREATE TABLE trace (user_id INTEGER, created_at INTEGER, action TEXT, info TEXT);
+        """)
+        conn.executemany(
+            "INSERT INTO user (user_id, agent_id, name, user_name) VALUES (?, ?, ?, ?)",
+            [(agent_id, agent_id, name, name.lower()) for agent_id, name in AGENT_NAMES.items()]
+        )
+        conn.execute("INSERT INTO post (post_id, user_id, content) VALUES (1, 2, 'hello')")
+        conn.execute("INSERT INTO follow (follow_id, follower_id, followee_id) VALUES (1, 0, 2)")
+    return path
+
+
+@pytest.fixture
+def reader(db_path):
+    reader = ActionTraceReader(db_path, AGENT_NAMES)
+    yield reader
+    reader.close()
+
+
+def test_mute_resolves_target_from_mutee_id(db_path, reader):
+    # OASIS 记录的屏蔽动作: {"mutee_id": ...}，user_id 为 0 的用户同样需要解析
+    _add_trace(db_path, 1, "mute", {"mutee_id": 0})
+    _add_trace(db_path, 0, "mute", {"mutee_id": 2})
+
+    actions, last_rowid = reader.fetch_new_actions(0)
+
+    assert last_rowid == 2
+    assert [(a["agent_name"], a["action_type"], a["action_args"]) for a in actions] == [
+        ("Bob", "MUTE", {"target_user_name": "Alice"}),
+        ("Alice", "MUTE", {"target_user_name": "Carol"}),
+    ]
+    assert all("_mute_target" not in action for action in actions)
+
+
+def test_skips_filtered_actions_but_advances_rowid(db_path, reader):
+    _add_trace(db_path, 0, "refresh", {})
+    _add_trace(db_path, 0, "sign_up", {})
+
+    assert reader.fetch_new_actions(0) == ([], 2)
+    assert reader.fetch_new_actions(2) == ([], 2)
+
+
+def test_enriches_posts_and_follows(db_path, reader):
+    _add_trace(db_path, 0, "like_post", {"post_id": 1})
+    _add_trace(db_path, 0, "follow", {"follow_id": 1})
+
+    actions, _ = reader.fetch_new_actions(0)
+
+    assert actions[0]["action_args"] == {"post_id": 1, "post_content": "hello", "post_author_name": "Carol"}
+    assert actions[1]["action_args"] == {"follow_id": 1, "target_user_name": "Carol"}
+
+
+def test_repeated_lookups_hit_the_cache(db_path, reader):
+    _add_trace(db_path, 0, "like_post", {"post_id": 1})
+    reader.fetch_new_actions(0)
+    _add_trace(db_path, 1, "like_post", {"post_id": 1})
+
+    actions, _ = reader.fetch_new_actions(1)
+
+    assert actions[0]["action_args"]["post_content"] == "hello"
+    assert reader.cache_stats()["posts"]["hits"] == 1
+
+
+def test_missing_database_returns_nothing(tmp_path):
+    reader = ActionTraceReader(str(tmp_path / "missing.db"), AGENT_NAMES)
+
+    assert reader.fetch_new_actions(5) == ([], 5)
@@ -0,0 +1,64 @@
+"""
+增量获取动作测试
+"""
+
+import json
+
+import pytest
+
+from app.services.action_stream import parse_action_cursor
+from app.services.simulation_runner import SimulationRunner
+
+
+def _action(seq, round_num, agent_id, timestamp):
+    return json.dumps({
+        "seq": seq,
+        "round": round_num,
+        "timestamp": timestamp,
+        "agent_id": agent_id,
+        "agent_name": f"Agent_{agent_id}",
+        "action_type": "CREATE_POST",
+        "action_args": {"content": f"r{round_num}a{agent_id}"},
+        "success": True,
+    }) + "\n"
+
+
+@pytest.fixture
+def simulation_id(tmp_path, monkeypatch):
+    monkeypatch.setattr(SimulationRunner, "RUN_STATE_DIR", str(tmp_path))
+    sim_dir = tmp_path / "sim_since"
+    for platform, lines in {
+        "twitter": [_action(1, 1, 0, "2025-01-01T00:01:00"), _action(2, 2, 0, "2025-01-01T00:02:00")],
+        "reddit": [_action(1, 1, 1, "2025-01-01T00:01:30")],
+    }.items():
+        (sim_dir / platform).mkdir(parents=True)
+        (sim_dir / platform / "actions.jsonl").write_text("".join(lines), encoding="utf-8")
+    return "sim_since"
+
+
+def test_since_seq_returns_newer_actions_in_time_order(simulation_id):
+    actions, cursor = SimulationRunner.get_actions_since(simulation_id, since_seq="0")
+
+    assert [(a.platform, a.round_num) for a in actions] == [("twitter", 1), ("reddit", 1), ("twitter", 2)]
+
+    actions, _ = SimulationRunner.get_actions_since(simulation_id, cursor=cursor)
+    assert actions == []
+
+
+def test_platform_filter_keeps_other_platform_positions(simulation_id, tmp_path):
+    reddit_log = tmp_path / simulation_id / "reddit" / "actions.jsonl"
+
+    actions, cursor = SimulationRunner.get_actions_since(
+        simulation_id, since_seq="twitter:0,reddit:1", platform="twitter"
+    )
+
+    assert [a.platform for a in actions] == ["twitter", "twitter"]
+    # 去掉平台过滤后继续使用游标，不会从头重读 reddit
+    assert parse_action_cursor(cursor)["reddit"] == reddit_log.stat().st_size
+    actions, _ = SimulationRunner.get_actions_since(simulation_id, cursor=cursor)
+    assert actions == []
+
+
+def test_negative_since_seq_is_rejected(simulation_id):
+    with pytest.raises(ValueError, match="since_seq"):
+        SimulationRunner.get_actions_since(simulation_id, since_seq="-1")
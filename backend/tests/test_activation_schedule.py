@@ -0,0 +1,95 @@
+"""
+激活计划测试：生成、保存与进程内预览
+"""
+
+import json
+
+import pytest
+
+from activation_scheduler import SCHEDULE_FILE, build_schedule, load_schedule, save_schedule
+from app.services.simulation_manager import SimulationManager
+
+
+CONFIG = {
+    "simulation_id": "sim_test",
+    "time_config": {
+        "total_simulation_hours": 24,
+        "minutes_per_round": 60,
+        "agents_per_hour_min": 5,
+        "agents_per_hour_max": 15,
+    },
+    "agent_configs": [
+        {"agent_id": agent_id, "activity_level": 0.8, "active_hours": list(range(24))}
+        for agent_id in range(30)
+    ],
+}
+
+
+def test_schedule_is_reproducible_under_a_seed():
+    first = build_schedule(CONFIG, ["twitter", "reddit"], seed=11)
+    second = build_schedule(CONFIG, ["twitter", "reddit"], seed=11)
+
+    assert first["platforms"] == second["platforms"]
+    assert first["total_rounds"] == 24
+    assert build_schedule(CONFIG, ["twitter"], seed=11, max_rounds=5)["platforms"]["twitter"]["rounds"] == \
+        first["platforms"]["twitter"]["rounds"][:5]
+
+
+def test_summary_counts_llm_calls():
+    schedule = build_schedule(CONFIG, ["twitter", "reddit"], seed=3, llm_concurrency=4, llm_call_seconds=2.0)
+    summary = schedule["summary"]
+
+    total = sum(len(ids) for data in schedule["platforms"].values() for ids in data["rounds"])
+    assert summary["total_llm_calls"] == total
+    assert summary["peak_concurrency"] <= 2 * 4
+    assert len(summary["per_round"]) == 24
+
+
+def test_save_and_load_round_trip(tmp_path):
+    path = str(tmp_path / SCHEDULE_FILE)
+    schedule = build_schedule(CONFIG, ["reddit"])
+    save_schedule(schedule, path)
+
+    loaded = load_schedule(path)
+    assert loaded["seed"] == schedule["seed"]
+    assert loaded["platforms"] == schedule["platforms"]
+
+
+def test_load_rejects_other_versions(tmp_path):
+    path = tmp_path / SCHEDULE_FILE
+    path.write_text(json.dumps({"version": 0, "platforms": {}}), encoding="utf-8")
+
+    with pytest.raises(ValueError):
+        load_schedule(str(path))
+
+
+@pytest.fixture
+def manager(tmp_path, monkeypatch):
+    monkeypatch.setattr(SimulationManager, "SIMULATION_DATA_DIR", str(tmp_path))
+    sim_dir = tmp_path / "sim_test"
+    sim_dir.mkdir()
+    (sim_dir / "simulation_config.json").write_text(json.dumps(CONFIG), encoding="utf-8")
+    return SimulationManager()
+
+
+def test_preview_writes_schedule_in_process(tmp_path, manager):
+    preview = manager.preview_activation_schedule("sim_test", seed=5, max_rounds=6, llm_call_seconds=1.5)
+
+    assert preview["seed"] == 5
+    assert preview["total_rounds"] == 6
+    assert preview["platforms"] == ["twitter", "reddit"]
+    assert preview["summary"]["llm_call_seconds"] == 1.5
+
+    saved = load_schedule(str(tmp_path / "sim_test" / SCHEDULE_FILE))
+    assert saved["platforms"] == build_schedule(CONFIG, ["twitter", "reddit"], seed=5, max_rounds=6)["platforms"]
+
+
+@pytest.mark.parametrize("platform", ["twitter", "reddit"])
+def test_preview_rejects_single_platform(manager, platform):
+    with pytest.raises(ValueError):
+        manager.preview_activation_schedule("sim_test", platform=platform)
+
+
+def test_preview_requires_config(manager):
+    with pytest.raises(ValueError):
+        manager.preview_activation_schedule("sim_missing")
@@ -0,0 +1,93 @@
+"""
+Agent 激活调度测试
+"""
+
+import random
+
+from activation_scheduler import ActivationScheduler, count_total_rounds, round_hour
+
+
+def _config(agent_count=200, seed=0):
+    rand = random.Random(seed)
+    return {
+        "time_config": {
+            "total_simulation_hours": 48,
+            "minutes_per_round": 60,
+            "agents_per_hour_min": 10,
+            "agents_per_hour_max": 40,
+        },
+        "agent_configs": [
+            {
+                "agent_id": agent_id,
+                "activity_level": rand.random(),
+                "active_hours": sorted(rand.sample(range(24), rand.randint(1, 24))),
+            }
+            for agent_id in range(agent_count)
+        ],
+    }
+
+
+def _sample_all(scheduler, config):
+    return [
+        scheduler.sample_agent_ids(round_hour(config, round_num))
+        for round_num in range(count_total_rounds(config))
+    ]
+
+
+def test_same_seed_reproduces_every_round():
+    config = _config()
+
+    first = _sample_all(ActivationScheduler(config, seed=42, platform="twitter"), config)
+    second = _sample_all(ActivationScheduler(config, seed=42, platform="twitter"), config)
+
+    assert first == second
+    assert any(first)
+
+
+def test_platforms_and_seeds_use_different_sequences():
+    config = _config()
+    twitter = _sample_all(ActivationScheduler(config, seed=42, platform="twitter"), config)
+
+    assert _sample_all(ActivationScheduler(config, seed=42, platform="reddit"), config) != twitter
+    assert _sample_all(ActivationScheduler(config, seed=43, platform="twitter"), config) != twitter
+
+
+def test_sampled_agents_are_active_in_that_hour():
+    config = _config()
+    active_hours = {cfg["agent_id"]: set(cfg["active_hours"]) for cfg in config["agent_configs"]}
+    scheduler = ActivationScheduler(config, seed=1, platform="twitter")
+
+    for round_num, agent_ids in enumerate(_sample_all(scheduler, config)):
+        hour = round_hour(config, round_num)
+        assert len(agent_ids) == len(set(agent_ids))
+        assert all(hour in active_hours[agent_id] for agent_id in agent_ids)
+
+
+def test_restored_state_continues_the_same_sequence():
+    config = _config()
+    scheduler = ActivationScheduler(config, seed=7, platform="reddit")
+    for hour in range(5):
+        scheduler.sample_agent_ids(hour)
+    state = scheduler.get_state()
+    expected = [scheduler.sample_agent_ids(hour) for hour in range(5, 10)]
+
+    restored = ActivationScheduler(config, seed=None, platform="reddit")
+    restored.set_state(state)
+
+    assert [restored.sample_agent_ids(hour) for hour in range(5, 10)] == expected
+
+
+def test_replay_overrides_sampling_within_the_plan():
+    class Graph:
+        def get_agent(self, agent_id):
+            return f"agent-{agent_id}"
+
+    class Env:
+        agent_graph = Graph()
+
+    config = _config()
+    scheduler = ActivationScheduler(config, seed=3, platform="twitter", replay=[[5, 1], []])
+
+    assert scheduler.get_active_agents(Env(), 9, round_num=0) == [(5, "agent-5"), (1, "agent-1")]
+    assert scheduler.get_active_agents(Env(), 9, round_num=1) == []
+    assert all(agent == f"agent-{agent_id}" for agent_id, agent in scheduler.get_active_agents(Env(), 9, round_num=2))
@@ -0,0 +1,85 @@
+"""
+目录变化监听测试（inotify 与轮询回退）
+"""
+
+import asyncio
+import sys
+
+import pytest
+
+import dir_watcher as script_dir_watcher
+import inotify_watch
+from app.utils.dir_watcher import DirectoryWatcher, MultiDirectoryWatcher
+
+
+linux_only = pytest.mark.skipif(not sys.platform.startswith("linux"), reason="inotify 仅 Linux 可用")
+
+
+@linux_only
+def test_wait_wakes_on_new_file(tmp_path):
+    watcher = DirectoryWatcher(str(tmp_path))
+    assert watcher.start()
+    try:
+        # 启动前已存在的文件需要扫描一次
+        assert watcher.has_changes()
+        assert not watcher.has_changes()
+        assert not watcher.wait(0.05)
+
+        (tmp_path / "cmd.json").write_text("{}", encoding="utf-8")
+        assert watcher.wait(5)
+        assert watcher.has_changes()
+        assert not watcher.has_changes()
+    finally:
+        watcher.stop()
+
+
+def test_fallback_polls_with_backoff(tmp_path, monkeypatch):
+    monkeypatch.setattr(inotify_watch, "inotify_init", lambda: (None, "disabled"))
+    watcher = DirectoryWatcher(str(tmp_path), min_interval=0.01, max_interval=0.05)
+
+    assert not watcher.start()
+    assert not watcher.is_inotify
+    assert watcher.has_changes() and watcher.has_changes()
+    assert [watcher.next_interval() for _ in range(5)] == [0.01, 0.02, 0.04, 0.05, 0.05]
+    watcher.reset_backoff()
+    assert watcher.next_interval() == 0.01
+
+
+@linux_only
+def test_multi_watcher_reports_changed_keys(tmp_path):
+    first, second = tmp_path / "twitter", tmp_path / "reddit"
+    first.mkdir()
+    second.mkdir()
+    watcher = MultiDirectoryWatcher()
+    assert watcher.start()
+    try:
+        assert watcher.add(str(first), "twitter")
+        assert watcher.add(str(second), "reddit", filenames=["actions.jsonl"])
+
+        (second / "other.txt").write_text("x", encoding="utf-8")
+        assert watcher.wait(0.05) == set()
+
+        (first / "actions.jsonl").write_text("x", encoding="utf-8")
+        (second / "actions.jsonl").write_text("x", encoding="utf-8")
+        assert watcher.wait(5) == {"twitter", "reddit"}
+
+        watcher.wake()
+        assert watcher.wait(5) == set()
+    finally:
+        watcher.close()
+
+
+@linux_only
+@pytest.mark.asyncio
+async def test_async_watcher_sets_changed_event(tmp_path):
+    watcher = script_dir_watcher.DirectoryWatcher(str(tmp_path))
+    assert watcher.start()
+    try:
+        assert watcher.has_changes()
+        assert not watcher.changed.is_set()
+
+        (tmp_path / "cmd.json").write_text("{}", encoding="utf-8")
+        await asyncio.wait_for(watcher.changed.wait(), timeout=5)
+        assert watcher.has_changes()
+    finally:
+        watcher.stop()
@@ -0,0 +1,56 @@
+"""
+后台采访任务测试
+"""
+
+import asyncio
+import time
+
+from app.models.task import TaskManager, TaskStatus
+from app.services.simulation_ipc import IPCDispatcher
+from app.services.simulation_runner import SimulationRunner
+
+
+def _wait_task(task_id, timeout=5.0):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        task = TaskManager().get_task(task_id)
+        if task.status in (TaskStatus.COMPLETED, TaskStatus.FAILED):
+            return task
+        time.sleep(0.01)
+    raise AssertionError(f"任务未在 {timeout}s 内结束: {task_id}")
+
+
+def test_interview_task_returns_before_completion():
+    release = asyncio.Event()
+
+    async def interview():
+        await release.wait()
+        return {"success": True, "result": {"response": "ok"}}
+
+    task_id = SimulationRunner.submit_interview_task("sim_test", interview())
+
+    task = TaskManager().get_task(task_id)
+    assert task.status == TaskStatus.PROCESSING
+    assert task.metadata["simulation_id"] == "sim_test"
+
+    IPCDispatcher.get().loop.call_soon_threadsafe(release.set)
+
+    task = _wait_task(task_id)
+    assert task.status == TaskStatus.COMPLETED
+    assert task.result == {"success": True, "result": {"response": "ok"}}
+
+
+def test_interview_task_records_failures():
+    async def timed_out():
+        raise TimeoutError("agent 1")
+
+    async def broken():
+        raise RuntimeError("boom")
+
+    timeout_task = _wait_task(SimulationRunner.submit_interview_task("sim_test", timed_out()))
+    assert timeout_task.status == TaskStatus.FAILED
+    assert "超时" in timeout_task.error
+
+    error_task = _wait_task(SimulationRunner.submit_interview_task("sim_test", broken()))
+    assert error_task.status == TaskStatus.FAILED
+    assert error_task.error == "boom"
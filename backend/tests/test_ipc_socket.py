@@ -0,0 +1,65 @@
+"""
+IPC Socket 传输层测试
+"""
+
+import asyncio
+import json
+import os
+import tempfile
+
+import pytest
+
+from ipc_socket import (
+    IPC_SOCKET_FILE,
+    MAX_SOCKET_PATH_LENGTH,
+    IPCSocketServer,
+    get_socket_path,
+    is_socket_supported,
+)
+
+
+def test_socket_path_in_simulation_dir(tmp_path):
+    assert get_socket_path(str(tmp_path)) == os.path.join(str(tmp_path), IPC_SOCKET_FILE)
+
+
+def test_long_socket_path_moves_to_tempdir(tmp_path):
+    sim_dir = tmp_path / ("x" * MAX_SOCKET_PATH_LENGTH)
+    socket_path = get_socket_path(str(sim_dir))
+
+    assert os.path.dirname(socket_path) == tempfile.gettempdir()
+    assert len(socket_path.encode("utf-8")) <= MAX_SOCKET_PATH_LENGTH
+    # 同一模拟目录总是得到同一路径
+    assert get_socket_path(str(sim_dir)) == socket_path
+    assert get_socket_path(str(tmp_path / ("y" * MAX_SOCKET_PATH_LENGTH))) != socket_path
+
+
+@pytest.mark.skipif(not is_socket_supported(), reason="当前平台不支持 Unix Domain Socket")
+@pytest.mark.asyncio
+async def test_command_round_trip(tmp_path):
+    server = IPCSocketServer(str(tmp_path))
+    assert await server.start()
+    try:
+        reader, writer = await asyncio.open_unix_connection(server.socket_path)
+        command = {"command_id": "c1", "command_type": "interview", "args": {"agent_id": 0}, "timestamp": "t"}
+        writer.write((json.dumps(command) + "\n").encode("utf-8"))
+        await writer.drain()
+
+        await asyncio.wait_for(server.command_arrived.wait(), timeout=5)
+        received = server.get_command_nowait()
+        assert received["command_id"] == "c1"
+        assert received["args"] == {"agent_id": 0}
+        assert server.is_socket_command("c1")
+
+        assert server.send_partial({"command_id": "c1", "status": "processing", "result": {"n": 1}})
+        assert server.send_response({"command_id": "c1", "status": "completed", "result": {"ok": True}, "error": None})
+
+        partial = json.loads(await asyncio.wait_for(reader.readline(), timeout=5))
+        final = json.loads(await asyncio.wait_for(reader.readline(), timeout=5))
+        assert partial["status"] == "processing"
+        assert final == {"command_id": "c1", "status": "completed", "result": {"ok": True}, "error": None}
+
+        writer.close()
+    finally:
+        await server.stop()
+
+    assert not os.path.exists(server.socket_path)
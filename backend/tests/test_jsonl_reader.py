@@ -0,0 +1,51 @@
+"""
+JSONL 倒序读取测试
+"""
+
+import pytest
+
+from app.utils.jsonl_reader import iter_jsonl_reverse, iter_lines_reverse
+from app.utils.log_archive import compress_log
+
+
+LINES = [f'{{"n": {i}, "pad": "{"x" * (i % 7)}"}}'.encode() for i in range(50)]
+
+
+@pytest.fixture
+def log_path(tmp_path):
+    path = tmp_path / "actions.jsonl"
+    path.write_bytes(b"\n".join(LINES) + b"\n")
+    return str(path)
+
+
+@pytest.mark.parametrize("block_size", [1, 7, 64, 1 << 16])
+def test_lines_in_reverse_order_for_any_block_size(log_path, block_size):
+    assert list(iter_lines_reverse(log_path, block_size)) == LINES[::-1]
+
+
+def test_skips_unfinished_last_line_and_blank_lines(tmp_path):
+    path = tmp_path / "actions.jsonl"
+    path.write_bytes(b'{"n": 0}\n\n{"n": 1}\n{"n": 2, "par')
+
+    assert list(iter_lines_reverse(str(path), block_size=4)) == [b'{"n": 1}', b'{"n": 0}']
+
+
+def test_file_without_complete_line(tmp_path):
+    path = tmp_path / "actions.jsonl"
+    path.write_bytes(b'{"n": 0')
+
+    assert list(iter_lines_reverse(str(path))) == []
+
+
+def test_archived_log_reads_the_same(log_path):
+    archived = compress_log(log_path, frame_size=100)
+
+    assert list(iter_lines_reverse(archived, block_size=16)) == LINES[::-1]
+
+
+def test_jsonl_skips_unparsable_lines(tmp_path):
+    path = tmp_path / "actions.jsonl"
+    path.write_bytes(b'{"n": 0}\nnot json\n[1, 2]\n{"n": 1}\n')
+
+    assert [record["n"] for record in iter_jsonl_reverse(str(path))] == [1, 0]
+
@@ -0,0 +1,136 @@
+"""
+日志归档测试：分帧压缩、帧索引、按原始位置读取与截断
+"""
+
+import gzip
+import os
+
+import pytest
+
+from action_logger import PlatformActionLogger
+from app.utils import log_archive
+from app.utils.log_archive import (
+    check_truncate,
+    compress_log,
+    frame_index_path,
+    get_frames,
+    iter_blocks_reverse,
+    log_size,
+    open_log,
+    resolve_log_path,
+    truncate_log,
+)
+
+
+@pytest.fixture
+def log_path(tmp_path):
+    path = tmp_path / "actions.jsonl"
+    path.write_bytes(b"".join(f'{{"seq": {i}, "pad": "{"x" * (i % 13)}"}}\n'.encode() for i in range(500)))
+    return str(path)
+
+
+@pytest.fixture
+def archived(log_path):
+    return compress_log(log_path, frame_size=512)
+
+
+def test_archive_is_plain_multi_member_gzip(log_path, archived):
+    with open(log_path, 'rb') as f:
+        original = f.read()
+    with open(archived, 'rb') as f:
+        assert gzip.decompress(f.read()) == original
+
+
+def test_frames_end_on_line_boundaries_and_cover_the_log(log_path, archived):
+    with open(log_path, 'rb') as f:
+        original = f.read()
+    frames = get_frames(archived)
+
+    assert len(frames) > 1
+    raw_offset = 0
+    for _, _, frame_offset, frame_length in frames:
+        assert frame_offset == raw_offset
+        raw_offset += frame_length
+        assert original[raw_offset - 1:raw_offset] == b"\n"
+    assert raw_offset == len(original) == log_size(archived)
+
+
+def test_frames_rebuilt_by_scanning_without_index(archived):
+    frames = get_frames(archived)
+    os.remove(frame_index_path(archived))
+    # 帧列表按文件修改时间缓存，清空后才会重新读取
+    log_archive._frames_cache.clear()
+
+    assert get_frames(archived) == frames
+
+
+@pytest.mark.parametrize("position", [0, 1, 511, 512, 4000])
+def test_open_at_raw_position(log_path, archived, position):
+    with open(log_path, 'rb') as f:
+        original = f.read()
+
+    with open_log(archived, position) as f:
+        assert f.read() == original[position:]
+
+
+def test_open_past_end_reads_nothing(archived):
+    with open_log(archived, log_size(archived)) as f:
+        assert f.read() == b""
+
+
+def test_reverse_blocks_of_archive(log_path, archived):
+    with open(log_path, 'rb') as f:
+        original = f.read()
+
+    assert b"".join(reversed(list(iter_blocks_reverse(archived, 64)))) == original
+
+
+def test_resolve_prefers_original_then_archive(log_path, archived):
+    assert resolve_log_path(log_path) == log_path
+    os.remove(log_path)
+    assert resolve_log_path(log_path) == archived
+
+
+def test_truncate_plain_log(log_path):
+    with open(log_path, 'rb') as f:
+        original = f.read()
+    size = original.index(b"\n", 100) + 1
+
+    truncate_log(log_path, size)
+
+    with open(log_path, 'rb') as f:
+        assert f.read() == original[:size]
+
+
+def test_truncate_segmented_log_drops_later_segments(tmp_path):
+    logger = PlatformActionLogger("twitter", str(tmp_path), segment_rounds=2)
+    for round_num in range(6):
+        logger.log_action(round_num, 0, "Agent_0", "CREATE_POST")
+        logger.log_round_end(round_num, 1)
+    logger.close()
+    manifest = resolve_log_path(str(tmp_path / "twitter" / "actions.jsonl"))
+    with open_log(manifest) as f:
+        original = f.read()
+    # 截断到第二个分段的第一行之后
+    first_segment = os.path.getsize(tmp_path / "twitter" / "actions-0000.jsonl")
+    size = original.index(b"\n", first_segment) + 1
+
+    truncate_log(manifest, size)
+
+    with open_log(manifest) as f:
+        assert f.read() == original[:size]
+    assert os.path.getsize(tmp_path / "twitter" / "actions-0001.jsonl") == size - first_segment
+    assert not os.path.exists(tmp_path / "twitter" / "actions-0002.jsonl")
+
+
+def test_archived_log_cannot_be_truncated(log_path, archived):
+    with pytest.raises(ValueError):
+        check_truncate(archived, 10)
+
+
+def test_failed_check_leaves_log_unchanged(log_path):
+    size = os.path.getsize(log_path)
+
+    with pytest.raises(ValueError):
+        truncate_log(log_path, size + 1)
+    assert os.path.getsize(log_path) == size
@@ -0,0 +1,113 @@
+"""
+运行状态持久化测试：run_state.json 与单独保存的聚合结果
+"""
+
+import json
+import os
+
+import pytest
+
+from app.services.action_index import ActionIndex
+from app.services.simulation_runner import (
+    AGGREGATES_FILE,
+    AgentAction,
+    RunnerStatus,
+    SimulationRunner,
+    SimulationRunState,
+)
+
+
+SIM_ID = "sim_test"
+
+
+def _action(round_num, agent_id, platform="twitter"):
+    return AgentAction(
+        round_num=round_num,
+        timestamp=f"2025-01-01T00:{round_num:02d}:{agent_id:02d}",
+        platform=platform,
+        agent_id=agent_id,
+        agent_name=f"Agent_{agent_id}",
+        action_type="CREATE_POST",
+    )
+
+
+def _read(path):
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+@pytest.fixture
+def sim_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(SimulationRunner, "RUN_STATE_DIR", str(tmp_path))
+    monkeypatch.setattr(SimulationRunner, "_run_states", {})
+    sim_dir = tmp_path / SIM_ID
+    sim_dir.mkdir()
+    yield sim_dir
+    ActionIndex.discard(str(sim_dir))
+
+
+@pytest.fixture
+def state():
+    state = SimulationRunState(simulation_id=SIM_ID, runner_status=RunnerStatus.RUNNING)
+    for round_num, agent_id in [(1, 0), (1, 1), (2, 0)]:
+        action = _action(round_num, agent_id)
+        state.add_action(action)
+        state.record_action_stats(action)
+    return state
+
+
+def test_aggregates_are_saved_apart_from_run_state(sim_dir, state):
+    SimulationRunner._save_run_state(state)
+
+    run_state = _read(sim_dir / "run_state.json")
+    assert "rounds" not in run_state and "agent_stats" not in run_state
+    assert run_state["total_actions_count"] == 3
+
+    aggregates = _read(sim_dir / AGGREGATES_FILE)
+    assert [(r["round_num"], r["active_agents_count"]) for r in aggregates["rounds"]] == [(1, 2), (2, 1)]
+    assert all("active_agents" not in r for r in aggregates["rounds"])
+    assert {s["agent_id"]: s["total_actions"] for s in aggregates["agent_stats"]} == {0: 2, 1: 1}
+
+
+def test_aggregates_are_throttled_while_running(sim_dir, state):
+    SimulationRunner._save_run_state(state)
+    state.record_action_stats(_action(2, 1))
+    state.updated_at = "changed"
+    SimulationRunner._save_run_state(state)
+
+    assert _read(sim_dir / "run_state.json")["updated_at"] == "changed"
+    assert _read(sim_dir / AGGREGATES_FILE)["rounds"][1]["total_actions"] == 1
+
+    SimulationRunner._save_run_state(state, flush_aggregates=True)
+    assert _read(sim_dir / AGGREGATES_FILE)["rounds"][1]["total_actions"] == 2
+
+
+def test_finished_run_saves_aggregates_immediately(sim_dir, state):
+    SimulationRunner._save_run_state(state)
+    state.record_action_stats(_action(2, 1))
+    state.runner_status = RunnerStatus.COMPLETED
+    SimulationRunner._save_run_state(state)
+
+    assert _read(sim_dir / AGGREGATES_FILE)["rounds"][1]["total_actions"] == 2
+
+
+def test_reloaded_rounds_resolve_active_agents_from_the_index(sim_dir, state):
+    SimulationRunner._save_run_state(state, flush_aggregates=True)
+    log_dir = sim_dir / "twitter"
+    log_dir.mkdir()
+    with open(log_dir / "actions.jsonl", 'w', encoding='utf-8') as f:
+        for round_num, agent_id in [(1, 0), (1, 1), (2, 0)]:
+            record = _action(round_num, agent_id).to_dict()
+            record["round"] = record.pop("round_num")
+            f.write(json.dumps(record) + "\n")
+
+    loaded = SimulationRunner._load_run_state(SIM_ID)
+    assert [r.active_agents for r in loaded.rounds] == [None, None]
+    assert [r.active_agents_count for r in loaded.rounds] == [2, 1]
+
+    # 继续聚合同一轮时补全活跃Agent，重复的Agent不会重复计数
+    loaded.record_action_stats(_action(1, 1))
+    loaded.record_action_stats(_action(1, 2))
+    assert loaded.rounds[0].active_agents == {0, 1, 2}
+    assert loaded.rounds[1].active_agents is None
+    assert os.path.exists(sim_dir / "action_index.db")
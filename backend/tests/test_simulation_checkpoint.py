@@ -0,0 +1,107 @@
+"""
+模拟检查点测试
+"""
+
+import json
+import os
+import shutil
+import sqlite3
+
+import pytest
+
+from simulation_checkpoint import PlatformCheckpointer
+
+
+def _create_db(path, rows):
+    with sqlite3.connect(path) as conn:
+        conn.execute("CREATE TABLE IF NOT EXISTS post (post_id INTEGER PRIMARY KEY, content TEXT)")
+        conn.executemany("INSERT INTO post (content) VALUES (?)", [(row,) for row in rows])
+    conn.close()
+
+
+def _contents(path):
+    conn = sqlite3.connect(path)
+    try:
+        return [row[0] for row in conn.execute("SELECT content FROM post ORDER BY post_id")]
+    finally:
+        conn.close()
+
+
+@pytest.fixture
+def db_path(tmp_path):
+    path = str(tmp_path / "twitter_simulation.db")
+    _create_db(path, ["a", "b"])
+    return path
+
+
+@pytest.fixture
+def checkpointer(tmp_path):
+    return PlatformCheckpointer(str(tmp_path), "twitter", interval=4)
+
+
+def test_due_every_interval_and_after_last_round(checkpointer):
+    assert [n for n in range(0, 11) if checkpointer.due(n, total_rounds=10)] == [4, 8, 10]
+    assert not PlatformCheckpointer("unused", "twitter", interval=0).due(10, total_rounds=10)
+
+
+def test_save_load_restore(db_path, checkpointer):
+    saved = checkpointer.save(db_path, 4, {"last_rowid": 7, "rng_state": {"state": 1}})
+    _create_db(db_path, ["after checkpoint"])
+
+    loaded = checkpointer.load()
+    assert loaded == json.loads(json.dumps(saved))
+    assert loaded["round"] == 4
+    assert loaded["last_rowid"] == 7
+
+    checkpointer.restore(loaded, db_path)
+    assert _contents(db_path) == ["a", "b"]
+
+
+def test_only_latest_backup_is_kept(db_path, checkpointer):
+    checkpointer.save(db_path, 4, {})
+    checkpointer.save(db_path, 8, {})
+
+    backups = sorted(name for name in os.listdir(checkpointer.checkpoint_dir) if name.endswith(".db"))
+    assert backups == ["twitter_round_00008.db"]
+    assert checkpointer.load()["round"] == 8
+
+
+def test_load_without_checkpoint(checkpointer):
+    assert checkpointer.load() is None
+
+
+def test_load_rejects_checkpoint_of_another_platform(tmp_path, db_path, checkpointer):
+    checkpointer.save(db_path, 4, {})
+    reddit = PlatformCheckpointer(str(tmp_path), "reddit")
+    shutil.copyfile(checkpointer.state_path, reddit.state_path)
+
+    with pytest.raises(ValueError):
+        reddit.load()
+
+
+def test_load_rejects_missing_backup(db_path, checkpointer):
+    checkpoint = checkpointer.save(db_path, 4, {})
+    os.remove(os.path.join(checkpointer.checkpoint_dir, checkpoint["db_file"]))
+
+    with pytest.raises(ValueError):
+        checkpointer.load()
+
+
+def test_load_rejects_corrupt_state(db_path, checkpointer):
+    checkpointer.save(db_path, 4, {})
+    with open(checkpointer.state_path, 'w', encoding='utf-8') as f:
+        f.write('{"version": 1, "platfo')
+
+    with pytest.raises(ValueError):
+        checkpointer.load()
+
+
+def test_clear_removes_only_this_platform(tmp_path, db_path, checkpointer):
+    checkpointer.save(db_path, 4, {})
+    reddit = PlatformCheckpointer(str(tmp_path), "reddit")
+    reddit.save(db_path, 4, {})
+
+    checkpointer.clear()
+
+    assert checkpointer.load() is None
+    assert reddit.load()["round"] == 4
@@ -76,9 +76,17 @@ export const listSimulations = (projectId) => {
   return service.get('/api/simulation/list', { params })
 }
 
+/**
+ * 预览激活计划（不调用 LLM），返回每轮预计 LLM 调用数、峰值并发和预计耗时
+ * @param {Object} data - { simulation_id, seed?, max_rounds?, llm_call_seconds? }
+ */
+export const previewActivationSchedule = (data) => {
+  return service.post('/api/simulation/schedule/preview', data)
+}
+
 /**
  * 启动模拟
- * @param {Object} data - { simulation_id, platform?, max_rounds?, enable_graph_memory_update? }
+ * @param {Object} data - { simulation_id, platform?, max_rounds?, enable_graph_memory_update?, seed?, use_activation_schedule? }
  */
 export const startSimulation = (data) => {
   return requestWithRetry(() => service.post('/api/simulation/start', data), 3, 1000)
@@ -92,6 +100,30 @@ export const stopSimulation = (data) => {
   return service.post('/api/simulation/stop', data)
 }
 
+/**
+ * 从最近的检查点继续运行中断的模拟
+ * @param {Object} data - { simulation_id, enable_graph_memory_update? }
+ */
+export const resumeSimulation = (data) => {
+  return service.post('/api/simulation/resume', data)
+}
+
+/**
+ * 获取各平台最近的检查点（判断能否继续运行）
+ * @param {string} simulationId
+ */
+export const getSimulationCheckpoints = (simulationId) => {
+  return service.get(`/api/simulation/${simulationId}/checkpoints`)
+}
+
+/**
+ * 归档已结束的模拟（压缩日志、整理数据库），归档后仍可正常查询
+ * @param {Object} data - { simulation_id }
+ */
+export const archiveSimulation = (data) => {
+  return service.post('/api/simulation/archive', data)
+}
+
 /**
  * 获取模拟运行实时状态
  * @param {string} simulationId
@@ -108,6 +140,16 @@ export const getRunStatusDetail = (simulationId) => {
   return service.get(`/api/simulation/${simulationId}/run-status/detail`)
 }
 
+/**
+ * 获取模拟进程资源占用采样（CPU、内存、文件描述符、数据库大小）
+ * @param {string} simulationId
+ * @param {number} limit - 只返回最近的采样数（默认全部）
+ */
+export const getSimulationMetrics = (simulationId, limit = null) => {
+  const params = limit !== null ? { limit } : {}
+  return service.get(`/api/simulation/${simulationId}/metrics`, { params })
+}
+
 /**
  * 获取模拟中的帖子
  * @param {string} simulationId
@@ -146,12 +188,44 @@ export const getAgentStats = (simulationId) => {
 /**
  * 获取模拟动作历史
  * @param {string} simulationId
- * @param {Object} params - { limit, offset, platform, agent_id, round_num }
+ * @param {Object} params - { limit, offset, platform, agent_id, round_num, cursor, since_seq }
+ * 传入 cursor（上次返回的 next_cursor）或 since_seq 时只返回之后的新动作
  */
 export const getSimulationActions = (simulationId, params = {}) => {
   return service.get(`/api/simulation/${simulationId}/actions`, { params })
 }
 
+/**
+ * 订阅模拟实时动作流（SSE，断线后 EventSource 会携带 Last-Event-ID 自动续传）
+ * @param {string} simulationId
+ * @param {Object} params - { platform, agent_id, cursor }
+ * @param {Object} handlers - { onAction(action, cursor), onEnd(data), onError(event) }
+ * @returns {EventSource} 调用 close() 取消订阅
+ */
+export const streamSimulationActions = (simulationId, params = {}, handlers = {}) => {
+  const query = new URLSearchParams()
+  Object.entries(params).forEach(([key, value]) => {
+    if (value !== undefined && value !== null && value !== '') query.append(key, value)
+  })
+  const qs = query.toString()
+  const source = new EventSource(
+    `${service.defaults.baseURL}/api/simulation/${simulationId}/actions/stream${qs ? `?${qs}` : ''}`
+  )
+
+  source.addEventListener('action', (event) => {
+    handlers.onAction && handlers.onAction(JSON.parse(event.data), event.lastEventId)
+  })
+  source.addEventListener('end', (event) => {
+    source.close()
+    handlers.onEnd && handlers.onEnd(JSON.parse(event.data))
+  })
+  source.onerror = (event) => {
+    handlers.onError && handlers.onError(event)
+  }
+
+  return source
+}
+
 /**
  * 关闭模拟环境（优雅退出）
  * @param {Object} data - { simulation_id, timeout? }
@@ -176,3 +250,74 @@ export const interviewAgents = (data) => {
   return requestWithRetry(() => service.post('/api/simulation/interview/batch', data), 3, 1000)
 }
 
+/**
+ * 后台批量采访 Agent，立即返回 task_id（通过 getInterviewTask 查询结果）
+ * @param {Object} data - { simulation_id, interviews: [{ agent_id, prompt }] }
+ */
+export const submitInterviewAgents = (data) => {
+  return service.post('/api/simulation/interview/batch', { ...data, async: true })
+}
+
+/**
+ * 查询后台采访任务
+ * @param {string} taskId
+ */
+export const getInterviewTask = (taskId) => {
+  return service.get(`/api/simulation/interview/task/${taskId}`)
+}
+
+/**
+ * 批量采访 Agent（流式），每个 Agent 的回答完成后立即回调
+ * @param {Object} data - { simulation_id, interviews: [{ agent_id, prompt }] }
+ * @param {Function} onPartial - 单个回答回调 { key, agent_id, platform, response, timestamp }
+ * @returns {Promise<Object>} 与 interviewAgents 相同的最终结果
+ */
+export const interviewAgentsStream = async (data, onPartial) => {
+  const response = await fetch(`${service.defaults.baseURL}/api/simulation/interview/batch/stream`, {
+    method: 'POST',
+    headers: { 'Content-Type': 'application/json' },
+    body: JSON.stringify(data)
+  })
+
+  if (!response.ok || !response.body) {
+    const res = await response.json().catch(() => ({}))
+    throw new Error(res.error || `HTTP ${response.status}`)
+  }
+
+  const reader = response.body.getReader()
+  const decoder = new TextDecoder()
+  let buffer = ''
+
+  while (true) {
+    const { done, value } = await reader.read()
+    if (done) break
+    buffer += decoder.decode(value, { stream: true })
+
+    // SSE 消息以空行分隔
+    let sep
+    while ((sep = buffer.indexOf('\n\n')) !== -1) {
+      const message = buffer.slice(0, sep)
+      buffer = buffer.slice(sep + 2)
+
+      let event = 'message'
+      let payload = ''
+      for (const line of message.split('\n')) {
+        if (line.startsWith('event: ')) event = line.slice(7)
+        else if (line.startsWith('data: ')) payload += line.slice(6)
+      }
+      if (!payload) continue
+
+      const parsed = JSON.parse(payload)
+      if (event === 'partial') {
+        onPartial && onPartial(parsed)
+      } else if (event === 'done') {
+        return { success: parsed.success, data: parsed }
+      } else if (event === 'error') {
+        throw new Error(parsed.error || 'Error')
+      }
+    }
+  }
+
+  throw new Error('Interview stream closed before completion')
+}
+